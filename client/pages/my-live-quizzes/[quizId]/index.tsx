@@ -3,6 +3,8 @@ import { useRouter } from "next/router";
 import React, { useCallback, useEffect, useRef, useState } from "react";
 import toast from "react-hot-toast";
 import {
+  LiveQuizSessionPage,
+  ParticipantProgress,
   ParticipantRow,
   liveQuizService,
 } from "@features/live-quiz/api/liveQuizService";
@@ -43,6 +45,16 @@ const formatDateTime = (isoString: string | null | undefined): string => {
   }
 };
 
+// A snapshot can be read just before a progress event that overtakes it;
+// keep whichever copy of a row the server wrote last.
+const isNewer = (
+  candidate: { updated_at?: string | null },
+  current: { updated_at?: string | null },
+): boolean =>
+  !candidate.updated_at ||
+  !current.updated_at ||
+  Date.parse(candidate.updated_at) >= Date.parse(current.updated_at);
+
 const formatDuration = (seconds: number | null | undefined): string => {
   if (seconds == null) return "—";
   const m = Math.floor(seconds / 60);
@@ -77,14 +89,56 @@ const LiveQuizCreatorDashboard: React.FC<LiveQuizCreatorDashboardProps> = ({
     });
   }, []);
 
+  const applyProgress = useCallback((progress: ParticipantProgress) => {
+    setParticipants((current) => {
+      const index = current.findIndex(
+        (row) => row.session_id === progress.session_id,
+      );
+      // Rows we have not seen yet arrive with the next snapshot.
+      if (index === -1 || !isNewer(progress, current[index])) return current;
+      const next = [...current];
+      next[index] = { ...current[index], ...progress };
+      return next;
+    });
+  }, []);
+
+  // A snapshot carries only the newest page of rows, so it is merged into
+  // the list rather than replacing it: rows past that page are kept.
+  const applySnapshot = useCallback((rows: ParticipantRow[]) => {
+    setParticipants((current) => {
+      const known = new Map(current.map((row, index) => [row.session_id, index]));
+      const next = [...current];
+      const added: ParticipantRow[] = [];
+      rows.forEach((row) => {
+        const index = known.get(row.session_id);
+        if (index === undefined) {
+          added.push(row);
+        } else if (isNewer(row, next[index])) {
+          next[index] = row;
+        }
+      });
+      return [...added, ...next];
+    });
+  }, []);
+
   const fetchParticipants = useCallback(
     async (showLoading = false) => {
       if (showLoading) setLoading(true);
       setError(null);
       try {
-        const data = await liveQuizService.listParticipants(quizId);
+        // The listing is paged; follow next_cursor until every row is read.
+        const rows: ParticipantRow[] = [];
+        let cursor: string | null | undefined = null;
+        do {
+          const page: LiveQuizSessionPage = await liveQuizService.listParticipants(
+            quizId,
+            cursor,
+          );
+          rows.push(...page.participants);
+          cursor = page.next_cursor;
+        } while (cursor && mountedRef.current);
         if (mountedRef.current) {
-          setParticipants(data);
+          setParticipants(rows);
         }
       } catch (err: any) {
         if (err?.response?.status === 403) {
@@ -140,7 +194,11 @@ const LiveQuizCreatorDashboard: React.FC<LiveQuizCreatorDashboardProps> = ({
           setRealtimeConnected(true);
           setError(null);
           if (event.type === "participants_snapshot") {
-            setParticipants(event.participants);
+            applySnapshot(event.participants);
+            return;
+          }
+          if (event.type === "participant_progress") {
+            applyProgress(event.participant);
             return;
           }
           upsertParticipant(event.participant);
@@ -188,7 +246,7 @@ const LiveQuizCreatorDashboard: React.FC<LiveQuizCreatorDashboardProps> = ({
         socketRef.current = null;
       }
     };
-  }, [fetchParticipants, quizId, upsertParticipant]);
+  }, [applyProgress, applySnapshot, fetchParticipants, quizId, upsertParticipant]);
 
   const handleRefreshClick = () => {
     fetchParticipants(true);
@@ -85,8 +85,19 @@ export interface ParticipantRow {
   progress_percentage?: number | null;
   status: string;
   auto_submitted: boolean;
+  updated_at?: string | null;
 }
 
+export type ParticipantProgress = Pick<
+  ParticipantRow,
+  | "session_id"
+  | "progress"
+  | "current_question_number"
+  | "progress_percentage"
+  | "status"
+  | "updated_at"
+>;
+
 export interface AccessCodeResponse {
   quiz_id: string;
   access_code: string;
@@ -115,16 +126,59 @@ export interface LiveQuizSummary {
   average_score?: number | null;
 }
 
+export interface LiveQuizLeaderboardEntry {
+  rank: number;
+  session_id: string;
+  participant_name: string;
+  score: number;
+  percentage?: number | null;
+  duration_seconds: number;
+  submitted_at?: string | null;
+  auto_submitted: boolean;
+}
+
+export interface LiveQuizAnalyticsPage {
+  quiz_id: string;
+  status: string;
+  participant_count: number;
+  status_counts: {
+    joined: number;
+    in_progress: number;
+    disconnected: number;
+    submitted: number;
+    timed_out: number;
+  };
+  average_score?: number | null;
+  score_histogram: { score: number; count: number }[];
+  questions: {
+    question_index: number;
+    correct_count: number;
+    answered_count: number;
+    correct_rate?: number | null;
+  }[];
+  leaderboard: LiveQuizLeaderboardEntry[];
+  participants: ParticipantRow[];
+  limit: number;
+  next_cursor?: string | null;
+}
+
+export interface LiveQuizSessionPage {
+  quiz_id: string;
+  participants: ParticipantRow[];
+  limit: number;
+  next_cursor?: string | null;
+}
+
 export type LiveQuizParticipantsEvent =
+  | ({ type: "participants_snapshot" } & LiveQuizAnalyticsPage)
   | {
-      type: "participants_snapshot";
+      type: "participant_progress";
       quiz_id: string;
-      participants: ParticipantRow[];
+      participant: ParticipantProgress;
     }
   | {
       type:
         | "participant_joined"
-        | "participant_progress"
         | "participant_submitted"
         | "participant_disconnected";
       quiz_id: string;
@@ -237,13 +291,29 @@ export const liveQuizService = {
     );
   },
 
-  async listParticipants(quizId: string): Promise<ParticipantRow[]> {
+  async listParticipants(
+    quizId: string,
+    cursor?: string | null,
+    limit = 100,
+  ): Promise<LiveQuizSessionPage> {
     const { data } = await api.get(
       `/api/v1/quizzes/${quizId}/live-sessions/participants`,
+      { params: { limit, ...(cursor ? { cursor } : {}) } },
     );
     return data;
   },
 
+  async getAnalytics(
+    quizId: string,
+    cursor?: string | null,
+    limit = 50,
+  ): Promise<LiveQuizAnalyticsPage> {
+    const { data } = await api.get(`/api/v1/quizzes/${quizId}/live-analytics`, {
+      params: { limit, ...(cursor ? { cursor } : {}) },
+    });
+    return data;
+  },
+
   async listLiveQuizzes(): Promise<LiveQuizSummary[]> {
     const { data } = await api.get("/api/v1/quizzes/live");
     return data;
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from functools import lru_cache
 from typing import Literal, Optional
 from urllib.parse import urlparse, urlunparse
@@ -25,6 +26,12 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("mongo_url", "MONGO_URI"),
     )
     HF_QUIZ_MODEL: str = "Qwen/Qwen2.5-7B-Instruct"
+    HF_INFERENCE_MAX_CONNECTIONS: int = 64
+    HF_INFERENCE_MAX_KEEPALIVE_CONNECTIONS: int = 32
+    HF_INFERENCE_MAX_CONNECTIONS_PER_HOST: int = 16
+    HF_INFERENCE_MAX_WAITING_PER_HOST: int = 256
+    HF_INFERENCE_TIMEOUT_SECONDS: float = 120.0
+    HF_INFERENCE_CONNECT_TIMEOUT_SECONDS: float = 10.0
     HF_EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     DOCUMENT_UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
     DOCUMENT_TEXT_MAX_CHARS: int = 50_000
@@ -33,6 +40,36 @@ class Settings(BaseSettings):
     DOCUMENT_CHUNK_SIZE_CHARS: int = 1600
     DOCUMENT_CHUNK_OVERLAP_CHARS: int = 220
     DOCUMENT_RAG_CACHE_ENABLED: bool = True
+    DOCUMENT_RAG_CACHE_EMBEDDING_ENCODING: Literal["float32", "int8"] = "float32"
+    DOCUMENT_CHUNK_EMBEDDING_CACHE_ENABLED: bool = True
+    DOCUMENT_CHUNK_EMBEDDING_CACHE_MAX_ENTRIES: int = 200_000
+    DOCUMENT_EMBEDDING_BATCH_SIZE: int = 16
+    DOCUMENT_EMBEDDING_MAX_CONCURRENCY: int = 4
+    DOCUMENT_EMBEDDING_MAX_ATTEMPTS: int = 3
+    DOCUMENT_EMBEDDING_LEASE_SECONDS: int = 120
+    DOCUMENT_EMBEDDING_LEASE_POLL_SECONDS: float = 0.25
+    DOCUMENT_EMBEDDING_LEASE_WAIT_SECONDS: float = 180
+    DOCUMENT_EXTRACTION_WORKERS: int = 2
+    DOCUMENT_EXTRACTION_PAGES_PER_TASK: int = 8
+    QUIZ_CLASSIFICATION_CACHE_MAX_ENTRIES: int = 2048
+    QUIZ_CLASSIFICATION_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    QUIZ_ANSWER_KEY_CACHE_MAX_ENTRIES: int = 1024
+    QUIZ_ANSWER_KEY_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    QUIZ_ACCESS_INDEX_READS_ENABLED: bool = False
+    QUIZ_EXPORT_CACHE_ENABLED: bool = True
+    QUIZ_EXPORT_CACHE_DIR: str = os.path.join(tempfile.gettempdir(), "quiz_exports")
+    QUIZ_EXPORT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    QUIZ_EXPORT_WORKERS: int = 2
+    LIVE_QUIZ_SEND_QUEUE_SIZE: int = 256
+    LIVE_QUIZ_SEND_TIMEOUT_SECONDS: float = 5.0
+    LIVE_QUIZ_SLOW_CONSUMER_POLICY: Literal["coalesce", "drop_oldest", "disconnect"] = "coalesce"
+    LIVE_QUIZ_SNAPSHOT_INTERVAL_SECONDS: float = 30.0
+    LIVE_QUIZ_CACHE_MAX_ENTRIES: int = 1024
+    LIVE_QUIZ_CACHE_TTL_SECONDS: float = 30.0
+    LIVE_QUIZ_EXPIRY_SWEEP_INTERVAL_SECONDS: float = 15.0
+    LIVE_QUIZ_EXPIRY_SWEEP_BATCH_SIZE: int = 500
+    LIVE_QUIZ_EXPIRY_SWEEP_LEASE_SECONDS: float = 60.0
+    LIVE_QUIZ_LEADERBOARD_SIZE: int = 50
     QUIZ_V2_WRITE_MODE: Literal["legacy_only", "dual_write", "v2_only"] = "v2_only"
     QUIZ_V2_FAIL_OPEN: bool = True
     QUIZ_V2_STRUCTURED_LOGGING: bool = True
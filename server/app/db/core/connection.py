@@ -5,6 +5,7 @@ import logging
 
 from cryptography.fernet import Fernet
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from server.app.quiz.repositories.live_session_queries import SESSION_LISTINGS
 from server.app.quiz.repositories.v2.setup import ensure_v2_collections_and_validators, ensure_v2_indexes
 from server.app.users.validators import ensure_user_collections
 
@@ -31,6 +32,7 @@ quiz_history_collection = database["quiz_history"]
 ai_generated_quizzes_collection = database["ai_generated_quizzes"]
 live_quiz_sessions_collection = database["live_quiz_sessions"]
 live_quiz_invitations_collection = database["live_quiz_invitations"]
+live_quiz_aggregates_collection = database["live_quiz_aggregates"]
 
 
 folders_collection = database["folders"]
@@ -43,7 +45,9 @@ folders_v2_collection = database["folders_v2"]
 folder_items_v2_collection = database["folder_items_v2"]
 saved_quizzes_v2_collection = database["saved_quizzes_v2"]
 quiz_history_v2_collection = database["quiz_history_v2"]
+quiz_access_v2_collection = database["quiz_access_v2"]
 document_rag_cache_collection = database["document_rag_cache"]
+chunk_embedding_cache_collection = database["chunk_embedding_cache"]
 
 
 async def ensure_ai_quiz_indexes(ai_generated_quizzes_collection: AsyncIOMotorCollection):
@@ -78,10 +82,21 @@ async def ensure_live_quiz_session_indexes(
     live_quiz_sessions_collection: AsyncIOMotorCollection,
 ):
     """Indexes for participant live quiz sessions."""
-    await live_quiz_sessions_collection.create_index("quiz_id")
     await live_quiz_sessions_collection.create_index("guest_id")
     await live_quiz_sessions_collection.create_index("status")
     await live_quiz_sessions_collection.create_index("expires_at")
+    # The expiry sweeper's scan: open sessions by expiry time.
+    await live_quiz_sessions_collection.create_index(
+        [("status", 1), ("expires_at", 1)],
+        name="live_quiz_session_expiry",
+    )
+    # One compound index per listing, so its filter, sort and keyset cursor
+    # are all served from the index; these also cover plain quiz_id lookups.
+    for listing in SESSION_LISTINGS:
+        await live_quiz_sessions_collection.create_index(
+            listing.index_keys,
+            name=listing.index_name,
+        )
 
 
 async def ensure_document_rag_cache_indexes(
@@ -108,6 +123,20 @@ async def ensure_document_rag_cache_indexes(
     )
 
 
+async def ensure_chunk_embedding_cache_indexes(
+    chunk_embedding_cache_collection: AsyncIOMotorCollection,
+):
+    await chunk_embedding_cache_collection.create_index(
+        [("embedding_model", 1), ("content_hash", 1)],
+        unique=True,
+        name="chunk_embedding_cache_key",
+    )
+    await chunk_embedding_cache_collection.create_index(
+        [("last_accessed_at", 1), ("access_count", 1)],
+        name="chunk_embedding_cache_eviction_order",
+    )
+
+
 async def drop_removed_collections():
     if "blacklisted_tokens" in await database.list_collection_names():
         await database.drop_collection("blacklisted_tokens")
@@ -142,6 +171,7 @@ async def startUp():
     await ensure_notification_indexes(notifications_collection)
     await ensure_live_quiz_session_indexes(live_quiz_sessions_collection)
     await ensure_document_rag_cache_indexes(document_rag_cache_collection)
+    await ensure_chunk_embedding_cache_indexes(chunk_embedding_cache_collection)
     await ensure_live_quiz_invitation_indexes(live_quiz_invitations_collection)
     await ensure_v2_collections_and_validators(database)
     await ensure_v2_indexes(
@@ -150,6 +180,7 @@ async def startUp():
         folder_items_v2_collection,
         saved_quizzes_v2_collection,
         quiz_history_v2_collection,
+        quiz_access_v2_collection,
     )
     from server.app.quiz.services.quiz_user_library_service import QuizUserLibraryService
 
@@ -157,6 +188,10 @@ async def startUp():
     if backfilled_folder_items:
         logger.info("Backfilled saved_quiz_id onto %s folder items.", backfilled_folder_items)
 
+    quiz_access_report = await QuizUserLibraryService().backfill_quiz_access_index(only_if_empty=True)
+    if quiz_access_report is not None and quiz_access_report.repaired:
+        logger.info("Backfilled %s quiz access index rows.", quiz_access_report.repaired)
+
 def get_users_collection() -> AsyncIOMotorCollection:
     if users_collection is None:
         raise RuntimeError("[DB Error] users_collection has not been initialized properly.")
@@ -220,6 +255,12 @@ def get_live_quiz_invitations_collection() -> AsyncIOMotorCollection:
     return live_quiz_invitations_collection
 
 
+def get_live_quiz_aggregates_collection() -> AsyncIOMotorCollection:
+    if live_quiz_aggregates_collection is None:
+        raise RuntimeError("[DB Error] live_quiz_aggregates_collection has not been initialized properly.")
+    return live_quiz_aggregates_collection
+
+
 def get_quizzes_v2_collection() -> AsyncIOMotorCollection:
     if quizzes_v2_collection is None:
         raise RuntimeError("[DB Error] quizzes_v2_collection has not been initialized properly.")
@@ -250,7 +291,19 @@ def get_quiz_history_v2_collection() -> AsyncIOMotorCollection:
     return quiz_history_v2_collection
 
 
+def get_quiz_access_v2_collection() -> AsyncIOMotorCollection:
+    if quiz_access_v2_collection is None:
+        raise RuntimeError("[DB Error] quiz_access_v2_collection has not been initialized properly.")
+    return quiz_access_v2_collection
+
+
 def get_document_rag_cache_collection() -> AsyncIOMotorCollection:
     if document_rag_cache_collection is None:
         raise RuntimeError("[DB Error] document_rag_cache_collection has not been initialized properly.")
     return document_rag_cache_collection
+
+
+def get_chunk_embedding_cache_collection() -> AsyncIOMotorCollection:
+    if chunk_embedding_cache_collection is None:
+        raise RuntimeError("[DB Error] chunk_embedding_cache_collection has not been initialized properly.")
+    return chunk_embedding_cache_collection
@@ -0,0 +1,67 @@
+"""Best-effort mutual exclusion across workers on top of Redis ``SET NX``.
+
+A lease is held by whoever set the key and expires on its own after ``ttl``,
+so a worker that dies mid-job blocks the others for at most one TTL. Release
+only deletes the key while it still holds this lease's token, and a holder
+with a long job extends the TTL the same way.
+"""
+
+from __future__ import annotations
+
+import logging
+import secrets
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+
+logger = logging.getLogger(__name__)
+
+RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+EXTEND_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisLease:
+    def __init__(self, redis_client: Redis, key: str, *, ttl_seconds: float):
+        self._redis = redis_client
+        self.key = key
+        self._ttl_ms = max(1, int(ttl_seconds * 1000))
+        self._token = secrets.token_hex(16)
+        self.held = False
+
+    async def acquire(self) -> bool:
+        self.held = bool(
+            await self._redis.set(self.key, self._token, nx=True, px=self._ttl_ms)
+        )
+        return self.held
+
+    async def extend(self) -> bool:
+        """Restart the TTL if this lease still holds the key; False once it has lapsed."""
+        if not self.held:
+            return False
+        self.held = bool(
+            await self._redis.eval(EXTEND_SCRIPT, 1, self.key, self._token, self._ttl_ms)
+        )
+        return self.held
+
+    async def release(self) -> None:
+        if not self.held:
+            return
+        self.held = False
+        try:
+            await self._redis.eval(RELEASE_SCRIPT, 1, self.key, self._token)
+        except (RedisError, OSError) as exc:
+            # The key still expires on its own; nothing else to clean up.
+            logger.warning("Failed to release Redis lease %s: %s", self.key, exc)
+
@@ -15,12 +15,12 @@ async def quiz_export_link(quiz_id: str, format: str = "pdf") -> dict[str, str]:
     if file_format not in SUPPORTED_EXPORT_FORMATS:
         raise ValueError(f"Unsupported export format: {format}")
 
-    quiz = await QuizV2Repository(get_quizzes_v2_collection()).find_by_id(quiz_id)
+    quiz = await QuizV2Repository(get_quizzes_v2_collection()).find_raw_by_id(quiz_id)
     if quiz is None:
         raise ValueError("Quiz not found")
-    if quiz.owner_user_id and quiz.owner_user_id != context.user_id:
-        visibility = quiz.visibility.value if hasattr(quiz.visibility, "value") else str(quiz.visibility)
-        if visibility not in {"public", "unlisted"}:
+    owner_user_id = quiz.get("owner_user_id")
+    if owner_user_id and owner_user_id != context.user_id:
+        if quiz.get("visibility", "private") not in {"public", "unlisted"}:
             raise PermissionError("Quiz access is required to export this quiz.")
 
     return {
@@ -28,5 +28,5 @@ async def quiz_export_link(quiz_id: str, format: str = "pdf") -> dict[str, str]:
         "quiz_id": quiz_id,
         "format": file_format,
         "href": "/download-quiz",
-        "filename": build_download_filename(quiz.title, file_format),
+        "filename": build_download_filename(quiz.get("title"), file_format),
     }
@@ -11,13 +11,12 @@ async def share_get_quiz(quiz_id: str) -> dict | None:
 
 
 async def share_create_link(quiz_id: str) -> dict[str, str]:
-    quiz = await QuizV2Repository(get_quizzes_v2_collection()).find_by_id(quiz_id)
+    quiz = await QuizV2Repository(get_quizzes_v2_collection()).find_raw_by_id(quiz_id)
     if quiz is None:
         raise ValueError("Quiz not found")
-    visibility = quiz.visibility.value if hasattr(quiz.visibility, "value") else str(quiz.visibility)
-    if visibility not in {"public", "unlisted"}:
+    if quiz.get("visibility", "private") not in {"public", "unlisted"}:
         context = await get_mcp_request_context(require_auth=True)
-        if quiz.owner_user_id != context.user_id:
+        if quiz.get("owner_user_id") != context.user_id:
             raise PermissionError("Quiz ownership is required to create a share link.")
     return {"link": f"{settings.share_url}/share/{quiz_id}"}
 
@@ -1,10 +1,14 @@
 import logging
 
 from server.app.quiz.repositories.token_repository import get_user_token
+from server.app.quiz.repositories.v2.models.quiz_models import QuizDocumentV2
 from server.app.quiz.services.canonical_quiz_service import CanonicalQuizWriteService
-from server.app.quiz.services.category_taxonomy_service import (
-    classify_quiz_taxonomy,
-    normalize_quiz_type,
+from server.app.quiz.services.category_taxonomy_service import normalize_quiz_type
+from server.app.quiz.services.taxonomy_classification_cache import (
+    CACHE_STATUS_STORED_QUIZ,
+    TaxonomyClassificationCache,
+    classify_quiz_taxonomy_cached,
+    get_taxonomy_classification_cache,
 )
 
 
@@ -12,24 +16,79 @@ logger = logging.getLogger(__name__)
 canonical_service = CanonicalQuizWriteService()
 
 
-async def save_ai_generated_quiz(quiz_data: dict):
+def _build_save_response(
+    canonical_quiz: QuizDocumentV2,
+    *,
+    cache: TaxonomyClassificationCache,
+    cache_status: str,
+) -> dict:
+    return {
+        "message": "Quiz saved successfully",
+        "quiz_id": str(canonical_quiz.id),
+        "duplicate": False,
+        "category": canonical_quiz.category,
+        "category_slug": canonical_quiz.category_slug,
+        "subcategory": canonical_quiz.subcategory,
+        "subcategory_slug": canonical_quiz.subcategory_slug,
+        "tags": canonical_quiz.tags,
+        "classification": (
+            canonical_quiz.classification.model_dump(mode="json")
+            if canonical_quiz.classification
+            else None
+        ),
+        "classification_cache": {
+            "status": cache_status,
+            **cache.stats.as_dict(),
+        },
+    }
+
+
+async def save_ai_generated_quiz(
+    quiz_data: dict,
+    *,
+    classification_cache: TaxonomyClassificationCache | None = None,
+):
     try:
+        cache = classification_cache if classification_cache is not None else get_taxonomy_classification_cache()
         quiz_type = normalize_quiz_type(quiz_data.get("question_type", "multichoice"))
-        classification_token = quiz_data.get("token")
-        if not classification_token and quiz_data.get("user_id"):
-            classification_token = await get_user_token(quiz_data["user_id"])
-        classification = await classify_quiz_taxonomy(
+        title = quiz_data.get("profession") or "General Knowledge"
+
+        # The fingerprint ignores taxonomy fields, so an identical quiz that is
+        # already stored keeps its classification and the classifier is skipped.
+        unclassified_document = canonical_service.build_quiz_document(
+            title=title,
+            description=quiz_data.get("custom_instruction"),
+            quiz_type=quiz_type,
+            owner_user_id=quiz_data.get("user_id"),
+            source="ai",
+            questions=quiz_data["questions"],
+        )
+        existing_quiz = await canonical_service.find_quiz_v2_by_fingerprint(
+            unclassified_document.content_fingerprint
+        )
+        if existing_quiz:
+            cache.stats.stored_quiz_hits += 1
+            return _build_save_response(existing_quiz, cache=cache, cache_status=CACHE_STATUS_STORED_QUIZ)
+
+        async def load_classification_token():
+            if quiz_data.get("user_id"):
+                return await get_user_token(quiz_data["user_id"])
+            return None
+
+        classification, cache_status = await classify_quiz_taxonomy_cached(
+            cache,
             quiz_type=quiz_type,
-            title=quiz_data.get("profession") or "General Knowledge",
+            title=title,
             profession=quiz_data.get("profession"),
             custom_instruction=quiz_data.get("custom_instruction"),
             questions=quiz_data.get("questions", []),
-            token=classification_token,
+            token=quiz_data.get("token"),
+            token_loader=load_classification_token,
             use_ai=True,
         )
         taxonomy_fields = classification.to_quiz_fields() if classification else {}
         quiz_document = canonical_service.build_quiz_document(
-            title=quiz_data.get("profession") or "General Knowledge",
+            title=title,
             description=quiz_data.get("custom_instruction"),
             quiz_type=quiz_type,
             owner_user_id=quiz_data.get("user_id"),
@@ -43,21 +102,7 @@ async def save_ai_generated_quiz(quiz_data: dict):
             classification=taxonomy_fields.get("classification"),
         )
         canonical_quiz = await canonical_service.find_or_create_quiz_v2_by_fingerprint(quiz_document)
-        return {
-            "message": "Quiz saved successfully",
-            "quiz_id": str(canonical_quiz.id),
-            "duplicate": False,
-            "category": canonical_quiz.category,
-            "category_slug": canonical_quiz.category_slug,
-            "subcategory": canonical_quiz.subcategory,
-            "subcategory_slug": canonical_quiz.subcategory_slug,
-            "tags": canonical_quiz.tags,
-            "classification": (
-                canonical_quiz.classification.model_dump(mode="json")
-                if canonical_quiz.classification
-                else None
-            ),
-        }
+        return _build_save_response(canonical_quiz, cache=cache, cache_status=cache_status)
     except Exception as exc:
         logger.error("Error saving quiz: %s", exc)
         raise
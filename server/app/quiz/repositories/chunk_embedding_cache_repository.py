@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+from pymongo import ASCENDING, UpdateOne
+
+from server.app.db.core.connection import get_chunk_embedding_cache_collection
+from server.app.quiz.utils.embedding_codec import (
+    EMBEDDING_ENCODING_FLOAT32,
+    EmbeddingEncoding,
+    decode_embedding_matrix,
+    encode_embedding_matrix,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChunkEmbeddingCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+_stats = ChunkEmbeddingCacheStats()
+
+
+def get_chunk_embedding_cache_stats() -> ChunkEmbeddingCacheStats:
+    """Process-wide hit/miss/eviction counters for the chunk embedding tier."""
+    return _stats
+
+
+def build_chunk_content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+async def get_cached_chunk_embeddings(
+    *,
+    contents: Iterable[str],
+    embedding_model: str,
+) -> dict[str, np.ndarray]:
+    """Return cached embeddings for ``contents`` keyed by content hash.
+
+    Entries are shared by every document that contains the same chunk text,
+    so a hit here is independent of who uploaded what.
+    """
+    content_hashes = sorted({build_chunk_content_hash(content) for content in contents})
+    if not content_hashes:
+        return {}
+
+    collection = get_chunk_embedding_cache_collection()
+    cursor = collection.find(
+        {
+            "embedding_model": embedding_model,
+            "content_hash": {"$in": content_hashes},
+        },
+        {
+            "content_hash": 1,
+            "embedding_encoding": 1,
+            "embedding_count": 1,
+            "embedding_dimensions": 1,
+            "embeddings": 1,
+            "embedding_scales": 1,
+        },
+    )
+
+    cached: dict[str, np.ndarray] = {}
+    async for entry in cursor:
+        matrix = decode_embedding_matrix(entry)
+        if matrix is not None and len(matrix) == 1:
+            cached[entry["content_hash"]] = matrix[0]
+
+    hits = len(cached)
+    _stats.hits += hits
+    _stats.misses += len(content_hashes) - hits
+
+    if cached:
+        await collection.update_many(
+            {
+                "embedding_model": embedding_model,
+                "content_hash": {"$in": list(cached)},
+            },
+            {
+                "$set": {"last_accessed_at": datetime.now(timezone.utc)},
+                "$inc": {"access_count": 1},
+            },
+        )
+    return cached
+
+
+async def upsert_chunk_embeddings(
+    *,
+    contents: Sequence[str],
+    embeddings: Sequence[Sequence[float]] | np.ndarray,
+    embedding_model: str,
+    max_entries: int,
+    embedding_encoding: EmbeddingEncoding = EMBEDDING_ENCODING_FLOAT32,
+) -> None:
+    if not contents:
+        return
+
+    collection = get_chunk_embedding_cache_collection()
+    now = datetime.now(timezone.utc)
+    operations: list[UpdateOne] = []
+    seen_hashes: set[str] = set()
+    for content, embedding in zip(contents, embeddings):
+        content_hash = build_chunk_content_hash(content)
+        if content_hash in seen_hashes:
+            continue
+        seen_hashes.add(content_hash)
+        operations.append(
+            UpdateOne(
+                {"embedding_model": embedding_model, "content_hash": content_hash},
+                {
+                    "$set": {
+                        **encode_embedding_matrix([embedding], encoding=embedding_encoding),
+                        "char_count": len(content),
+                        "last_accessed_at": now,
+                    },
+                    "$setOnInsert": {"created_at": now},
+                    "$inc": {"access_count": 1},
+                },
+                upsert=True,
+            )
+        )
+
+    await collection.bulk_write(operations, ordered=False)
+    await evict_chunk_embeddings(max_entries=max_entries)
+
+
+async def evict_chunk_embeddings(*, max_entries: int) -> int:
+    """Trim the cache to ``max_entries``, dropping least recently used first.
+
+    Ties on ``last_accessed_at`` fall back to the lowest ``access_count``.
+    """
+    if max_entries <= 0:
+        return 0
+
+    collection = get_chunk_embedding_cache_collection()
+    overflow = await collection.estimated_document_count() - max_entries
+    if overflow <= 0:
+        return 0
+
+    cursor = (
+        collection.find({}, {"_id": 1})
+        .sort([("last_accessed_at", ASCENDING), ("access_count", ASCENDING)])
+        .limit(overflow)
+    )
+    stale_ids: list[Any] = [entry["_id"] async for entry in cursor]
+    if not stale_ids:
+        return 0
+
+    result = await collection.delete_many({"_id": {"$in": stale_ids}})
+    evicted = int(getattr(result, "deleted_count", 0) or 0)
+    _stats.evictions += evicted
+    logger.info(
+        "Evicted %s chunk embedding cache entries (limit %s)",
+        evicted,
+        max_entries,
+    )
+    return evicted
@@ -2,13 +2,27 @@ from __future__ import annotations
 
 import hashlib
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Any, Optional, Sequence, Union
+
+import numpy as np
 
 from server.app.db.core.connection import get_document_rag_cache_collection
 from server.app.quiz.utils.chunk_text import TextChunk
+from server.app.quiz.utils.embedding_codec import (
+    EMBEDDING_ENCODING_FLOAT32,
+    EmbeddingEncoding,
+    decode_embedding_matrix,
+    encode_embedding_matrix,
+)
 from server.app.quiz.utils.extract_text import ExtractedDocument
 
 
+# Version 1 (no ``cache_format_version`` field) stored each chunk's embedding
+# as a BSON array of doubles. Version 2 stores chunk text per chunk and all
+# embeddings as one packed matrix, row i belonging to chunk i.
+CACHE_FORMAT_VERSION = 2
+
+
 def build_document_fingerprint(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
@@ -30,20 +44,54 @@ def _build_cache_query(
     }
 
 
-def _serialize_chunk_payload(
-    *,
-    chunk: TextChunk,
-    embedding: list[float],
-) -> dict[str, Any]:
+def _serialize_chunk_metadata(chunk: TextChunk) -> dict[str, Any]:
     return {
         "chunk_id": chunk.chunk_id,
         "content": chunk.content,
         "char_count": chunk.char_count,
-        "embedding": embedding,
     }
 
 
-def _deserialize_cached_chunks(
+def _serialize_cache_payload(
+    *,
+    chunks: list[TextChunk],
+    chunk_embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+    embedding_encoding: EmbeddingEncoding,
+) -> dict[str, Any]:
+    return {
+        "cache_format_version": CACHE_FORMAT_VERSION,
+        "chunks": [_serialize_chunk_metadata(chunk) for chunk in chunks],
+        **encode_embedding_matrix(chunk_embeddings, encoding=embedding_encoding),
+    }
+
+
+def _deserialize_chunk_metadata(payload: list[dict[str, Any]]) -> list[TextChunk]:
+    chunks: list[TextChunk] = []
+    for item in payload:
+        if not isinstance(item, dict):
+            return []
+        chunk = TextChunk(
+            chunk_id=int(item.get("chunk_id", len(chunks))),
+            content=str(item.get("content", "")),
+            char_count=int(item.get("char_count", 0)),
+        )
+        if not chunk.content:
+            return []
+        chunks.append(chunk)
+    return chunks
+
+
+def _deserialize_cached_document(
+    cached_document: dict[str, Any],
+) -> tuple[list[TextChunk], Optional[np.ndarray]]:
+    chunks = _deserialize_chunk_metadata(cached_document.get("chunks") or [])
+    embeddings = decode_embedding_matrix(cached_document)
+    if embeddings is None or len(embeddings) != len(chunks):
+        return [], None
+    return chunks, embeddings
+
+
+def _deserialize_legacy_cached_chunks(
     payload: list[dict[str, Any]],
 ) -> tuple[list[TextChunk], list[list[float]]]:
     chunks: list[TextChunk] = []
@@ -102,7 +150,13 @@ async def get_cached_document_embeddings(
     chunk_size_chars: int,
     chunk_overlap_chars: int,
     chunk_limit: int,
-) -> Optional[list[list[float]]]:
+    embedding_encoding: EmbeddingEncoding = EMBEDDING_ENCODING_FLOAT32,
+) -> Optional[np.ndarray]:
+    """Return the cached chunk embeddings as a ``(len(chunks), dims)`` matrix.
+
+    Legacy array-format entries are decoded the slow way once and rewritten
+    in the packed format as part of the access-count update.
+    """
     collection = get_document_rag_cache_collection()
     document_fingerprint = build_document_fingerprint(document.text)
     cache_query = _build_cache_query(
@@ -117,19 +171,34 @@ async def get_cached_document_embeddings(
     if not cached_document:
         return None
 
-    cached_chunks, cached_embeddings = _deserialize_cached_chunks(
-        cached_document.get("chunks") or []
-    )
-    if not cached_embeddings or not _cached_chunks_match(chunks, cached_chunks):
-        return None
+    access_update: dict[str, Any] = {
+        "$set": {"last_accessed_at": datetime.now(timezone.utc)},
+        "$inc": {"access_count": 1},
+    }
+    if cached_document.get("cache_format_version") == CACHE_FORMAT_VERSION:
+        cached_chunks, cached_embeddings = _deserialize_cached_document(cached_document)
+        if cached_embeddings is None or not _cached_chunks_match(chunks, cached_chunks):
+            return None
+    else:
+        cached_chunks, legacy_embeddings = _deserialize_legacy_cached_chunks(
+            cached_document.get("chunks") or []
+        )
+        if (
+            not legacy_embeddings
+            or len({len(embedding) for embedding in legacy_embeddings}) != 1
+            or not _cached_chunks_match(chunks, cached_chunks)
+        ):
+            return None
+        cached_embeddings = np.asarray(legacy_embeddings, dtype=np.float32)
+        access_update["$set"].update(
+            _serialize_cache_payload(
+                chunks=cached_chunks,
+                chunk_embeddings=cached_embeddings,
+                embedding_encoding=embedding_encoding,
+            )
+        )
 
-    await collection.update_one(
-        {"_id": cached_document["_id"]},
-        {
-            "$set": {"last_accessed_at": datetime.now(timezone.utc)},
-            "$inc": {"access_count": 1},
-        },
-    )
+    await collection.update_one({"_id": cached_document["_id"]}, access_update)
     return cached_embeddings
 
 
@@ -137,11 +206,12 @@ async def upsert_document_embeddings(
     *,
     document: ExtractedDocument,
     chunks: list[TextChunk],
-    chunk_embeddings: list[list[float]],
+    chunk_embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
     embedding_model: str,
     chunk_size_chars: int,
     chunk_overlap_chars: int,
     chunk_limit: int,
+    embedding_encoding: EmbeddingEncoding = EMBEDDING_ENCODING_FLOAT32,
 ) -> None:
     collection = get_document_rag_cache_collection()
     document_fingerprint = build_document_fingerprint(document.text)
@@ -153,10 +223,6 @@ async def upsert_document_embeddings(
         chunk_limit=chunk_limit,
     )
     now = datetime.now(timezone.utc)
-    serialized_chunks = [
-        _serialize_chunk_payload(chunk=chunk, embedding=embedding)
-        for chunk, embedding in zip(chunks, chunk_embeddings)
-    ]
 
     await collection.update_one(
         cache_query,
@@ -166,7 +232,11 @@ async def upsert_document_embeddings(
                 "source_document_name": document.source_document_name,
                 "source_document_type": document.source_document_type,
                 "source_characters": document.source_characters,
-                "chunks": serialized_chunks,
+                **_serialize_cache_payload(
+                    chunks=chunks,
+                    chunk_embeddings=chunk_embeddings,
+                    embedding_encoding=embedding_encoding,
+                ),
                 "total_chunks": len(chunks),
                 "updated_at": now,
                 "last_accessed_at": now,
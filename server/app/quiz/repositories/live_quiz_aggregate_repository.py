@@ -0,0 +1,204 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument, UpdateOne
+
+from server.app.core.config import settings
+
+
+SESSION_STATUSES = ("joined", "active", "disconnected", "submitted")
+
+# Increments to ``$inc`` paths plus leaderboard entries to push, for one quiz.
+AggregateChange = Tuple[Dict[str, int], List[Dict[str, Any]]]
+
+
+def empty_live_quiz_aggregate(quiz_id: str) -> Dict[str, Any]:
+    return {
+        "_id": quiz_id,
+        "participant_count": 0,
+        "status_counts": {status: 0 for status in SESSION_STATUSES},
+        "timed_out_count": 0,
+        "scored_count": 0,
+        "score_sum": 0,
+        "score_histogram": {},
+        "questions": {},
+        "leaderboard": [],
+    }
+
+
+def merge_aggregate_change(
+    changes: Dict[str, AggregateChange],
+    quiz_id: str,
+    change: AggregateChange,
+) -> None:
+    """Fold ``change`` into the pending changes for ``quiz_id``."""
+    increments, entries = changes.setdefault(quiz_id, ({}, []))
+    for path, amount in change[0].items():
+        increments[path] = increments.get(path, 0) + amount
+    entries.extend(change[1])
+
+
+def apply_aggregate_change(
+    aggregate: Dict[str, Any],
+    change: AggregateChange,
+    leaderboard_size: int,
+) -> None:
+    """Apply ``change`` to an in-memory summary the way the update would."""
+    for path, amount in change[0].items():
+        *parents, leaf = path.split(".")
+        target = aggregate
+        for key in parents:
+            target = target.setdefault(key, {})
+        target[leaf] = target.get(leaf, 0) + amount
+    if change[1]:
+        aggregate["leaderboard"] = rank_leaderboard(
+            aggregate["leaderboard"] + change[1],
+            leaderboard_size,
+        )
+
+
+def rank_leaderboard(entries: List[Dict[str, Any]], size: int) -> List[Dict[str, Any]]:
+    return sorted(
+        entries,
+        key=lambda entry: (-entry["score"], entry["duration_seconds"], entry["session_id"]),
+    )[:size]
+
+
+class LiveQuizAggregateRepository:
+    """One running summary document per live quiz, keyed by the quiz id.
+
+    Session writes apply their effect as ``$inc`` counters and a capped,
+    sorted ``$push`` onto the leaderboard, so dashboards read one document
+    however many participants joined. Updates never upsert: a quiz without
+    a summary (one that went live before summaries existed) keeps none
+    until the service rebuilds it from its sessions.
+
+    Every update bumps ``version``. A rebuild first stores an empty summary
+    marked ``rebuilding``, which updates keep counting into and reads treat
+    as missing, then swaps in the recount only if ``version`` has not moved
+    while it scanned; otherwise it scans again.
+    """
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        leaderboard_size: Optional[int] = None,
+    ):
+        self.collection = collection
+        self.leaderboard_size = leaderboard_size or settings.LIVE_QUIZ_LEADERBOARD_SIZE
+
+    async def get(self, quiz_id: str) -> Optional[Dict[str, Any]]:
+        """The quiz's summary, or None when it has none or one still being rebuilt."""
+        return await self.collection.find_one({"_id": quiz_id, "rebuilding": {"$ne": True}})
+
+    async def get_many(self, quiz_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not quiz_ids:
+            return {}
+        cursor = self.collection.find({"_id": {"$in": quiz_ids}, "rebuilding": {"$ne": True}})
+        return {
+            aggregate["_id"]: aggregate
+            for aggregate in await cursor.to_list(length=len(quiz_ids))
+        }
+
+    async def ensure(self, quiz_id: str) -> None:
+        """Start an empty summary for a quiz that has no sessions yet."""
+        await self.collection.update_one(
+            {"_id": quiz_id},
+            {"$setOnInsert": {**empty_live_quiz_aggregate(quiz_id), "updated_at": _utc_now()}},
+            upsert=True,
+        )
+
+    async def list_quiz_ids(self) -> List[str]:
+        return [document["_id"] async for document in self.collection.find({}, {"_id": 1})]
+
+    async def begin_rebuild(self, quiz_id: str) -> Optional[Dict[str, Any]]:
+        """The summary a rebuild will replace, stored empty and ``rebuilding`` if there was none.
+
+        Updates that land while the sessions are scanned count into it
+        instead of being dropped for want of a document.
+        """
+        return await self.collection.find_one_and_update(
+            {"_id": quiz_id},
+            {
+                "$setOnInsert": {
+                    **empty_live_quiz_aggregate(quiz_id),
+                    "version": 0,
+                    "rebuilding": True,
+                    "updated_at": _utc_now(),
+                }
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def replace_if_unchanged(
+        self,
+        aggregate: Dict[str, Any],
+        version: Optional[int],
+    ) -> Optional[Dict[str, Any]]:
+        """Store a recounted summary unless an update landed since ``begin_rebuild``.
+
+        Returns the stored summary, or None when ``version`` moved and the
+        recount may have missed that update.
+        """
+        stored = {
+            **{key: value for key, value in aggregate.items() if key != "_id"},
+            "version": (version or 0) + 1,
+            "rebuilding": False,
+            "updated_at": _utc_now(),
+        }
+        result = await self.collection.update_one(
+            {"_id": aggregate["_id"], "version": version},
+            {"$set": stored},
+        )
+        if not result.matched_count:
+            return None
+        return {"_id": aggregate["_id"], **stored}
+
+    async def apply(
+        self,
+        quiz_id: str,
+        increments: Dict[str, int],
+        leaderboard_entries: Optional[List[Dict[str, Any]]] = None,
+    ) -> bool:
+        """Apply one session change; returns False when the quiz has no summary."""
+        result = await self.collection.update_one(
+            {"_id": quiz_id},
+            self._update(increments, leaderboard_entries or []),
+        )
+        return result.matched_count > 0
+
+    async def apply_many(self, changes: Dict[str, AggregateChange]) -> None:
+        """Apply a batch of changes in one round trip, one update per quiz."""
+        if not changes:
+            return
+        await self.collection.bulk_write(
+            [
+                UpdateOne({"_id": quiz_id}, self._update(increments, entries))
+                for quiz_id, (increments, entries) in changes.items()
+            ],
+            ordered=False,
+        )
+
+    def _update(
+        self,
+        increments: Dict[str, int],
+        leaderboard_entries: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        update: Dict[str, Any] = {"$set": {"updated_at": _utc_now()}}
+        increments = {path: amount for path, amount in increments.items() if amount}
+        update["$inc"] = {**increments, "version": 1}
+        if leaderboard_entries:
+            update["$push"] = {
+                "leaderboard": {
+                    "$each": leaderboard_entries,
+                    "$sort": {"score": -1, "duration_seconds": 1, "session_id": 1},
+                    "$slice": self.leaderboard_size,
+                }
+            }
+        return update
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
@@ -0,0 +1,88 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+class InvalidSessionCursor(ValueError):
+    """A listing cursor that was not produced by ``SessionListing.next_cursor``."""
+
+
+@dataclass(frozen=True)
+class SessionListing:
+    """One live-session listing and the compound index that serves it.
+
+    The index is the listing's equality fields followed by its sort key, newest
+    first, with ``_id`` as the tie-breaker. Pages are read by keyset: the next
+    page starts strictly after the last row's (sort value, ``_id``) pair, so
+    the server walks the index from that point instead of skipping rows and
+    never sorts in memory.
+    """
+
+    index_name: str
+    equality_fields: Tuple[str, ...]
+    sort_field: str
+
+    @property
+    def index_keys(self) -> List[Tuple[str, int]]:
+        return [(field, 1) for field in self.equality_fields] + self.sort
+
+    @property
+    def sort(self) -> List[Tuple[str, int]]:
+        return [(self.sort_field, -1), ("_id", -1)]
+
+    def query(self, values: Dict[str, Any], cursor: Optional[str] = None) -> Dict[str, Any]:
+        query = {field: values[field] for field in self.equality_fields}
+        if cursor is None:
+            return query
+        sort_value, last_id = self._decode(cursor)
+        if sort_value is None:
+            # Missing sort values come last, so only their ties remain.
+            return {**query, self.sort_field: None, "_id": {"$lt": last_id}}
+        # One index scan from the last sort value down; the rows already
+        # served at that value are filtered out as they are fetched. ``$not``
+        # rather than ``$lte`` keeps missing values, which sort last, in range.
+        return {
+            **query,
+            self.sort_field: {"$not": {"$gt": sort_value}},
+            "$nor": [{self.sort_field: sort_value, "_id": {"$gte": last_id}}],
+        }
+
+    def next_cursor(self, last_row: Dict[str, Any]) -> str:
+        sort_value = last_row.get(self.sort_field)
+        payload = {
+            "v": sort_value.isoformat() if isinstance(sort_value, datetime) else None,
+            "i": str(last_row["_id"]),
+        }
+        return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+    def _decode(self, cursor: str) -> Tuple[Optional[datetime], ObjectId]:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            sort_value = datetime.fromisoformat(payload["v"]) if payload["v"] else None
+            return sort_value, ObjectId(payload["i"])
+        except (ValueError, KeyError, TypeError, InvalidId) as exc:
+            raise InvalidSessionCursor("Invalid session cursor") from exc
+
+
+QUIZ_SESSIONS = SessionListing(
+    index_name="live_quiz_session_quiz_listing",
+    equality_fields=("quiz_id",),
+    sort_field="created_at",
+)
+CREATOR_QUIZ_SESSIONS = SessionListing(
+    index_name="live_quiz_session_creator_listing",
+    equality_fields=("quiz_id", "creator_user_id"),
+    sort_field="created_at",
+)
+PARTICIPANT_SESSIONS = SessionListing(
+    index_name="live_quiz_session_participant_listing",
+    equality_fields=("participant_email",),
+    sort_field="submitted_at",
+)
+
+SESSION_LISTINGS = (QUIZ_SESSIONS, CREATOR_QUIZ_SESSIONS, PARTICIPANT_SESSIONS)
@@ -1,14 +1,27 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from bson import ObjectId
 from bson.errors import InvalidId
 from motor.motor_asyncio import AsyncIOMotorCollection
-from pymongo import ReturnDocument
+from pymongo import ReturnDocument, UpdateOne
 
+from server.app.quiz.repositories.live_session_queries import (
+    CREATOR_QUIZ_SESSIONS,
+    PARTICIPANT_SESSIONS,
+    QUIZ_SESSIONS,
+    SessionListing,
+)
 from server.app.quiz.repositories.v2.repositories.quiz_repository import QuizV2Repository
 
 
+OPEN_SESSION_STATUSES = ["active", "joined", "disconnected"]
+
+
+def _literal_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: {"$literal": value} for field, value in fields.items()}
+
+
 class LiveQuizSessionRepository:
     def __init__(
         self,
@@ -19,12 +32,10 @@ class LiveQuizSessionRepository:
         self.sessions_collection = sessions_collection
 
     async def get_quiz_by_id(self, quiz_id: str) -> Optional[Dict[str, Any]]:
-        quiz = await self.quiz_repository.find_by_id(quiz_id)
-        return quiz.model_dump(by_alias=True) if quiz else None
+        return await self.quiz_repository.find_raw_by_id(quiz_id)
 
     async def get_quiz_by_access_code(self, access_code: str) -> Optional[Dict[str, Any]]:
-        quiz = await self.quiz_repository.find_by_access_code(access_code.strip().upper())
-        return quiz.model_dump(by_alias=True) if quiz else None
+        return await self.quiz_repository.find_raw_by_access_code(access_code.strip().upper())
 
     async def access_code_exists(self, access_code: str) -> bool:
         return await self.quiz_repository.access_code_exists(access_code)
@@ -92,52 +103,192 @@ class LiveQuizSessionRepository:
         except InvalidId:
             return None
 
+    async def transition_session(
+        self,
+        session_id: str,
+        from_statuses: List[str],
+        updates: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """Apply ``updates`` only while the session is in one of ``from_statuses``.
+
+        Returns the updated session with ``previous_status`` holding the
+        status it replaced, or None when the session is missing or has moved on.
+        """
+        try:
+            object_id = ObjectId(session_id)
+        except InvalidId:
+            return None
+        return await self.sessions_collection.find_one_and_update(
+            {"_id": object_id, "status": {"$in": from_statuses}},
+            [
+                {
+                    "$set": {
+                        **_literal_fields(updates),
+                        "previous_status": "$status",
+                        "updated_at": datetime.now(timezone.utc),
+                    }
+                }
+            ],
+            return_document=ReturnDocument.AFTER,
+        )
+
     async def save_answer(
         self,
         session_id: str,
         question_index: int,
         selected_answer: str,
-        next_question_index: int,
+        next_question_index: Optional[int],
+        *,
+        participant_token_hash: str,
+        now: datetime,
     ) -> Optional[Dict[str, Any]]:
-        session = await self.get_session(session_id)
-        if not session:
+        """Upsert one answer in a single round trip and return the updated session.
+
+        The filter carries the token, status, expiry and question bounds
+        checks, and the pipeline update replaces only this question's entry,
+        so concurrent answers from the same participant cannot overwrite each
+        other. Returns None when any check fails; the caller reads the session
+        to find out which. Like ``transition_session``, the returned session
+        carries the status it replaced in ``previous_status``.
+        """
+        try:
+            object_id = ObjectId(session_id)
+        except InvalidId:
             return None
 
-        now = datetime.now(timezone.utc)
-        answers = [
-            answer
-            for answer in session.get("answers", [])
-            if answer.get("question_index") != question_index
-        ]
-        answers.append(
-            {
-                "question_index": question_index,
-                "selected_answer": selected_answer,
-                "answered_at": now,
+        highest_index = max(question_index, next_question_index or 0)
+        answer = {
+            "question_index": question_index,
+            "selected_answer": selected_answer,
+            "answered_at": now,
+        }
+        other_answers = {
+            "$filter": {
+                "input": {"$ifNull": ["$answers", []]},
+                "cond": {"$ne": ["$$this.question_index", question_index]},
             }
-        )
-        answers.sort(key=lambda answer: answer["question_index"])
-        return await self.update_session(
-            session_id,
+        }
+        return await self.sessions_collection.find_one_and_update(
             {
-                "answers": answers,
-                "current_question_index": next_question_index,
-                "status": "active",
+                "_id": object_id,
+                "participant_token_hash": participant_token_hash,
+                "status": {"$in": OPEN_SESSION_STATUSES},
+                "expires_at": {"$gt": now},
+                "total_questions": {"$gt": highest_index},
             },
+            [
+                {
+                    "$set": {
+                        "answers": {
+                            "$sortArray": {
+                                "input": {"$concatArrays": [other_answers, [{"$literal": answer}]]},
+                                "sortBy": {"question_index": 1},
+                            }
+                        },
+                        "current_question_index": (
+                            "$current_question_index"
+                            if next_question_index is None
+                            else {"$literal": next_question_index}
+                        ),
+                        "previous_status": "$status",
+                        "status": "active",
+                        "updated_at": now,
+                    }
+                }
+            ],
+            return_document=ReturnDocument.AFTER,
         )
 
-    async def list_quiz_sessions(self, quiz_id: str) -> List[Dict[str, Any]]:
-        cursor = self.sessions_collection.find({"quiz_id": quiz_id}).sort(
-            "created_at", -1,
+    async def find_expired_sessions(self, now: datetime, limit: int) -> List[Dict[str, Any]]:
+        """Open sessions past ``expires_at``, oldest expiry first."""
+        cursor = self.sessions_collection.find(
+            {
+                "status": {"$in": OPEN_SESSION_STATUSES},
+                "expires_at": {"$lte": now},
+            }
+        ).sort("expires_at", 1).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def finalize_expired_sessions(
+        self,
+        finalized_fields: Dict[ObjectId, Dict[str, Any]],
+        now: datetime,
+    ) -> List[Dict[str, Any]]:
+        """Apply each session's final fields in one bulk write and return the written sessions.
+
+        A session the participant submitted meanwhile is left alone, and each
+        returned session carries ``previous_status``. Every update in one call
+        must share ``submitted_at``; it picks out the sessions this call
+        closed when they are read back.
+        """
+        if not finalized_fields:
+            return []
+        submitted_at = next(iter(finalized_fields.values()))["submitted_at"]
+        await self.sessions_collection.bulk_write(
+            [
+                UpdateOne(
+                    {
+                        "_id": session_id,
+                        "status": {"$in": OPEN_SESSION_STATUSES},
+                        "expires_at": {"$lte": now},
+                    },
+                    [
+                        {
+                            "$set": {
+                                **_literal_fields(fields),
+                                "previous_status": "$status",
+                                "updated_at": now,
+                            }
+                        }
+                    ],
+                )
+                for session_id, fields in finalized_fields.items()
+            ],
+            ordered=False,
+        )
+        cursor = self.sessions_collection.find(
+            {
+                "_id": {"$in": list(finalized_fields)},
+                "status": "submitted",
+                "submitted_at": submitted_at,
+            }
         )
-        return await cursor.to_list(length=500)
+        return await cursor.to_list(length=len(finalized_fields))
+
+    async def list_quiz_sessions(self, quiz_id: str, limit: int = 500) -> List[Dict[str, Any]]:
+        """A quiz's newest ``limit`` sessions; ``list_quiz_sessions_page`` reads past them."""
+        cursor = self.sessions_collection.find(QUIZ_SESSIONS.query({"quiz_id": quiz_id})).sort(
+            QUIZ_SESSIONS.sort,
+        ).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    def iter_quiz_sessions(self, quiz_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Every session of a quiz, fetched in batches as the caller iterates."""
+        return self.sessions_collection.find({"quiz_id": quiz_id})
+
+    async def list_quiz_sessions_page(
+        self,
+        quiz_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of a quiz's sessions, newest first, and the next page's cursor."""
+        return await self._list_page(QUIZ_SESSIONS, {"quiz_id": quiz_id}, limit, cursor)
 
-    async def list_quiz_sessions_by_creator(self, quiz_id: str, creator_user_id: str) -> List[Dict[str, Any]]:
+    async def list_quiz_sessions_by_creator(
+        self,
+        quiz_id: str,
+        creator_user_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """List sessions for a quiz, filtered by creator_user_id for security."""
-        cursor = self.sessions_collection.find(
-            {"quiz_id": quiz_id, "creator_user_id": creator_user_id}
-        ).sort("created_at", -1)
-        return await cursor.to_list(length=500)
+        return await self._list_page(
+            CREATOR_QUIZ_SESSIONS,
+            {"quiz_id": quiz_id, "creator_user_id": creator_user_id},
+            limit,
+            cursor,
+        )
 
     async def get_session_by_id_and_creator(self, session_id: str, creator_user_id: str) -> Optional[Dict[str, Any]]:
         """Get a session ensuring it belongs to the creator."""
@@ -152,9 +303,27 @@ class LiveQuizSessionRepository:
         self,
         user_email: str,
         limit: int = 50,
-    ) -> List[Dict[str, Any]]:
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """Find sessions where the participant email matches a user's email."""
-        cursor = self.sessions_collection.find(
-            {"participant_email": user_email.strip().lower()}
-        ).sort("submitted_at", -1).limit(limit)
-        return await cursor.to_list(length=limit)
+        return await self._list_page(
+            PARTICIPANT_SESSIONS,
+            {"participant_email": user_email.strip().lower()},
+            limit,
+            cursor,
+        )
+
+    async def _list_page(
+        self,
+        listing: SessionListing,
+        values: Dict[str, Any],
+        limit: int,
+        cursor: Optional[str],
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        # One extra row tells whether another page follows.
+        rows = await self.sessions_collection.find(listing.query(values, cursor)).sort(
+            listing.sort,
+        ).limit(limit + 1).to_list(length=limit + 1)
+        if len(rows) <= limit:
+            return rows, None
+        return rows[:limit], listing.next_cursor(rows[limit - 1])
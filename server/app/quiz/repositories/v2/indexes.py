@@ -130,3 +130,7 @@ async def ensure_quiz_history_v2_indexes(collection: AsyncIOMotorCollection):
         unique=True,
         partialFilterExpression={"legacy_history_id": {"$exists": True, "$type": "string"}},
     )
+
+
+async def ensure_quiz_access_v2_indexes(collection: AsyncIOMotorCollection):
+    await collection.create_index([("user_id", 1), ("quiz_id", 1)], unique=True)
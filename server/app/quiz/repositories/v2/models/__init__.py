@@ -4,7 +4,10 @@ from .quiz_models import (
     QuizMetadataUpdateV2,
     QuizQuestionV2,
     QuizQuestionsUpdateV2,
+    QuizRawDocumentV2,
+    quiz_version,
 )
+from .quiz_summary_models import QuizSummaryV2
 from .reference_models import (
     FolderCreateV2,
     FolderDocumentV2,
@@ -28,6 +31,9 @@ __all__ = [
     "QuizMetadataUpdateV2",
     "QuizQuestionV2",
     "QuizQuestionsUpdateV2",
+    "QuizRawDocumentV2",
+    "QuizSummaryV2",
     "SavedQuizCreateV2",
     "SavedQuizDocumentV2",
+    "quiz_version",
 ]
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Any, List, Optional, TypedDict
 
 from bson import ObjectId
 from pydantic import BaseModel, ConfigDict, Field, model_validator
@@ -146,3 +146,42 @@ class QuizDocumentV2(BaseModel):
         json_encoders={ObjectId: str},
         extra="forbid",
     )
+
+
+def quiz_version(updated_at: Optional[datetime]) -> str:
+    """A stored quiz's version, from its ``updated_at``; what derived caches are keyed by."""
+    return updated_at.isoformat() if updated_at is not None else "unversioned"
+
+
+class QuizRawDocumentV2(TypedDict, total=False):
+    """A quiz document exactly as stored: enums are plain strings and questions plain dicts."""
+
+    _id: ObjectId
+    title: str
+    quiz_type: str
+    questions: list[dict[str, Any]]
+    description: Optional[str]
+    owner_user_id: Optional[str]
+    visibility: str
+    status: str
+    source: str
+    tags: list[str]
+    category: Optional[str]
+    category_slug: Optional[str]
+    subcategory: Optional[str]
+    subcategory_slug: Optional[str]
+    classification: Optional[dict[str, Any]]
+    legacy_source_collection: Optional[str]
+    legacy_quiz_id: Optional[str]
+    content_fingerprint: Optional[str]
+    structure_fingerprint: Optional[str]
+    live_quiz_enabled: bool
+    time_limit_minutes: Optional[int]
+    access_code: Optional[str]
+    access_code_expires_at: Optional[datetime]
+    participant_access_mode: str
+    invited_participant_emails: list[str]
+    schema_version: int
+    created_at: datetime
+    updated_at: datetime
+    deleted_at: Optional[datetime]
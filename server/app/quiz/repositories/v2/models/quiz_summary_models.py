@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+
+QUIZ_SUMMARY_PROJECTION = {
+    "title": 1,
+    "quiz_type": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "question_count": {"$size": {"$ifNull": ["$questions", []]}},
+}
+
+
+@dataclass(frozen=True, slots=True)
+class QuizSummaryV2:
+    """A quiz as library listings show it: no questions, only how many there are.
+
+    Built from a document read with ``QUIZ_SUMMARY_PROJECTION``, which
+    counts the questions in Mongo so they never leave the server.
+    """
+
+    id: str
+    title: str
+    quiz_type: str
+    question_count: int
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_document(cls, document: dict[str, Any]) -> QuizSummaryV2:
+        return cls(
+            id=str(document["_id"]),
+            title=document.get("title") or "",
+            quiz_type=str(document.get("quiz_type") or ""),
+            question_count=int(document.get("question_count") or 0),
+            created_at=document.get("created_at"),
+            updated_at=document.get("updated_at"),
+        )
@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Iterable
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateOne
+
+
+QUIZ_ACCESS_SOURCES = ("folder", "history", "saved")
+
+# Stands in for ``updated_at`` on a row being inserted, so any read is newer.
+NEVER_READ = datetime(1970, 1, 1)
+
+
+class QuizAccessV2Repository:
+    """Materialized ``(user_id, quiz_id)`` pairs a user can open without owning the quiz.
+
+    One document per pair lists the library references that grant access
+    (``saved``, ``history`` and ``folder``). ``ReferenceV2Repository`` keeps it
+    current on every reference write; a pair with no remaining source keeps
+    its row with no sources, which grants nothing.
+
+    Each write carries the time its sources were read as ``updated_at`` and
+    only replaces a row read earlier, so when two refreshes of a pair race
+    the one that read last wins, whichever order they land in. Keeping
+    emptied rows is what lets that guard stop an older refresh from adding
+    a removed pair back.
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    @staticmethod
+    def _update(sources: Iterable[str], read_at: datetime) -> list[dict]:
+        newer = {"$lt": [{"$ifNull": ["$updated_at", NEVER_READ]}, read_at]}
+        return [
+            {
+                "$set": {
+                    "sources": {"$cond": [newer, {"$literal": sorted(sources)}, "$sources"]},
+                    "updated_at": {"$cond": [newer, read_at, "$updated_at"]},
+                }
+            }
+        ]
+
+    async def has_access(self, user_id: str, quiz_id: str) -> bool:
+        document = await self.collection.find_one(
+            {"user_id": user_id, "quiz_id": quiz_id, "sources": {"$ne": []}},
+            {"_id": 1},
+        )
+        return document is not None
+
+    async def is_empty(self) -> bool:
+        return await self.collection.find_one({}, {"_id": 1}) is None
+
+    async def list_all(self) -> dict[tuple[str, str], list[str]]:
+        return {
+            (document["user_id"], document["quiz_id"]): list(document.get("sources") or [])
+            async for document in self.collection.find(
+                {"sources": {"$ne": []}},
+                {"user_id": 1, "quiz_id": 1, "sources": 1},
+            )
+        }
+
+    async def apply_changes(
+        self,
+        upserts: dict[tuple[str, str], Iterable[str]],
+        deletes: Iterable[tuple[str, str]] = (),
+        *,
+        read_at: datetime,
+        batch_size: int = 1000,
+    ) -> int:
+        """Write many pairs in ``bulk_write`` batches; returns the number of requests sent.
+
+        ``read_at`` is when the caller started reading the references the
+        sources came from; rows written from a later read are left alone.
+        ``deletes`` are written as rows with no sources.
+        """
+        changes = {**upserts, **dict.fromkeys(deletes, ())}
+        requests = [
+            UpdateOne(
+                {"user_id": user_id, "quiz_id": quiz_id},
+                self._update(sources, read_at),
+                upsert=True,
+            )
+            for (user_id, quiz_id), sources in changes.items()
+        ]
+        for start in range(0, len(requests), batch_size):
+            await self.collection.bulk_write(requests[start:start + batch_size], ordered=False)
+        return len(requests)
@@ -7,7 +7,14 @@ from motor.motor_asyncio import AsyncIOMotorCollection
 from pymongo import ReturnDocument
 from pymongo.errors import DuplicateKeyError
 
-from ..models.quiz_models import QuizDocumentV2, QuizMetadataUpdateV2, QuizQuestionsUpdateV2
+from ..models.quiz_models import (
+    QuizDocumentV2,
+    QuizMetadataUpdateV2,
+    QuizQuestionsUpdateV2,
+    QuizRawDocumentV2,
+    quiz_version,
+)
+from ..models.quiz_summary_models import QUIZ_SUMMARY_PROJECTION, QuizSummaryV2
 
 
 class QuizV2Repository:
@@ -33,16 +40,22 @@ class QuizV2Repository:
         )
         return QuizDocumentV2(**document) if document else None
 
+    async def find_raw_by_content_fingerprint(self, content_fingerprint: str) -> Optional[QuizRawDocumentV2]:
+        return await self.collection.find_one({"content_fingerprint": content_fingerprint})
+
     async def find_by_content_fingerprint(self, content_fingerprint: str) -> Optional[QuizDocumentV2]:
-        document = await self.collection.find_one({"content_fingerprint": content_fingerprint})
+        document = await self.find_raw_by_content_fingerprint(content_fingerprint)
         return QuizDocumentV2(**document) if document else None
 
     async def find_by_structure_fingerprint(self, structure_fingerprint: str) -> Optional[QuizDocumentV2]:
         document = await self.collection.find_one({"structure_fingerprint": structure_fingerprint})
         return QuizDocumentV2(**document) if document else None
 
+    async def find_raw_by_access_code(self, access_code: str) -> Optional[QuizRawDocumentV2]:
+        return await self.collection.find_one({"access_code": access_code})
+
     async def find_by_access_code(self, access_code: str) -> Optional[QuizDocumentV2]:
-        document = await self.collection.find_one({"access_code": access_code})
+        document = await self.find_raw_by_access_code(access_code)
         return QuizDocumentV2(**document) if document else None
 
     async def access_code_exists(self, access_code: str) -> bool:
@@ -202,28 +215,81 @@ class QuizV2Repository:
                 return existing
             raise
 
-    async def find_by_id(self, quiz_id: str) -> Optional[QuizDocumentV2]:
+    async def find_raw_by_id(self, quiz_id: str) -> Optional[QuizRawDocumentV2]:
+        """The stored document as Motor returns it, for read-only callers that work on dicts."""
         try:
-            document = await self.collection.find_one({"_id": ObjectId(quiz_id)})
+            return await self.collection.find_one({"_id": ObjectId(quiz_id)})
         except InvalidId:
             return None
+
+    async def find_by_id(self, quiz_id: str) -> Optional[QuizDocumentV2]:
+        document = await self.find_raw_by_id(quiz_id)
         return QuizDocumentV2(**document) if document else None
 
-    async def find_many_by_ids(self, quiz_ids: list[str]) -> list[QuizDocumentV2]:
-        object_ids: list[ObjectId] = []
-        order: list[ObjectId] = []
-        for quiz_id in quiz_ids:
-            try:
-                object_id = ObjectId(quiz_id)
-            except InvalidId:
-                continue
-            object_ids.append(object_id)
-            order.append(object_id)
+    async def find_version(self, quiz_id: str) -> Optional[str]:
+        """The quiz's answer-key version, read from ``_id`` and ``updated_at`` only.
+
+        Returns None when the quiz does not exist.
+        """
+        try:
+            document = await self.collection.find_one(
+                {"_id": ObjectId(quiz_id)},
+                {"_id": 1, "updated_at": 1},
+            )
+        except InvalidId:
+            return None
+        return quiz_version(document.get("updated_at")) if document else None
+
+    async def find_answer_key_document(self, quiz_id: str) -> Optional[dict]:
+        """The raw fields an answer key is compiled from, not validated into a model."""
+        try:
+            return await self.collection.find_one(
+                {"_id": ObjectId(quiz_id)},
+                {
+                    "quiz_type": 1,
+                    "updated_at": 1,
+                    "questions.question": 1,
+                    "questions.correct_answer": 1,
+                    "questions.answer": 1,
+                },
+            )
+        except InvalidId:
+            return None
+
+    async def find_titles_by_ids(self, quiz_ids: list[str]) -> dict[str, dict]:
+        """``title`` and ``quiz_type`` of each existing quiz, keyed by id, without loading questions."""
+        object_ids = [ObjectId(quiz_id) for quiz_id in quiz_ids if ObjectId.is_valid(quiz_id)]
+        if not object_ids:
+            return {}
+        documents = await self.collection.find(
+            {"_id": {"$in": object_ids}},
+            {"title": 1, "quiz_type": 1},
+        ).to_list(length=len(object_ids))
+        return {str(document["_id"]): document for document in documents}
+
+    async def find_summaries_by_ids(self, quiz_ids: list[str]) -> list[QuizSummaryV2]:
+        """Listing rows for the given ids, in the order given; questions are counted in Mongo, not read."""
+        order = [ObjectId(quiz_id) for quiz_id in quiz_ids if ObjectId.is_valid(quiz_id)]
+        if not order:
+            return []
+        documents = await self.collection.find(
+            {"_id": {"$in": order}},
+            QUIZ_SUMMARY_PROJECTION,
+        ).to_list(length=len(order))
+        by_id = {document["_id"]: document for document in documents}
+        return [QuizSummaryV2.from_document(by_id[object_id]) for object_id in order if object_id in by_id]
+
+    async def find_raw_many_by_ids(self, quiz_ids: list[str]) -> list[QuizRawDocumentV2]:
+        """Stored documents for the given ids, in the order given, skipping invalid and missing ids."""
+        object_ids = [ObjectId(quiz_id) for quiz_id in quiz_ids if ObjectId.is_valid(quiz_id)]
         if not object_ids:
             return []
         documents = await self.collection.find({"_id": {"$in": object_ids}}).to_list(length=len(object_ids))
         by_id = {document["_id"]: document for document in documents}
-        return [QuizDocumentV2(**by_id[object_id]) for object_id in order if object_id in by_id]
+        return [by_id[object_id] for object_id in object_ids if object_id in by_id]
+
+    async def find_many_by_ids(self, quiz_ids: list[str]) -> list[QuizDocumentV2]:
+        return [QuizDocumentV2(**document) for document in await self.find_raw_many_by_ids(quiz_ids)]
 
     async def update_metadata(
         self,
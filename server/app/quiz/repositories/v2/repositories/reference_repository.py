@@ -1,5 +1,6 @@
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Iterable, Optional
 
 from bson import ObjectId
 from bson.errors import InvalidId
@@ -12,6 +13,7 @@ from ..models.reference_models import (
     QuizHistoryDocumentV2,
     SavedQuizDocumentV2,
 )
+from .quiz_access_repository import QuizAccessV2Repository
 
 
 class ReferenceV2Repository:
@@ -21,11 +23,15 @@ class ReferenceV2Repository:
         folder_items_collection: AsyncIOMotorCollection,
         saved_quizzes_collection: AsyncIOMotorCollection,
         quiz_history_collection: AsyncIOMotorCollection,
+        quiz_access_collection: Optional[AsyncIOMotorCollection] = None,
     ):
         self.folders_collection = folders_collection
         self.folder_items_collection = folder_items_collection
         self.saved_quizzes_collection = saved_quizzes_collection
         self.quiz_history_collection = quiz_history_collection
+        self.quiz_access_repository = (
+            QuizAccessV2Repository(quiz_access_collection) if quiz_access_collection is not None else None
+        )
 
     @staticmethod
     def _normalize_datetime(value: datetime) -> datetime:
@@ -44,6 +50,100 @@ class ReferenceV2Repository:
     def _active_query() -> dict:
         return {"$or": [{"deleted_at": {"$exists": False}}, {"deleted_at": None}]}
 
+    async def list_quiz_access_sources(self, user_id: str, quiz_ids: list[str]) -> dict[str, list[str]]:
+        """Which active references give ``user_id`` each of ``quiz_ids``, in four queries."""
+        sources: dict[str, list[str]] = {quiz_id: [] for quiz_id in quiz_ids}
+        quiz_query = {"user_id": user_id, "quiz_id": {"$in": quiz_ids}}
+        folder_documents = await self.folders_collection.find(
+            {"$and": [{"user_id": user_id}, self._active_query()]},
+            {"_id": 1},
+        ).to_list(length=None)
+        folder_ids = [str(document["_id"]) for document in folder_documents]
+        for source, collection, query in (
+            ("folder", self.folder_items_collection, {"folder_id": {"$in": folder_ids}, "quiz_id": {"$in": quiz_ids}}),
+            ("history", self.quiz_history_collection, quiz_query),
+            ("saved", self.saved_quizzes_collection, quiz_query),
+        ):
+            if source == "folder" and not folder_ids:
+                continue
+            documents = await collection.find(
+                {"$and": [query, self._active_query()]},
+                {"quiz_id": 1},
+            ).to_list(length=None)
+            for quiz_id in {document["quiz_id"] for document in documents}:
+                sources[quiz_id].append(source)
+        return sources
+
+    async def list_all_quiz_access_sources(self) -> dict[tuple[str, str], list[str]]:
+        """Derive every ``(user_id, quiz_id)`` access pair from the active references."""
+        sources: dict[tuple[str, str], set[str]] = defaultdict(set)
+        for source, collection in (
+            ("history", self.quiz_history_collection),
+            ("saved", self.saved_quizzes_collection),
+        ):
+            async for document in collection.find(self._active_query(), {"user_id": 1, "quiz_id": 1}):
+                if document.get("user_id") and document.get("quiz_id"):
+                    sources[(document["user_id"], document["quiz_id"])].add(source)
+
+        user_by_folder_id = {
+            str(document["_id"]): document.get("user_id")
+            async for document in self.folders_collection.find(self._active_query(), {"user_id": 1})
+        }
+        async for document in self.folder_items_collection.find(
+            self._active_query(),
+            {"folder_id": 1, "quiz_id": 1},
+        ):
+            user_id = user_by_folder_id.get(document.get("folder_id"))
+            if user_id and document.get("quiz_id"):
+                sources[(user_id, document["quiz_id"])].add("folder")
+        return {pair: sorted(granted) for pair, granted in sources.items()}
+
+    async def _refresh_quiz_access(self, pairs: Iterable[tuple[Optional[str], Optional[str]]]) -> None:
+        """Recompute the access index rows for ``(user_id, quiz_id)`` pairs a write touched."""
+        if self.quiz_access_repository is None:
+            return
+        quiz_ids_by_user: dict[str, set[str]] = defaultdict(set)
+        for user_id, quiz_id in pairs:
+            if user_id and quiz_id:
+                quiz_ids_by_user[user_id].add(quiz_id)
+        for user_id, quiz_ids in quiz_ids_by_user.items():
+            read_at = datetime.utcnow()
+            sources = await self.list_quiz_access_sources(user_id, sorted(quiz_ids))
+            await self.quiz_access_repository.apply_changes(
+                {(user_id, quiz_id): granted for quiz_id, granted in sources.items() if granted},
+                [(user_id, quiz_id) for quiz_id, granted in sources.items() if not granted],
+                read_at=read_at,
+            )
+
+    async def _refresh_folder_item_access(self, *items: Optional[dict]) -> None:
+        items = [item for item in items if item and item.get("folder_id") and item.get("quiz_id")]
+        if self.quiz_access_repository is None or not items:
+            return
+        folder_ids = [ObjectId(item["folder_id"]) for item in items if ObjectId.is_valid(item["folder_id"])]
+        folders = await self.folders_collection.find(
+            {"_id": {"$in": folder_ids}},
+            {"user_id": 1},
+        ).to_list(length=len(folder_ids))
+        user_by_folder_id = {str(folder["_id"]): folder.get("user_id") for folder in folders}
+        await self._refresh_quiz_access(
+            (user_by_folder_id.get(item["folder_id"]), item["quiz_id"]) for item in items
+        )
+
+    async def _refresh_folder_access(self, folder_id: str, user_ids: Iterable[Optional[str]]) -> None:
+        if self.quiz_access_repository is None:
+            return
+        items = await self.folder_items_collection.find(
+            {"folder_id": folder_id},
+            {"quiz_id": 1},
+        ).to_list(length=None)
+        await self._refresh_quiz_access(
+            (user_id, item.get("quiz_id")) for user_id in set(user_ids) for item in items
+        )
+
+    @staticmethod
+    def _reference_pairs(*documents: Optional[dict]) -> list[tuple[Optional[str], Optional[str]]]:
+        return [(document.get("user_id"), document.get("quiz_id")) for document in documents if document]
+
     async def insert_folder(self, folder: FolderDocumentV2) -> FolderDocumentV2:
         payload = folder.model_dump(by_alias=True)
         payload.pop("_id", None)
@@ -79,18 +179,21 @@ class ReferenceV2Repository:
         payload = folder_item.model_dump(by_alias=True)
         result = await self.folder_items_collection.insert_one(payload)
         payload["_id"] = result.inserted_id
+        await self._refresh_folder_item_access(payload)
         return FolderItemDocumentV2(**payload)
 
     async def insert_saved_quiz(self, saved_quiz: SavedQuizDocumentV2) -> SavedQuizDocumentV2:
         payload = saved_quiz.model_dump(by_alias=True)
         result = await self.saved_quizzes_collection.insert_one(payload)
         payload["_id"] = result.inserted_id
+        await self._refresh_quiz_access(self._reference_pairs(payload))
         return SavedQuizDocumentV2(**payload)
 
     async def insert_quiz_history(self, quiz_history: QuizHistoryDocumentV2) -> QuizHistoryDocumentV2:
         payload = quiz_history.model_dump(by_alias=True)
         result = await self.quiz_history_collection.insert_one(payload)
         payload["_id"] = result.inserted_id
+        await self._refresh_quiz_access(self._reference_pairs(payload))
         return QuizHistoryDocumentV2(**payload)
 
     async def upsert_folder_by_legacy_id(self, folder: FolderDocumentV2) -> FolderDocumentV2:
@@ -105,6 +208,11 @@ class ReferenceV2Repository:
             upsert=True,
             return_document=ReturnDocument.AFTER,
         )
+        if existing is not None and existing.get("user_id") != updated.get("user_id"):
+            await self._refresh_folder_access(
+                str(updated["_id"]),
+                [existing.get("user_id"), updated.get("user_id")],
+            )
         return FolderDocumentV2(**updated)
 
     async def get_folder_by_legacy_id(self, legacy_folder_id: str) -> FolderDocumentV2 | None:
@@ -170,6 +278,7 @@ class ReferenceV2Repository:
                 {"_id": folder["_id"]},
                 {"$set": {"deleted_at": deleted_at, "updated_at": deleted_at}},
             )
+            await self._refresh_folder_access(str(folder["_id"]), [folder.get("user_id")])
 
     async def delete_folder_by_id(self, folder_id: str):
         try:
@@ -181,10 +290,13 @@ class ReferenceV2Repository:
             {"folder_id": folder_id, **self._active_query()},
             {"$set": {"deleted_at": deleted_at}},
         )
-        await self.folders_collection.update_one(
+        folder = await self.folders_collection.find_one_and_update(
             {"_id": object_id, **self._active_query()},
             {"$set": {"deleted_at": deleted_at, "updated_at": deleted_at}},
+            projection={"user_id": 1},
         )
+        if folder is not None:
+            await self._refresh_folder_access(folder_id, [folder.get("user_id")])
 
     async def delete_folder_by_public_id(self, folder_id: str):
         folder = await self.get_folder_by_public_id(folder_id)
@@ -251,6 +363,7 @@ class ReferenceV2Repository:
                 return_document=ReturnDocument.AFTER,
             )
             await self.folder_items_collection.delete_one({"_id": legacy_match["_id"]})
+            await self._refresh_folder_item_access(updated, legacy_match)
             return FolderItemDocumentV2(**updated)
 
         if legacy_match is not None:
@@ -282,6 +395,7 @@ class ReferenceV2Repository:
             upsert=True,
             return_document=ReturnDocument.AFTER,
         )
+        await self._refresh_folder_item_access(updated, legacy_match, target_match)
         return FolderItemDocumentV2(**updated)
 
     async def upsert_folder_item(
@@ -319,11 +433,33 @@ class ReferenceV2Repository:
         ).to_list(length=1000)
         return [FolderItemDocumentV2(**document) for document in documents]
 
+    async def list_folder_items_for_folders(self, folder_ids: list[str]) -> list[FolderItemDocumentV2]:
+        if not folder_ids:
+            return []
+        documents = await self.folder_items_collection.find(
+            {"$and": [{"folder_id": {"$in": folder_ids}}, self._active_query()]}
+        ).to_list(length=None)
+        return [FolderItemDocumentV2(**document) for document in documents]
+
+    async def list_folder_item_ids_by_folder(self, folder_ids: list[str]) -> dict[str, list[str]]:
+        """Active item ids for each folder, grouped by Mongo in a single aggregation."""
+        if not folder_ids:
+            return {}
+        groups = await self.folder_items_collection.aggregate(
+            [
+                {"$match": {"$and": [{"folder_id": {"$in": folder_ids}}, self._active_query()]}},
+                {"$group": {"_id": "$folder_id", "item_ids": {"$push": "$_id"}}},
+            ]
+        ).to_list(length=None)
+        return {group["_id"]: [str(item_id) for item_id in group["item_ids"]] for group in groups}
+
     async def delete_folder_item_by_legacy_id(self, legacy_folder_item_id: str):
-        await self.folder_items_collection.update_one(
+        deleted = await self.folder_items_collection.find_one_and_update(
             {"legacy_folder_item_id": legacy_folder_item_id, **self._active_query()},
             {"$set": {"deleted_at": datetime.utcnow()}},
+            projection={"folder_id": 1, "quiz_id": 1},
         )
+        await self._refresh_folder_item_access(deleted)
 
     async def update_folder_item(
         self,
@@ -349,14 +485,20 @@ class ReferenceV2Repository:
             if value is not None
         }
         try:
-            updated = await self.folder_items_collection.find_one_and_update(
-                {"_id": ObjectId(folder_item_id)},
-                {"$set": updates},
-                return_document=ReturnDocument.AFTER,
-            )
+            object_id = ObjectId(folder_item_id)
         except InvalidId:
             return None
-        return FolderItemDocumentV2(**updated) if updated else None
+        previous = await self.folder_items_collection.find_one_and_update(
+            {"_id": object_id},
+            {"$set": updates},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if previous is None:
+            return None
+        updated = {**previous, **updates}
+        if folder_id is not None or quiz_id is not None:
+            await self._refresh_folder_item_access(updated, previous)
+        return FolderItemDocumentV2(**updated)
 
     async def backfill_folder_item_saved_quiz_ids(self, *, limit: int = 100_000) -> int:
         documents = await self.folder_items_collection.find(
@@ -428,10 +570,12 @@ class ReferenceV2Repository:
             object_id = ObjectId(folder_item_id)
         except InvalidId:
             return
-        await self.folder_items_collection.update_one(
+        deleted = await self.folder_items_collection.find_one_and_update(
             {"_id": object_id, **self._active_query()},
             {"$set": {"deleted_at": datetime.utcnow()}},
+            projection={"folder_id": 1, "quiz_id": 1},
         )
+        await self._refresh_folder_item_access(deleted)
 
     async def delete_folder_item_by_public_id(self, folder_item_id: str):
         item = await self.get_folder_item_by_public_id(folder_item_id)
@@ -484,6 +628,7 @@ class ReferenceV2Repository:
                 return_document=ReturnDocument.AFTER,
             )
             await self.saved_quizzes_collection.delete_one({"_id": legacy_match["_id"]})
+            await self._refresh_quiz_access(self._reference_pairs(updated, legacy_match))
             return SavedQuizDocumentV2(**updated)
 
         if legacy_match is not None:
@@ -511,6 +656,7 @@ class ReferenceV2Repository:
             upsert=True,
             return_document=ReturnDocument.AFTER,
         )
+        await self._refresh_quiz_access(self._reference_pairs(updated, legacy_match, target_match))
         return SavedQuizDocumentV2(**updated)
 
     async def list_saved_quizzes_for_user(
@@ -613,16 +759,20 @@ class ReferenceV2Repository:
         return SavedQuizDocumentV2(**updated) if updated else None
 
     async def delete_saved_quiz(self, user_id: str, quiz_id: str):
-        await self.saved_quizzes_collection.update_one(
+        result = await self.saved_quizzes_collection.update_one(
             {"user_id": user_id, "quiz_id": quiz_id, **self._active_query()},
             {"$set": {"deleted_at": datetime.utcnow()}},
         )
+        if result.modified_count:
+            await self._refresh_quiz_access([(user_id, quiz_id)])
 
     async def delete_saved_quiz_by_legacy_id(self, legacy_saved_quiz_id: str):
-        await self.saved_quizzes_collection.update_one(
+        deleted = await self.saved_quizzes_collection.find_one_and_update(
             {"legacy_saved_quiz_id": legacy_saved_quiz_id, **self._active_query()},
             {"$set": {"deleted_at": datetime.utcnow()}},
+            projection={"user_id": 1, "quiz_id": 1},
         )
+        await self._refresh_quiz_access(self._reference_pairs(deleted))
 
     async def delete_saved_quiz_by_id(
         self,
@@ -637,11 +787,13 @@ class ReferenceV2Repository:
             return 0
         if user_id is not None:
             query["user_id"] = user_id
-        result = await self.saved_quizzes_collection.update_one(
+        deleted = await self.saved_quizzes_collection.find_one_and_update(
             {"$and": [query, self._active_query()]},
             {"$set": {"deleted_at": datetime.utcnow()}},
+            projection={"user_id": 1, "quiz_id": 1},
         )
-        return result.modified_count
+        await self._refresh_quiz_access(self._reference_pairs(deleted))
+        return int(deleted is not None)
 
     async def delete_saved_quiz_for_user(
         self,
@@ -676,6 +828,7 @@ class ReferenceV2Repository:
             upsert=True,
             return_document=ReturnDocument.AFTER,
         )
+        await self._refresh_quiz_access(self._reference_pairs(updated, existing))
         return QuizHistoryDocumentV2(**updated)
 
     async def get_quiz_history_by_legacy_id(
@@ -736,10 +889,12 @@ class ReferenceV2Repository:
         return [QuizHistoryDocumentV2(**document) for document in documents]
 
     async def delete_quiz_history_by_legacy_id(self, legacy_history_id: str):
-        await self.quiz_history_collection.update_one(
+        deleted = await self.quiz_history_collection.find_one_and_update(
             {"legacy_history_id": legacy_history_id, **self._active_query()},
             {"$set": {"deleted_at": datetime.utcnow()}},
+            projection={"user_id": 1, "quiz_id": 1},
         )
+        await self._refresh_quiz_access(self._reference_pairs(deleted))
 
     async def soft_delete_quiz_history_by_id(
         self,
@@ -754,11 +909,13 @@ class ReferenceV2Repository:
             return 0
         if user_id is not None:
             query["user_id"] = user_id
-        result = await self.quiz_history_collection.update_one(
+        deleted = await self.quiz_history_collection.find_one_and_update(
             {"$and": [query, self._active_query()]},
             {"$set": {"deleted_at": datetime.utcnow()}},
+            projection={"user_id": 1, "quiz_id": 1},
         )
-        return result.modified_count
+        await self._refresh_quiz_access(self._reference_pairs(deleted))
+        return int(deleted is not None)
 
     async def delete_quiz_history_for_user(
         self,
@@ -1,6 +1,7 @@
 from .constants import (
     FOLDER_ITEMS_V2_COLLECTION,
     FOLDERS_V2_COLLECTION,
+    QUIZ_ACCESS_V2_COLLECTION,
     QUIZ_HISTORY_V2_COLLECTION,
     QUIZZES_V2_COLLECTION,
     SAVED_QUIZZES_V2_COLLECTION,
@@ -136,4 +137,20 @@ def get_v2_collection_validators() -> dict[str, dict]:
                 },
             }
         },
+        QUIZ_ACCESS_V2_COLLECTION: {
+            "$jsonSchema": {
+                "bsonType": "object",
+                "required": ["user_id", "quiz_id", "sources", "updated_at"],
+                "properties": {
+                    "user_id": {"bsonType": "string", "minLength": 1},
+                    "quiz_id": {"bsonType": "string", "minLength": 1},
+                    "sources": {
+                        "bsonType": "array",
+                        "minItems": 1,
+                        "items": {"enum": ["folder", "history", "saved"]},
+                    },
+                    "updated_at": {"bsonType": "date"},
+                },
+            }
+        },
     }
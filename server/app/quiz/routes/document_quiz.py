@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, Response, UploadFile, status
@@ -19,8 +20,9 @@ from server.app.quiz.services.live_session_service import LiveQuizSessionService
 from server.app.quiz.utils.ai_generate import generate_document_quiz_with_rag
 from server.app.quiz.utils.chunk_text import split_text_into_chunks
 from server.app.quiz.utils.extract_text import (
-    extract_text_from_bytes,
+    extract_chunks_from_bytes_async,
     extract_text_from_pasted_content,
+    get_extraction_pool,
 )
 
 
@@ -40,6 +42,10 @@ def _format_max_size_message(max_bytes: int) -> str:
     return f"{max_bytes:,} bytes"
 
 
+def _elapsed_ms(started_at: float) -> float:
+    return round((time.perf_counter() - started_at) * 1000, 2)
+
+
 @router.post("/document-quizzes/generate", response_model=DocumentQuizResponse)
 @limiter.limit(RateLimits.QUIZ_GENERATE)
 async def generate_document_quiz(
@@ -84,6 +90,8 @@ async def generate_document_quiz(
             detail="Live quiz duration and access code expiration are required",
         )
 
+    stage_timings: dict[str, float] = {}
+    started_at = time.perf_counter()
     try:
         if document_file is not None:
             # Read incrementally so an oversized upload is rejected without
@@ -106,9 +114,14 @@ async def generate_document_quiz(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="The uploaded document is empty.",
                 )
-            document = extract_text_from_bytes(
+            # Pages are chunked as they are extracted, and extraction stops
+            # at DOCUMENT_RAG_MAX_CHUNKS, so extract_ms includes chunking.
+            document, chunks = await extract_chunks_from_bytes_async(
                 file_bytes=file_bytes,
                 filename=document_file.filename or "document",
+                executor=get_extraction_pool(settings.DOCUMENT_EXTRACTION_WORKERS),
+                max_workers=settings.DOCUMENT_EXTRACTION_WORKERS,
+                pages_per_task=settings.DOCUMENT_EXTRACTION_PAGES_PER_TASK,
             )
         else:
             if len(document_text or "") > settings.DOCUMENT_TEXT_MAX_CHARS:
@@ -123,12 +136,18 @@ async def generate_document_quiz(
                 text=document_text or "",
                 title=document_title,
             )
+            chunks = None
     except HTTPException:
         raise
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    chunks = split_text_into_chunks(document.text)
+    stage_timings["extract_ms"] = _elapsed_ms(started_at)
+
+    if chunks is None:
+        started_at = time.perf_counter()
+        chunks = split_text_into_chunks(document.text)
+        stage_timings["chunk_ms"] = _elapsed_ms(started_at)
     if not chunks:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -136,6 +155,7 @@ async def generate_document_quiz(
         )
 
     user_id = str(current_user.id) if current_user else None
+    started_at = time.perf_counter()
     try:
         rag_result = await generate_document_quiz_with_rag(
             document=document,
@@ -148,6 +168,7 @@ async def generate_document_quiz(
             focus_topic=focus_topic,
             user_id=user_id,
             token=token,
+            redis_client=getattr(request.app.state, "redis", None),
         )
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
@@ -156,6 +177,7 @@ async def generate_document_quiz(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Document quiz generation failed: {str(exc)}",
         ) from exc
+    stage_timings["rag_ms"] = _elapsed_ms(started_at)
 
     quiz_id = None
     live_access_code = None
@@ -182,6 +204,7 @@ async def generate_document_quiz(
         "user_id": user_id,
     }
 
+    started_at = time.perf_counter()
     try:
         save_result = await save_ai_generated_quiz(save_payload)
         if save_result and "quiz_id" in save_result:
@@ -200,6 +223,21 @@ async def generate_document_quiz(
             user_id,
         )
         quiz_id = None
+    stage_timings["save_ms"] = _elapsed_ms(started_at)
+
+    extraction = document.extraction
+    logger.info(
+        "Document quiz pipeline for %s %s: %s",
+        document.source_document_type,
+        document.source_document_name,
+        stage_timings,
+        extra={
+            "stage_timings": stage_timings,
+            "page_count": extraction.page_count if extraction else None,
+            "pages_extracted": extraction.pages_extracted if extraction else None,
+            "extraction_stopped_early": extraction.stopped_early if extraction else False,
+        },
+    )
 
     if live_quiz_enabled:
         if not quiz_id:
@@ -2,6 +2,7 @@ import logging
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from server.app.core.dependencies import get_current_user_optional
 from server.app.core.rate_limiter import limiter
@@ -26,7 +27,7 @@ async def download_quiz_handler(
     response: Response,
     query: DownloadQuizQuery = Depends(),
     current_user: UserOut | None = Depends(get_current_user_optional),
-) -> StreamingResponse:
+) -> Response:
     logger.info("Received download query: %s", query)
     if query.quiz_id:
         if current_user is None:
@@ -37,9 +38,10 @@ async def download_quiz_handler(
             quiz_id=query.quiz_id,
             file_format=query.format,
             user_id=current_user.id,
+            if_none_match=request.headers.get("if-none-match"),
         )
 
-    return download_mock_quiz(query.format, query.question_type, query.num_question)
+    return await run_in_threadpool(download_mock_quiz, query.format, query.question_type, query.num_question)
 
 
 @router.post("/download-quiz")
@@ -49,7 +51,8 @@ async def download_quiz_from_payload_handler(
     response: Response,
     payload: DownloadQuizRequestModel = Body(...),
 ) -> StreamingResponse:
-    return download_quiz_from_payload(
+    return await run_in_threadpool(
+        download_quiz_from_payload,
         title=payload.title,
         description=payload.description,
         quiz_type=payload.quiz_type,
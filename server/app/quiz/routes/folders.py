@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from pydantic import BaseModel
 
 from server.app.quiz.models.folder_model import BulkDeleteFoldersRequest, BulkRemoveRequest, FolderCreate
@@ -50,9 +50,13 @@ async def get_folders_for_user(user=Depends(get_current_user)):
 
 
 @router.get("/view/{folder_id}")
-async def get_folder_by_id_route(folder_id: str, user=Depends(get_current_user)):
+async def get_folder_by_id_route(
+    folder_id: str,
+    summary: bool = Query(False),
+    user=Depends(get_current_user),
+):
     try:
-        folder = await quiz_user_library_service.get_folder(folder_id=folder_id, user_id=user.id)
+        folder = await quiz_user_library_service.get_folder(folder_id=folder_id, user_id=user.id, summary=summary)
     except PermissionError:
         raise HTTPException(status_code=403, detail="Unauthorized access to folder")
 
@@ -62,6 +66,23 @@ async def get_folder_by_id_route(folder_id: str, user=Depends(get_current_user))
     return folder
 
 
+@router.get("/view/{folder_id}/items/{folder_item_id}")
+async def get_folder_item_route(folder_id: str, folder_item_id: str, user=Depends(get_current_user)):
+    try:
+        item = await quiz_user_library_service.get_folder_item(
+            folder_id=folder_id,
+            folder_item_id=folder_item_id,
+            user_id=user.id,
+        )
+    except PermissionError:
+        raise HTTPException(status_code=403, detail="Unauthorized access to folder")
+
+    if not item:
+        raise HTTPException(status_code=404, detail="Folder item not found")
+
+    return item
+
+
 @router.delete("/bulk_delete")
 async def bulk_delete_folders_route(req: BulkDeleteFoldersRequest = Body(...), user=Depends(get_current_user)):
     deleted_count = 0
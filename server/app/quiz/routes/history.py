@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from server.app.quiz.models.quiz_history_models import QuizHistoryModel
 from server.app.quiz.schemas.quiz_management_schemas import (
@@ -26,15 +26,21 @@ async def save_quiz(quiz: QuizHistoryModel, current_user=Depends(get_verified_us
 
 
 @router.get("/quiz-history")
-async def get_user_quiz_history(current_user=Depends(get_verified_user)):
+async def get_user_quiz_history(
+    summary: bool = Query(False),
+    current_user=Depends(get_verified_user),
+):
     """
     Returns quiz history for the currently authenticated user.
     JWT token required in Authorization header.
+    With ``summary=true`` items carry ``question_count`` instead of
+    ``questions``; fetch ``/quiz-history/{history_id}`` for the questions.
     """
 
     user_id = str(current_user.id)
     quizzes = await quiz_user_library_service.list_quiz_history_items(
-        user_id=user_id
+        user_id=user_id,
+        summary=summary,
     )
     return quizzes
 
@@ -3,12 +3,12 @@ from typing import List, Optional
 
 import jwt
 from bson import ObjectId
-from fastapi import APIRouter, Depends, Header, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
 from motor.motor_asyncio import AsyncIOMotorCollection
 from jwt.exceptions import DecodeError, ExpiredSignatureError, InvalidTokenError
 
 from server.app.db.core.connection import (
+    get_live_quiz_aggregates_collection,
     get_live_quiz_invitations_collection,
     get_live_quiz_sessions_collection,
     get_quizzes_v2_collection,
@@ -23,6 +23,9 @@ from server.app.quiz.schemas.quiz_schemas import (
     QuizAccessPreview,
 )
 from server.app.core.dependencies import get_verified_user
+from server.app.quiz.repositories.live_quiz_aggregate_repository import (
+    LiveQuizAggregateRepository,
+)
 from server.app.quiz.repositories.live_session_repository import (
     LiveQuizSessionRepository,
 )
@@ -34,8 +37,10 @@ from server.app.email_platform.service import EmailService
 from server.app.users.identity import ACTIVE_USER_STATUSES, coerce_user_status, now_utc
 from server.app.users.repository import build_user_out_payload, get_active_session
 from server.app.quiz.schemas.live_session_schemas import (
-    LiveQuizAnalyticsRow,
+    LiveQuizAnalyticsPage,
+    LiveQuizHistoryPage,
     LiveQuizSummaryRow,
+    LiveQuizSessionPage,
     LiveQuizSessionState,
     SaveLiveQuizAnswerRequest,
     SaveLiveQuizAnswerResponse,
@@ -45,6 +50,7 @@ from server.app.quiz.schemas.live_session_schemas import (
 )
 from server.app.quiz.services.live_session_service import LiveQuizSessionService
 from server.app.quiz.services.live_quiz_realtime import live_quiz_realtime_broadcaster
+from server.app.quiz.services.live_quiz_snapshot_cache import live_quiz_snapshot_cache
 
 
 router = APIRouter()
@@ -56,12 +62,20 @@ def get_live_quiz_service(
     sessions_collection: AsyncIOMotorCollection = Depends(
         get_live_quiz_sessions_collection
     ),
+    aggregates_collection: AsyncIOMotorCollection = Depends(
+        get_live_quiz_aggregates_collection
+    ),
 ) -> LiveQuizSessionService:
     repository = LiveQuizSessionRepository(
         quizzes_v2_collection,
         sessions_collection,
     )
-    return LiveQuizSessionService(repository, broadcaster=live_quiz_realtime_broadcaster)
+    return LiveQuizSessionService(
+        repository,
+        broadcaster=live_quiz_realtime_broadcaster,
+        snapshot_cache=live_quiz_snapshot_cache,
+        aggregates=LiveQuizAggregateRepository(aggregates_collection),
+    )
 
 
 def get_live_quiz_invitation_repository(
@@ -214,26 +228,54 @@ async def disconnect_live_quiz_session(
 
 @router.get(
     "/quizzes/{quiz_id}/live-sessions",
-    response_model=List[LiveQuizAnalyticsRow],
+    response_model=LiveQuizSessionPage,
 )
 async def list_live_quiz_sessions(
     quiz_id: str,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     current_user: UserOut = Depends(get_verified_user),
     service: LiveQuizSessionService = Depends(get_live_quiz_service),
 ):
-    return await service.list_analytics(quiz_id, current_user.id)
+    return await service.list_sessions_page(quiz_id, current_user.id, limit, cursor)
 
 
 @router.get(
     "/quizzes/{quiz_id}/live-sessions/participants",
-    response_model=List[LiveQuizAnalyticsRow],
+    response_model=LiveQuizSessionPage,
 )
 async def list_live_quiz_participants(
     quiz_id: str,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    current_user: UserOut = Depends(get_verified_user),
+    service: LiveQuizSessionService = Depends(get_live_quiz_service),
+):
+    return await service.list_sessions_page(quiz_id, current_user.id, limit, cursor)
+
+
+@router.get("/live-quiz-history", response_model=LiveQuizHistoryPage)
+async def list_live_quiz_history(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
+    current_user: UserOut = Depends(get_verified_user),
+    service: LiveQuizSessionService = Depends(get_live_quiz_service),
+):
+    return await service.list_participant_history(current_user.email, limit, cursor)
+
+
+@router.get(
+    "/quizzes/{quiz_id}/live-analytics",
+    response_model=LiveQuizAnalyticsPage,
+)
+async def get_live_quiz_analytics(
+    quiz_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None),
     current_user: UserOut = Depends(get_verified_user),
     service: LiveQuizSessionService = Depends(get_live_quiz_service),
 ):
-    return await service.list_analytics(quiz_id, current_user.id)
+    return await service.get_analytics_page(quiz_id, current_user.id, limit, cursor)
 
 
 async def _get_verified_user_from_websocket_token(
@@ -330,21 +372,22 @@ async def live_quiz_participants_ws(
             users_collection,
             sessions_collection,
         )
-        rows = await service.list_analytics(quiz_id, current_user.id)
+        snapshot = await service.get_participants_snapshot(quiz_id, current_user.id)
     except HTTPException:
         await websocket.close(code=1008)
         return
 
-    await live_quiz_realtime_broadcaster.connect(quiz_id, websocket, accepted=True)
     try:
-        await websocket.send_json(
-            jsonable_encoder({
-                "type": "participants_snapshot",
-                "quiz_id": quiz_id,
-                "participants": rows,
-            })
+        # Broadcasts that race the snapshot are queued behind it.
+        await live_quiz_realtime_broadcaster.connect(
+            quiz_id,
+            websocket,
+            accepted=True,
+            initial_event=snapshot,
         )
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
+        pass
+    finally:
         live_quiz_realtime_broadcaster.disconnect(quiz_id, websocket)
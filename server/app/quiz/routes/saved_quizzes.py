@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from server.app.quiz.models.saved_quiz_model import SavedQuizModel
 from server.app.quiz.schemas.quiz_management_schemas import (
@@ -41,11 +41,13 @@ async def create_saved_quiz(
 
 @router.get("/", status_code=status.HTTP_200_OK)
 async def list_saved_quizzes(
+    summary: bool = Query(False),
     current_user: UserResponseSchema = Depends(get_current_user),
 ):
     try:
         return await quiz_user_library_service.list_saved_quizzes(
-            user_id=str(current_user.id)
+            user_id=str(current_user.id),
+            summary=summary,
         )
     except HTTPException:
         raise
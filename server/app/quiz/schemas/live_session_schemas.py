@@ -95,6 +95,24 @@ class LiveQuizAnalyticsRow(BaseModel):
     progress_percentage: Optional[float] = None
     status: str
     auto_submitted: bool = False
+    updated_at: Optional[datetime] = None
+
+
+class LiveQuizSessionPage(BaseModel):
+    quiz_id: str
+    participants: List[LiveQuizAnalyticsRow] = []
+    limit: int
+    next_cursor: Optional[str] = None
+
+
+class LiveQuizHistoryRow(LiveQuizAnalyticsRow):
+    quiz_id: str
+
+
+class LiveQuizHistoryPage(BaseModel):
+    sessions: List[LiveQuizHistoryRow] = []
+    limit: int
+    next_cursor: Optional[str] = None
 
 
 class LiveQuizSummaryRow(BaseModel):
@@ -110,3 +128,48 @@ class LiveQuizSummaryRow(BaseModel):
     participant_count: int = 0
     completed_count: int = 0
     average_score: Optional[float] = None
+
+
+class LiveQuizStatusCounts(BaseModel):
+    joined: int = 0
+    in_progress: int = 0
+    disconnected: int = 0
+    submitted: int = 0
+    timed_out: int = 0
+
+
+class LiveQuizScoreBucket(BaseModel):
+    score: int
+    count: int
+
+
+class LiveQuizQuestionStats(BaseModel):
+    question_index: int
+    correct_count: int = 0
+    answered_count: int = 0
+    correct_rate: Optional[float] = None
+
+
+class LiveQuizLeaderboardEntry(BaseModel):
+    rank: int
+    session_id: str
+    participant_name: str
+    score: int
+    percentage: Optional[float] = None
+    duration_seconds: int = 0
+    submitted_at: Optional[datetime] = None
+    auto_submitted: bool = False
+
+
+class LiveQuizAnalyticsPage(BaseModel):
+    quiz_id: str
+    status: str
+    participant_count: int = 0
+    status_counts: LiveQuizStatusCounts
+    average_score: Optional[float] = None
+    score_histogram: List[LiveQuizScoreBucket] = []
+    questions: List[LiveQuizQuestionStats] = []
+    leaderboard: List[LiveQuizLeaderboardEntry] = []
+    participants: List[LiveQuizAnalyticsRow] = []
+    limit: int
+    next_cursor: Optional[str] = None
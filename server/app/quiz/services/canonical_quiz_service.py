@@ -13,11 +13,27 @@ from server.app.quiz.repositories.v2.models.quiz_models import (
     QuizQuestionsUpdateV2,
 )
 from server.app.quiz.repositories.v2.repositories.quiz_repository import QuizV2Repository
+from server.app.quiz.services.live_quiz_snapshot_cache import (
+    LiveQuizSnapshotCache,
+    live_quiz_snapshot_cache,
+)
 
 
 class CanonicalQuizWriteService:
-    def __init__(self, repository: Optional[QuizV2Repository] = None):
+    def __init__(
+        self,
+        repository: Optional[QuizV2Repository] = None,
+        snapshot_cache: Optional[LiveQuizSnapshotCache] = None,
+    ):
         self.repository = repository or QuizV2Repository(get_quizzes_v2_collection())
+        # Writes drop the quiz from this process's live snapshot cache; other
+        # workers pick the change up when their entry expires.
+        self.snapshot_cache = live_quiz_snapshot_cache if snapshot_cache is None else snapshot_cache
+
+    def _quiz_changed(self, quiz: Optional[QuizDocumentV2]) -> Optional[QuizDocumentV2]:
+        if quiz is not None:
+            self.snapshot_cache.invalidate(str(quiz.id))
+        return quiz
 
     @staticmethod
     def normalize_questions(questions: list[Any]) -> list[dict[str, Any]]:
@@ -143,13 +159,19 @@ class CanonicalQuizWriteService:
         return await self.repository.insert_quiz(quiz_document)
 
     async def upsert_quiz_v2_by_legacy_mapping(self, quiz_document: QuizDocumentV2) -> QuizDocumentV2:
-        return await self.repository.upsert_by_legacy_mapping(quiz_document)
+        return self._quiz_changed(await self.repository.upsert_by_legacy_mapping(quiz_document))
 
     async def upsert_quiz_v2_by_legacy_mapping_with_status(
         self,
         quiz_document: QuizDocumentV2,
     ) -> tuple[QuizDocumentV2, str]:
-        return await self.repository.upsert_by_legacy_mapping_with_status(quiz_document)
+        stored, status = await self.repository.upsert_by_legacy_mapping_with_status(quiz_document)
+        if status != "unchanged":
+            self._quiz_changed(stored)
+        return stored, status
+
+    async def find_quiz_v2_by_fingerprint(self, content_fingerprint: str) -> Optional[QuizDocumentV2]:
+        return await self.repository.find_by_content_fingerprint(content_fingerprint)
 
     async def find_or_create_quiz_v2_by_fingerprint(self, quiz_document: QuizDocumentV2) -> QuizDocumentV2:
         return await self.repository.find_or_create_by_fingerprint(quiz_document)
@@ -159,27 +181,29 @@ class CanonicalQuizWriteService:
         quiz_id: str,
         update_data: QuizMetadataUpdateV2,
     ) -> Optional[QuizDocumentV2]:
-        return await self.repository.update_metadata(quiz_id, update_data)
+        return self._quiz_changed(await self.repository.update_metadata(quiz_id, update_data))
 
     async def update_quiz_questions_v2(
         self,
         quiz_id: str,
         update_data: QuizQuestionsUpdateV2,
     ) -> Optional[QuizDocumentV2]:
-        return await self.repository.update_questions(quiz_id, update_data)
+        return self._quiz_changed(await self.repository.update_questions(quiz_id, update_data))
 
     async def get_quiz_v2_by_id(self, quiz_id: str) -> Optional[QuizDocumentV2]:
         return await self.repository.find_by_id(quiz_id)
 
     async def soft_delete_quiz_v2(self, quiz_id: str) -> Optional[QuizDocumentV2]:
-        return await self.repository.soft_delete(quiz_id)
+        return self._quiz_changed(await self.repository.soft_delete(quiz_id))
 
     async def soft_delete_quiz_v2_by_legacy_mapping(
         self,
         legacy_source_collection: str,
         legacy_quiz_id: str,
     ) -> Optional[QuizDocumentV2]:
-        return await self.repository.soft_delete_by_legacy_mapping(
-            legacy_source_collection,
-            legacy_quiz_id,
+        return self._quiz_changed(
+            await self.repository.soft_delete_by_legacy_mapping(
+                legacy_source_collection,
+                legacy_quiz_id,
+            )
         )
@@ -1,15 +1,15 @@
-import asyncio
-import functools
 import json
 import os
 import re
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Iterable
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
 
 from dotenv import load_dotenv
-from huggingface_hub import InferenceClient
+
+from server.app.quiz.utils.inference_gateway import get_inference_session
 
 
 load_dotenv()
@@ -35,6 +35,7 @@ QUIZ_TYPE_ALIASES = {
     "short answer": "short-answer",
     "short-answer": "short-answer",
 }
+CONFIDENT_CLASSIFICATION_THRESHOLD = 0.72
 STOP_WORDS = {
     "and",
     "the",
@@ -161,16 +162,19 @@ def quiz_type_to_title(value: str) -> str:
     return quiz_type_to_api_label(value).title()
 
 
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _is_scoring_token(token: str) -> bool:
+    return len(token) > 2 and token not in STOP_WORDS
+
+
 def tokenize(value: str) -> set[str]:
-    return {
-        token
-        for token in re.findall(r"[a-z0-9]+", value.lower())
-        if len(token) > 2 and token not in STOP_WORDS
-    }
+    return {token for token in WORD_PATTERN.findall(value.lower()) if _is_scoring_token(token)}
 
 
 def normalize_text(value: str) -> str:
-    return " ".join(re.findall(r"[a-z0-9]+", value.lower()))
+    return " ".join(WORD_PATTERN.findall(value.lower()))
 
 
 def build_tags(entry: TaxonomyEntry, quiz_type: str, extra_tags: Iterable[str] | None = None) -> list[str]:
@@ -205,6 +209,85 @@ def get_taxonomy_entries() -> tuple[TaxonomyEntry, ...]:
     return tuple(entries)
 
 
+_SUBCATEGORY_TOKEN = 0
+_CATEGORY_TOKEN = 1
+_ALIAS_TOKEN = 2
+_SUBCATEGORY_PHRASE = 0
+_CATEGORY_PHRASE = 1
+
+
+@dataclass(frozen=True)
+class TaxonomyIndexEntry:
+    entry: TaxonomyEntry
+    category_phrase: str
+    subcategory_phrase: str
+    category_token_count: int
+    subcategory_token_count: int
+
+
+@dataclass(frozen=True)
+class TaxonomyIndex:
+    """Everything ``classify_deterministically`` needs, computed once per taxonomy.
+
+    ``token_postings`` maps an input token to the ``(entry index, kind)``
+    pairs it scores for, aliases included. ``phrase_postings`` does the same
+    for each distinct normalized name, so a category phrase shared by all of
+    its subcategories is searched for once.
+    """
+
+    entries: tuple[TaxonomyIndexEntry, ...]
+    token_postings: Mapping[str, tuple[tuple[int, int], ...]]
+    phrase_postings: Mapping[str, tuple[tuple[int, int], ...]]
+
+    def match_phrases(self, normalized_text: str) -> list[str]:
+        return [phrase for phrase in self.phrase_postings if phrase in normalized_text]
+
+
+def build_taxonomy_index(entries: Iterable[TaxonomyEntry]) -> TaxonomyIndex:
+    index_entries: list[TaxonomyIndexEntry] = []
+    token_postings: dict[str, list[tuple[int, int]]] = {}
+    phrase_postings: dict[str, list[tuple[int, int]]] = {}
+
+    for position, entry in enumerate(entries):
+        category_phrase = normalize_text(entry.category)
+        subcategory_phrase = normalize_text(entry.subcategory)
+        category_tokens = tokenize(entry.category)
+        subcategory_tokens = tokenize(entry.subcategory)
+        aliases = TAXONOMY_ALIASES.get(entry.subcategory_slug, set())
+
+        index_entries.append(
+            TaxonomyIndexEntry(
+                entry=entry,
+                category_phrase=category_phrase,
+                subcategory_phrase=subcategory_phrase,
+                category_token_count=len(category_tokens),
+                subcategory_token_count=len(subcategory_tokens),
+            )
+        )
+        for tokens, kind in (
+            (subcategory_tokens, _SUBCATEGORY_TOKEN),
+            (category_tokens, _CATEGORY_TOKEN),
+            (aliases, _ALIAS_TOKEN),
+        ):
+            for token in tokens:
+                token_postings.setdefault(token, []).append((position, kind))
+        if subcategory_phrase:
+            phrase_postings.setdefault(subcategory_phrase, []).append((position, _SUBCATEGORY_PHRASE))
+        if category_phrase:
+            phrase_postings.setdefault(category_phrase, []).append((position, _CATEGORY_PHRASE))
+
+    return TaxonomyIndex(
+        entries=tuple(index_entries),
+        token_postings=MappingProxyType({token: tuple(postings) for token, postings in token_postings.items()}),
+        phrase_postings=MappingProxyType({phrase: tuple(postings) for phrase, postings in phrase_postings.items()}),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_taxonomy_index() -> TaxonomyIndex:
+    return build_taxonomy_index(get_taxonomy_entries())
+
+
 def get_taxonomy_entry(category: str, subcategory: str) -> TaxonomyEntry | None:
     category_slug = slugify(category)
     subcategory_slug = slugify(subcategory)
@@ -249,38 +332,46 @@ def build_classification_text(
 
 
 def classify_deterministically(text: str, quiz_type: str) -> TaxonomyClassification | None:
-    entries = get_taxonomy_entries()
-    if not entries or not text.strip():
+    index = get_taxonomy_index()
+    if not index.entries or not text.strip():
         return None
 
-    normalized_text = normalize_text(text)
-    input_tokens = tokenize(text)
+    words = WORD_PATTERN.findall(text.lower())
+    input_tokens = {token for token in words if _is_scoring_token(token)}
+
+    # Per candidate entry: [subcategory phrase, category phrase,
+    # subcategory token hits, category token hits, alias hits].
+    candidates: dict[int, list[int]] = {}
+    for phrase in index.match_phrases(" ".join(words)):
+        for position, kind in index.phrase_postings[phrase]:
+            candidates.setdefault(position, [0, 0, 0, 0, 0])[kind] = 1
+    for token in input_tokens:
+        for position, kind in index.token_postings.get(token, ()):
+            candidates.setdefault(position, [0, 0, 0, 0, 0])[2 + kind] += 1
+
     best_entry: TaxonomyEntry | None = None
     best_score = 0.0
 
-    for entry in entries:
-        category_phrase = normalize_text(entry.category)
-        subcategory_phrase = normalize_text(entry.subcategory)
-        category_tokens = tokenize(entry.category)
-        subcategory_tokens = tokenize(entry.subcategory)
-        aliases = TAXONOMY_ALIASES.get(entry.subcategory_slug, set())
+    # Entry order breaks ties, exactly as a full scan would.
+    for position in sorted(candidates):
+        indexed = index.entries[position]
+        subcategory_phrase_hit, category_phrase_hit, subcategory_hits, category_hits, alias_hits = candidates[position]
 
         score = 0.0
-        if subcategory_phrase and subcategory_phrase in normalized_text:
+        if subcategory_phrase_hit:
             score += 0.65
-        if category_phrase and category_phrase in normalized_text:
+        if category_phrase_hit:
             score += 0.2
-        if subcategory_tokens:
-            score += 0.45 * (len(subcategory_tokens & input_tokens) / len(subcategory_tokens))
-        if category_tokens:
-            score += 0.15 * (len(category_tokens & input_tokens) / len(category_tokens))
-        alias_hits = len(aliases & input_tokens)
+        if indexed.subcategory_token_count:
+            score += 0.45 * (subcategory_hits / indexed.subcategory_token_count)
+        if indexed.category_token_count:
+            score += 0.15 * (category_hits / indexed.category_token_count)
         if alias_hits:
             score += min(0.45, alias_hits * 0.18)
 
         if score > best_score:
             best_score = score
-            best_entry = entry
+            best_entry = indexed.entry
 
     if not best_entry or best_score < 0.35:
         return None
@@ -323,17 +414,12 @@ Quiz type: {quiz_type}
 Quiz content:
 {text[:4000]}
 """
-    loop = asyncio.get_event_loop()
-    client = InferenceClient(token=token)
-    response = await loop.run_in_executor(
-        None,
-        functools.partial(
-            client.chat.completions.create,
-            model="deepseek-ai/DeepSeek-V3-0324",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=256,
-            temperature=0,
-        ),
+    client = get_inference_session(token)
+    response = await client.chat_completion(
+        model="deepseek-ai/DeepSeek-V3-0324",
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=256,
+        temperature=0,
     )
     parsed = parse_ai_classification_response(response.choices[0].message.content)
     if not parsed:
@@ -373,7 +459,7 @@ async def classify_quiz_taxonomy(
         questions=questions,
     )
     deterministic = classify_deterministically(text, canonical_quiz_type)
-    if deterministic and deterministic.confidence >= 0.72:
+    if deterministic and deterministic.confidence >= CONFIDENT_CLASSIFICATION_THRESHOLD:
         return deterministic
 
     final_token = token or os.getenv("HUGGINGFACEHUB_API_TOKEN")
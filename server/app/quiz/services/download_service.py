@@ -1,19 +1,31 @@
 import logging
 import re
+from typing import BinaryIO
 
 from bson import ObjectId
 from bson.errors import InvalidId
 from fastapi import HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
+from server.app.core.config import settings
 from server.app.db.core.connection import get_quizzes_v2_collection
 from server.app.quiz.mock_data.multi_choice import mock_multiple_choice_questions
 from server.app.quiz.mock_data.open_ended import mock_open_ended_questions
 from server.app.quiz.mock_data.true_false import mock_true_false_questions
+from server.app.quiz.repositories.v2.repositories.quiz_repository import QuizV2Repository
+from server.app.quiz.services.quiz_export_cache import (
+    CachedQuizExport,
+    QuizExportCache,
+    export_cache_key,
+    export_etag,
+    quiz_export_cache,
+)
 from server.app.quiz.utils.generate_docx import generate_docx
 from server.app.quiz.utils.generate_json import generate_json
 from server.app.quiz.utils.generate_pdf import generate_pdf
 from server.app.quiz.utils.generate_txt import generate_txt
+from server.app.quiz.utils.render_export import EXPORT_MEDIA_TYPES
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +106,56 @@ def _render_download_stream(payload: dict, file_format: str) -> StreamingRespons
     return StreamingResponse(buffer, media_type=content_type)
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def _export_cache_headers(etag: str) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+    }
+
+
+class _CachedExportResponse(StreamingResponse):
+    """Sends a cached export from the file ``QuizExportCache.open`` returned.
+
+    The file was opened before the response, so another worker evicting it
+    mid-send does not cut the download short. The file is closed and the
+    export released however the send ends.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, cache: QuizExportCache, export: CachedQuizExport, file: BinaryIO, filename: str):
+        super().__init__(
+            self._chunks(file),
+            media_type=export.media_type,
+            headers={
+                **_export_cache_headers(export.etag),
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "Content-Length": str(export.size),
+            },
+        )
+        self.cache = cache
+        self.export = export
+        self.file = file
+
+    async def _chunks(self, file: BinaryIO):
+        while chunk := await run_in_threadpool(file.read, self.chunk_size):
+            yield chunk
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.file.close()
+            self.cache.release(self.export)
+
+
 def download_mock_quiz(format: str, question_type: str, num_question: int) -> StreamingResponse:
     if question_type == "multichoice":
         quiz_data = mock_multiple_choice_questions()
@@ -154,22 +216,26 @@ async def download_quiz_by_id(
     quiz_id: str,
     file_format: str,
     user_id: str | None = None,
-) -> StreamingResponse:
+    if_none_match: str | None = None,
+) -> Response:
     """
     Download an existing quiz by its MongoDB ObjectId.
     Extracts only the 'questions' list to match existing generators.
+    Quizzes with a content fingerprint are rendered once per version and
+    format into the export cache and served from disk with an ETag;
+    ``if_none_match`` is the request's If-None-Match header.
     """
-    v2_collection = get_quizzes_v2_collection()
+    quiz_repository = QuizV2Repository(get_quizzes_v2_collection())
     logger.info(f"pulling quiz {quiz_id} from database")
 
     try:
-        object_id = ObjectId(quiz_id)
+        ObjectId(quiz_id)
     except InvalidId:
         logger.warning(f"Invalid quiz_id format: {quiz_id}")
         raise HTTPException(status_code=400, detail="Invalid quiz_id (must be a valid ObjectId)")
 
     payload = None
-    quiz_doc = await v2_collection.find_one({"_id": object_id})
+    quiz_doc = await quiz_repository.find_raw_by_id(quiz_id)
     if quiz_doc:
         payload = _build_download_payload(
             title=quiz_doc.get("title"),
@@ -199,9 +265,20 @@ async def download_quiz_by_id(
         )
 
     # STEP 4 — Generate the downloadable file
-    response = _render_download_stream(payload, file_format)
-    logger.info(f"download of quiz {quiz_id} should commence immediately!")
     filename = build_download_filename(payload["title"], file_format)
+    content_fingerprint = quiz_doc.get("content_fingerprint")
+    if settings.QUIZ_EXPORT_CACHE_ENABLED and content_fingerprint and file_format in EXPORT_MEDIA_TYPES:
+        key = export_cache_key(content_fingerprint, quiz_doc.get("updated_at"), file_format)
+        etag = export_etag(key)
+        if _etag_matches(if_none_match, etag):
+            # The ETag is the cache key, so the client's copy is current whether or not it is on disk here.
+            return Response(status_code=304, headers=_export_cache_headers(etag))
+        export, file = await quiz_export_cache.open(key, file_format, payload)
+        logger.info(f"download of quiz {quiz_id} served from the export cache")
+        return _CachedExportResponse(quiz_export_cache, export, file, filename)
+
+    response = await run_in_threadpool(_render_download_stream, payload, file_format)
+    logger.info(f"download of quiz {quiz_id} should commence immediately!")
     response.headers.update(
         {
             "Content-Disposition": f'attachment; filename="{filename}"'
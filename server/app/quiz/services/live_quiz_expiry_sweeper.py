@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from redis.exceptions import RedisError
+
+from server.app.core.config import settings
+from server.app.db.core.redis_lease import RedisLease
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+
+
+logger = logging.getLogger(__name__)
+
+LEASE_KEY = "live-quiz:expiry-sweeper"
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class LiveQuizExpirySweeperStats:
+    sweeps: int = 0
+    batches: int = 0
+    finalized: int = 0
+    lease_busy: int = 0
+    lease_lost: int = 0
+    failures: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class LiveQuizExpirySweeper:
+    """Closes live quiz sessions that expired without the participant coming back.
+
+    Participant requests still finalize an expired session lazily; the
+    sweeper covers sessions nobody polls again, so analytics and quiz status
+    stop reporting them as in progress. Each tick one worker holds a Redis
+    lease and drains due sessions through the service's
+    ``finalize_expired_batch``. The lease is extended before every further
+    batch, and the sweep stops as soon as it cannot be, so a long backlog
+    never runs past the TTL into another worker's sweep.
+
+    The writes only match sessions that are still open and expired, so a
+    sweep racing a participant's own submit, or another worker when Redis is
+    unreachable, cannot close a session twice.
+    """
+
+    def __init__(
+        self,
+        service: LiveQuizSessionService,
+        *,
+        batch_size: int = 500,
+        max_batches_per_sweep: int = 20,
+        interval_seconds: float = 15.0,
+        lease_seconds: float = 60.0,
+        clock: Callable[[], datetime] = _utc_now,
+    ):
+        self.service = service
+        self._batch_size = batch_size
+        self._max_batches_per_sweep = max_batches_per_sweep
+        self._interval_seconds = interval_seconds
+        self._lease_seconds = lease_seconds
+        self._clock = clock
+        self._redis: Optional[Any] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = LiveQuizExpirySweeperStats()
+
+    async def start(self, redis_client: Optional[Any]) -> None:
+        if self._task is not None or self._interval_seconds <= 0:
+            return
+        self._redis = redis_client
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.stats.failures += 1
+                logger.exception("Live quiz expiry sweep failed")
+            await asyncio.sleep(self._interval_seconds)
+
+    async def run_once(self) -> int:
+        """Sweep under the Redis lease; returns how many sessions were closed."""
+        if self._redis is None:
+            return await self.sweep()
+
+        lease = RedisLease(self._redis, LEASE_KEY, ttl_seconds=self._lease_seconds)
+        try:
+            acquired = await lease.acquire()
+        except (RedisError, OSError) as exc:
+            logger.warning("Expiry sweeper lease unavailable, sweeping without it: %s", exc)
+            return await self.sweep()
+        if not acquired:
+            self.stats.lease_busy += 1
+            return 0
+        try:
+            return await self.sweep(lease)
+        finally:
+            await lease.release()
+
+    async def _keep_lease(self, lease: RedisLease) -> bool:
+        try:
+            if await lease.extend():
+                return True
+        except (RedisError, OSError) as exc:
+            logger.warning("Could not extend the expiry sweeper lease, stopping this sweep: %s", exc)
+            return False
+        self.stats.lease_lost += 1
+        logger.warning("Expiry sweeper lease lapsed mid-sweep; leaving the rest to the next holder")
+        return False
+
+    async def sweep(self, lease: Optional[RedisLease] = None) -> int:
+        self.stats.sweeps += 1
+        closed = 0
+        for batch in range(self._max_batches_per_sweep):
+            if batch and lease is not None and not await self._keep_lease(lease):
+                break
+            due, finalized = await self.service.finalize_expired_batch(self._clock(), self._batch_size)
+            if not due:
+                break
+            self.stats.batches += 1
+            self.stats.finalized += finalized
+            closed += finalized
+            if due < self._batch_size:
+                break
+        return closed
+
+
+def build_live_quiz_expiry_sweeper(service: LiveQuizSessionService) -> LiveQuizExpirySweeper:
+    return LiveQuizExpirySweeper(
+        service,
+        batch_size=settings.LIVE_QUIZ_EXPIRY_SWEEP_BATCH_SIZE,
+        interval_seconds=settings.LIVE_QUIZ_EXPIRY_SWEEP_INTERVAL_SECONDS,
+        lease_seconds=settings.LIVE_QUIZ_EXPIRY_SWEEP_LEASE_SECONDS,
+    )
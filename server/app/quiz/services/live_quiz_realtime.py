@@ -1,13 +1,238 @@
-from collections import defaultdict
-from typing import Any
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Literal, Optional
 
 from fastapi import WebSocket
 from fastapi.encoders import jsonable_encoder
 
+from server.app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+SlowConsumerPolicy = Literal["coalesce", "drop_oldest", "disconnect"]
+
+EVENT_CHANNEL_PREFIX = "live-quiz:events:"
+# Sequence counter and backlog share a hash tag so the script stays on one
+# slot under Redis Cluster. The channel is passed as an argument, not a key.
+PUBLISH_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+local id = redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], '*', 'seq', seq, 'key', ARGV[5], 'event', ARGV[1])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+redis.call('PEXPIRE', KEYS[2], ARGV[3])
+redis.call('PUBLISH', ARGV[4], seq .. ' ' .. id .. ' ' .. ARGV[5] .. ' ' .. ARGV[1])
+return seq
+"""
+# Close code asking the dashboard to reconnect and take a fresh snapshot.
+RESYNC_CLOSE_CODE = 1012
+# Close code for a dashboard that could not keep up with the event rate.
+SLOW_CONSUMER_CLOSE_CODE = 1013
+_NO_COALESCE_KEY = "-"
+
+
+def event_channel(quiz_id: str) -> str:
+    return f"{EVENT_CHANNEL_PREFIX}{quiz_id}"
+
+
+def _sequence_key(quiz_id: str) -> str:
+    return f"live-quiz:{{{quiz_id}}}:seq"
+
+
+def _backlog_key(quiz_id: str) -> str:
+    return f"live-quiz:{{{quiz_id}}}:backlog"
+
+
+def _parse_stream_id(stream_id: str) -> tuple[int, int]:
+    milliseconds, _, sequence = stream_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+def encode_event(event: dict[str, Any]) -> str:
+    """Encode an event exactly as ``WebSocket.send_json`` would."""
+    return json.dumps(jsonable_encoder(event), separators=(",", ":"), ensure_ascii=False)
+
+
+def event_coalesce_key(event: dict[str, Any]) -> str:
+    # Dashboards upsert participant rows by session id, so a newer event for
+    # the same participant makes a queued older one redundant.
+    participant = event.get("participant")
+    if isinstance(participant, dict) and participant.get("session_id"):
+        return str(participant["session_id"])
+    return _NO_COALESCE_KEY
+
+
+@dataclass
+class LiveQuizRealtimeMetrics:
+    published: int = 0
+    publish_errors: int = 0
+    received: int = 0
+    replayed: int = 0
+    duplicates: int = 0
+    resyncs: int = 0
+    reconnects: int = 0
+    enqueued: int = 0
+    sent: int = 0
+    send_failures: int = 0
+    send_seconds_total: float = 0.0
+    max_send_seconds: float = 0.0
+    max_queue_depth: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    slow_consumers_disconnected: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _QuizCursor:
+    seq: int
+    stream_id: tuple[int, int]
+    raw_stream_id: str
+
+
+class _Connection:
+    __slots__ = ("websocket", "queue", "ready", "writer")
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.queue: deque[tuple[str, str]] = deque()
+        self.ready = asyncio.Event()
+        self.writer: Optional[asyncio.Task] = None
+
 
 class LiveQuizRealtimeBroadcaster:
-    def __init__(self):
-        self._connections: dict[str, set[WebSocket]] = defaultdict(set)
+    """Delivers live quiz events to dashboard sockets on every worker.
+
+    Each event is encoded once and appended to a bounded queue per socket;
+    a writer task per socket drains it, so a slow dashboard only delays
+    itself. When a queue is full, ``slow_consumer_policy`` decides:
+
+    - ``coalesce`` replaces a queued event for the same participant, and
+      disconnects the socket if there is none to replace;
+    - ``drop_oldest`` discards the oldest queued event;
+    - ``disconnect`` closes the socket with ``SLOW_CONSUMER_CLOSE_CODE``.
+
+    A send that takes longer than ``send_timeout_seconds`` also disconnects
+    the socket. Dashboards reconnect on close and take a fresh snapshot;
+    publishers also send one every ``snapshot_interval_seconds`` per quiz, as
+    decided by ``claim_snapshot``.
+
+    Without Redis, ``publish`` only reaches sockets held by this process.
+    After ``start``, events go through Redis and every worker dispatches them
+    to its own sockets:
+
+    - ``publish`` runs one script that bumps the quiz's sequence number,
+      appends the event to a capped backlog stream and publishes
+      ``"<seq> <stream id> <coalesce key> <json>"`` on the quiz channel.
+    - Each worker runs a single subscriber task on ``live-quiz:events:*``
+      and keeps the last sequence seen per quiz with local sockets.
+    - A sequence gap, e.g. after a dropped subscriber connection, is filled
+      from the backlog. If the backlog was already trimmed, the quiz's local
+      sockets are closed with ``RESYNC_CLOSE_CODE``.
+    """
+
+    def __init__(
+        self,
+        *,
+        backlog_size: int = 500,
+        backlog_ttl_seconds: int = 6 * 60 * 60,
+        reconnect_initial_seconds: float = 0.1,
+        reconnect_max_seconds: float = 5.0,
+        poll_timeout_seconds: float = 1.0,
+        send_queue_size: int = 256,
+        send_timeout_seconds: float = 5.0,
+        slow_consumer_policy: SlowConsumerPolicy = "coalesce",
+        snapshot_interval_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if send_queue_size < 1:
+            raise ValueError("send_queue_size must be at least 1")
+
+        self._connections: dict[str, dict[WebSocket, _Connection]] = {}
+        self._backlog_size = backlog_size
+        self._backlog_ttl_ms = backlog_ttl_seconds * 1000
+        self._reconnect_initial_seconds = reconnect_initial_seconds
+        self._reconnect_max_seconds = reconnect_max_seconds
+        self._poll_timeout_seconds = poll_timeout_seconds
+        self._send_queue_size = send_queue_size
+        self._send_timeout_seconds = send_timeout_seconds
+        self._slow_consumer_policy = slow_consumer_policy
+        self._snapshot_interval_seconds = snapshot_interval_seconds
+        self._snapshot_clock: OrderedDict[str, float] = OrderedDict()
+        self._clock = clock
+
+        self._redis: Any = None
+        self._subscriber_task: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+        self._cursors: dict[str, _QuizCursor] = {}
+        self.metrics = LiveQuizRealtimeMetrics()
+
+    @property
+    def is_distributed(self) -> bool:
+        return self._redis is not None
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(
+            len(connection.queue)
+            for connections in self._connections.values()
+            for connection in connections.values()
+        )
+
+    def connection_count(self, quiz_id: str) -> int:
+        return len(self._connections.get(quiz_id, {}))
+
+    def claim_snapshot(self, quiz_id: str) -> bool:
+        """Return True when this worker should publish a full snapshot of ``quiz_id``.
+
+        The first call for a quiz only starts its clock: dashboards receive a
+        snapshot when they connect.
+        """
+        if self._snapshot_interval_seconds <= 0:
+            return True
+        now = self._clock()
+        # Entries are kept in claim order, so quizzes gone quiet sit at the
+        # front; they start over as if seen for the first time.
+        while self._snapshot_clock:
+            if now - next(iter(self._snapshot_clock.values())) < self._snapshot_interval_seconds * 2:
+                break
+            self._snapshot_clock.popitem(last=False)
+
+        claimed_at = self._snapshot_clock.get(quiz_id)
+        if claimed_at is not None and now - claimed_at < self._snapshot_interval_seconds:
+            return False
+        self._snapshot_clock[quiz_id] = now
+        self._snapshot_clock.move_to_end(quiz_id)
+        return claimed_at is not None
+
+    async def start(self, redis_client: Any) -> None:
+        if self._subscriber_task is not None:
+            return
+        self._redis = redis_client
+        self._subscribed = asyncio.Event()
+        self._subscriber_task = asyncio.create_task(self._run_subscriber())
+
+    async def wait_until_subscribed(self, timeout: float = 5.0) -> None:
+        await asyncio.wait_for(self._subscribed.wait(), timeout)
+
+    async def stop(self) -> None:
+        task, self._subscriber_task = self._subscriber_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        for quiz_id, connections in list(self._connections.items()):
+            for websocket in list(connections):
+                self.disconnect(quiz_id, websocket)
+        self._redis = None
+        self._cursors.clear()
 
     async def connect(
         self,
@@ -15,30 +240,277 @@ class LiveQuizRealtimeBroadcaster:
         websocket: WebSocket,
         *,
         accepted: bool = False,
+        initial_event: Optional[dict[str, Any]] = None,
     ) -> None:
+        """Register ``websocket`` and send it ``initial_event`` before any broadcast.
+
+        Broadcasts that arrive while the initial event is being sent wait in
+        the socket's queue. A failed initial send unregisters the socket and
+        re-raises.
+        """
         if not accepted:
             await websocket.accept()
-        self._connections[quiz_id].add(websocket)
+        connections = self._connections.get(quiz_id)
+        first_local_socket = connections is None
+        if connections is None:
+            connections = self._connections[quiz_id] = {}
+
+        connection = _Connection(websocket)
+        connections[websocket] = connection
+        if first_local_socket and self._redis is not None:
+            await self._load_cursor(quiz_id)
+
+        if initial_event is not None:
+            try:
+                async with asyncio.timeout(self._send_timeout_seconds):
+                    await websocket.send_text(encode_event(initial_event))
+            except BaseException:
+                self.disconnect(quiz_id, websocket)
+                raise
+        if self._connections.get(quiz_id, {}).get(websocket) is connection:
+            connection.writer = asyncio.create_task(self._drain(quiz_id, connection))
 
     def disconnect(self, quiz_id: str, websocket: WebSocket) -> None:
         connections = self._connections.get(quiz_id)
         if not connections:
             return
-        connections.discard(websocket)
+        connection = connections.pop(websocket, None)
+        if connection is not None and connection.writer is not None:
+            if connection.writer is not asyncio.current_task():
+                connection.writer.cancel()
         if not connections:
             self._connections.pop(quiz_id, None)
+            self._cursors.pop(quiz_id, None)
 
     async def publish(self, quiz_id: str, event: dict[str, Any]) -> None:
-        connections = list(self._connections.get(quiz_id, set()))
-        stale: list[WebSocket] = []
-        for websocket in connections:
+        text = encode_event(event)
+        coalesce_key = event_coalesce_key(event)
+        if self._redis is None:
+            self.dispatch_local(quiz_id, text, coalesce_key=coalesce_key)
+            return
+
+        try:
+            await self._redis.eval(
+                PUBLISH_SCRIPT,
+                2,
+                _sequence_key(quiz_id),
+                _backlog_key(quiz_id),
+                text,
+                self._backlog_size,
+                self._backlog_ttl_ms,
+                event_channel(quiz_id),
+                coalesce_key,
+            )
+            self.metrics.published += 1
+        except Exception as exc:
+            # Other workers miss this one; their dashboards catch up from the
+            # next snapshot. Sockets on this worker still get it.
+            self.metrics.publish_errors += 1
+            logger.warning("Live quiz event for %s was not published to Redis: %s", quiz_id, exc)
+            self.dispatch_local(quiz_id, text, coalesce_key=coalesce_key)
+
+    def dispatch_local(self, quiz_id: str, text: str, *, coalesce_key: str = _NO_COALESCE_KEY) -> None:
+        """Queue an encoded event for every local socket of ``quiz_id``; never blocks."""
+        for connection in list(self._connections.get(quiz_id, {}).values()):
+            self._push(quiz_id, connection, coalesce_key, text)
+
+    def _push(self, quiz_id: str, connection: _Connection, coalesce_key: str, text: str) -> None:
+        queue = connection.queue
+        if len(queue) >= self._send_queue_size:
+            if self._slow_consumer_policy == "drop_oldest":
+                queue.popleft()
+                self.metrics.dropped += 1
+            elif self._slow_consumer_policy == "coalesce" and coalesce_key != _NO_COALESCE_KEY and (
+                self._remove_queued(queue, coalesce_key)
+            ):
+                self.metrics.coalesced += 1
+            else:
+                self._disconnect_slow_consumer(quiz_id, connection)
+                return
+
+        queue.append((coalesce_key, text))
+        connection.ready.set()
+        self.metrics.enqueued += 1
+        if len(queue) > self.metrics.max_queue_depth:
+            self.metrics.max_queue_depth = len(queue)
+
+    @staticmethod
+    def _remove_queued(queue: deque[tuple[str, str]], coalesce_key: str) -> bool:
+        for index, (queued_key, _) in enumerate(queue):
+            if queued_key == coalesce_key:
+                del queue[index]
+                return True
+        return False
+
+    def _disconnect_slow_consumer(self, quiz_id: str, connection: _Connection) -> None:
+        self.metrics.slow_consumers_disconnected += 1
+        self.metrics.dropped += len(connection.queue)
+        connection.queue.clear()
+        logger.warning("Disconnecting slow live quiz dashboard for %s", quiz_id)
+        self._close(quiz_id, connection, SLOW_CONSUMER_CLOSE_CODE)
+
+    def _close(self, quiz_id: str, connection: _Connection, code: int) -> None:
+        self.disconnect(quiz_id, connection.websocket)
+        asyncio.create_task(self._close_quietly(connection.websocket, code))
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket, code: int) -> None:
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
+    async def _drain(self, quiz_id: str, connection: _Connection) -> None:
+        websocket = connection.websocket
+        while True:
+            await connection.ready.wait()
+            while connection.queue:
+                _, text = connection.queue.popleft()
+                started = time.perf_counter()
+                try:
+                    # Unlike wait_for, timeout() never swallows a cancel that
+                    # lands as the send completes, so disconnect() always stops us.
+                    async with asyncio.timeout(self._send_timeout_seconds):
+                        await websocket.send_text(text)
+                except TimeoutError:
+                    self.metrics.send_failures += 1
+                    self._disconnect_slow_consumer(quiz_id, connection)
+                    return
+                except Exception:
+                    self.metrics.send_failures += 1
+                    self.disconnect(quiz_id, websocket)
+                    return
+                elapsed = time.perf_counter() - started
+                self.metrics.sent += 1
+                self.metrics.send_seconds_total += elapsed
+                if elapsed > self.metrics.max_send_seconds:
+                    self.metrics.max_send_seconds = elapsed
+            connection.ready.clear()
+
+    async def _load_cursor(self, quiz_id: str) -> None:
+        # Anything up to now is covered by the snapshot the route sends after
+        # connecting; gaps are only checked from here on.
+        try:
+            entries = await self._redis.xrevrange(_backlog_key(quiz_id), count=1)
+        except Exception as exc:
+            logger.warning("Could not read live quiz backlog position for %s: %s", quiz_id, exc)
+            return
+        if quiz_id in self._cursors:
+            return
+        if entries:
+            raw_stream_id, fields = entries[0]
+            self._cursors[quiz_id] = _QuizCursor(
+                seq=int(fields["seq"]),
+                stream_id=_parse_stream_id(raw_stream_id),
+                raw_stream_id=raw_stream_id,
+            )
+        else:
+            # No events yet: the first one published will carry seq 1.
+            self._cursors[quiz_id] = _QuizCursor(seq=0, stream_id=(0, 0), raw_stream_id="0-0")
+
+    async def _run_subscriber(self) -> None:
+        delay = self._reconnect_initial_seconds
+        while True:
+            pubsub = self._redis.pubsub()
             try:
-                await websocket.send_json(jsonable_encoder(event))
-            except Exception:
-                stale.append(websocket)
+                await pubsub.psubscribe(f"{EVENT_CHANNEL_PREFIX}*")
+                # After a reconnect, missed messages would only show up as a
+                # gap on the quiz's next event; catch quiet quizzes up now.
+                for quiz_id in list(self._cursors):
+                    await self._replay_backlog(quiz_id, until=None)
+                self._subscribed.set()
+                delay = self._reconnect_initial_seconds
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=self._poll_timeout_seconds,
+                    )
+                    if message and message.get("type") == "pmessage":
+                        await self._handle_message(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self._subscribed.clear()
+                self.metrics.reconnects += 1
+                logger.warning("Live quiz subscriber lost Redis, retrying in %.2fs: %s", delay, exc)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self._reconnect_max_seconds)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def _handle_message(self, channel: str, data: str) -> None:
+        quiz_id = channel[len(EVENT_CHANNEL_PREFIX):]
+        if quiz_id not in self._connections:
+            return
+        self.metrics.received += 1
+
+        try:
+            raw_seq, raw_stream_id, coalesce_key, text = data.split(" ", 3)
+            seq = int(raw_seq)
+            stream_id = _parse_stream_id(raw_stream_id)
+        except ValueError:
+            logger.warning("Ignoring malformed live quiz event on %s", channel)
+            return
+
+        cursor = self._cursors.get(quiz_id)
+        if cursor is not None:
+            if stream_id <= cursor.stream_id:
+                self.metrics.duplicates += 1
+                return
+            if seq > cursor.seq + 1:
+                if not await self._replay_backlog(quiz_id, until=stream_id):
+                    return
+
+        self._cursors[quiz_id] = _QuizCursor(seq=seq, stream_id=stream_id, raw_stream_id=raw_stream_id)
+        self.dispatch_local(quiz_id, text, coalesce_key=coalesce_key)
+
+    async def _replay_backlog(self, quiz_id: str, *, until: Optional[tuple[int, int]]) -> bool:
+        """Dispatch backlog entries after the quiz cursor, stopping before ``until``.
+
+        Returns False when the gap cannot be filled and the quiz was resynced.
+        """
+        cursor = self._cursors.get(quiz_id)
+        if cursor is None:
+            return True
+
+        entries = await self._redis.xrange(_backlog_key(quiz_id), min=cursor.raw_stream_id, max="+")
+        missed = [
+            (raw_stream_id, fields)
+            for raw_stream_id, fields in entries
+            if _parse_stream_id(raw_stream_id) > cursor.stream_id
+            and (until is None or _parse_stream_id(raw_stream_id) < until)
+        ]
+        if missed:
+            trimmed = int(missed[0][1]["seq"]) != cursor.seq + 1
+        else:
+            trimmed = until is not None
+        if trimmed:
+            self._resync(quiz_id)
+            return False
+
+        for raw_stream_id, fields in missed:
+            self._cursors[quiz_id] = _QuizCursor(
+                seq=int(fields["seq"]),
+                stream_id=_parse_stream_id(raw_stream_id),
+                raw_stream_id=raw_stream_id,
+            )
+            self.metrics.replayed += 1
+            self.dispatch_local(quiz_id, fields["event"], coalesce_key=fields.get("key", _NO_COALESCE_KEY))
+        return True
 
-        for websocket in stale:
-            self.disconnect(quiz_id, websocket)
+    def _resync(self, quiz_id: str) -> None:
+        self.metrics.resyncs += 1
+        logger.warning("Live quiz %s backlog no longer covers missed events; resyncing dashboards", quiz_id)
+        for connection in list(self._connections.get(quiz_id, {}).values()):
+            self._close(quiz_id, connection, RESYNC_CLOSE_CODE)
 
 
-live_quiz_realtime_broadcaster = LiveQuizRealtimeBroadcaster()
+live_quiz_realtime_broadcaster = LiveQuizRealtimeBroadcaster(
+    send_queue_size=settings.LIVE_QUIZ_SEND_QUEUE_SIZE,
+    send_timeout_seconds=settings.LIVE_QUIZ_SEND_TIMEOUT_SECONDS,
+    slow_consumer_policy=settings.LIVE_QUIZ_SLOW_CONSUMER_POLICY,
+    snapshot_interval_seconds=settings.LIVE_QUIZ_SNAPSHOT_INTERVAL_SECONDS,
+)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from server.app.core.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class LiveQuizSnapshot:
+    """What the participant paths need from a quiz, prepared once per version.
+
+    ``quiz`` is shared between requests and must not be mutated.
+    ``public_questions`` are the question payloads sent to participants,
+    without ``selected_answer``; ``answer_key`` holds the per-question
+    grading fields, without ``user_answer``.
+    """
+
+    quiz_id: str
+    version: Optional[datetime]
+    quiz: dict[str, Any]
+    public_questions: tuple[dict[str, Any], ...]
+    answer_key: tuple[dict[str, Any], ...]
+
+
+def build_live_quiz_snapshot(quiz: dict[str, Any]) -> LiveQuizSnapshot:
+    questions = quiz.get("questions") or []
+    quiz_type = quiz.get("quiz_type")
+    public_questions = tuple(
+        {
+            "question_index": index,
+            "question": question.get("question", ""),
+            "options": question.get("options"),
+            "question_type": question.get("question_type") or quiz_type,
+        }
+        for index, question in enumerate(questions)
+    )
+    answer_key = tuple(
+        {
+            "question": question.get("question", ""),
+            "correct_answer": question.get("correct_answer") or question.get("answer"),
+            "question_type": question.get("question_type") or quiz_type or "multichoice",
+            "source": question.get("source", "live"),
+        }
+        for question in questions
+    )
+    return LiveQuizSnapshot(
+        quiz_id=str(quiz.get("_id")),
+        version=quiz.get("updated_at"),
+        quiz=quiz,
+        public_questions=public_questions,
+        answer_key=answer_key,
+    )
+
+
+@dataclass
+class LiveQuizSnapshotCacheStats:
+    hits: int = 0
+    misses: int = 0
+    shared_loads: int = 0
+    invalidations: int = 0
+    discarded_loads: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class LiveQuizSnapshotCache:
+    """Bounded, TTL-limited in-process cache of live quiz snapshots.
+
+    Quiz writes in this process call ``invalidate``; other workers pick the
+    change up when their entry expires, so ``ttl_seconds`` bounds how long a
+    worker can serve an old version. Concurrent misses for the same quiz
+    share one load, and a load that overlaps an invalidation of its quiz is
+    returned to its callers but not stored.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[LiveQuizSnapshot, float]] = OrderedDict()
+        self._loading: dict[str, asyncio.Future] = {}
+        self.stats = LiveQuizSnapshotCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, quiz_id: str) -> Optional[LiveQuizSnapshot]:
+        entry = self._entries.get(quiz_id)
+        if entry is None:
+            return None
+        snapshot, expires_at = entry
+        if self._clock() >= expires_at:
+            del self._entries[quiz_id]
+            return None
+        self._entries.move_to_end(quiz_id)
+        return snapshot
+
+    def _remember(self, quiz_id: str, snapshot: LiveQuizSnapshot) -> None:
+        current = self._entries.get(quiz_id)
+        if (
+            current is not None
+            and current[0].version is not None
+            and snapshot.version is not None
+            and snapshot.version < current[0].version
+        ):
+            return
+        self._entries[quiz_id] = (snapshot, self._clock() + self._ttl_seconds)
+        self._entries.move_to_end(quiz_id)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(
+        self,
+        quiz_id: str,
+        loader: Callable[[], Awaitable[Optional[dict[str, Any]]]],
+    ) -> Optional[LiveQuizSnapshot]:
+        """Return the cached snapshot, or build one from ``loader``'s quiz document.
+
+        A missing quiz is not cached. The load runs as its own task, so a
+        cancelled request does not cancel it for the others waiting on it.
+        """
+        snapshot = self._lookup(quiz_id)
+        if snapshot is not None:
+            self.stats.hits += 1
+            return snapshot
+
+        load = self._loading.get(quiz_id)
+        if load is None:
+            self.stats.misses += 1
+            load = asyncio.ensure_future(self._load(quiz_id, loader))
+            self._loading[quiz_id] = load
+            load.add_done_callback(lambda done: self._finish_load(quiz_id, done))
+        else:
+            self.stats.shared_loads += 1
+        return await asyncio.shield(load)
+
+    async def _load(
+        self,
+        quiz_id: str,
+        loader: Callable[[], Awaitable[Optional[dict[str, Any]]]],
+    ) -> Optional[LiveQuizSnapshot]:
+        quiz = await loader()
+        if not quiz:
+            return None
+        snapshot = build_live_quiz_snapshot(quiz)
+        # ``invalidate`` and ``clear`` drop the quiz's in-flight load, so a
+        # load that is no longer the current one may have read the old quiz.
+        if self._loading.get(quiz_id) is asyncio.current_task():
+            self._remember(quiz_id, snapshot)
+        else:
+            self.stats.discarded_loads += 1
+        return snapshot
+
+    def _finish_load(self, quiz_id: str, load: asyncio.Future) -> None:
+        if self._loading.get(quiz_id) is load:
+            del self._loading[quiz_id]
+        if not load.cancelled():
+            # Waiters re-raise a failure; retrieve it so a load nobody is
+            # still waiting for does not log "exception was never retrieved".
+            load.exception()
+
+    def invalidate(self, quiz_id: str) -> None:
+        quiz_id = str(quiz_id)
+        self._entries.pop(quiz_id, None)
+        # Later callers must not join a load that may have read the old quiz,
+        # and that load must not store it; loads of other quizzes are kept.
+        self._loading.pop(quiz_id, None)
+        self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._loading.clear()
+
+
+live_quiz_snapshot_cache = LiveQuizSnapshotCache(
+    max_entries=settings.LIVE_QUIZ_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.LIVE_QUIZ_CACHE_TTL_SECONDS,
+)
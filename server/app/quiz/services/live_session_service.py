@@ -9,15 +9,37 @@ from fastapi import HTTPException, status
 from pydantic import EmailStr, TypeAdapter, ValidationError
 
 from server.app.core.config import settings
-from server.app.quiz.utils.grading import grade_answers
+from server.app.quiz.utils.batch_grading import grade_batch
+from server.app.quiz.repositories.live_quiz_aggregate_repository import (
+    AggregateChange,
+    LiveQuizAggregateRepository,
+    apply_aggregate_change,
+    empty_live_quiz_aggregate,
+    merge_aggregate_change,
+)
+from server.app.quiz.repositories.live_session_queries import InvalidSessionCursor
 from server.app.quiz.repositories.live_session_repository import (
+    OPEN_SESSION_STATUSES,
     LiveQuizSessionRepository,
 )
 from server.app.quiz.services.live_quiz_realtime import LiveQuizRealtimeBroadcaster
+from server.app.quiz.services.live_quiz_snapshot_cache import (
+    LiveQuizSnapshot,
+    LiveQuizSnapshotCache,
+    build_live_quiz_snapshot,
+    live_quiz_snapshot_cache,
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Participant rows in a dashboard's ``participants_snapshot``; the rest are
+# paged through ``get_analytics_page``.
+PARTICIPANT_SNAPSHOT_PAGE_SIZE = 50
+
+# Scans of a quiz's sessions a summary rebuild makes before giving up on storing it.
+AGGREGATE_REBUILD_ATTEMPTS = 3
+
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
@@ -38,9 +60,13 @@ class LiveQuizSessionService:
         self,
         repository: LiveQuizSessionRepository,
         broadcaster: Optional[LiveQuizRealtimeBroadcaster] = None,
+        snapshot_cache: Optional[LiveQuizSnapshotCache] = None,
+        aggregates: Optional[LiveQuizAggregateRepository] = None,
     ):
         self.repository = repository
         self.broadcaster = broadcaster
+        self.snapshot_cache = snapshot_cache
+        self.aggregates = aggregates
 
     async def generate_access_code(
         self,
@@ -114,6 +140,14 @@ class LiveQuizSessionService:
         )
         if not updated_quiz:
             raise HTTPException(status_code=500, detail="Could not enable live quiz")
+        # Services built without a cache still read through the process cache
+        # elsewhere, so the write drops the quiz from both.
+        live_quiz_snapshot_cache.invalidate(quiz_id)
+        if self.snapshot_cache is not None and self.snapshot_cache is not live_quiz_snapshot_cache:
+            self.snapshot_cache.invalidate(quiz_id)
+        if self.aggregates and not quiz.get("live_quiz_enabled"):
+            # A quiz going live for the first time has no sessions to count.
+            await self.aggregates.ensure(str(updated_quiz["_id"]))
 
         invitations_created = 0
         invitations_delivered = 0
@@ -291,6 +325,10 @@ class LiveQuizSessionService:
             "updated_at": started_at,
         }
         session_id = await self.repository.create_session(session_data)
+        await self._record_change(
+            str(quiz["_id"]),
+            ({"participant_count": 1, "status_counts.joined": 1}, []),
+        )
         remaining_seconds = self._remaining_seconds(expires_at, server_now)
 
         # Update invitation status if invitation repository is available
@@ -329,7 +367,11 @@ class LiveQuizSessionService:
             "remaining_seconds": remaining_seconds,
             "redirect_url": f"/live-quiz/{session_id}",
         }
-        await self._publish_participant_event(str(quiz["_id"]), session_id, "participant_joined")
+        await self._publish_participant_event(
+            str(quiz["_id"]),
+            {**session_data, "_id": session_id},
+            "participant_joined",
+        )
         return response
 
     async def get_session_state(
@@ -338,23 +380,23 @@ class LiveQuizSessionService:
         participant_token: str,
     ) -> Dict[str, Any]:
         session = await self._get_authorized_session(session_id, participant_token)
-        quiz = await self.repository.get_quiz_by_id(session["quiz_id"])
-        if not quiz:
+        snapshot = await self._get_quiz_snapshot(session["quiz_id"])
+        if not snapshot:
             raise HTTPException(status_code=404, detail="Quiz not found")
 
         if self._is_expired(session) and session.get("status") in {"active", "joined", "disconnected"}:
             session = await self._finalize_session(
                 session,
-                quiz,
+                snapshot,
                 auto_submitted=True,
             )
             await self._publish_participant_event(
                 session["quiz_id"],
-                str(session["_id"]),
+                session,
                 "participant_submitted",
             )
 
-        return self._build_session_state(session, quiz)
+        return self._build_session_state(session, snapshot)
 
     async def save_answer(
         self,
@@ -364,35 +406,42 @@ class LiveQuizSessionService:
         selected_answer: str,
         next_question_index: Optional[int] = None,
     ) -> Dict[str, Any]:
-        session = await self._get_authorized_session(session_id, participant_token)
-        if session.get("status") not in {"active", "joined", "disconnected"}:
-            raise HTTPException(status_code=409, detail="Session is not active")
-        if self._is_expired(session):
-            quiz = await self.repository.get_quiz_by_id(session["quiz_id"])
-            if quiz:
-                await self._finalize_session(session, quiz, auto_submitted=True)
-            raise HTTPException(status_code=409, detail="Session has expired")
-        if question_index < 0 or question_index >= session["total_questions"]:
-            raise HTTPException(status_code=400, detail="Invalid question index")
+        if not participant_token:
+            raise HTTPException(status_code=401, detail="Participant token missing")
 
-        next_index = (
-            next_question_index
-            if next_question_index is not None
-            else session["current_question_index"]
-        )
-        if next_index < 0 or next_index >= session["total_questions"]:
-            raise HTTPException(status_code=400, detail="Invalid next question index")
-        updated = await self.repository.save_answer(
-            session_id,
-            question_index,
-            selected_answer,
-            next_index,
-        )
+        # The write checks token, status, expiry and question bounds itself;
+        # the session is only read when it refuses, to report why.
+        updated = None
+        if question_index >= 0 and (next_question_index is None or next_question_index >= 0):
+            updated = await self._write_answer(
+                session_id,
+                participant_token,
+                question_index,
+                selected_answer,
+                next_question_index,
+            )
         if not updated:
-            raise HTTPException(status_code=404, detail="Session not found")
+            await self._raise_answer_rejection(
+                session_id,
+                participant_token,
+                question_index,
+                next_question_index,
+            )
+            # The session changed between the write and the read; retry once.
+            updated = await self._write_answer(
+                session_id,
+                participant_token,
+                question_index,
+                selected_answer,
+                next_question_index,
+            )
+            if not updated:
+                raise HTTPException(status_code=409, detail="Session is not active")
+
+        await self._record_change(updated["quiz_id"], self._status_change(updated))
         await self._publish_participant_event(
             updated["quiz_id"],
-            str(updated["_id"]),
+            updated,
             "participant_progress",
         )
         return {
@@ -409,8 +458,8 @@ class LiveQuizSessionService:
         invitation_repository=None,
     ) -> Dict[str, Any]:
         session = await self._get_authorized_session(session_id, participant_token)
-        quiz = await self.repository.get_quiz_by_id(session["quiz_id"])
-        if not quiz:
+        snapshot = await self._get_quiz_snapshot(session["quiz_id"])
+        if not snapshot:
             raise HTTPException(status_code=404, detail="Quiz not found")
 
         if session.get("status") == "submitted":
@@ -434,7 +483,7 @@ class LiveQuizSessionService:
 
         finalized = await self._finalize_session(
             session,
-            quiz,
+            snapshot,
             auto_submitted=auto_submitted or is_expired,
         )
 
@@ -455,7 +504,7 @@ class LiveQuizSessionService:
 
         await self._publish_participant_event(
             finalized["quiz_id"],
-            str(finalized["_id"]),
+            finalized,
             "participant_submitted",
         )
         return self._submission_response(finalized)
@@ -469,50 +518,196 @@ class LiveQuizSessionService:
         if session.get("status") not in {"active", "joined"}:
             return {"status": session.get("status")}
 
-        updated = await self.repository.update_session(
+        updated = await self.repository.transition_session(
             session_id,
+            ["active", "joined"],
             {"status": "disconnected"},
         )
         if updated:
+            await self._record_change(updated["quiz_id"], self._status_change(updated))
             await self._publish_participant_event(
                 updated["quiz_id"],
-                str(updated["_id"]),
+                updated,
                 "participant_disconnected",
             )
             return {"status": "disconnected"}
         return {"status": session.get("status")}
 
-    async def list_analytics(self, quiz_id: str, requester_id: str) -> List[Dict[str, Any]]:
-        quiz = await self.repository.get_quiz_by_id(quiz_id)
-        if not quiz:
-            raise HTTPException(status_code=404, detail="Quiz not found")
+    async def list_sessions_page(
+        self,
+        quiz_id: str,
+        requester_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """One page of the creator's sessions for a quiz, newest first."""
+        await self._get_owned_quiz(quiz_id, requester_id)
+        try:
+            sessions, next_cursor = await self.repository.list_quiz_sessions_by_creator(
+                quiz_id,
+                requester_id,
+                limit,
+                cursor,
+            )
+        except InvalidSessionCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return {
+            "quiz_id": quiz_id,
+            "participants": [self._analytics_row(session) for session in sessions],
+            "limit": limit,
+            "next_cursor": next_cursor,
+        }
 
-        owner_id = quiz.get("created_by") or quiz.get("owner_id") or quiz.get("owner_user_id")
-        if not owner_id or str(owner_id) != requester_id:
-            raise HTTPException(status_code=403, detail="Not allowed")
+    async def list_participant_history(
+        self,
+        user_email: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """One page of the live quiz sessions a user joined with their email, latest first."""
+        try:
+            sessions, next_cursor = await self.repository.find_live_quiz_sessions_for_user(
+                user_email,
+                limit,
+                cursor,
+            )
+        except InvalidSessionCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return {
+            "sessions": [
+                {**self._analytics_row(session), "quiz_id": session["quiz_id"]}
+                for session in sessions
+            ],
+            "limit": limit,
+            "next_cursor": next_cursor,
+        }
 
-        sessions = await self.repository.list_quiz_sessions(quiz_id)
-        return [self._analytics_row(session) for session in sessions]
+    async def get_analytics_page(
+        self,
+        quiz_id: str,
+        requester_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """The quiz's running summary plus one page of participant rows.
+
+        The summary comes from the quiz's aggregate document, so its cost
+        does not grow with the number of participants; only ``limit``
+        sessions are read for the rows, starting after ``cursor``.
+        """
+        quiz = await self._get_owned_quiz(quiz_id, requester_id)
+        return await self._analytics_page(quiz_id, quiz, limit, cursor)
+
+    async def get_participants_snapshot(self, quiz_id: str, requester_id: str) -> Dict[str, Any]:
+        """The ``participants_snapshot`` event a dashboard starts from: the first analytics page."""
+        quiz = await self._get_owned_quiz(quiz_id, requester_id)
+        return await self._participants_snapshot(quiz_id, quiz)
+
+    async def _participants_snapshot(self, quiz_id: str, quiz: Dict[str, Any]) -> Dict[str, Any]:
+        page = await self._analytics_page(quiz_id, quiz, PARTICIPANT_SNAPSHOT_PAGE_SIZE)
+        return {"type": "participants_snapshot", **page}
+
+    async def _analytics_page(
+        self,
+        quiz_id: str,
+        quiz: Dict[str, Any],
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        try:
+            sessions, next_cursor = await self.repository.list_quiz_sessions_page(
+                quiz_id,
+                limit,
+                cursor,
+            )
+        except InvalidSessionCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        aggregate = await self._get_aggregate(quiz_id)
+        status_counts = aggregate["status_counts"]
+        scored_count = aggregate["scored_count"]
+        return {
+            "quiz_id": quiz_id,
+            "status": self._quiz_status_from_counts(
+                quiz,
+                status_counts,
+                aggregate["participant_count"],
+            ),
+            "participant_count": aggregate["participant_count"],
+            "status_counts": {
+                "joined": status_counts.get("joined", 0),
+                "in_progress": status_counts.get("active", 0),
+                "disconnected": status_counts.get("disconnected", 0),
+                "submitted": status_counts.get("submitted", 0),
+                "timed_out": aggregate["timed_out_count"],
+            },
+            "average_score": self._average_score(aggregate),
+            "score_histogram": [
+                {"score": int(score), "count": count}
+                for score, count in sorted(
+                    aggregate["score_histogram"].items(),
+                    key=lambda item: int(item[0]),
+                )
+                if count
+            ],
+            "questions": [
+                {
+                    "question_index": index,
+                    "correct_count": counts.get("correct", 0),
+                    "answered_count": counts.get("answered", 0),
+                    "correct_rate": round(counts.get("correct", 0) / scored_count * 100, 2)
+                    if scored_count
+                    else None,
+                }
+                for index, counts in sorted(
+                    aggregate["questions"].items(),
+                    key=lambda item: int(item[0]),
+                )
+            ],
+            "leaderboard": [
+                {"rank": rank, **entry}
+                for rank, entry in enumerate(aggregate["leaderboard"], start=1)
+            ],
+            "participants": [self._analytics_row(session) for session in sessions],
+            "limit": limit,
+            "next_cursor": next_cursor,
+        }
 
     async def list_creator_live_quizzes(
         self,
         creator_user_id: str,
     ) -> List[Dict[str, Any]]:
         quizzes = await self.repository.list_live_quizzes_by_creator(creator_user_id)
+        if self.aggregates:
+            aggregates = await self.aggregates.get_many([str(quiz["_id"]) for quiz in quizzes])
         rows = []
         for quiz in quizzes:
             quiz_id = str(quiz["_id"])
-            sessions = await self.repository.list_quiz_sessions(quiz_id)
-            completed = [
-                session
-                for session in sessions
-                if session.get("submitted_at") or session.get("status") == "submitted"
-            ]
-            scores = [
-                session.get("score")
-                for session in completed
-                if isinstance(session.get("score"), int)
-            ]
+            if self.aggregates:
+                aggregate = aggregates.get(quiz_id) or await self._get_aggregate(quiz_id)
+                participant_count = aggregate["participant_count"]
+                completed_count = aggregate["status_counts"].get("submitted", 0)
+                average_score = self._average_score(aggregate)
+                quiz_status = self._quiz_status_from_counts(
+                    quiz,
+                    aggregate["status_counts"],
+                    participant_count,
+                )
+            else:
+                sessions = await self.repository.list_quiz_sessions(quiz_id)
+                completed = [
+                    session
+                    for session in sessions
+                    if session.get("submitted_at") or session.get("status") == "submitted"
+                ]
+                scores = [
+                    session.get("score")
+                    for session in completed
+                    if isinstance(session.get("score"), int)
+                ]
+                participant_count = len(sessions)
+                completed_count = len(completed)
+                average_score = round(sum(scores) / len(scores), 2) if scores else None
+                quiz_status = self._quiz_status(quiz, sessions)
             rows.append(
                 {
                     "quiz_id": quiz_id,
@@ -524,13 +719,11 @@ class LiveQuizSessionService:
                         "participant_access_mode", "public"
                     ),
                     "invited_emails": quiz.get("invited_participant_emails", []),
-                    "status": self._quiz_status(quiz, sessions),
+                    "status": quiz_status,
                     "created_at": quiz.get("created_at"),
-                    "participant_count": len(sessions),
-                    "completed_count": len(completed),
-                    "average_score": round(sum(scores) / len(scores), 2)
-                    if scores
-                    else None,
+                    "participant_count": participant_count,
+                    "completed_count": completed_count,
+                    "average_score": average_score,
                 }
             )
         return rows
@@ -543,6 +736,16 @@ class LiveQuizSessionService:
                 return code
         raise HTTPException(status_code=500, detail="Could not generate access code")
 
+    async def _get_owned_quiz(self, quiz_id: str, requester_id: str) -> Dict[str, Any]:
+        quiz = await self.repository.get_quiz_by_id(quiz_id)
+        if not quiz:
+            raise HTTPException(status_code=404, detail="Quiz not found")
+
+        owner_id = quiz.get("created_by") or quiz.get("owner_id") or quiz.get("owner_user_id")
+        if not owner_id or str(owner_id) != requester_id:
+            raise HTTPException(status_code=403, detail="Not allowed")
+        return quiz
+
     async def _get_startable_quiz(self, code: str) -> Dict[str, Any]:
         quiz = await self.repository.get_quiz_by_access_code(code)
         if not quiz or not quiz.get("live_quiz_enabled"):
@@ -569,80 +772,316 @@ class LiveQuizSessionService:
             raise HTTPException(status_code=403, detail="Invalid participant token")
         return session
 
+    async def _get_quiz_snapshot(self, quiz_id: str) -> Optional[LiveQuizSnapshot]:
+        if self.snapshot_cache is None:
+            quiz = await self.repository.get_quiz_by_id(quiz_id)
+            return build_live_quiz_snapshot(quiz) if quiz else None
+        return await self.snapshot_cache.get_or_load(
+            quiz_id,
+            lambda: self.repository.get_quiz_by_id(quiz_id),
+        )
+
+    async def _write_answer(
+        self,
+        session_id: str,
+        participant_token: str,
+        question_index: int,
+        selected_answer: str,
+        next_question_index: Optional[int],
+    ) -> Optional[Dict[str, Any]]:
+        return await self.repository.save_answer(
+            session_id,
+            question_index,
+            selected_answer,
+            next_question_index,
+            participant_token_hash=_hash_token(participant_token),
+            now=_utc_now(),
+        )
+
+    async def _raise_answer_rejection(
+        self,
+        session_id: str,
+        participant_token: str,
+        question_index: int,
+        next_question_index: Optional[int],
+    ) -> None:
+        """Raise the error for an answer the atomic write refused, if it still applies."""
+        session = await self._get_authorized_session(session_id, participant_token)
+        if session.get("status") not in {"active", "joined", "disconnected"}:
+            raise HTTPException(status_code=409, detail="Session is not active")
+        if self._is_expired(session):
+            snapshot = await self._get_quiz_snapshot(session["quiz_id"])
+            if snapshot:
+                await self._finalize_session(session, snapshot, auto_submitted=True)
+            raise HTTPException(status_code=409, detail="Session has expired")
+        if question_index < 0 or question_index >= session["total_questions"]:
+            raise HTTPException(status_code=400, detail="Invalid question index")
+
+        next_index = (
+            next_question_index
+            if next_question_index is not None
+            else session["current_question_index"]
+        )
+        if next_index < 0 or next_index >= session["total_questions"]:
+            raise HTTPException(status_code=400, detail="Invalid next question index")
+
     async def _finalize_session(
         self,
         session: Dict[str, Any],
-        quiz: Dict[str, Any],
+        snapshot: LiveQuizSnapshot,
         auto_submitted: bool,
     ) -> Dict[str, Any]:
-        graded = self._grade_session(session, quiz)
-        submitted_at = _utc_now()
-
-        # Calculate duration_used_seconds
-        started_at = _as_utc(session["started_at"])
-        duration_used_seconds = int((submitted_at - started_at).total_seconds())
-
-        updated = await self.repository.update_session(
+        graded = self._grade_session(session, snapshot)
+        updated = await self.repository.transition_session(
             str(session["_id"]),
-            {
-                "status": "submitted",
-                "submitted_at": submitted_at,
-                "score": graded["score"],
-                "percentage": graded["percentage"],
-                "duration_used_seconds": duration_used_seconds,
-                "auto_submitted": auto_submitted,
-            },
+            OPEN_SESSION_STATUSES,
+            self._finalized_fields(session, graded, auto_submitted, _utc_now()),
         )
         if not updated:
+            # Another request closed the session first; it has been counted.
+            current = await self.repository.get_session(str(session["_id"]))
+            if current and current.get("status") == "submitted":
+                return current
             raise HTTPException(status_code=404, detail="Session not found")
+        await self._record_change(
+            updated["quiz_id"],
+            self._completion_change(updated, graded.get("correct_question_indexes", [])),
+        )
         return updated
 
+    async def finalize_expired_batch(self, now: datetime, limit: int) -> tuple[int, int]:
+        """Close up to ``limit`` sessions that expired unattended, as of ``now``.
+
+        One indexed read, one bulk write and one read-back; sessions closed
+        in the meantime are skipped. Returns how many were due and how many
+        this call closed.
+        """
+        due = await self.repository.find_expired_sessions(now, limit)
+        if not due:
+            return 0, 0
+
+        snapshots: Dict[str, Optional[LiveQuizSnapshot]] = {}
+        for quiz_id in {session["quiz_id"] for session in due}:
+            snapshots[quiz_id] = await self._get_quiz_snapshot(quiz_id)
+        graded = {
+            session["_id"]: self._grade_session(session, snapshots[session["quiz_id"]])
+            if snapshots[session["quiz_id"]]
+            else None
+            for session in due
+        }
+        finalized = await self.repository.finalize_expired_sessions(
+            {
+                session["_id"]: self._finalized_fields(session, graded[session["_id"]], True, now)
+                for session in due
+            },
+            now,
+        )
+        changes: Dict[str, AggregateChange] = {}
+        for session in finalized:
+            merge_aggregate_change(
+                changes,
+                session["quiz_id"],
+                self._completion_change(
+                    session,
+                    (graded[session["_id"]] or {}).get("correct_question_indexes", []),
+                ),
+            )
+        await self._record_changes(changes)
+        for session in finalized:
+            await self._publish_participant_event(session["quiz_id"], session, "participant_submitted")
+        return len(due), len(finalized)
+
+    def _finalized_fields(
+        self,
+        session: Dict[str, Any],
+        graded: Optional[Dict[str, Any]],
+        auto_submitted: bool,
+        submitted_at: datetime,
+    ) -> Dict[str, Any]:
+        # A session whose quiz was removed cannot be graded; it is still closed.
+        graded = graded or {"score": None, "percentage": None}
+
+        # Calculate duration_used_seconds
+        started_at = _as_utc(session["started_at"])
+        duration_used_seconds = int((submitted_at - started_at).total_seconds())
+
+        return {
+            "status": "submitted",
+            "submitted_at": submitted_at,
+            "score": graded["score"],
+            "percentage": graded["percentage"],
+            "duration_used_seconds": duration_used_seconds,
+            "auto_submitted": auto_submitted,
+        }
+
     def _grade_session(
         self,
         session: Dict[str, Any],
-        quiz: Dict[str, Any],
+        snapshot: LiveQuizSnapshot,
     ) -> Dict[str, Any]:
-        questions = quiz.get("questions") or []
         answer_by_index = {
             answer["question_index"]: answer.get("selected_answer", "")
             for answer in session.get("answers", [])
         }
-        grading_payload = []
-        for index, question in enumerate(questions):
-            correct_answer = question.get("correct_answer") or question.get("answer")
-            grading_payload.append(
-                {
-                    "question": question.get("question", ""),
-                    "user_answer": answer_by_index.get(index, ""),
-                    "correct_answer": correct_answer,
-                    "question_type": question.get("question_type")
-                    or quiz.get("quiz_type")
-                    or "multichoice",
-                    "source": question.get("source", "live"),
-                }
+        grading_payload = [
+            {**entry, "user_answer": answer_by_index.get(index, "")}
+            for index, entry in enumerate(snapshot.answer_key)
+        ]
+
+        # Questions without an answer key are not graded, so map results back
+        # to their question through ``source_index``.
+        correct_question_indexes = grade_batch(grading_payload, "mock").correct_source_indexes
+        score = len(correct_question_indexes)
+        total = len(snapshot.answer_key)
+        percentage = round((score / total) * 100, 2) if total else 0
+        return {
+            "score": score,
+            "percentage": percentage,
+            "correct_question_indexes": correct_question_indexes,
+        }
+
+    def _status_change(self, session: Dict[str, Any]) -> AggregateChange:
+        """Move one participant between status counters after a status write."""
+        previous, current = session.get("previous_status"), session["status"]
+        if not previous or previous == current:
+            return {}, []
+        return {f"status_counts.{previous}": -1, f"status_counts.{current}": 1}, []
+
+    def _completion_change(
+        self,
+        session: Dict[str, Any],
+        correct_question_indexes: List[int],
+    ) -> AggregateChange:
+        increments, _ = self._status_change(session)
+        if session.get("auto_submitted"):
+            increments["timed_out_count"] = 1
+        score = session.get("score")
+        if score is None:
+            return increments, []
+
+        increments.update(
+            {"scored_count": 1, "score_sum": score, f"score_histogram.{score}": 1}
+        )
+        for answer in session.get("answers", []):
+            increments[f"questions.{answer['question_index']}.answered"] = 1
+        for index in correct_question_indexes:
+            increments[f"questions.{index}.correct"] = 1
+        entry = {
+            "session_id": str(session["_id"]),
+            "participant_name": session.get("participant_name", ""),
+            "score": score,
+            "percentage": session.get("percentage"),
+            "duration_seconds": session.get("duration_used_seconds") or 0,
+            "submitted_at": session.get("submitted_at"),
+            "auto_submitted": session.get("auto_submitted", False),
+        }
+        return increments, [entry]
+
+    async def _record_change(self, quiz_id: str, change: AggregateChange) -> None:
+        await self._record_changes({quiz_id: change})
+
+    async def _record_changes(self, changes: Dict[str, AggregateChange]) -> None:
+        # The session write already succeeded; a lost summary update only
+        # skews the dashboard until the summary is rebuilt.
+        changes = {quiz_id: change for quiz_id, change in changes.items() if change[0] or change[1]}
+        if not self.aggregates or not changes:
+            return
+        try:
+            await self.aggregates.apply_many(changes)
+        except Exception as e:
+            logger.warning(f"Could not update live quiz aggregates for {list(changes)}: {e}")
+
+    async def _get_aggregate(self, quiz_id: str) -> Dict[str, Any]:
+        if not self.aggregates:
+            return await self._build_aggregate(quiz_id)
+        aggregate = await self.aggregates.get(quiz_id)
+        if aggregate is None:
+            aggregate = await self.rebuild_aggregate(quiz_id)
+        return aggregate
+
+    async def rebuild_aggregate(self, quiz_id: str) -> Dict[str, Any]:
+        """Recount a quiz's summary from its sessions and store it.
+
+        Session writes that land during the scan count into the summary
+        ``begin_rebuild`` left in place, and the recount is only stored if
+        none did; otherwise the sessions are scanned again. If writes keep
+        landing, the last recount is returned without being stored and the
+        next read tries again.
+        """
+        for _ in range(AGGREGATE_REBUILD_ATTEMPTS):
+            current = await self.aggregates.begin_rebuild(quiz_id)
+            aggregate = await self._build_aggregate(quiz_id)
+            stored = await self.aggregates.replace_if_unchanged(aggregate, current.get("version"))
+            if stored is not None:
+                return stored
+        logger.warning(f"Live quiz {quiz_id} kept changing while its summary was rebuilt")
+        return aggregate
+
+    async def check_aggregate(self, quiz_id: str, *, repair: bool = False) -> bool:
+        """Whether the stored summary matches a recount of the sessions.
+
+        With ``repair`` a missing or drifted summary is rebuilt.
+        """
+        stored = await self.aggregates.get(quiz_id)
+        recount = await self._build_aggregate(quiz_id)
+        consistent = stored is not None and all(
+            stored.get(field) == recount[field] for field in recount if field != "_id"
+        )
+        if repair and not consistent:
+            await self.rebuild_aggregate(quiz_id)
+        return consistent
+
+    async def _build_aggregate(self, quiz_id: str) -> Dict[str, Any]:
+        """Count a quiz's sessions from scratch, for quizzes without a summary.
+
+        Scores come from the sessions; per-question results are regraded
+        against the current quiz.
+        """
+        snapshot = await self._get_quiz_snapshot(quiz_id)
+        leaderboard_size = (
+            self.aggregates.leaderboard_size
+            if self.aggregates
+            else settings.LIVE_QUIZ_LEADERBOARD_SIZE
+        )
+        aggregate = empty_live_quiz_aggregate(quiz_id)
+        async for session in self.repository.iter_quiz_sessions(quiz_id):
+            status = session.get("status", "joined")
+            apply_aggregate_change(
+                aggregate,
+                ({"participant_count": 1, f"status_counts.{status}": 1}, []),
+                leaderboard_size,
             )
+            if status != "submitted":
+                continue
+            graded = self._grade_session(session, snapshot) if snapshot else {}
+            apply_aggregate_change(
+                aggregate,
+                self._completion_change(
+                    {**session, "previous_status": None},
+                    graded.get("correct_question_indexes", []),
+                ),
+                leaderboard_size,
+            )
+        return aggregate
 
-        graded_answers = grade_answers(grading_payload, "mock")
-        score = sum(1 for answer in graded_answers if answer.get("is_correct"))
-        total = len(questions)
-        percentage = round((score / total) * 100, 2) if total else 0
-        return {"score": score, "percentage": percentage}
+    def _average_score(self, aggregate: Dict[str, Any]) -> Optional[float]:
+        if not aggregate["scored_count"]:
+            return None
+        return round(aggregate["score_sum"] / aggregate["scored_count"], 2)
 
     def _build_session_state(
         self,
         session: Dict[str, Any],
-        quiz: Dict[str, Any],
+        snapshot: LiveQuizSnapshot,
     ) -> Dict[str, Any]:
+        quiz = snapshot.quiz
         current_index = session.get("current_question_index", 0)
-        questions = quiz.get("questions") or []
+        questions = snapshot.public_questions
         question = None
         if session.get("status") in {"active", "joined", "disconnected"} and 0 <= current_index < len(questions):
-            raw_question = questions[current_index]
             question = self._public_question(
-                raw_question,
-                current_index,
+                questions[current_index],
                 session.get("answers", []),
-                quiz.get("quiz_type"),
             )
 
         server_now = _utc_now()
@@ -682,23 +1121,16 @@ class LiveQuizSessionService:
 
     def _public_question(
         self,
-        question: Dict[str, Any],
-        index: int,
+        public_question: Dict[str, Any],
         answers: List[Dict[str, Any]],
-        quiz_type: Optional[str],
     ) -> Dict[str, Any]:
+        index = public_question["question_index"]
         selected_answer = None
         for answer in answers:
             if answer.get("question_index") == index:
                 selected_answer = answer.get("selected_answer")
                 break
-        return {
-            "question_index": index,
-            "question": question.get("question", ""),
-            "options": question.get("options"),
-            "question_type": question.get("question_type") or quiz_type,
-            "selected_answer": selected_answer,
-        }
+        return {**public_question, "selected_answer": selected_answer}
 
     def _submission_response(
         self,
@@ -721,6 +1153,23 @@ class LiveQuizSessionService:
             duration_seconds = int(
                 (_as_utc(session["submitted_at"]) - _as_utc(session["started_at"])).total_seconds()
             )
+        return {
+            "session_id": str(session["_id"]),
+            "participant_name": session.get("participant_name", ""),
+            "participant_email": session.get("participant_email"),
+            "score": session.get("score"),
+            "total_questions": session.get("total_questions", 0),
+            "percentage": session.get("percentage"),
+            "joined_at": session.get("joined_at") or session.get("started_at"),
+            "started_at": session.get("started_at"),
+            "submitted_at": session.get("submitted_at"),
+            "duration_seconds": duration_seconds,
+            **self._progress_delta(session),
+            "auto_submitted": session.get("auto_submitted", False),
+        }
+
+    def _progress_delta(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        """The analytics row fields an answer can change, for progress events."""
         total_questions = session.get("total_questions", 0)
         answered_count = len(session.get("answers", []))
         status = session.get("status", "active")
@@ -739,20 +1188,11 @@ class LiveQuizSessionService:
         )
         return {
             "session_id": str(session["_id"]),
-            "participant_name": session.get("participant_name", ""),
-            "participant_email": session.get("participant_email"),
-            "score": session.get("score"),
-            "total_questions": total_questions,
-            "percentage": session.get("percentage"),
-            "joined_at": session.get("joined_at") or session.get("started_at"),
-            "started_at": session.get("started_at"),
-            "submitted_at": session.get("submitted_at"),
-            "duration_seconds": duration_seconds,
             "progress": answered_count,
             "current_question_number": current_question_number,
             "progress_percentage": progress_percentage,
             "status": status,
-            "auto_submitted": session.get("auto_submitted", False),
+            "updated_at": _as_utc(session["updated_at"]) if session.get("updated_at") else None,
         }
 
     def _quiz_status(
@@ -760,12 +1200,24 @@ class LiveQuizSessionService:
         quiz: Dict[str, Any],
         sessions: List[Dict[str, Any]],
     ) -> str:
-        if any(session.get("status") in {"joined", "active"} for session in sessions):
+        status_counts: Dict[str, int] = {}
+        for session in sessions:
+            status = "submitted" if session.get("submitted_at") else session.get("status")
+            status_counts[status] = status_counts.get(status, 0) + 1
+        return self._quiz_status_from_counts(quiz, status_counts, len(sessions))
+
+    def _quiz_status_from_counts(
+        self,
+        quiz: Dict[str, Any],
+        status_counts: Dict[str, int],
+        participant_count: int,
+    ) -> str:
+        if status_counts.get("joined", 0) or status_counts.get("active", 0):
             return "in_progress"
         expires_at = quiz.get("access_code_expires_at")
         if expires_at and _as_utc(expires_at) <= _utc_now():
             return "expired"
-        if sessions and all(session.get("submitted_at") for session in sessions):
+        if participant_count and status_counts.get("submitted", 0) == participant_count:
             return "completed"
         return "active"
 
@@ -817,22 +1269,39 @@ class LiveQuizSessionService:
     async def _publish_participant_event(
         self,
         quiz_id: str,
-        session_id: str,
+        session: Dict[str, Any],
         event_type: str,
     ) -> None:
+        """Broadcast a change to ``session``, the document the write returned.
+
+        Progress events only carry the fields an answer changes; dashboards
+        merge them into the participant's row. Every
+        ``LIVE_QUIZ_SNAPSHOT_INTERVAL_SECONDS`` the quiz's summary and first
+        page of participants follow, so dashboards resync even if they missed
+        an event.
+        """
         if not self.broadcaster:
             return
-        session = await self.repository.get_session(session_id)
-        if not session:
-            return
+        participant = (
+            self._progress_delta(session)
+            if event_type == "participant_progress"
+            else self._analytics_row(session)
+        )
         await self.broadcaster.publish(
             quiz_id,
             {
                 "type": event_type,
                 "quiz_id": quiz_id,
-                "participant": self._analytics_row(session),
+                "participant": participant,
             },
         )
+        if self.broadcaster.claim_snapshot(quiz_id):
+            snapshot = await self._get_quiz_snapshot(quiz_id)
+            if snapshot:
+                await self.broadcaster.publish(
+                    quiz_id,
+                    await self._participants_snapshot(quiz_id, snapshot.quiz),
+                )
 
     def _is_expired(self, session: Dict[str, Any]) -> bool:
         return _as_utc(session["expires_at"]) <= _utc_now()
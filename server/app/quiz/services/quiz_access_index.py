@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from server.app.quiz.repositories.v2.repositories.reference_repository import ReferenceV2Repository
+
+
+AccessPair = tuple[str, str]
+
+
+@dataclass
+class QuizAccessIndexReport:
+    expected: int = 0
+    indexed: int = 0
+    missing: list[AccessPair] = field(default_factory=list)
+    stale: list[AccessPair] = field(default_factory=list)
+    mismatched: list[AccessPair] = field(default_factory=list)
+    repaired: int = 0
+
+    @property
+    def consistent(self) -> bool:
+        return not (self.missing or self.stale or self.mismatched)
+
+    def to_dict(self, *, sample_size: int = 20) -> dict[str, Any]:
+        return {
+            "expected": self.expected,
+            "indexed": self.indexed,
+            "missing": len(self.missing),
+            "stale": len(self.stale),
+            "mismatched": len(self.mismatched),
+            "repaired": self.repaired,
+            "consistent": self.consistent,
+            "samples": {
+                "missing": [list(pair) for pair in self.missing[:sample_size]],
+                "stale": [list(pair) for pair in self.stale[:sample_size]],
+                "mismatched": [list(pair) for pair in self.mismatched[:sample_size]],
+            },
+        }
+
+
+async def check_quiz_access_index(
+    reference_repository: ReferenceV2Repository,
+    *,
+    repair: bool = False,
+) -> QuizAccessIndexReport:
+    """Compare ``quiz_access_v2`` with the references it is derived from.
+
+    ``missing`` pairs have a reference but no index row, ``stale`` rows have
+    no reference left and ``mismatched`` rows list the wrong sources. With
+    ``repair`` the index is rewritten to match, which is also how it is
+    backfilled; rows a reference write refreshed during the scan are newer
+    than it and are left alone.
+    """
+    access_repository = reference_repository.quiz_access_repository
+    if access_repository is None:
+        raise ValueError("The reference repository has no quiz access collection configured.")
+
+    read_at = datetime.utcnow()
+    expected = await reference_repository.list_all_quiz_access_sources()
+    indexed = await access_repository.list_all()
+    report = QuizAccessIndexReport(expected=len(expected), indexed=len(indexed))
+    for pair, sources in expected.items():
+        if pair not in indexed:
+            report.missing.append(pair)
+        elif sorted(indexed[pair]) != sources:
+            report.mismatched.append(pair)
+    report.stale = [pair for pair in indexed if pair not in expected]
+
+    if repair and not report.consistent:
+        report.repaired = await access_repository.apply_changes(
+            {pair: expected[pair] for pair in report.missing + report.mismatched},
+            report.stale,
+            read_at=read_at,
+        )
+    return report
+
+
+async def backfill_quiz_access_index(reference_repository: ReferenceV2Repository) -> QuizAccessIndexReport:
+    return await check_quiz_access_index(reference_repository, repair=True)
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from server.app.core.config import settings
+from server.app.db.core.redis import get_redis_client
+from server.app.quiz.repositories.v2.models.quiz_models import quiz_version
+from server.app.quiz.utils.batch_grading import GRADING_SOURCES, clean_answer
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_true_false(value: Any) -> str:
+    text = str(value).strip().lower()
+    if text in {"1", "true"}:
+        return "true"
+    if text in {"0", "false"}:
+        return "false"
+    return text
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledAnswerKey:
+    """Everything grading needs from a quiz, prepared once per quiz version.
+
+    ``question_indexes`` maps each question's text to its position, so a
+    submitted question is found with one hash lookup. ``correct_answers``
+    holds, per grading source, the correct answers already canonicalized for
+    true/false quizzes and cleaned the way ``grade_batch`` would clean them.
+    """
+
+    quiz_id: str
+    version: str
+    quiz_type: str
+    question_indexes: dict[str, int]
+    correct_answers: dict[str, tuple[str, ...]]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "CompiledAnswerKey":
+        payload = json.loads(raw)
+        payload["correct_answers"] = {
+            source: tuple(answers) for source, answers in payload["correct_answers"].items()
+        }
+        return cls(**payload)
+
+
+def compile_answer_key(
+    quiz_id: str,
+    version: str,
+    quiz_type: str,
+    questions: list[dict[str, Any]],
+) -> CompiledAnswerKey:
+    """Compile ``{question, correct_answer}`` pairs; a repeated question keeps its last answer."""
+    canonical = [
+        normalize_true_false(question["correct_answer"]) if quiz_type == "true-false"
+        else question["correct_answer"]
+        for question in questions
+    ]
+    correct_answers = {}
+    for source in GRADING_SOURCES:
+        if source == "ai" and quiz_type.strip().lower() == "true-false":
+            # The AI grader compares true/false answers as given.
+            correct_answers[source] = tuple(canonical)
+        else:
+            correct_answers[source] = tuple(clean_answer(answer, source) for answer in canonical)
+    return CompiledAnswerKey(
+        quiz_id=quiz_id,
+        version=version,
+        quiz_type=quiz_type,
+        question_indexes={
+            question["question"]: index for index, question in enumerate(questions)
+        },
+        correct_answers=correct_answers,
+    )
+
+
+def compile_quiz_document(document: dict[str, Any]) -> CompiledAnswerKey:
+    """Compile a raw quiz document, without validating it into a model."""
+    quiz_type = document["quiz_type"]
+    return compile_answer_key(
+        str(document["_id"]),
+        quiz_version(document.get("updated_at")),
+        str(getattr(quiz_type, "value", quiz_type)),
+        [
+            {
+                "question": question["question"],
+                "correct_answer": question.get("correct_answer", question.get("answer")),
+            }
+            for question in document.get("questions") or []
+        ],
+    )
+
+
+@dataclass
+class QuizAnswerKeyCacheStats:
+    memory_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    redis_errors: int = 0
+    corrupt_entries: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class QuizAnswerKeyCache:
+    """Bounded in-process LRU of compiled answer keys in front of Redis.
+
+    Entries are keyed by quiz id and version (the quiz's ``updated_at``), so
+    an edited quiz is compiled afresh and old versions simply age out. Redis
+    failures are logged and treated as misses, and so is a Redis value that
+    no longer decodes.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl_seconds: int = 24 * 60 * 60,
+        redis_client_factory: Optional[Callable[[], Awaitable[Any]]] = get_redis_client,
+    ):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._redis_client_factory = redis_client_factory
+        self._entries: OrderedDict[str, CompiledAnswerKey] = OrderedDict()
+        self.stats = QuizAnswerKeyCacheStats()
+
+    @staticmethod
+    def _key(quiz_id: str, version: str) -> str:
+        return f"{quiz_id}:{version}"
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"quiz-answer-key:{key}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, answer_key: CompiledAnswerKey) -> None:
+        key = self._key(answer_key.quiz_id, answer_key.version)
+        self._entries[key] = answer_key
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compile(
+        self,
+        quiz_id: str,
+        version: str,
+        loader: Callable[[], Awaitable[Optional[dict[str, Any]]]],
+    ) -> Optional[CompiledAnswerKey]:
+        """Return the answer key for this quiz version, compiling ``loader``'s document on a miss.
+
+        The compiled key carries the loaded document's own version, which is
+        newer than ``version`` if the quiz changed in between.
+        """
+        key = self._key(quiz_id, version)
+        answer_key = self._entries.get(key)
+        if answer_key is not None:
+            self._entries.move_to_end(key)
+            self.stats.memory_hits += 1
+            return answer_key
+
+        if self._redis_client_factory is not None:
+            try:
+                redis_client = await self._redis_client_factory()
+                raw = await redis_client.get(self._redis_key(key))
+            except Exception as exc:
+                self.stats.redis_errors += 1
+                logger.warning("Answer key cache read failed for %s: %s", key, exc)
+                raw = None
+            if raw:
+                try:
+                    answer_key = CompiledAnswerKey.from_json(raw)
+                except (ValueError, KeyError, TypeError, AttributeError) as exc:
+                    # Recompiling below overwrites the bad value.
+                    self.stats.corrupt_entries += 1
+                    logger.warning("Discarding unreadable answer key cache entry %s: %s", key, exc)
+                else:
+                    self._remember(answer_key)
+                    self.stats.redis_hits += 1
+                    return answer_key
+
+        self.stats.misses += 1
+        document = await loader()
+        if not document:
+            return None
+        answer_key = compile_quiz_document(document)
+        self._remember(answer_key)
+        await self._store(answer_key)
+        return answer_key
+
+    async def _store(self, answer_key: CompiledAnswerKey) -> None:
+        if self._redis_client_factory is None:
+            return
+        key = self._key(answer_key.quiz_id, answer_key.version)
+        try:
+            redis_client = await self._redis_client_factory()
+            await redis_client.set(self._redis_key(key), answer_key.to_json(), ex=self._ttl_seconds)
+        except Exception as exc:
+            self.stats.redis_errors += 1
+            logger.warning("Answer key cache write failed for %s: %s", key, exc)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_cache: Optional[QuizAnswerKeyCache] = None
+
+
+def get_quiz_answer_key_cache() -> QuizAnswerKeyCache:
+    global _cache
+    if _cache is None:
+        _cache = QuizAnswerKeyCache(
+            max_entries=settings.QUIZ_ANSWER_KEY_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.QUIZ_ANSWER_KEY_CACHE_TTL_SECONDS,
+        )
+    return _cache
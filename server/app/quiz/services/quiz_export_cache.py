@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+from collections import Counter, OrderedDict
+from concurrent.futures import Executor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from stat import S_ISREG
+from typing import Any, BinaryIO, Callable, Optional
+
+from server.app.core.config import settings
+from server.app.quiz.repositories.v2.models.quiz_models import quiz_version
+from server.app.quiz.utils.render_export import (
+    EXPORT_MEDIA_TYPES,
+    get_export_pool,
+    render_export_file,
+)
+from server.app.quiz.utils.single_flight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the generators change what a quiz renders to, so old files are not served.
+EXPORT_RENDER_VERSION = 1
+
+
+def export_cache_key(content_fingerprint: str, updated_at: Optional[datetime], file_format: str) -> str:
+    """Cache key of a stored quiz's export.
+
+    ``content_fingerprint`` is set when the quiz is created and is not
+    recomputed by metadata or question edits, so the quiz's version is part
+    of the key as well.
+    """
+    source = f"{EXPORT_RENDER_VERSION}:{content_fingerprint}:{quiz_version(updated_at)}:{file_format}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def export_etag(key: str) -> str:
+    """The strong ETag of the export cached under ``key``; known before it is rendered."""
+    return f'"{key}"'
+
+
+@dataclass(frozen=True, slots=True)
+class CachedQuizExport:
+    path: Path
+    media_type: str
+    size: int
+    etag: str
+
+
+@dataclass
+class QuizExportCacheStats:
+    hits: int = 0
+    renders: int = 0
+    shared_renders: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class QuizExportCache:
+    """Rendered quiz exports on local disk, named by ``export_cache_key`` and evicted least recently used.
+
+    Files are rendered by ``render_export_file`` in ``executor`` (the shared
+    export process pool by default), and concurrent requests for the same
+    export share one render. A hit touches the file's mtime, so mtime order
+    is the recency order of every worker sharing ``directory``: each render
+    rescans the directory before evicting, and a file another worker rendered
+    is adopted on its first request here. Exports fetched with ``pin=True``
+    are not evicted by this worker until ``release``d; ``open`` also hands
+    back a descriptor, which keeps reading after another worker unlinks the
+    file.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        max_bytes: int,
+        executor: Optional[Executor] = None,
+        executor_factory: Callable[[], Executor] = lambda: get_export_pool(settings.QUIZ_EXPORT_WORKERS),
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._executor = executor
+        self._executor_factory = executor_factory
+        self._entries: Optional[OrderedDict[str, int]] = None
+        self._pinned: Counter[str] = Counter()
+        self._renders: SingleFlight[int] = SingleFlight()
+        self.stats = QuizExportCacheStats()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self._index().values())
+
+    def _index(self, rescan: bool = False) -> OrderedDict[str, int]:
+        if self._entries is None or rescan:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # mtimes only tick every few milliseconds; within one tick, keep this worker's own order.
+            positions = {name: index for index, name in enumerate(self._entries or ())}
+            files = []
+            for path in self.directory.iterdir():
+                if path.name.startswith("."):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if not S_ISREG(stat.st_mode):
+                    continue
+                files.append((stat.st_mtime_ns, positions.get(path.name, -1), path.name, stat.st_size))
+            self._entries = OrderedDict((name, size) for _, _, name, size in sorted(files))
+        return self._entries
+
+    def _export(self, name: str, file_format: str) -> CachedQuizExport:
+        return CachedQuizExport(
+            path=self.directory / name,
+            media_type=EXPORT_MEDIA_TYPES[file_format],
+            size=self._index()[name],
+            etag=export_etag(name.partition(".")[0]),
+        )
+
+    def _evict(self, keep: Optional[str] = None, rescan: bool = False) -> None:
+        entries = self._index(rescan)
+        total = sum(entries.values())
+        for name in list(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep or self._pinned[name]:
+                continue
+            total -= entries.pop(name)
+            (self.directory / name).unlink(missing_ok=True)
+            self.stats.evictions += 1
+
+    async def get_or_render(
+        self,
+        key: str,
+        file_format: str,
+        payload: dict[str, Any],
+        *,
+        pin: bool = False,
+    ) -> CachedQuizExport:
+        """The cached export for ``key``, rendered from ``payload`` first if it is not on disk."""
+        name = f"{key}.{file_format}"
+        entries = self._index()
+        path = self.directory / name
+        try:
+            os.utime(path)
+            size = path.stat().st_size
+        except FileNotFoundError:
+            entries.pop(name, None)
+        else:
+            entries[name] = size
+            entries.move_to_end(name)
+            self.stats.hits += 1
+            return self._checkout(name, file_format, pin)
+
+        _, shared = await self._renders.run(name, lambda: self._render(name, file_format, payload))
+        if shared:
+            self.stats.shared_renders += 1
+        if name not in self._index():
+            # Another render finished and evicted this one before this caller resumed.
+            return await self.get_or_render(key, file_format, payload, pin=pin)
+        return self._checkout(name, file_format, pin)
+
+    async def open(
+        self,
+        key: str,
+        file_format: str,
+        payload: dict[str, Any],
+    ) -> tuple[CachedQuizExport, BinaryIO]:
+        """The pinned export for ``key`` and the file opened for reading.
+
+        The caller closes the file and ``release``s the export once it is sent.
+        """
+        while True:
+            export = await self.get_or_render(key, file_format, payload, pin=True)
+            try:
+                return export, open(export.path, "rb")
+            except FileNotFoundError:
+                # Another worker evicted it between the render and the open.
+                self._index().pop(export.path.name, None)
+                self.release(export)
+
+    def _checkout(self, name: str, file_format: str, pin: bool) -> CachedQuizExport:
+        if pin:
+            self._pinned[name] += 1
+        return self._export(name, file_format)
+
+    def release(self, export: CachedQuizExport) -> None:
+        """Unpin an export fetched with ``pin=True`` once its response is sent."""
+        name = export.path.name
+        self._pinned[name] -= 1
+        if self._pinned[name] <= 0:
+            del self._pinned[name]
+            self._evict()
+
+    async def _render(self, name: str, file_format: str, payload: dict[str, Any]) -> int:
+        executor = self._executor or self._executor_factory()
+        loop = asyncio.get_running_loop()
+        size = await loop.run_in_executor(
+            executor,
+            render_export_file,
+            payload,
+            file_format,
+            str(self.directory / name),
+        )
+        self.stats.renders += 1
+        entries = self._index()
+        entries[name] = size
+        entries.move_to_end(name)
+        self._evict(keep=name, rescan=True)
+        logger.info("rendered quiz export %s (%d bytes)", name, size)
+        return size
+
+
+quiz_export_cache = QuizExportCache(
+    settings.QUIZ_EXPORT_CACHE_DIR,
+    max_bytes=settings.QUIZ_EXPORT_CACHE_MAX_BYTES,
+)
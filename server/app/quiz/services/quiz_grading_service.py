@@ -6,70 +6,87 @@ only in the grading response, after submission.
 """
 from typing import Any, Optional
 
+from fastapi import HTTPException
+
 from server.app.db.core.connection import (
     get_folder_items_v2_collection,
     get_folders_v2_collection,
+    get_quiz_access_v2_collection,
     get_quiz_history_v2_collection,
     get_quizzes_v2_collection,
     get_saved_quizzes_v2_collection,
 )
-from server.app.quiz.repositories.v2.models.quiz_models import QuizDocumentV2
 from server.app.quiz.repositories.v2.repositories.quiz_repository import QuizV2Repository
 from server.app.quiz.repositories.v2.repositories.reference_repository import ReferenceV2Repository
-from server.app.quiz.utils.grading import grade_answers
+from server.app.quiz.services.quiz_answer_key_cache import (
+    CompiledAnswerKey,
+    QuizAnswerKeyCache,
+    compile_answer_key,
+    get_quiz_answer_key_cache,
+    normalize_true_false,
+)
+from server.app.quiz.utils.batch_grading import GRADING_SOURCES, grade_batch
 
 
 class SubmissionMismatchError(ValueError):
     """A submitted answer does not correspond to a question in the quiz."""
 
 
-def _normalize_true_false(value: Any) -> str:
-    text = str(value).strip().lower()
-    if text in {"1", "true"}:
-        return "true"
-    if text in {"0", "false"}:
-        return "false"
-    return text
-
-
-def grade_against_stored_questions(
-    stored_questions: list[dict[str, Any]],
+def grade_against_answer_key(
+    answer_key: CompiledAnswerKey,
     submitted_answers: list[dict[str, Any]],
     *,
-    quiz_type: str,
     source: str = "mock",
 ) -> list[dict[str, Any]]:
-    """Grade submitted {question, user_answer} pairs against stored questions.
+    """Grade submitted {question, user_answer} pairs against a compiled answer key.
 
     Raises SubmissionMismatchError when a submitted question is not part of
-    the stored quiz.
+    the quiz.
     """
-    questions_by_text = {q["question"]: q for q in stored_questions}
+    if source not in GRADING_SOURCES:
+        raise HTTPException(status_code=400, detail="Invalid quiz source. Must be 'mock' or 'ai'.")
+    true_false = answer_key.quiz_type == "true-false"
+    correct_answers = answer_key.correct_answers[source]
 
     grading_payload = []
     for submitted in submitted_answers:
-        stored = questions_by_text.get(submitted.get("question"))
-        if stored is None:
+        question = submitted.get("question")
+        index = answer_key.question_indexes.get(question) if isinstance(question, str) else None
+        if index is None:
             raise SubmissionMismatchError(
                 "Submitted answers do not match this quiz's questions."
             )
 
         user_answer = submitted.get("user_answer")
-        correct_answer = stored["correct_answer"]
-        if quiz_type == "true-false":
-            user_answer = _normalize_true_false(user_answer)
-            correct_answer = _normalize_true_false(correct_answer)
+        if true_false:
+            user_answer = normalize_true_false(user_answer)
 
         grading_payload.append(
             {
-                "question": stored["question"],
+                "question": question,
                 "user_answer": user_answer,
-                "correct_answer": correct_answer,
-                "question_type": quiz_type,
+                "correct_answer": correct_answers[index],
+                "question_type": answer_key.quiz_type,
             }
         )
 
-    return grade_answers(grading_payload, source)
+    return grade_batch(grading_payload, source, clean_correct_answers=False).rows()
+
+
+def grade_against_stored_questions(
+    stored_questions: list[dict[str, Any]],
+    submitted_answers: list[dict[str, Any]],
+    *,
+    quiz_type: str,
+    source: str = "mock",
+) -> list[dict[str, Any]]:
+    """Grade submitted {question, user_answer} pairs against stored questions.
+
+    Raises SubmissionMismatchError when a submitted question is not part of
+    the stored quiz.
+    """
+    answer_key = compile_answer_key("", "", quiz_type, stored_questions)
+    return grade_against_answer_key(answer_key, submitted_answers, source=source)
 
 
 class QuizGradingService:
@@ -78,6 +95,7 @@ class QuizGradingService:
         *,
         quiz_repository: Optional[QuizV2Repository] = None,
         reference_repository: Optional[ReferenceV2Repository] = None,
+        answer_keys: Optional[QuizAnswerKeyCache] = None,
     ):
         self.quiz_repository = (
             quiz_repository
@@ -92,16 +110,26 @@ class QuizGradingService:
                 get_folder_items_v2_collection(),
                 get_saved_quizzes_v2_collection(),
                 get_quiz_history_v2_collection(),
+                get_quiz_access_v2_collection(),
             )
         )
+        self.answer_keys = answer_keys if answer_keys is not None else get_quiz_answer_key_cache()
 
-    async def _resolve_quiz(self, quiz_id: str) -> Optional[QuizDocumentV2]:
-        quiz_doc = await self.quiz_repository.find_by_id(quiz_id)
-        if not quiz_doc:
+    async def _answer_key(self, quiz_id: str) -> Optional[CompiledAnswerKey]:
+        version = await self.quiz_repository.find_version(quiz_id)
+        if version is None:
             saved_reference = await self.reference_repository.get_saved_quiz_by_public_id(quiz_id)
-            if saved_reference:
-                quiz_doc = await self.quiz_repository.find_by_id(saved_reference.quiz_id)
-        return quiz_doc
+            if not saved_reference:
+                return None
+            quiz_id = saved_reference.quiz_id
+            version = await self.quiz_repository.find_version(quiz_id)
+            if version is None:
+                return None
+        return await self.answer_keys.get_or_compile(
+            quiz_id,
+            version,
+            lambda: self.quiz_repository.find_answer_key_document(quiz_id),
+        )
 
     async def grade_submission(
         self,
@@ -110,21 +138,12 @@ class QuizGradingService:
         *,
         source: str = "mock",
     ) -> Optional[list[dict[str, Any]]]:
-        """Returns graded results, or None when the quiz does not exist."""
-        quiz_doc = await self._resolve_quiz(quiz_id)
-        if quiz_doc is None:
-            return None
+        """Returns graded results, or None when the quiz does not exist.
 
-        stored_questions = [
-            {
-                "question": question.question,
-                "correct_answer": question.correct_answer,
-            }
-            for question in quiz_doc.questions
-        ]
-        return grade_against_stored_questions(
-            stored_questions,
-            submitted_answers,
-            quiz_type=quiz_doc.quiz_type.value,
-            source=source,
-        )
+        The quiz is read as its ``updated_at`` alone; its questions come from
+        the compiled answer key cached for that version.
+        """
+        answer_key = await self._answer_key(quiz_id)
+        if answer_key is None:
+            return None
+        return grade_against_answer_key(answer_key, submitted_answers, source=source)
@@ -1,16 +1,20 @@
+from collections import defaultdict
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
+from server.app.core.config import settings
 from server.app.db.core.connection import (
     get_folder_items_v2_collection,
     get_folders_v2_collection,
+    get_quiz_access_v2_collection,
     get_quiz_history_v2_collection,
     get_quizzes_v2_collection,
     get_saved_quizzes_v2_collection,
 )
 from server.app.quiz.repositories.v2.models.quiz_models import QuizDocumentV2
+from server.app.quiz.repositories.v2.models.quiz_summary_models import QuizSummaryV2
 from server.app.quiz.repositories.v2.models.reference_models import (
     FolderDocumentV2,
     FolderItemDocumentV2,
@@ -25,6 +29,7 @@ from server.app.quiz.schemas.quiz_management_schemas import (
     SavedQuizResponse,
 )
 from server.app.quiz.services.canonical_quiz_service import CanonicalQuizWriteService
+from server.app.quiz.services.quiz_access_index import QuizAccessIndexReport, backfill_quiz_access_index
 
 
 class QuizUserLibraryService:
@@ -42,6 +47,7 @@ class QuizUserLibraryService:
             get_folder_items_v2_collection(),
             get_saved_quizzes_v2_collection(),
             get_quiz_history_v2_collection(),
+            get_quiz_access_v2_collection(),
         )
 
     @staticmethod
@@ -49,7 +55,7 @@ class QuizUserLibraryService:
         return value.isoformat() if isinstance(value, datetime) else value
 
     @staticmethod
-    def _quiz_type(quiz: QuizDocumentV2) -> str:
+    def _quiz_type(quiz: QuizDocumentV2 | QuizSummaryV2) -> str:
         return quiz.quiz_type.value if hasattr(quiz.quiz_type, "value") else str(quiz.quiz_type)
 
     @staticmethod
@@ -75,10 +81,54 @@ class QuizUserLibraryService:
             for question in quiz.questions
         ]
 
+    @staticmethod
+    def _question_fields(
+        quiz: QuizDocumentV2 | QuizSummaryV2,
+        build_questions: Callable[[QuizDocumentV2], list[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """``questions`` for a full quiz, ``question_count`` for a summary row."""
+        if isinstance(quiz, QuizSummaryV2):
+            return {"question_count": quiz.question_count}
+        return {"questions": build_questions(quiz)}
+
+    @staticmethod
+    def _folder_item_sort_key(item: FolderItemDocumentV2) -> tuple[int, datetime]:
+        return (item.position if item.position is not None else 10**9, item.created_at)
+
+    @staticmethod
+    def _folder_item_title(
+        item: FolderItemDocumentV2,
+        saved_reference: SavedQuizDocumentV2 | None,
+        quiz_title: str,
+    ) -> str:
+        if saved_reference and saved_reference.display_title:
+            return saved_reference.display_title
+        return item.display_title or quiz_title
+
+    @staticmethod
+    def _title_similarities(query: str, titles: list[str]) -> list[float]:
+        """``max(partial_ratio, token_set_ratio)`` of ``query`` against each title, one extract pass per scorer."""
+        scores = [0.0] * len(titles)
+        for scorer in (fuzz.partial_ratio, fuzz.token_set_ratio):
+            for _, score, index in process.extract(query, titles, scorer=scorer, limit=None):
+                scores[index] = max(scores[index], score)
+        return scores
+
     async def _get_quizzes_by_ids(self, quiz_ids: list[str]) -> dict[str, QuizDocumentV2]:
         quizzes = await self.quiz_repository.find_many_by_ids(quiz_ids)
         return {str(quiz.id): quiz for quiz in quizzes}
 
+    async def _get_listed_quizzes_by_ids(
+        self,
+        quiz_ids: list[str],
+        *,
+        summary: bool,
+    ) -> dict[str, QuizDocumentV2 | QuizSummaryV2]:
+        if not summary:
+            return await self._get_quizzes_by_ids(quiz_ids)
+        summaries = await self.quiz_repository.find_summaries_by_ids(quiz_ids)
+        return {quiz.id: quiz for quiz in summaries}
+
     async def get_owned_or_library_quiz(
         self,
         *,
@@ -92,6 +142,12 @@ class QuizUserLibraryService:
         if quiz.owner_user_id == user_id:
             return quiz
 
+        access_repository = self.reference_repository.quiz_access_repository
+        if access_repository is not None and settings.QUIZ_ACCESS_INDEX_READS_ENABLED:
+            if await access_repository.has_access(user_id, quiz_id):
+                return quiz
+            # A row the index is missing must not deny access; confirm against the references.
+
         saved_references = await self.reference_repository.list_saved_quizzes_for_user(
             user_id,
             limit=1000,
@@ -160,7 +216,7 @@ class QuizUserLibraryService:
     def _build_saved_payload(
         self,
         reference: SavedQuizDocumentV2,
-        quiz: QuizDocumentV2,
+        quiz: QuizDocumentV2 | QuizSummaryV2,
     ) -> dict[str, Any]:
         return {
             "_id": str(reference.id),
@@ -170,10 +226,27 @@ class QuizUserLibraryService:
             "title": reference.display_title or quiz.title,
             "question_type": self._quiz_type(quiz),
             "is_deleted": False,
-            "questions": self._saved_questions(quiz),
+            **self._question_fields(quiz, self._saved_questions),
             "created_at": self._isoformat(reference.saved_at),
         }
 
+    def _build_folder_item_payload(
+        self,
+        item: FolderItemDocumentV2,
+        quiz: QuizDocumentV2 | QuizSummaryV2,
+        saved_reference: SavedQuizDocumentV2 | None,
+    ) -> dict[str, Any]:
+        return {
+            "id": str(item.id),
+            "quiz_id": str(quiz.id),
+            "saved_quiz_id": item.saved_quiz_id,
+            "title": self._folder_item_title(item, saved_reference, quiz.title),
+            "question_type": self._quiz_type(quiz),
+            **self._question_fields(quiz, self._saved_questions),
+            "created_at": self._isoformat(item.created_at),
+            "added_on": self._isoformat(item.created_at),
+        }
+
     async def create_saved_quiz(
         self,
         *,
@@ -200,10 +273,19 @@ class QuizUserLibraryService:
             revive_deleted=True,
         )
 
-    async def list_saved_quizzes(self, *, user_id: str, limit: int = 100) -> list[dict[str, Any]]:
+    async def list_saved_quizzes(
+        self,
+        *,
+        user_id: str,
+        limit: int = 100,
+        summary: bool = False,
+    ) -> list[dict[str, Any]]:
         references = await self.reference_repository.list_saved_quizzes_for_user(user_id, limit=limit)
         references = sorted(references, key=lambda reference: reference.saved_at, reverse=True)
-        quizzes_by_id = await self._get_quizzes_by_ids([reference.quiz_id for reference in references])
+        quizzes_by_id = await self._get_listed_quizzes_by_ids(
+            [reference.quiz_id for reference in references],
+            summary=summary,
+        )
         return [
             self._build_saved_payload(reference, quizzes_by_id[reference.quiz_id])
             for reference in references
@@ -299,10 +381,19 @@ class QuizUserLibraryService:
             )
         )
 
-    async def list_quiz_history_items(self, *, user_id: str, limit: int = 100) -> list[dict[str, Any]]:
+    async def list_quiz_history_items(
+        self,
+        *,
+        user_id: str,
+        limit: int = 100,
+        summary: bool = False,
+    ) -> list[dict[str, Any]]:
         references = await self.reference_repository.list_quiz_history_for_user(user_id, limit=limit)
         references = sorted(references, key=lambda reference: reference.created_at, reverse=True)
-        quizzes_by_id = await self._get_quizzes_by_ids([reference.quiz_id for reference in references])
+        quizzes_by_id = await self._get_listed_quizzes_by_ids(
+            [reference.quiz_id for reference in references],
+            summary=summary,
+        )
         items: list[dict[str, Any]] = []
         for reference in references:
             quiz = quizzes_by_id.get(reference.quiz_id)
@@ -321,7 +412,7 @@ class QuizUserLibraryService:
                     "profession": metadata.get("topic") or quiz.title,
                     "audience_type": metadata.get("audience_type"),
                     "custom_instruction": metadata.get("custom_instruction"),
-                    "questions": self._history_questions(quiz),
+                    **self._question_fields(quiz, self._history_questions),
                 }
             )
         return items
@@ -373,9 +464,12 @@ class QuizUserLibraryService:
 
     async def list_folders(self, *, user_id: str) -> list[dict[str, Any]]:
         folders = await self.reference_repository.list_folders_for_user(user_id)
+        item_ids_by_folder = await self.reference_repository.list_folder_item_ids_by_folder(
+            [str(folder.id) for folder in folders]
+        )
         payloads: list[dict[str, Any]] = []
         for folder in sorted(folders, key=lambda item: (item.created_at, str(item.id))):
-            items = await self.reference_repository.list_folder_items_for_folder(str(folder.id))
+            item_ids = item_ids_by_folder.get(str(folder.id), [])
             payloads.append(
                 {
                     "id": str(folder.id),
@@ -383,20 +477,26 @@ class QuizUserLibraryService:
                     "name": folder.name,
                     "created_at": self._isoformat(folder.created_at),
                     "updated_at": self._isoformat(folder.updated_at),
-                    "quizzes": [{"id": str(item.id)} for item in items],
-                    "quiz_count": len(items),
+                    "quizzes": [{"id": item_id} for item_id in item_ids],
+                    "quiz_count": len(item_ids),
                 }
             )
         return payloads
 
-    async def get_folder(self, *, folder_id: str, user_id: str) -> dict[str, Any] | None:
+    async def get_folder(
+        self,
+        *,
+        folder_id: str,
+        user_id: str,
+        summary: bool = False,
+    ) -> dict[str, Any] | None:
         folder = await self.reference_repository.get_folder_by_public_id(folder_id)
         if folder is None:
             return None
         if folder.user_id != user_id:
             raise PermissionError("Unauthorized access to folder")
         items = await self.reference_repository.list_folder_items_for_folder(str(folder.id))
-        quizzes_by_id = await self._get_quizzes_by_ids([item.quiz_id for item in items])
+        quizzes_by_id = await self._get_listed_quizzes_by_ids([item.quiz_id for item in items], summary=summary)
         saved_quizzes_by_id = await self._get_saved_quizzes_by_ids(
             [
                 item.saved_quiz_id
@@ -406,27 +506,12 @@ class QuizUserLibraryService:
             user_id=user_id,
         )
         quiz_items = []
-        for item in sorted(items, key=lambda value: (value.position if value.position is not None else 10**9, value.created_at)):
+        for item in sorted(items, key=self._folder_item_sort_key):
             quiz = quizzes_by_id.get(item.quiz_id)
             if quiz is None:
                 continue
             saved_reference = saved_quizzes_by_id.get(item.saved_quiz_id or "")
-            quiz_items.append(
-                {
-                    "id": str(item.id),
-                    "quiz_id": str(quiz.id),
-                    "saved_quiz_id": item.saved_quiz_id,
-                    "title": (
-                        saved_reference.display_title
-                        if saved_reference and saved_reference.display_title
-                        else item.display_title or quiz.title
-                    ),
-                    "question_type": self._quiz_type(quiz),
-                    "questions": self._saved_questions(quiz),
-                    "created_at": self._isoformat(item.created_at),
-                    "added_on": self._isoformat(item.created_at),
-                }
-            )
+            quiz_items.append(self._build_folder_item_payload(item, quiz, saved_reference))
         return {
             "id": str(folder.id),
             "user_id": folder.user_id,
@@ -436,6 +521,31 @@ class QuizUserLibraryService:
             "quizzes": quiz_items,
         }
 
+    async def get_folder_item(
+        self,
+        *,
+        folder_id: str,
+        folder_item_id: str,
+        user_id: str,
+    ) -> dict[str, Any] | None:
+        """One folder item with its questions, for clients that listed the folder in summary mode."""
+        folder = await self.reference_repository.get_folder_by_public_id(folder_id)
+        if folder is None:
+            return None
+        if folder.user_id != user_id:
+            raise PermissionError("Unauthorized access to folder")
+        item = await self.reference_repository.get_folder_item_by_public_id(folder_item_id)
+        if item is None or item.folder_id != str(folder.id):
+            return None
+        quiz = await self.quiz_repository.find_by_id(item.quiz_id)
+        if quiz is None:
+            return None
+        saved_reference = None
+        if item.saved_quiz_id:
+            saved_quizzes_by_id = await self._get_saved_quizzes_by_ids([item.saved_quiz_id], user_id=user_id)
+            saved_reference = saved_quizzes_by_id.get(item.saved_quiz_id)
+        return self._build_folder_item_payload(item, quiz, saved_reference)
+
     async def get_folder_by_name(self, *, user_id: str, name: str) -> dict[str, Any] | None:
         normalized_name = name.strip().casefold()
         folders = await self.reference_repository.list_folders_for_user(user_id)
@@ -445,33 +555,59 @@ class QuizUserLibraryService:
         return None
 
     async def find_quiz_in_folders_by_title(self, *, user_id: str, title: str) -> dict[str, Any]:
+        """Fuzzy-match ``title`` across every folder item the user has.
+
+        Items, quiz titles and saved references are each read in one batch and
+        scored in a single pass; full quizzes are loaded only for the matches.
+        """
         normalized_title = title.strip().casefold()
-        matches: list[dict[str, Any]] = []
         folders = await self.reference_repository.list_folders_for_user(user_id)
+        items = await self.reference_repository.list_folder_items_for_folders([str(folder.id) for folder in folders])
+        items_by_folder: dict[str, list[FolderItemDocumentV2]] = defaultdict(list)
+        for item in items:
+            items_by_folder[item.folder_id].append(item)
+        quiz_titles = await self.quiz_repository.find_titles_by_ids(list(dict.fromkeys(item.quiz_id for item in items)))
+        saved_quizzes_by_id = await self._get_saved_quizzes_by_ids(
+            [item.saved_quiz_id for item in items if item.saved_quiz_id],
+            user_id=user_id,
+        )
+
+        candidates: list[tuple[FolderDocumentV2, FolderItemDocumentV2, str]] = []
         for folder in folders:
-            folder_payload = await self.get_folder(folder_id=str(folder.id), user_id=user_id)
-            if not folder_payload:
-                continue
-            for quiz in folder_payload.get("quizzes", []):
-                quiz_title = str(quiz.get("title") or "")
-                normalized_quiz_title = quiz_title.casefold()
-                similarity = max(
-                    fuzz.partial_ratio(normalized_title, normalized_quiz_title),
-                    fuzz.token_set_ratio(normalized_title, normalized_quiz_title),
+            for item in sorted(items_by_folder[str(folder.id)], key=self._folder_item_sort_key):
+                quiz_title = quiz_titles.get(item.quiz_id)
+                if quiz_title is None:
+                    continue
+                saved_reference = saved_quizzes_by_id.get(item.saved_quiz_id or "")
+                candidates.append(
+                    (folder, item, str(self._folder_item_title(item, saved_reference, quiz_title.get("title")) or ""))
                 )
-                if normalized_title in normalized_quiz_title or similarity >= 85:
-                    matches.append(
-                        {
-                            "folder_id": folder_payload["id"],
-                            "folder_name": folder_payload["name"],
-                            "folder_item_id": quiz.get("id"),
-                            "quiz_id": quiz.get("quiz_id"),
-                            "title": quiz_title,
-                            "question_type": quiz.get("question_type"),
-                            "questions": quiz.get("questions") or [],
-                            "match_score": similarity,
-                        }
-                    )
+        normalized_titles = [candidate_title.casefold() for _, _, candidate_title in candidates]
+        similarities = self._title_similarities(normalized_title, normalized_titles)
+        matched = [
+            (candidate, similarity)
+            for candidate, normalized_quiz_title, similarity in zip(candidates, normalized_titles, similarities)
+            if normalized_title in normalized_quiz_title or similarity >= 85
+        ]
+
+        quizzes_by_id = await self._get_quizzes_by_ids([item.quiz_id for (_, item, _), _ in matched])
+        matches: list[dict[str, Any]] = []
+        for (folder, item, quiz_title), similarity in matched:
+            quiz = quizzes_by_id.get(item.quiz_id)
+            if quiz is None:
+                continue
+            matches.append(
+                {
+                    "folder_id": str(folder.id),
+                    "folder_name": folder.name,
+                    "folder_item_id": str(item.id),
+                    "quiz_id": str(quiz.id),
+                    "title": quiz_title,
+                    "question_type": self._quiz_type(quiz),
+                    "questions": self._saved_questions(quiz),
+                    "match_score": similarity,
+                }
+            )
         return {
             "query": title,
             "found": bool(matches),
@@ -569,3 +705,11 @@ class QuizUserLibraryService:
 
     async def backfill_folder_item_saved_quiz_ids(self, *, limit: int = 100_000) -> int:
         return await self.reference_repository.backfill_folder_item_saved_quiz_ids(limit=limit)
+
+    async def backfill_quiz_access_index(self, *, only_if_empty: bool = False) -> QuizAccessIndexReport | None:
+        access_repository = self.reference_repository.quiz_access_repository
+        if access_repository is None:
+            return None
+        if only_if_empty and not await access_repository.is_empty():
+            return None
+        return await backfill_quiz_access_index(self.reference_repository)
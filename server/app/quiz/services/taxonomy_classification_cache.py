@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from server.app.core.config import settings
+from server.app.db.core.redis import get_redis_client
+from server.app.quiz.services.category_taxonomy_service import (
+    CONFIDENT_CLASSIFICATION_THRESHOLD,
+    TaxonomyClassification,
+    build_classification_text,
+    classify_quiz_taxonomy,
+    normalize_quiz_type,
+    normalize_text,
+)
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATUS_STORED_QUIZ = "stored_quiz"
+CACHE_STATUS_MEMORY = "memory"
+CACHE_STATUS_REDIS = "redis"
+CACHE_STATUS_MISS = "miss"
+
+
+@dataclass
+class TaxonomyClassificationCacheStats:
+    stored_quiz_hits: int = 0
+    memory_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    redis_errors: int = 0
+    corrupt_entries: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+def build_classification_cache_key(text: str, quiz_type: str) -> str:
+    normalized = f"{normalize_quiz_type(quiz_type)}\n{normalize_text(text)}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def is_cacheable_classification(classification: TaxonomyClassification | None) -> bool:
+    # A low-confidence deterministic fallback means the model was skipped or
+    # failed; caching it would keep the next save from asking again.
+    if classification is None:
+        return False
+    return classification.method == "ai" or classification.confidence >= CONFIDENT_CLASSIFICATION_THRESHOLD
+
+
+class TaxonomyClassificationCache:
+    """Bounded in-process LRU in front of a shared Redis tier.
+
+    Entries are keyed by quiz type plus the normalized classification text,
+    so the same topic worded with different casing or punctuation reuses one
+    classification. Redis failures are logged and treated as misses, and a
+    Redis value that no longer decodes is deleted and treated as a miss.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 2048,
+        ttl_seconds: int = 7 * 24 * 60 * 60,
+        redis_client_factory: Optional[Callable[[], Awaitable[Any]]] = get_redis_client,
+    ):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._redis_client_factory = redis_client_factory
+        self._entries: OrderedDict[str, TaxonomyClassification] = OrderedDict()
+        self.stats = TaxonomyClassificationCacheStats()
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"quiz-classification:{key}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, classification: TaxonomyClassification) -> None:
+        self._entries[key] = classification
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> tuple[TaxonomyClassification | None, str]:
+        classification = self._entries.get(key)
+        if classification is not None:
+            self._entries.move_to_end(key)
+            self.stats.memory_hits += 1
+            return classification, CACHE_STATUS_MEMORY
+
+        if self._redis_client_factory is not None:
+            try:
+                redis_client = await self._redis_client_factory()
+                raw = await redis_client.get(self._redis_key(key))
+            except Exception as exc:
+                self.stats.redis_errors += 1
+                logger.warning("Classification cache read failed for %s: %s", key, exc)
+                raw = None
+            if raw:
+                classification = await self._decode(redis_client, key, raw)
+            if classification is not None:
+                self._remember(key, classification)
+                self.stats.redis_hits += 1
+                return classification, CACHE_STATUS_REDIS
+
+        self.stats.misses += 1
+        return None, CACHE_STATUS_MISS
+
+    async def _decode(self, redis_client: Any, key: str, raw: Any) -> TaxonomyClassification | None:
+        try:
+            payload = json.loads(raw)
+            return TaxonomyClassification(**{**payload, "tags": tuple(payload["tags"])})
+        except (ValueError, KeyError, TypeError) as exc:
+            self.stats.corrupt_entries += 1
+            logger.warning("Discarding unreadable classification cache entry %s: %s", key, exc)
+        try:
+            await redis_client.delete(self._redis_key(key))
+        except Exception as exc:
+            self.stats.redis_errors += 1
+            logger.warning("Classification cache delete failed for %s: %s", key, exc)
+        return None
+
+    async def set(self, key: str, classification: TaxonomyClassification) -> None:
+        self._remember(key, classification)
+        if self._redis_client_factory is None:
+            return
+        try:
+            redis_client = await self._redis_client_factory()
+            await redis_client.set(
+                self._redis_key(key),
+                json.dumps(asdict(classification)),
+                ex=self._ttl_seconds,
+            )
+        except Exception as exc:
+            self.stats.redis_errors += 1
+            logger.warning("Classification cache write failed for %s: %s", key, exc)
+
+
+async def classify_quiz_taxonomy_cached(
+    cache: TaxonomyClassificationCache,
+    *,
+    quiz_type: str,
+    title: str | None = None,
+    profession: str | None = None,
+    custom_instruction: str | None = None,
+    questions: list[Any] | None = None,
+    token: str | None = None,
+    token_loader: Optional[Callable[[], Awaitable[str | None]]] = None,
+    use_ai: bool = True,
+) -> tuple[TaxonomyClassification | None, str]:
+    """``classify_quiz_taxonomy`` behind the cache; also returns the cache status.
+
+    ``token_loader`` is only awaited on a miss, so hits skip the token lookup
+    as well as the model call.
+    """
+    text = build_classification_text(
+        title=title,
+        profession=profession,
+        custom_instruction=custom_instruction,
+        questions=questions,
+    )
+    key = build_classification_cache_key(text, quiz_type)
+    cached, status = await cache.get(key)
+    if cached is not None:
+        return cached, status
+
+    if not token and token_loader is not None:
+        token = await token_loader()
+    classification = await classify_quiz_taxonomy(
+        quiz_type=quiz_type,
+        title=title,
+        profession=profession,
+        custom_instruction=custom_instruction,
+        questions=questions,
+        token=token,
+        use_ai=use_ai,
+    )
+    if is_cacheable_classification(classification):
+        await cache.set(key, classification)
+    return classification, status
+
+
+_cache: Optional[TaxonomyClassificationCache] = None
+
+
+def get_taxonomy_classification_cache() -> TaxonomyClassificationCache:
+    global _cache
+    if _cache is None:
+        _cache = TaxonomyClassificationCache(
+            max_entries=settings.QUIZ_CLASSIFICATION_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.QUIZ_CLASSIFICATION_CACHE_TTL_SECONDS,
+        )
+    return _cache
@@ -1,24 +1,41 @@
 from __future__ import annotations
 
 import asyncio
-import functools
 import json
-import math
+import logging
 import os
 from dataclasses import dataclass
 from typing import Any, Optional
 
-from huggingface_hub import InferenceClient
-from huggingface_hub.inference._providers import get_provider_helper
+import numpy as np
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 from server.app.core.config import settings
+from server.app.db.core.redis_lease import RedisLease
+from server.app.quiz.repositories.chunk_embedding_cache_repository import (
+    build_chunk_content_hash,
+    get_cached_chunk_embeddings,
+    upsert_chunk_embeddings,
+)
 from server.app.quiz.repositories.document_rag_repository import (
+    build_document_fingerprint,
     get_cached_document_embeddings,
     upsert_document_embeddings,
 )
 from server.app.quiz.repositories.token_repository import get_user_token
 from server.app.quiz.utils.chunk_text import TextChunk
+from server.app.quiz.utils.embedding_client import BatchEmbeddingClient
 from server.app.quiz.utils.extract_text import ExtractedDocument
+from server.app.quiz.utils.inference_gateway import InferenceSession, get_inference_session
+from server.app.quiz.utils.rag_retrieval import (
+    ChunkEmbeddingIndex,
+    EmbeddingMatrixInput,
+)
+from server.app.quiz.utils.single_flight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -38,6 +55,20 @@ class DocumentQuizGenerationResult:
     embedding_cache_hit: bool
 
 
+@dataclass
+class _DocumentEmbeddingJobResult:
+    chunk_embeddings: EmbeddingMatrixInput
+    # Set only when the job embedded its caller's query alongside the chunks.
+    retrieval_query: Optional[str]
+    query_embedding: Optional[list[float]]
+    cache_hit: bool
+
+
+# Identical uploads racing through generation share one embedding job per
+# process; the Redis lease below extends that across workers.
+_document_embedding_jobs: SingleFlight[_DocumentEmbeddingJobResult] = SingleFlight()
+
+
 async def resolve_document_quiz_token(
     user_id: Optional[str],
     provided_token: Optional[str],
@@ -53,57 +84,6 @@ async def resolve_document_quiz_token(
     return os.getenv("HUGGINGFACEHUB_API_TOKEN")
 
 
-def _cosine_similarity(left: list[float], right: list[float]) -> float:
-    if not left or not right:
-        return 0.0
-
-    dot_product = sum(a * b for a, b in zip(left, right))
-    left_norm = math.sqrt(sum(value * value for value in left))
-    right_norm = math.sqrt(sum(value * value for value in right))
-    if left_norm == 0 or right_norm == 0:
-        return 0.0
-    return dot_product / (left_norm * right_norm)
-
-
-def _mean_embedding(vectors: list[list[float]]) -> list[float]:
-    if not vectors:
-        return []
-    dimensions = len(vectors[0])
-    return [
-        sum(vector[index] for vector in vectors) / len(vectors)
-        for index in range(dimensions)
-    ]
-
-
-def _normalize_embedding(values: list[float]) -> list[float]:
-    if not values:
-        return []
-    norm = math.sqrt(sum(value * value for value in values))
-    if norm == 0:
-        return values
-    return [value / norm for value in values]
-
-
-def _coerce_embedding_vector(payload: Any) -> list[float]:
-    if not isinstance(payload, list) or not payload:
-        raise ValueError("Embedding response was empty or had an unexpected format.")
-
-    if all(isinstance(item, (int, float)) for item in payload):
-        return [float(item) for item in payload]
-
-    nested_vectors: list[list[float]] = []
-    for item in payload:
-        if isinstance(item, list) and item and all(
-            isinstance(value, (int, float)) for value in item
-        ):
-            nested_vectors.append([float(value) for value in item])
-
-    if not nested_vectors:
-        raise ValueError("Embedding response could not be converted into a vector.")
-
-    return _mean_embedding(nested_vectors)
-
-
 def _normalize_question_type(question_type: str) -> str:
     normalized = question_type.strip().lower()
     aliases = {
@@ -120,38 +100,6 @@ def _normalize_question_type(question_type: str) -> str:
     return aliases.get(normalized, normalized)
 
 
-async def _feature_extract_text(
-    client: InferenceClient,
-    text: str,
-    *,
-    model: str,
-) -> list[float]:
-    loop = asyncio.get_event_loop()
-
-    provider_helper = get_provider_helper(
-        getattr(client, "provider", "hf-inference"),
-        task="feature-extraction",
-        model=model,
-    )
-    request_parameters = provider_helper.prepare_request(
-        inputs=text,
-        parameters={"normalize": False},
-        headers=client.headers,
-        model=model,
-        api_key=client.token,
-    )
-
-    response = await loop.run_in_executor(
-        None,
-        functools.partial(
-            client._inner_post,
-            request_parameters,
-        ),
-    )
-    embedding_payload = provider_helper.get_response(response, request_parameters)
-    return _normalize_embedding(_coerce_embedding_vector(embedding_payload))
-
-
 def _build_retrieval_query(
     *,
     document: ExtractedDocument,
@@ -176,53 +124,16 @@ def _build_retrieval_query(
 
 def _select_relevant_chunks(
     chunks: list[TextChunk],
-    chunk_embeddings: list[list[float]],
+    chunk_embeddings: EmbeddingMatrixInput,
     query_embedding: list[float],
     *,
     top_k: int,
 ) -> list[RetrievedChunk]:
-    centroid = _mean_embedding(chunk_embeddings)
-    scored_candidates: list[tuple[int, float, float, float]] = []
-
-    for index, chunk_embedding in enumerate(chunk_embeddings):
-        query_score = _cosine_similarity(query_embedding, chunk_embedding)
-        centroid_score = _cosine_similarity(centroid, chunk_embedding)
-        hybrid_score = (0.7 * query_score) + (0.3 * centroid_score)
-        scored_candidates.append((index, hybrid_score, query_score, centroid_score))
-
-    ranked = sorted(scored_candidates, key=lambda item: item[1], reverse=True)
-    pool = ranked[: max(top_k * 3, top_k)]
-    selected_indices: list[int] = []
-
-    for index, hybrid_score, _, _ in pool:
-        if len(selected_indices) >= top_k:
-            break
-        if not selected_indices:
-            selected_indices.append(index)
-            continue
-
-        diversity_penalty = max(
-            _cosine_similarity(chunk_embeddings[index], chunk_embeddings[selected])
-            for selected in selected_indices
-        )
-        mmr_score = (0.7 * hybrid_score) - (0.3 * diversity_penalty)
-        if mmr_score > -1:
-            selected_indices.append(index)
-
-    if len(selected_indices) < min(top_k, len(chunks)):
-        for index, _, _, _ in ranked:
-            if index not in selected_indices:
-                selected_indices.append(index)
-            if len(selected_indices) >= min(top_k, len(chunks)):
-                break
-
+    embedding_index = ChunkEmbeddingIndex(chunk_embeddings)
     selected = sorted(
         (
-            RetrievedChunk(
-                chunk=chunks[index],
-                score=next(score for idx, score, _, _ in scored_candidates if idx == index),
-            )
-            for index in selected_indices
+            RetrievedChunk(chunk=chunks[item.index], score=item.score)
+            for item in embedding_index.select(query_embedding, top_k=top_k)
         ),
         key=lambda item: item.chunk.chunk_id,
     )
@@ -288,35 +199,186 @@ Retrieved chunks:
 """.strip()
 
 
-async def _resolve_chunk_embeddings(
+def _build_embedding_client(client: InferenceSession) -> BatchEmbeddingClient:
+    return BatchEmbeddingClient(
+        client,
+        model=settings.HF_EMBEDDING_MODEL,
+        batch_size=settings.DOCUMENT_EMBEDDING_BATCH_SIZE,
+        max_concurrency=settings.DOCUMENT_EMBEDDING_MAX_CONCURRENCY,
+        max_attempts=settings.DOCUMENT_EMBEDDING_MAX_ATTEMPTS,
+    )
+
+
+async def _embed_uncached_chunks(
     *,
-    client: InferenceClient,
-    document: ExtractedDocument,
+    embedding_client: BatchEmbeddingClient,
     chunks: list[TextChunk],
-) -> tuple[list[list[float]], bool]:
-    if settings.DOCUMENT_RAG_CACHE_ENABLED:
-        cached_embeddings = await get_cached_document_embeddings(
-            document=document,
-            chunks=chunks,
+    retrieval_query: str,
+) -> tuple[np.ndarray, list[float]]:
+    cached_by_hash: dict[str, np.ndarray] = {}
+    if settings.DOCUMENT_CHUNK_EMBEDDING_CACHE_ENABLED:
+        cached_by_hash = await get_cached_chunk_embeddings(
+            contents=(chunk.content for chunk in chunks),
             embedding_model=settings.HF_EMBEDDING_MODEL,
-            chunk_size_chars=settings.DOCUMENT_CHUNK_SIZE_CHARS,
-            chunk_overlap_chars=settings.DOCUMENT_CHUNK_OVERLAP_CHARS,
-            chunk_limit=settings.DOCUMENT_RAG_MAX_CHUNKS,
         )
-        if cached_embeddings:
-            return cached_embeddings, True
-
-    chunk_embeddings: list[list[float]] = []
-    for chunk in chunks:
-        chunk_embeddings.append(
-            await _feature_extract_text(
-                client,
-                chunk.content,
-                model=settings.HF_EMBEDDING_MODEL,
+
+    chunk_hashes = [build_chunk_content_hash(chunk.content) for chunk in chunks]
+    uncached_contents: dict[str, str] = {}
+    for chunk, content_hash in zip(chunks, chunk_hashes):
+        if content_hash not in cached_by_hash:
+            uncached_contents.setdefault(content_hash, chunk.content)
+
+    # The query rides along in the last batch so a miss costs
+    # ceil((uncached chunks + 1) / batch_size) requests.
+    embeddings = await embedding_client.embed([*uncached_contents.values(), retrieval_query])
+    fresh_by_hash = dict(zip(uncached_contents, embeddings[:-1]))
+
+    if settings.DOCUMENT_CHUNK_EMBEDDING_CACHE_ENABLED and fresh_by_hash:
+        await upsert_chunk_embeddings(
+            contents=list(uncached_contents.values()),
+            embeddings=list(fresh_by_hash.values()),
+            embedding_model=settings.HF_EMBEDDING_MODEL,
+            max_entries=settings.DOCUMENT_CHUNK_EMBEDDING_CACHE_MAX_ENTRIES,
+        )
+
+    chunk_embeddings = np.asarray(
+        [
+            cached_by_hash[content_hash]
+            if content_hash in cached_by_hash
+            else fresh_by_hash[content_hash]
+            for content_hash in chunk_hashes
+        ],
+        dtype=np.float32,
+    )
+    return chunk_embeddings, embeddings[-1]
+
+
+def _document_embedding_job_key(document: ExtractedDocument) -> str:
+    return ":".join(
+        [
+            build_document_fingerprint(document.text),
+            settings.HF_EMBEDDING_MODEL,
+            str(settings.DOCUMENT_CHUNK_SIZE_CHARS),
+            str(settings.DOCUMENT_CHUNK_OVERLAP_CHARS),
+            str(settings.DOCUMENT_RAG_MAX_CHUNKS),
+        ]
+    )
+
+
+async def _get_cached_chunk_matrix(
+    *,
+    document: ExtractedDocument,
+    chunks: list[TextChunk],
+) -> Optional[np.ndarray]:
+    return await get_cached_document_embeddings(
+        document=document,
+        chunks=chunks,
+        embedding_model=settings.HF_EMBEDDING_MODEL,
+        chunk_size_chars=settings.DOCUMENT_CHUNK_SIZE_CHARS,
+        chunk_overlap_chars=settings.DOCUMENT_CHUNK_OVERLAP_CHARS,
+        chunk_limit=settings.DOCUMENT_RAG_MAX_CHUNKS,
+        embedding_encoding=settings.DOCUMENT_RAG_CACHE_EMBEDDING_ENCODING,
+    )
+
+
+async def _wait_for_embedding_lease(
+    lease: RedisLease,
+    *,
+    document: ExtractedDocument,
+    chunks: list[TextChunk],
+) -> Optional[np.ndarray]:
+    """Acquire ``lease`` or pick up the embeddings its holder cached.
+
+    Returns the cached matrix if another worker finished the job, otherwise
+    ``None`` once this worker holds the lease, Redis is unreachable, or
+    ``DOCUMENT_EMBEDDING_LEASE_WAIT_SECONDS`` pass without either, and it
+    should embed the document itself.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.DOCUMENT_EMBEDDING_LEASE_WAIT_SECONDS
+    while True:
+        try:
+            if await lease.acquire():
+                return None
+        except (RedisError, OSError) as exc:
+            logger.warning(
+                "Embedding lease unavailable, embedding without cross-worker coalescing: %s",
+                exc,
+            )
+            return None
+
+        if loop.time() >= deadline:
+            logger.warning(
+                "Gave up waiting for embedding lease %s, embedding without it", lease.key
             )
+            return None
+        await asyncio.sleep(settings.DOCUMENT_EMBEDDING_LEASE_POLL_SECONDS)
+        cached_embeddings = await _get_cached_chunk_matrix(document=document, chunks=chunks)
+        if cached_embeddings is not None:
+            return cached_embeddings
+
+
+async def _keep_embedding_lease(lease: RedisLease) -> None:
+    """Extend ``lease`` every third of its TTL until cancelled or it is lost."""
+    interval = settings.DOCUMENT_EMBEDDING_LEASE_SECONDS / 3
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if not await lease.extend():
+                logger.warning("Embedding lease %s lapsed before the job finished", lease.key)
+                return
+        except (RedisError, OSError) as exc:
+            logger.warning("Could not extend embedding lease %s: %s", lease.key, exc)
+            return
+
+
+async def _run_document_embedding_job(
+    *,
+    embedding_client: BatchEmbeddingClient,
+    document: ExtractedDocument,
+    chunks: list[TextChunk],
+    retrieval_query: str,
+    job_key: str,
+    redis_client: Optional[Redis],
+) -> _DocumentEmbeddingJobResult:
+    if not settings.DOCUMENT_RAG_CACHE_ENABLED:
+        chunk_embeddings, query_embedding = await _embed_uncached_chunks(
+            embedding_client=embedding_client,
+            chunks=chunks,
+            retrieval_query=retrieval_query,
+        )
+        return _DocumentEmbeddingJobResult(
+            chunk_embeddings, retrieval_query, query_embedding, cache_hit=False
         )
 
-    if settings.DOCUMENT_RAG_CACHE_ENABLED:
+    cached_embeddings = await _get_cached_chunk_matrix(document=document, chunks=chunks)
+    if cached_embeddings is not None:
+        return _DocumentEmbeddingJobResult(cached_embeddings, None, None, cache_hit=True)
+
+    lease = None
+    if redis_client is not None:
+        lease = RedisLease(
+            redis_client,
+            f"document-embedding-lease:{job_key}",
+            ttl_seconds=settings.DOCUMENT_EMBEDDING_LEASE_SECONDS,
+        )
+        cached_embeddings = await _wait_for_embedding_lease(
+            lease,
+            document=document,
+            chunks=chunks,
+        )
+        if cached_embeddings is not None:
+            return _DocumentEmbeddingJobResult(cached_embeddings, None, None, cache_hit=True)
+
+    heartbeat = None
+    if lease is not None and lease.held:
+        heartbeat = asyncio.create_task(_keep_embedding_lease(lease))
+    try:
+        chunk_embeddings, query_embedding = await _embed_uncached_chunks(
+            embedding_client=embedding_client,
+            chunks=chunks,
+            retrieval_query=retrieval_query,
+        )
         await upsert_document_embeddings(
             document=document,
             chunks=chunks,
@@ -325,9 +387,46 @@ async def _resolve_chunk_embeddings(
             chunk_size_chars=settings.DOCUMENT_CHUNK_SIZE_CHARS,
             chunk_overlap_chars=settings.DOCUMENT_CHUNK_OVERLAP_CHARS,
             chunk_limit=settings.DOCUMENT_RAG_MAX_CHUNKS,
+            embedding_encoding=settings.DOCUMENT_RAG_CACHE_EMBEDDING_ENCODING,
         )
+    finally:
+        if heartbeat is not None:
+            heartbeat.cancel()
+        if lease is not None:
+            await lease.release()
+
+    return _DocumentEmbeddingJobResult(
+        chunk_embeddings, retrieval_query, query_embedding, cache_hit=False
+    )
+
+
+async def _resolve_chunk_embeddings(
+    *,
+    embedding_client: BatchEmbeddingClient,
+    document: ExtractedDocument,
+    chunks: list[TextChunk],
+    retrieval_query: str,
+    redis_client: Optional[Redis] = None,
+) -> tuple[EmbeddingMatrixInput, list[float], bool]:
+    job_key = _document_embedding_job_key(document)
+    job_result, shared = await _document_embedding_jobs.run(
+        job_key,
+        lambda: _run_document_embedding_job(
+            embedding_client=embedding_client,
+            document=document,
+            chunks=chunks,
+            retrieval_query=retrieval_query,
+            job_key=job_key,
+            redis_client=redis_client,
+        ),
+    )
 
-    return chunk_embeddings, False
+    if job_result.query_embedding is not None and job_result.retrieval_query == retrieval_query:
+        query_embedding = job_result.query_embedding
+    else:
+        [query_embedding] = await embedding_client.embed([retrieval_query])
+
+    return job_result.chunk_embeddings, query_embedding, job_result.cache_hit or shared
 
 
 def _extract_first_json_object(raw_text: str) -> dict[str, Any]:
@@ -443,12 +542,13 @@ async def generate_document_quiz_with_rag(
     focus_topic: str | None,
     user_id: str | None,
     token: str | None,
+    redis_client: Optional[Redis] = None,
 ) -> DocumentQuizGenerationResult:
     final_token = await resolve_document_quiz_token(user_id, token)
     if not final_token:
         raise ValueError("A Hugging Face token is required for document quiz generation.")
 
-    client = InferenceClient(token=final_token)
+    client = get_inference_session(final_token)
     retrieval_query = _build_retrieval_query(
         document=document,
         question_type=question_type,
@@ -458,16 +558,16 @@ async def generate_document_quiz_with_rag(
         focus_topic=focus_topic,
     )
 
-    chunk_embeddings, embedding_cache_hit = await _resolve_chunk_embeddings(
-        client=client,
+    (
+        chunk_embeddings,
+        query_embedding,
+        embedding_cache_hit,
+    ) = await _resolve_chunk_embeddings(
+        embedding_client=_build_embedding_client(client),
         document=document,
         chunks=chunks,
-    )
-
-    query_embedding = await _feature_extract_text(
-        client,
-        retrieval_query,
-        model=settings.HF_EMBEDDING_MODEL,
+        retrieval_query=retrieval_query,
+        redis_client=redis_client,
     )
     retrieved_chunks = _select_relevant_chunks(
         chunks,
@@ -486,16 +586,11 @@ async def generate_document_quiz_with_rag(
         custom_instruction=custom_instruction,
     )
 
-    loop = asyncio.get_event_loop()
-    response = await loop.run_in_executor(
-        None,
-        functools.partial(
-            client.chat_completion,
-            model=settings.HF_QUIZ_MODEL,
-            messages=[{"role": "user", "content": generation_prompt}],
-            max_tokens=2400,
-            temperature=0.3,
-        ),
+    response = await client.chat_completion(
+        model=settings.HF_QUIZ_MODEL,
+        messages=[{"role": "user", "content": generation_prompt}],
+        max_tokens=2400,
+        temperature=0.3,
     )
     response_text = response.choices[0].message.content
     payload = _extract_first_json_object(response_text)
@@ -0,0 +1,194 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+
+# Option letters ("B) ") and "Correct answer:" prefixes, stripped in one match.
+_ANSWER_PREFIX = re.compile(r"^(?:[A-D]\)\s*)?(?:correct answer[:\-]?\s*)?", re.IGNORECASE)
+
+FUZZY_THRESHOLDS = {"open-ended": 50, "short-answer": 80}
+GRADING_SOURCES = ("mock", "ai")
+
+
+def normalize_answer(ans: str) -> str:
+
+    """Cleans answer strings (removes option letters, prefixes, punctuation)."""
+
+    return _ANSWER_PREFIX.sub("", str(ans).strip(), count=1).strip()
+
+
+def clean_answer(value: Any, source: str) -> str:
+    """The answer text ``grade_batch`` compares for ``source``."""
+    if source == "ai":
+        return normalize_answer(value)
+    return str(value).strip()
+
+
+@dataclass
+class GradedAnswers:
+    """Grading results as columns; entry ``i`` of each list describes one graded answer.
+
+    Answers without a correct answer are not graded, so ``source_index``
+    maps each entry back to its position in the input.
+    ``accuracy_percentage`` is None for question types graded by exact match.
+    """
+
+    source_index: List[int] = field(default_factory=list)
+    question: List[Any] = field(default_factory=list)
+    user_answer: List[Any] = field(default_factory=list)
+    correct_answer: List[Any] = field(default_factory=list)
+    question_type: List[str] = field(default_factory=list)
+    accuracy_percentage: List[Optional[float]] = field(default_factory=list)
+    is_correct: List[bool] = field(default_factory=list)
+    result: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.source_index)
+
+    @property
+    def correct_source_indexes(self) -> List[int]:
+        return [index for index, correct in zip(self.source_index, self.is_correct) if correct]
+
+    def append(
+        self,
+        source_index: int,
+        question: Any,
+        user_answer: Any,
+        correct_answer: Any,
+        question_type: str,
+        is_correct: bool = False,
+        result: str = "Incorrect",
+    ) -> None:
+        self.source_index.append(source_index)
+        self.question.append(question)
+        self.user_answer.append(user_answer)
+        self.correct_answer.append(correct_answer)
+        self.question_type.append(question_type)
+        self.accuracy_percentage.append(None)
+        self.is_correct.append(is_correct)
+        self.result.append(result)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """The per-answer dicts ``grade_answers`` has always returned."""
+        rows = []
+        for question, user_answer, correct_answer, question_type, accuracy, is_correct, result in zip(
+            self.question,
+            self.user_answer,
+            self.correct_answer,
+            self.question_type,
+            self.accuracy_percentage,
+            self.is_correct,
+            self.result,
+        ):
+            row = {
+                "question": question,
+                "user_answer": user_answer,
+                "correct_answer": correct_answer,
+                "question_type": question_type,
+            }
+            if accuracy is not None:
+                row["accuracy_percentage"] = accuracy
+            row["is_correct"] = is_correct
+            row["result"] = result
+            rows.append(row)
+        return rows
+
+
+def grade_batch(
+    user_answers: List[Dict[str, Any]],
+    source: str = "mock",
+    *,
+    clean_correct_answers: bool = True,
+) -> GradedAnswers:
+    """Grade a whole list of answers at once.
+
+    ``source`` picks the rules: "ai" strips option letters and answer
+    prefixes and compares true/false answers as integers, "mock" only trims
+    whitespace. Each distinct answer string is normalized once, and the
+    open-ended and short-answer pairs are scored together with rapidfuzz's
+    ``cpdist``, each distinct pair once.
+
+    Pass ``clean_correct_answers=False`` when the correct answers already went
+    through ``clean_answer``, as in a compiled answer key.
+    """
+    graded = GradedAnswers()
+    normalized: Dict[str, str] = {}
+    fuzzy_positions: List[int] = []
+    fuzzy_pairs: Dict[tuple, int] = {}
+    fuzzy_slots: List[int] = []
+
+    def clean(value: Any) -> str:
+        text = str(value)
+        if source != "ai":
+            return text.strip()
+        if text not in normalized:
+            normalized[text] = normalize_answer(text)
+        return normalized[text]
+
+    def clean_correct(value: Any) -> Any:
+        return clean(value) if clean_correct_answers else value
+
+    for index, answer in enumerate(user_answers):
+        question_type = answer.get("question_type", "").strip()
+        if source == "ai":
+            question_type = question_type.lower()
+            if question_type == "true-false":
+                _grade_true_false(graded, index, answer, question_type)
+                continue
+
+        user_answer = clean(answer.get("user_answer", ""))
+        correct_answer = clean_correct(answer.get("correct_answer", ""))
+        if not correct_answer:
+            continue
+
+        graded.append(index, answer.get("question", ""), user_answer, correct_answer, question_type)
+        if question_type in FUZZY_THRESHOLDS:
+            fuzzy_positions.append(len(graded) - 1)
+            fuzzy_slots.append(fuzzy_pairs.setdefault((user_answer, correct_answer), len(fuzzy_pairs)))
+        elif question_type == "multichoice" or (source != "ai" and question_type == "true-false"):
+            _mark(graded, len(graded) - 1, user_answer.lower() == correct_answer.lower())
+
+    if fuzzy_pairs:
+        pairs = list(fuzzy_pairs)
+        scores = process.cpdist(
+            [user_answer for user_answer, _ in pairs],
+            [correct_answer for _, correct_answer in pairs],
+            scorer=fuzz.token_set_ratio,
+            dtype=np.float64,
+        ).tolist()
+        for position, slot in zip(fuzzy_positions, fuzzy_slots):
+            accuracy = scores[slot]
+            graded.accuracy_percentage[position] = accuracy
+            _mark(graded, position, accuracy >= FUZZY_THRESHOLDS[graded.question_type[position]])
+    return graded
+
+
+def _mark(graded: GradedAnswers, position: int, is_correct: bool) -> None:
+    graded.is_correct[position] = is_correct
+    graded.result[position] = "Correct" if is_correct else "Incorrect"
+
+
+def _grade_true_false(
+    graded: GradedAnswers,
+    index: int,
+    answer: Dict[str, Any],
+    question_type: str,
+) -> None:
+    try:
+        user_answer = int(answer.get("user_answer", -1))
+        correct_answer = int(answer.get("correct_answer", -1))
+    except ValueError:
+        graded.append(
+            index,
+            answer.get("question", ""),
+            answer.get("user_answer", ""),
+            answer.get("correct_answer", ""),
+            question_type,
+            result="Invalid format",
+        )
+        return
+    graded.append(index, answer.get("question", ""), user_answer, correct_answer, question_type)
+    _mark(graded, len(graded) - 1, user_answer == correct_answer)
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import re
+from collections import deque
 from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
 
 from server.app.core.config import settings
 
 
 _SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])\s+")
+_PARAGRAPH_BREAK_PATTERN = re.compile(r"\n\s*\n")
+_SEGMENT_SEPARATOR = "\n\n"
 
 
 @dataclass
@@ -16,35 +20,54 @@ class TextChunk:
     char_count: int
 
 
-def _join_segments(segments: list[str]) -> str:
-    return "\n\n".join(segment.strip() for segment in segments if segment.strip()).strip()
-
-
-def _select_overlap_segments(segments: list[str], overlap_size: int) -> list[str]:
-    if overlap_size <= 0:
-        return []
-
-    overlap_segments: list[str] = []
-    total_length = 0
-
-    for segment in reversed(segments):
-        segment = segment.strip()
-        if not segment:
-            continue
-
-        separator_length = 2 if overlap_segments else 0
-        projected_length = total_length + separator_length + len(segment)
-
-        if overlap_segments and projected_length > overlap_size:
-            break
-
-        overlap_segments.append(segment)
-        total_length = projected_length
+def _iter_paragraphs(text: str) -> Iterator[str]:
+    # Lazy equivalent of re.split(_PARAGRAPH_BREAK_PATTERN, text).
+    start = 0
+    for match in _PARAGRAPH_BREAK_PATTERN.finditer(text):
+        paragraph = text[start : match.start()].strip()
+        if paragraph:
+            yield paragraph
+        start = match.end()
+    paragraph = text[start:].strip()
+    if paragraph:
+        yield paragraph
+
+
+class _PageParagraphs:
+    """Paragraphs of ``sanitize_document_text("\\n".join(pages))``, fed one page at a time.
+
+    Pages must be whitespace-normalized, as ``stream_document_pages`` yields
+    them. A paragraph is released once the break after it has been seen, so
+    at most the current paragraph and one page are held.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._started = False
+
+    def feed(self, page: str) -> Iterator[str]:
+        if self._started:
+            # Normalizing the joined text drops spaces before the joining newline.
+            scan_from = len(self._pending.rstrip())
+            self._pending = self._pending.rstrip(" \t") + "\n" + page
+        else:
+            scan_from = 0
+            self._pending = page
+            self._started = True
 
-        if total_length >= overlap_size:
-            break
+        start = 0
+        for match in _PARAGRAPH_BREAK_PATTERN.finditer(self._pending, scan_from):
+            paragraph = self._pending[start : match.start()].strip()
+            if paragraph:
+                yield paragraph
+            start = match.end()
+        self._pending = self._pending[start:]
 
-    return list(reversed(overlap_segments))
+    def close(self) -> Iterator[str]:
+        paragraph = self._pending.strip()
+        self._pending = ""
+        if paragraph:
+            yield paragraph
 
 
 def _split_long_paragraph(paragraph: str, max_chars: int) -> list[str]:
@@ -56,80 +79,222 @@ def _split_long_paragraph(paragraph: str, max_chars: int) -> list[str]:
         ]
 
     chunks: list[str] = []
-    current = ""
+    current: list[str] = []
+    current_length = 0
     for sentence in sentences:
         sentence = sentence.strip()
         if not sentence:
             continue
 
-        candidate = f"{current} {sentence}".strip() if current else sentence
-        if current and len(candidate) > max_chars:
-            chunks.append(current.strip())
-            current = sentence
+        if current and current_length + 1 + len(sentence) > max_chars:
+            chunks.append(" ".join(current))
+            current = [sentence]
+            current_length = len(sentence)
+        elif current:
+            current.append(sentence)
+            current_length += 1 + len(sentence)
         else:
-            current = candidate
+            current = [sentence]
+            current_length = len(sentence)
 
-    if current.strip():
-        chunks.append(current.strip())
+    if current:
+        chunks.append(" ".join(current))
     return chunks
 
 
-def split_text_into_chunks(
+def _iter_segments(paragraphs: Iterable[str], chunk_size: int) -> Iterator[str]:
+    for paragraph in paragraphs:
+        if len(paragraph) <= chunk_size:
+            yield paragraph
+        else:
+            yield from _split_long_paragraph(paragraph, chunk_size)
+
+
+class _SegmentWindow:
+    """The segments of the chunk being built, with its joined length tracked.
+
+    Segments are stored stripped. Whitespace-only segments are kept as empty
+    strings: they add nothing to the joined text but still count as members
+    of the window, exactly as they do in a plain list of segments.
+    """
+
+    def __init__(self, segments: list[str] | None = None):
+        self._segments: deque[str] = deque()
+        self._text_length = 0
+        self._non_empty = 0
+        for segment in segments or []:
+            self.append(segment)
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    @staticmethod
+    def _joined_length(text_length: int, non_empty: int) -> int:
+        if non_empty == 0:
+            return 0
+        return text_length + len(_SEGMENT_SEPARATOR) * (non_empty - 1)
+
+    @property
+    def joined_length(self) -> int:
+        return self._joined_length(self._text_length, self._non_empty)
+
+    def joined_length_with(self, segment: str) -> int:
+        if not segment:
+            return self.joined_length
+        return self._joined_length(self._text_length + len(segment), self._non_empty + 1)
+
+    def append(self, segment: str) -> None:
+        self._segments.append(segment)
+        if segment:
+            self._text_length += len(segment)
+            self._non_empty += 1
+
+    def popleft(self) -> None:
+        segment = self._segments.popleft()
+        if segment:
+            self._text_length -= len(segment)
+            self._non_empty -= 1
+
+    def join(self) -> str:
+        return _SEGMENT_SEPARATOR.join(segment for segment in self._segments if segment)
+
+    def overlap_segments(self, overlap_size: int) -> list[str]:
+        """Trailing segments whose joined length first reaches ``overlap_size``.
+
+        At least one non-empty segment is kept when there is one, even if it
+        is longer than ``overlap_size`` on its own.
+        """
+        if overlap_size <= 0:
+            return []
+
+        overlap: list[str] = []
+        total_length = 0
+        for segment in reversed(self._segments):
+            if not segment:
+                continue
+
+            separator_length = len(_SEGMENT_SEPARATOR) if overlap else 0
+            projected_length = total_length + separator_length + len(segment)
+            if overlap and projected_length > overlap_size:
+                break
+
+            overlap.append(segment)
+            total_length = projected_length
+            if total_length >= overlap_size:
+                break
+
+        overlap.reverse()
+        return overlap
+
+
+class _ChunkBuilder:
+    def __init__(self, max_chars: int | None, overlap_chars: int | None, max_chunks: int | None):
+        self.chunk_size = max_chars or settings.DOCUMENT_CHUNK_SIZE_CHARS
+        self._overlap_size = overlap_chars or settings.DOCUMENT_CHUNK_OVERLAP_CHARS
+        self._chunk_limit = max_chunks or settings.DOCUMENT_RAG_MAX_CHUNKS
+        self._emitted = 0
+        self._window = _SegmentWindow()
+
+    @property
+    def full(self) -> bool:
+        return self._emitted >= self._chunk_limit
+
+    def _emit(self) -> TextChunk:
+        content = self._window.join()
+        chunk = TextChunk(chunk_id=self._emitted, content=content, char_count=len(content))
+        self._emitted += 1
+        return chunk
+
+    def add(self, raw_segment: str) -> TextChunk | None:
+        """Add the next segment; returns the chunk it closes, if any."""
+        segment = raw_segment.strip()
+        window = self._window
+        if len(window) and window.joined_length_with(segment) > self.chunk_size:
+            chunk = self._emit()
+            self._window = window = _SegmentWindow(window.overlap_segments(self._overlap_size))
+            window.append(segment)
+            while window.joined_length > self.chunk_size and len(window) > 1:
+                window.popleft()
+            return chunk
+        window.append(segment)
+        return None
+
+    def finish(self) -> TextChunk | None:
+        if self.full or not self._window.join():
+            return None
+        return self._emit()
+
+
+def iter_text_chunks(
     text: str,
     *,
     max_chars: int | None = None,
     overlap_chars: int | None = None,
     max_chunks: int | None = None,
-) -> list[TextChunk]:
-    chunk_size = max_chars or settings.DOCUMENT_CHUNK_SIZE_CHARS
-    overlap_size = overlap_chars or settings.DOCUMENT_CHUNK_OVERLAP_CHARS
-    chunk_limit = max_chunks or settings.DOCUMENT_RAG_MAX_CHUNKS
+) -> Iterator[TextChunk]:
+    """Yield chunks of ``text`` lazily; the remaining text is not scanned.
+
+    Produces exactly the chunks ``split_text_into_chunks`` returns, in time
+    linear in the length of the consumed text.
+    """
+    builder = _ChunkBuilder(max_chars, overlap_chars, max_chunks)
+    for segment in _iter_segments(_iter_paragraphs(text), builder.chunk_size):
+        chunk = builder.add(segment)
+        if chunk is not None:
+            yield chunk
+        if builder.full:
+            return
+
+    chunk = builder.finish()
+    if chunk is not None:
+        yield chunk
+
+
+async def aiter_page_chunks(
+    pages: AsyncIterable[str],
+    *,
+    max_chars: int | None = None,
+    overlap_chars: int | None = None,
+    max_chunks: int | None = None,
+) -> AsyncIterator[TextChunk]:
+    """``iter_text_chunks`` over a document arriving page by page.
+
+    Yields the chunks of ``sanitize_document_text("\\n".join(pages))`` and
+    stops reading ``pages`` once the chunk limit is reached.
+    """
+    builder = _ChunkBuilder(max_chars, overlap_chars, max_chunks)
+    paragraphs = _PageParagraphs()
+    async for page in pages:
+        for segment in _iter_segments(paragraphs.feed(page), builder.chunk_size):
+            chunk = builder.add(segment)
+            if chunk is not None:
+                yield chunk
+            if builder.full:
+                return
+
+    for segment in _iter_segments(paragraphs.close(), builder.chunk_size):
+        chunk = builder.add(segment)
+        if chunk is not None:
+            yield chunk
+        if builder.full:
+            return
+    chunk = builder.finish()
+    if chunk is not None:
+        yield chunk
 
-    paragraphs = [segment.strip() for segment in re.split(r"\n\s*\n", text) if segment.strip()]
-    prepared_segments: list[str] = []
 
-    for paragraph in paragraphs:
-        if len(paragraph) <= chunk_size:
-            prepared_segments.append(paragraph)
-        else:
-            prepared_segments.extend(_split_long_paragraph(paragraph, chunk_size))
-
-    chunks: list[TextChunk] = []
-    current_segments: list[str] = []
-
-    for segment in prepared_segments:
-        candidate_segments = [*current_segments, segment]
-        candidate = _join_segments(candidate_segments)
-
-        if current_segments and len(candidate) > chunk_size:
-            current_content = _join_segments(current_segments)
-            chunks.append(
-                TextChunk(
-                    chunk_id=len(chunks),
-                    content=current_content,
-                    char_count=len(current_content),
-                )
-            )
-
-            overlap_segments = _select_overlap_segments(current_segments, overlap_size)
-            current_segments = [*overlap_segments, segment]
-
-            while len(_join_segments(current_segments)) > chunk_size and len(current_segments) > 1:
-                current_segments = current_segments[1:]
-        else:
-            current_segments = candidate_segments
-
-        if len(chunks) >= chunk_limit:
-            break
-
-    current_content = _join_segments(current_segments)
-    if current_content and len(chunks) < chunk_limit:
-        chunks.append(
-            TextChunk(
-                chunk_id=len(chunks),
-                content=current_content,
-                char_count=len(current_content),
-            )
+def split_text_into_chunks(
+    text: str,
+    *,
+    max_chars: int | None = None,
+    overlap_chars: int | None = None,
+    max_chunks: int | None = None,
+) -> list[TextChunk]:
+    return list(
+        iter_text_chunks(
+            text,
+            max_chars=max_chars,
+            overlap_chars=overlap_chars,
+            max_chunks=max_chunks,
         )
-
-    return chunks
+    )
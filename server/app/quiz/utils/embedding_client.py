@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from typing import Any
+
+import httpx
+from huggingface_hub.errors import HfHubHTTPError, InferenceTimeoutError
+
+from server.app.quiz.utils.inference_gateway import InferenceSession
+
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+def mean_embedding(vectors: list[list[float]]) -> list[float]:
+    if not vectors:
+        return []
+    dimensions = len(vectors[0])
+    return [
+        sum(vector[index] for vector in vectors) / len(vectors)
+        for index in range(dimensions)
+    ]
+
+
+def normalize_embedding(values: list[float]) -> list[float]:
+    if not values:
+        return []
+    norm = math.sqrt(sum(value * value for value in values))
+    if norm == 0:
+        return values
+    return [value / norm for value in values]
+
+
+def _is_number_list(payload: Any) -> bool:
+    return isinstance(payload, list) and bool(payload) and all(
+        isinstance(value, (int, float)) for value in payload
+    )
+
+
+def coerce_embedding_vector(payload: Any) -> list[float]:
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("Embedding response was empty or had an unexpected format.")
+
+    if _is_number_list(payload):
+        return [float(item) for item in payload]
+
+    # Token-level output: mean-pool the token vectors into one embedding.
+    nested_vectors = [
+        [float(value) for value in item] for item in payload if _is_number_list(item)
+    ]
+    if not nested_vectors:
+        raise ValueError("Embedding response could not be converted into a vector.")
+
+    return mean_embedding(nested_vectors)
+
+
+def split_batch_embedding_payload(payload: Any, expected_count: int) -> list[Any]:
+    """Return one per-input embedding payload from a batched response."""
+    if expected_count == 1 and _is_number_list(payload):
+        # Some deployments squeeze single-input batches down to a flat vector.
+        return [payload]
+
+    if not isinstance(payload, list) or len(payload) != expected_count:
+        raise ValueError(
+            "Embedding response did not contain one vector per input "
+            f"(expected {expected_count})."
+        )
+    return payload
+
+
+def _is_retryable_error(error: Exception) -> bool:
+    if isinstance(error, HfHubHTTPError):
+        response = getattr(error, "response", None)
+        status_code = getattr(response, "status_code", None)
+        return status_code in _RETRYABLE_STATUS_CODES
+    return isinstance(error, (InferenceTimeoutError, httpx.TransportError, OSError))
+
+
+class BatchEmbeddingClient:
+    """Embeds many texts with few feature-extraction requests.
+
+    Texts are grouped into batches of ``batch_size`` inputs per request, at
+    most ``max_concurrency`` batches are in flight at once, and each batch is
+    retried independently on transient failures.
+    """
+
+    def __init__(
+        self,
+        client: InferenceSession,
+        *,
+        model: str,
+        batch_size: int = 16,
+        max_concurrency: int = 4,
+        max_attempts: int = 3,
+        retry_backoff_seconds: float = 0.5,
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+
+        self._client = client
+        self._model = model
+        self._batch_size = batch_size
+        self._max_concurrency = max_concurrency
+        self._max_attempts = max_attempts
+        self._retry_backoff_seconds = retry_backoff_seconds
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        batches = [
+            texts[start : start + self._batch_size]
+            for start in range(0, len(texts), self._batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def run_batch(batch: list[str]) -> list[list[float]]:
+            async with semaphore:
+                return await self._embed_batch_with_retries(batch)
+
+        results = await asyncio.gather(*(run_batch(batch) for batch in batches))
+        return [embedding for batch_embeddings in results for embedding in batch_embeddings]
+
+    async def _embed_batch_with_retries(self, batch: list[str]) -> list[list[float]]:
+        attempt = 1
+        while True:
+            try:
+                return await self._embed_batch(batch)
+            except Exception as error:
+                if attempt >= self._max_attempts or not _is_retryable_error(error):
+                    raise
+                delay = self._retry_backoff_seconds * (2 ** (attempt - 1))
+                logger.warning(
+                    "Embedding batch of %s inputs failed on attempt %s/%s; retrying in %.2fs: %s",
+                    len(batch),
+                    attempt,
+                    self._max_attempts,
+                    delay,
+                    error,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _embed_batch(self, batch: list[str]) -> list[list[float]]:
+        payload = await self._client.feature_extraction(
+            batch,
+            model=self._model,
+            parameters={"normalize": False},
+        )
+        return [
+            normalize_embedding(coerce_embedding_vector(item))
+            for item in split_batch_embedding_payload(payload, len(batch))
+        ]
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Any, Literal, Optional, Sequence, Union
+
+import numpy as np
+from bson.binary import Binary
+
+
+EmbeddingEncoding = Literal["float32", "int8"]
+
+EMBEDDING_ENCODING_FLOAT32: EmbeddingEncoding = "float32"
+EMBEDDING_ENCODING_INT8: EmbeddingEncoding = "int8"
+
+# Stored bytes are always little-endian regardless of the host.
+_FLOAT32 = np.dtype("<f4")
+_INT8 = np.dtype("i1")
+_INT8_MAX = 127.0
+
+
+def encode_embedding_matrix(
+    embeddings: Union[np.ndarray, Sequence[Sequence[float]]],
+    *,
+    encoding: EmbeddingEncoding = EMBEDDING_ENCODING_FLOAT32,
+) -> dict[str, Any]:
+    """Pack a row-per-chunk embedding matrix into BSON binary fields.
+
+    ``float32`` stores the matrix verbatim. ``int8`` stores each row scaled
+    into [-127, 127] alongside a per-row float32 scale, a quarter of the size
+    at a cosine error well below 1e-3 for sentence embeddings.
+    """
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError("Embeddings must be a two-dimensional matrix.")
+
+    fields: dict[str, Any] = {
+        "embedding_encoding": encoding,
+        "embedding_count": int(matrix.shape[0]),
+        "embedding_dimensions": int(matrix.shape[1]),
+    }
+    if encoding == EMBEDDING_ENCODING_FLOAT32:
+        fields["embeddings"] = Binary(matrix.astype(_FLOAT32, copy=False).tobytes())
+        return fields
+
+    if encoding == EMBEDDING_ENCODING_INT8:
+        scales = np.abs(matrix).max(axis=1, initial=0.0) / _INT8_MAX
+        scales[scales == 0] = 1.0
+        quantized = np.clip(np.rint(matrix / scales[:, None]), -_INT8_MAX, _INT8_MAX)
+        fields["embeddings"] = Binary(quantized.astype(_INT8).tobytes())
+        fields["embedding_scales"] = Binary(scales.astype(_FLOAT32).tobytes())
+        return fields
+
+    raise ValueError(f"Unsupported embedding encoding '{encoding}'.")
+
+
+def decode_embedding_matrix(fields: dict[str, Any]) -> Optional[np.ndarray]:
+    """Inverse of ``encode_embedding_matrix``; ``None`` if the fields are unusable.
+
+    float32 payloads are returned as a read-only view over the BSON bytes
+    without copying. int8 payloads are dequantized into a new array.
+    """
+    payload = fields.get("embeddings")
+    count = fields.get("embedding_count")
+    dimensions = fields.get("embedding_dimensions")
+    if not isinstance(payload, bytes) or not isinstance(count, int) or not isinstance(dimensions, int):
+        return None
+    if count <= 0 or dimensions <= 0:
+        return None
+
+    encoding = fields.get("embedding_encoding")
+    if encoding == EMBEDDING_ENCODING_FLOAT32:
+        if len(payload) != count * dimensions * _FLOAT32.itemsize:
+            return None
+        return np.frombuffer(payload, dtype=_FLOAT32).reshape(count, dimensions)
+
+    if encoding == EMBEDDING_ENCODING_INT8:
+        scales_payload = fields.get("embedding_scales")
+        if (
+            len(payload) != count * dimensions
+            or not isinstance(scales_payload, bytes)
+            or len(scales_payload) != count * _FLOAT32.itemsize
+        ):
+            return None
+        quantized = np.frombuffer(payload, dtype=_INT8).reshape(count, dimensions)
+        scales = np.frombuffer(scales_payload, dtype=_FLOAT32)
+        return quantized.astype(np.float32) * scales[:, None]
+
+    return None
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import io
+import multiprocessing
 import os
 import re
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import AsyncIterator, Optional
 
 from docx import Document as DocxDocument
 from pypdf import PdfReader
 
+from server.app.quiz.utils.chunk_text import TextChunk, aiter_page_chunks
+
 
 try:
     import fitz  # type: ignore
@@ -21,6 +30,14 @@ _WHITESPACE_PATTERN = re.compile(r"[ \t]+")
 _MULTI_NEWLINE_PATTERN = re.compile(r"\n{3,}")
 
 
+@dataclass
+class ExtractionStats:
+    page_count: int
+    pages_extracted: int
+    stopped_early: bool
+    extract_ms: float
+
+
 @dataclass
 class ExtractedDocument:
     text: str
@@ -28,14 +45,18 @@ class ExtractedDocument:
     source_document_type: str
     title: str
     source_characters: int
+    extraction: Optional[ExtractionStats] = None
 
 
-def sanitize_document_text(text: str) -> str:
+def _normalize_whitespace(text: str) -> str:
     cleaned = text.replace("\r\n", "\n").replace("\r", "\n")
     cleaned = _WHITESPACE_PATTERN.sub(" ", cleaned)
     cleaned = re.sub(r"[ \t]+\n", "\n", cleaned)
-    cleaned = _MULTI_NEWLINE_PATTERN.sub("\n\n", cleaned)
-    return cleaned.strip()
+    return _MULTI_NEWLINE_PATTERN.sub("\n\n", cleaned)
+
+
+def sanitize_document_text(text: str) -> str:
+    return _normalize_whitespace(text).strip()
 
 
 def derive_document_title(filename: str | None, fallback_text: str = "") -> str:
@@ -76,38 +97,312 @@ def _extract_txt_text(file_bytes: bytes) -> str:
     return file_bytes.decode(errors="ignore")
 
 
-def extract_text_from_bytes(
-    *,
-    file_bytes: bytes,
-    filename: str,
-) -> ExtractedDocument:
+def _resolve_document_type(filename: str) -> str:
     extension = Path(filename).suffix.lower()
     if extension not in SUPPORTED_DOCUMENT_EXTENSIONS:
         raise ValueError(
             f"Unsupported file type '{extension}'. Supported types are PDF, DOCX, and TXT."
         )
+    return extension.lstrip(".")
+
+
+def _build_extracted_document(
+    *,
+    text: str,
+    filename: str,
+    source_document_type: str,
+    extraction: Optional[ExtractionStats] = None,
+) -> ExtractedDocument:
+    if not text:
+        raise ValueError("No readable text was found in the uploaded document.")
+
+    return ExtractedDocument(
+        text=text,
+        source_document_name=os.path.basename(filename),
+        source_document_type=source_document_type,
+        title=derive_document_title(filename, text),
+        source_characters=len(text),
+        extraction=extraction,
+    )
+
 
-    if extension == ".pdf":
+def extract_text_from_bytes(
+    *,
+    file_bytes: bytes,
+    filename: str,
+) -> ExtractedDocument:
+    source_document_type = _resolve_document_type(filename)
+    if source_document_type == "pdf":
         text = _extract_pdf_text(file_bytes)
-        source_document_type = "pdf"
-    elif extension == ".docx":
+    elif source_document_type == "docx":
         text = _extract_docx_text(file_bytes)
-        source_document_type = "docx"
     else:
         text = _extract_txt_text(file_bytes)
-        source_document_type = "txt"
 
-    cleaned_text = sanitize_document_text(text)
-    if not cleaned_text:
-        raise ValueError("No readable text was found in the uploaded document.")
+    return _build_extracted_document(
+        text=sanitize_document_text(text),
+        filename=filename,
+        source_document_type=source_document_type,
+    )
 
-    return ExtractedDocument(
-        text=cleaned_text,
-        source_document_name=os.path.basename(filename),
+
+# --- Off-loop, page-parallel extraction -------------------------------------
+#
+# The functions below run inside worker processes, so they only take and
+# return picklable values. PDFs are handed over as a temp-file path rather
+# than bytes so each task does not re-pickle the whole upload.
+
+
+def _count_pdf_pages(path: str) -> int:
+    if fitz is not None:
+        with fitz.open(path) as pdf_document:
+            return pdf_document.page_count
+    return len(PdfReader(path).pages)
+
+
+def _extract_pdf_page_range(path: str, start: int, stop: int) -> list[str]:
+    if fitz is not None:
+        with fitz.open(path) as pdf_document:
+            pages = [pdf_document[index].get_text("text") for index in range(start, stop)]
+    else:
+        reader = PdfReader(path)
+        pages = [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+    return [_normalize_whitespace(page) for page in pages]
+
+
+def _extract_docx_pages(file_bytes: bytes) -> list[str]:
+    return [_normalize_whitespace(_extract_docx_text(file_bytes))]
+
+
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_extraction_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool shared by all document extractions in this process.
+
+    ``spawn`` keeps workers independent of the parent's event loop and driver
+    threads; worker count is fixed by the first caller.
+    """
+    global _extraction_pool
+    if _extraction_pool is None:
+        _extraction_pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _extraction_pool
+
+
+def shutdown_extraction_pool() -> None:
+    global _extraction_pool
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown(wait=False, cancel_futures=True)
+        _extraction_pool = None
+
+
+async def _stream_pdf_pages(
+    path: str,
+    *,
+    executor: Executor,
+    page_count: int,
+    pages_per_task: int,
+    max_in_flight: int,
+) -> AsyncIterator[str]:
+    loop = asyncio.get_running_loop()
+    ranges = deque(
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    )
+    in_flight: deque[asyncio.Future] = deque()
+    try:
+        while ranges or in_flight:
+            while ranges and len(in_flight) < max_in_flight:
+                start, stop = ranges.popleft()
+                in_flight.append(
+                    loop.run_in_executor(executor, _extract_pdf_page_range, path, start, stop)
+                )
+            for page in await in_flight.popleft():
+                yield page
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+async def stream_document_pages(
+    *,
+    file_bytes: bytes,
+    filename: str,
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+    pages_per_task: int = 8,
+    page_count_holder: Optional[list[int]] = None,
+) -> AsyncIterator[str]:
+    """Async generator of whitespace-normalized page text, extracted off the loop.
+
+    Pages are not stripped, so ``sanitize_document_text("\\n".join(pages))``
+    equals the whole-document extraction exactly. PDF page ranges are
+    extracted in parallel but yielded in page order, and no more than one
+    range per worker (``max_workers``, the CPU count by default) is
+    scheduled ahead of the consumer, so closing the generator early leaves
+    the rest of the document unread.
+    """
+    source_document_type = _resolve_document_type(filename)
+    executor = executor or get_extraction_pool()
+    loop = asyncio.get_running_loop()
+
+    if source_document_type == "txt":
+        if page_count_holder is not None:
+            page_count_holder.append(1)
+        yield _normalize_whitespace(_extract_txt_text(file_bytes))
+        return
+
+    if source_document_type == "docx":
+        pages = await loop.run_in_executor(executor, _extract_docx_pages, file_bytes)
+        if page_count_holder is not None:
+            page_count_holder.append(len(pages))
+        for page in pages:
+            yield page
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as handle:
+        handle.write(file_bytes)
+        path = handle.name
+    try:
+        page_count = await loop.run_in_executor(executor, _count_pdf_pages, path)
+        if page_count_holder is not None:
+            page_count_holder.append(page_count)
+        async for page in _stream_pdf_pages(
+            path,
+            executor=executor,
+            page_count=page_count,
+            pages_per_task=pages_per_task,
+            max_in_flight=max_workers or os.cpu_count() or 1,
+        ):
+            yield page
+    finally:
+        os.unlink(path)
+
+
+async def extract_text_from_bytes_async(
+    *,
+    file_bytes: bytes,
+    filename: str,
+    max_characters: Optional[int] = None,
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+    pages_per_task: int = 8,
+) -> ExtractedDocument:
+    """Extract an upload without blocking the event loop.
+
+    Pages are consumed in order until ``max_characters`` of text have been
+    collected; the remaining pages are never extracted. Without a budget the
+    text is identical to ``extract_text_from_bytes``.
+    """
+    source_document_type = _resolve_document_type(filename)
+    started_at = time.perf_counter()
+    page_count_holder: list[int] = []
+    pages: list[str] = []
+    collected_characters = 0
+    stopped_early = False
+
+    page_stream = stream_document_pages(
+        file_bytes=file_bytes,
+        filename=filename,
+        executor=executor,
+        max_workers=max_workers,
+        pages_per_task=pages_per_task,
+        page_count_holder=page_count_holder,
+    )
+    try:
+        async for page in page_stream:
+            pages.append(page)
+            collected_characters += len(page) + 1
+            if max_characters is not None and collected_characters >= max_characters:
+                stopped_early = True
+                break
+    finally:
+        await page_stream.aclose()
+
+    page_count = page_count_holder[0] if page_count_holder else len(pages)
+    stats = ExtractionStats(
+        page_count=page_count,
+        pages_extracted=len(pages),
+        stopped_early=stopped_early and len(pages) < page_count,
+        extract_ms=round((time.perf_counter() - started_at) * 1000, 2),
+    )
+    return _build_extracted_document(
+        text=sanitize_document_text("\n".join(pages)),
+        filename=filename,
         source_document_type=source_document_type,
-        title=derive_document_title(filename, cleaned_text),
-        source_characters=len(cleaned_text),
+        extraction=stats,
+    )
+
+
+async def extract_chunks_from_bytes_async(
+    *,
+    file_bytes: bytes,
+    filename: str,
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+    pages_per_task: int = 8,
+    max_chars: Optional[int] = None,
+    overlap_chars: Optional[int] = None,
+    max_chunks: Optional[int] = None,
+) -> tuple[ExtractedDocument, list[TextChunk]]:
+    """Extract an upload and chunk its pages as they arrive.
+
+    Pages stream from ``stream_document_pages`` into ``aiter_page_chunks``;
+    once ``max_chunks`` chunks are built the remaining pages are never
+    extracted. The chunks are those ``split_text_into_chunks`` returns for
+    the whole document, and the document's text is the pages read.
+    """
+    source_document_type = _resolve_document_type(filename)
+    started_at = time.perf_counter()
+    page_count_holder: list[int] = []
+    pages: list[str] = []
+
+    page_stream = stream_document_pages(
+        file_bytes=file_bytes,
+        filename=filename,
+        executor=executor,
+        max_workers=max_workers,
+        pages_per_task=pages_per_task,
+        page_count_holder=page_count_holder,
+    )
+
+    async def read_pages() -> AsyncIterator[str]:
+        async for page in page_stream:
+            pages.append(page)
+            yield page
+
+    page_reader = read_pages()
+    try:
+        chunks = [
+            chunk
+            async for chunk in aiter_page_chunks(
+                page_reader,
+                max_chars=max_chars,
+                overlap_chars=overlap_chars,
+                max_chunks=max_chunks,
+            )
+        ]
+    finally:
+        await page_reader.aclose()
+        await page_stream.aclose()
+
+    page_count = page_count_holder[0] if page_count_holder else len(pages)
+    stats = ExtractionStats(
+        page_count=page_count,
+        pages_extracted=len(pages),
+        stopped_early=len(pages) < page_count,
+        extract_ms=round((time.perf_counter() - started_at) * 1000, 2),
+    )
+    document = _build_extracted_document(
+        text=sanitize_document_text("\n".join(pages)),
+        filename=filename,
+        source_document_type=source_document_type,
+        extraction=stats,
     )
+    return document, chunks
 
 
 def extract_text_from_pasted_content(
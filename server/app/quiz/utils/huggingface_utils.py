@@ -4,18 +4,14 @@ from pathlib import Path
 
 import re
 
-import asyncio
-
-import functools
-
 from typing import Any, Dict, List, Optional
 
-from huggingface_hub import InferenceClient
-
 from dotenv import load_dotenv
 
 from server.app.quiz.repositories.token_repository import get_user_token
 
+from server.app.quiz.utils.inference_gateway import get_inference_session
+
 
 env_path = Path(__file__).resolve().parents[3] / ".env"
 
@@ -348,9 +344,6 @@ async def resolve_final_token(user_id: Optional[str], provided_token: Optional[s
 
 async def generate_quiz_with_huggingface(payload: Dict[str, Any]) -> Dict[str, Any]:
 
-    loop = asyncio.get_event_loop()
-
-
     user_id = payload.get("user_id")
 
     provided_token = payload.get("token")
@@ -359,46 +352,38 @@ async def generate_quiz_with_huggingface(payload: Dict[str, Any]) -> Dict[str, A
     final_token = await resolve_final_token(user_id, provided_token)
 
 
-    client = InferenceClient(token=final_token)
+    client = get_inference_session(final_token)
 
 
-    response = await loop.run_in_executor(
+    response = await client.chat_completion(
 
-        None,
+        model="deepseek-ai/DeepSeek-V3-0324",
 
-        functools.partial(
+        messages=[{
 
-            client.chat.completions.create,
+            "role": "user",
 
-            model="deepseek-ai/DeepSeek-V3-0324",
+            "content": build_prompt(
 
-            messages=[{
+                payload.get("profession", "General Knowledge"),
 
-                "role": "user",
+                payload.get("question_type", "multichoice").lower(),
 
-                "content": build_prompt(
+                payload.get("difficulty_level", "medium"),
 
-                    payload.get("profession", "General Knowledge"),
+                int(payload.get("num_questions", 5)),
 
-                    payload.get("question_type", "multichoice").lower(),
+                payload.get("audience_type", "general"),
 
-                    payload.get("difficulty_level", "medium"),
+                payload.get("custom_instruction")
 
-                    int(payload.get("num_questions", 5)),
-
-                    payload.get("audience_type", "general"),
-
-                    payload.get("custom_instruction")
-
-                )
-
-            }],
+            )
 
-            max_tokens=2048,
+        }],
 
-            temperature=0.7,
+        max_tokens=2048,
 
-        ),
+        temperature=0.7,
 
     )
 
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+import httpx
+from huggingface_hub import ChatCompletionOutput
+from huggingface_hub.errors import InferenceTimeoutError
+from huggingface_hub.inference._common import RequestParameters
+from huggingface_hub.inference._providers import get_provider_helper
+from huggingface_hub.utils import hf_raise_for_status
+
+from server.app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceBackpressureError(RuntimeError):
+    """Raised instead of queueing when a host already has too many waiters."""
+
+
+@dataclass
+class InferenceGatewayMetrics:
+    requests: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    waiting: int = 0
+    max_waiting: int = 0
+    wait_seconds_total: float = 0.0
+    clients_created: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class InferenceSession:
+    """Per-token view of the gateway, shaped like the bits of ``InferenceClient`` we use."""
+
+    def __init__(self, gateway: "InferenceGateway", *, token: Optional[str], provider: Optional[str]):
+        self._gateway = gateway
+        self.token = token
+        self.provider = provider
+        self.headers: dict[str, str] = {}
+
+    async def post(self, request_parameters: RequestParameters) -> bytes:
+        return await self._gateway.post(request_parameters)
+
+    async def chat_completion(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        temperature: float,
+    ) -> ChatCompletionOutput:
+        provider_helper = get_provider_helper(self.provider, task="conversational", model=model)
+        request_parameters = provider_helper.prepare_request(
+            inputs=messages,
+            parameters={
+                "model": model,
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+            },
+            headers=self.headers,
+            model=model,
+            api_key=self.token,
+        )
+        data = await self.post(request_parameters)
+        return ChatCompletionOutput.parse_obj_as_instance(data)
+
+    async def feature_extraction(
+        self,
+        inputs: list[str],
+        *,
+        model: str,
+        parameters: Optional[dict[str, Any]] = None,
+    ) -> Any:
+        provider_helper = get_provider_helper(self.provider, task="feature-extraction", model=model)
+        request_parameters = provider_helper.prepare_request(
+            inputs=inputs,
+            parameters=parameters or {},
+            headers=self.headers,
+            model=model,
+            api_key=self.token,
+        )
+        response = await self.post(request_parameters)
+        return provider_helper.get_response(response, request_parameters)
+
+
+class InferenceGateway:
+    """One pooled ``httpx.AsyncClient`` shared by every inference call.
+
+    Connections are kept alive across requests and tokens. Each host gets at
+    most ``max_connections_per_host`` requests in flight; up to
+    ``max_waiting_per_host`` more wait for a slot, and anything beyond that
+    fails fast with ``InferenceBackpressureError``.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 64,
+        max_keepalive_connections: int = 32,
+        keepalive_expiry_seconds: float = 30.0,
+        max_connections_per_host: int = 16,
+        max_waiting_per_host: int = 256,
+        timeout_seconds: float = 120.0,
+        connect_timeout_seconds: float = 10.0,
+        max_sessions: int = 256,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if max_connections_per_host < 1:
+            raise ValueError("max_connections_per_host must be at least 1")
+
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        )
+        self._timeout = httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds)
+        self._max_connections_per_host = max_connections_per_host
+        self._max_waiting_per_host = max_waiting_per_host
+        self._max_sessions = max_sessions
+        self._transport = transport
+
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._host_waiting: dict[str, int] = {}
+        self._sessions: OrderedDict[tuple[Optional[str], Optional[str]], InferenceSession] = OrderedDict()
+        self.metrics = InferenceGatewayMetrics()
+
+    def session(self, token: Optional[str], *, provider: Optional[str] = None) -> InferenceSession:
+        key = (token, provider)
+        session = self._sessions.get(key)
+        if session is None:
+            session = InferenceSession(self, token=token, provider=provider)
+            self._sessions[key] = session
+            if len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(key)
+        return session
+
+    def _http_client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the loop that opened them; a new loop
+        # (tests, worker restarts) gets a fresh pool.
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http_loop is not loop or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                limits=self._limits,
+                timeout=self._timeout,
+                transport=self._transport,
+            )
+            self._http_loop = loop
+            self._host_slots = {}
+            self._host_waiting = {}
+            self.metrics.clients_created += 1
+        return self._http
+
+    async def post(self, request_parameters: RequestParameters) -> bytes:
+        http = self._http_client()
+        host = httpx.URL(request_parameters.url).host
+        slots = self._host_slots.get(host)
+        if slots is None:
+            slots = self._host_slots[host] = asyncio.Semaphore(self._max_connections_per_host)
+
+        waiting = self._host_waiting.get(host, 0)
+        if slots.locked() and waiting >= self._max_waiting_per_host:
+            self.metrics.rejected += 1
+            logger.warning(
+                "Rejecting inference request to %s: %s requests already waiting",
+                host,
+                waiting,
+            )
+            raise InferenceBackpressureError(
+                f"Too many inference requests queued for {host}; try again shortly."
+            )
+
+        self._host_waiting[host] = waiting + 1
+        self.metrics.waiting += 1
+        self.metrics.max_waiting = max(self.metrics.max_waiting, self.metrics.waiting)
+        queued_at = time.perf_counter()
+        try:
+            await slots.acquire()
+        finally:
+            self._host_waiting[host] -= 1
+            self.metrics.waiting -= 1
+        self.metrics.wait_seconds_total += time.perf_counter() - queued_at
+
+        self.metrics.requests += 1
+        self.metrics.in_flight += 1
+        self.metrics.max_in_flight = max(self.metrics.max_in_flight, self.metrics.in_flight)
+        try:
+            response = await http.post(
+                request_parameters.url,
+                json=request_parameters.json,
+                content=request_parameters.data,
+                headers=request_parameters.headers,
+            )
+            hf_raise_for_status(response)
+            return response.content
+        except httpx.TimeoutException as error:
+            self.metrics.failures += 1
+            self.metrics.timeouts += 1
+            raise InferenceTimeoutError(
+                f"Inference call timed out: {request_parameters.url}"
+            ) from error
+        except Exception:
+            self.metrics.failures += 1
+            raise
+        finally:
+            self.metrics.in_flight -= 1
+            slots.release()
+
+    async def aclose(self) -> None:
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+        self._http_loop = None
+
+
+_gateway: Optional[InferenceGateway] = None
+
+
+def get_inference_gateway() -> InferenceGateway:
+    global _gateway
+    if _gateway is None:
+        _gateway = InferenceGateway(
+            max_connections=settings.HF_INFERENCE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HF_INFERENCE_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections_per_host=settings.HF_INFERENCE_MAX_CONNECTIONS_PER_HOST,
+            max_waiting_per_host=settings.HF_INFERENCE_MAX_WAITING_PER_HOST,
+            timeout_seconds=settings.HF_INFERENCE_TIMEOUT_SECONDS,
+            connect_timeout_seconds=settings.HF_INFERENCE_CONNECT_TIMEOUT_SECONDS,
+        )
+    return _gateway
+
+
+def get_inference_session(token: Optional[str]) -> InferenceSession:
+    return get_inference_gateway().session(token)
+
+
+async def close_inference_gateway() -> None:
+    global _gateway
+    if _gateway is not None:
+        await _gateway.aclose()
+        _gateway = None
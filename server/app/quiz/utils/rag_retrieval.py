@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Union
+
+import numpy as np
+
+
+QUERY_SCORE_WEIGHT = 0.7
+CENTROID_SCORE_WEIGHT = 0.3
+MMR_RELEVANCE_WEIGHT = 0.7
+MMR_DIVERSITY_WEIGHT = 0.3
+MMR_POOL_MULTIPLIER = 3
+
+EmbeddingMatrixInput = Union[np.ndarray, Sequence[Sequence[float]]]
+EmbeddingVectorInput = Union[np.ndarray, Sequence[float]]
+
+
+@dataclass(frozen=True)
+class ScoredChunkIndex:
+    index: int
+    score: float
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    # Zero rows stay zero so they score 0.0 against everything, matching the
+    # zero-norm guard of the scalar cosine similarity.
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms != 0)
+
+
+def _normalize_vector(vector: EmbeddingVectorInput) -> np.ndarray:
+    values = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(values)
+    if norm == 0:
+        return np.zeros_like(values)
+    return values / norm
+
+
+class ChunkEmbeddingIndex:
+    """Row-normalized float32 matrix of chunk embeddings for batched retrieval.
+
+    Scoring mirrors the original per-chunk implementation: a 0.7/0.3 blend of
+    query and centroid cosine similarity, followed by an MMR pass over the
+    top ``3 * top_k`` candidates.
+    """
+
+    def __init__(self, embeddings: EmbeddingMatrixInput):
+        raw = np.asarray(embeddings, dtype=np.float32)
+        if raw.size == 0:
+            raw = raw.reshape(0, 0)
+        if raw.ndim != 2:
+            raise ValueError("Chunk embeddings must be a two-dimensional matrix.")
+
+        self._matrix = _normalize_rows(raw)
+        self._matrix.setflags(write=False)
+        # The centroid is the mean of the embeddings as supplied, not of the
+        # normalized rows, so scores stay comparable with the list-based path.
+        self._centroid = (
+            _normalize_vector(raw.mean(axis=0, dtype=np.float64))
+            if len(raw)
+            else np.zeros(raw.shape[1], dtype=np.float32)
+        )
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._matrix
+
+    @property
+    def size(self) -> int:
+        return int(self._matrix.shape[0])
+
+    @property
+    def dimensions(self) -> int:
+        return int(self._matrix.shape[1])
+
+    def query_similarities(self, query_embedding: EmbeddingVectorInput) -> np.ndarray:
+        query = _normalize_vector(query_embedding)
+        if query.size == 0 or self.size == 0:
+            return np.zeros(self.size, dtype=np.float64)
+        return (self._matrix @ query).astype(np.float64)
+
+    def centroid_similarities(self) -> np.ndarray:
+        if self.size == 0:
+            return np.zeros(0, dtype=np.float64)
+        return (self._matrix @ self._centroid).astype(np.float64)
+
+    def hybrid_scores(self, query_embedding: EmbeddingVectorInput) -> np.ndarray:
+        return (
+            QUERY_SCORE_WEIGHT * self.query_similarities(query_embedding)
+        ) + (CENTROID_SCORE_WEIGHT * self.centroid_similarities())
+
+    def select(
+        self,
+        query_embedding: EmbeddingVectorInput,
+        *,
+        top_k: int,
+    ) -> list[ScoredChunkIndex]:
+        if self.size == 0 or top_k <= 0:
+            return []
+
+        hybrid_scores = self.hybrid_scores(query_embedding)
+        # A stable sort on the negated scores keeps ties in chunk order, the
+        # same ordering ``sorted(..., reverse=True)`` produced.
+        ranked = np.argsort(-hybrid_scores, kind="stable")
+        pool = ranked[: top_k * MMR_POOL_MULTIPLIER]
+        pool_vectors = self._matrix[pool]
+        pool_similarities = pool_vectors @ pool_vectors.T
+
+        selected_positions: list[int] = []
+        max_similarity_to_selected = np.full(len(pool), -np.inf, dtype=np.float32)
+
+        for position, index in enumerate(pool):
+            if len(selected_positions) >= top_k:
+                break
+            if selected_positions:
+                diversity_penalty = float(max_similarity_to_selected[position])
+                mmr_score = (MMR_RELEVANCE_WEIGHT * hybrid_scores[index]) - (
+                    MMR_DIVERSITY_WEIGHT * diversity_penalty
+                )
+                if not mmr_score > -1:
+                    continue
+
+            selected_positions.append(position)
+            np.maximum(
+                max_similarity_to_selected,
+                pool_similarities[position],
+                out=max_similarity_to_selected,
+            )
+
+        selected_indices = [int(pool[position]) for position in selected_positions]
+        target_count = min(top_k, self.size)
+        if len(selected_indices) < target_count:
+            chosen = set(selected_indices)
+            for index in ranked:
+                index = int(index)
+                if index not in chosen:
+                    chosen.add(index)
+                    selected_indices.append(index)
+                if len(selected_indices) >= target_count:
+                    break
+
+        return [
+            ScoredChunkIndex(index=index, score=float(hybrid_scores[index]))
+            for index in selected_indices
+        ]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+from .generate_docx import generate_docx
+from .generate_json import generate_json
+from .generate_pdf import generate_pdf
+from .generate_txt import generate_txt
+
+
+EXPORT_MEDIA_TYPES = {
+    "txt": "text/plain",
+    "json": "application/json",
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+_GENERATORS = {
+    "txt": generate_txt,
+    "json": generate_json,
+    "pdf": generate_pdf,
+    "docx": generate_docx,
+}
+
+
+def render_export(payload: dict[str, Any], file_format: str) -> bytes:
+    """The file a download payload renders to; text formats are UTF-8 encoded."""
+    content = _GENERATORS[file_format](payload).getvalue()
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+def render_export_file(payload: dict[str, Any], file_format: str, path: str) -> int:
+    """Render into ``path`` atomically and return its size.
+
+    Runs in the export pool: the bytes go straight to disk from the worker
+    instead of back through the event loop's process.
+    """
+    content = render_export(payload, file_format)
+    target = Path(path)
+    descriptor, temporary = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(descriptor, "wb") as handle:
+            handle.write(content)
+        os.replace(temporary, target)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+    return len(content)
+
+
+_export_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_export_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool shared by all export renders in this process.
+
+    reportlab and python-docx hold the GIL while they render, so a process
+    pool is what keeps PDF and DOCX exports off the event loop. Worker count
+    is fixed by the first caller.
+    """
+    global _export_pool
+    if _export_pool is None:
+        _export_pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _export_pool
+
+
+def shutdown_export_pool() -> None:
+    global _export_pool
+    if _export_pool is not None:
+        _export_pool.shutdown(wait=False, cancel_futures=True)
+        _export_pool = None
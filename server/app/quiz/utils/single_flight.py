@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    started: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """Run at most one job per key at a time within this event loop.
+
+    Callers that arrive while a job for their key is running await that job
+    instead of starting another. The job runs as its own task, so a caller
+    that is cancelled (e.g. a client disconnect) does not cancel it for the
+    others. Results are not kept once the job finishes.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Task[T]] = {}
+        self.stats = SingleFlightStats()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def run(self, key: Hashable, job: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for coalesced callers."""
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(job())
+        self.stats.started += 1
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task), False
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter went away.
+            task.exception()
@@ -7,11 +7,12 @@ from server.app.core.config import settings
 from server.app.db.core.connection import (
     get_folder_items_v2_collection,
     get_folders_v2_collection,
+    get_quiz_access_v2_collection,
     get_quiz_history_v2_collection,
     get_quizzes_v2_collection,
     get_saved_quizzes_v2_collection,
 )
-from server.app.quiz.repositories.v2.models.quiz_models import QuizDocumentV2
+from server.app.quiz.repositories.v2.models.quiz_models import QuizRawDocumentV2
 from server.app.quiz.repositories.v2.repositories.quiz_repository import QuizV2Repository
 from server.app.quiz.repositories.v2.repositories.reference_repository import ReferenceV2Repository
 
@@ -44,6 +45,7 @@ class SharedQuizReadService:
                 get_folder_items_v2_collection(),
                 get_saved_quizzes_v2_collection(),
                 get_quiz_history_v2_collection(),
+                get_quiz_access_v2_collection(),
             )
         )
 
@@ -53,31 +55,32 @@ class SharedQuizReadService:
         logger.info("%s | %s", event, fields)
 
     @staticmethod
-    def _normalize_v2_quiz(quiz_doc: QuizDocumentV2) -> dict[str, Any]:
-        topic = quiz_doc.title or "General Knowledge"
+    def _normalize_v2_quiz(quiz_doc: QuizRawDocumentV2) -> dict[str, Any]:
+        title = quiz_doc.get("title")
+        topic = title or "General Knowledge"
         return {
-            "id": str(quiz_doc.id),
-            "title": quiz_doc.title,
-            "description": quiz_doc.description or build_default_description(topic),
-            "quiz_type": quiz_doc.quiz_type.value,
+            "id": str(quiz_doc["_id"]),
+            "title": title,
+            "description": quiz_doc.get("description") or build_default_description(topic),
+            "quiz_type": quiz_doc.get("quiz_type"),
             # correct_answer is deliberately omitted: shared quizzes are served
             # to anonymous callers, and answers in the payload are readable in
             # the browser's network inspector.
             "questions": [
                 {
-                    "question": question.question,
-                    "options": question.options,
+                    "question": question.get("question"),
+                    "options": question.get("options"),
                 }
-                for question in quiz_doc.questions
+                for question in quiz_doc.get("questions") or []
             ],
         }
 
     async def resolve_shared_quiz(self, quiz_id: str) -> Optional[dict[str, Any]]:
-        quiz_doc = await self.quiz_repository.find_by_id(quiz_id)
+        quiz_doc = await self.quiz_repository.find_raw_by_id(quiz_id)
         if not quiz_doc:
             saved_reference = await self.reference_repository.get_saved_quiz_by_public_id(quiz_id)
             if saved_reference:
-                quiz_doc = await self.quiz_repository.find_by_id(saved_reference.quiz_id)
+                quiz_doc = await self.quiz_repository.find_raw_by_id(saved_reference.quiz_id)
 
         payload = self._normalize_v2_quiz(quiz_doc) if quiz_doc else None
         self._log("quiz_read_v2_served", operation="shared_quiz_detail", read_mode="v2_only", quiz_id=quiz_id)
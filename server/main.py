@@ -18,13 +18,25 @@ from server.app.core.rate_limiter import limiter, rate_limit_handler
 from server.app.db.core.connection import (
     database,
     get_auth_events_collection,
+    get_live_quiz_aggregates_collection,
+    get_live_quiz_sessions_collection,
     get_quizzes_collection,
+    get_quizzes_v2_collection,
     get_user_sessions_collection,
     get_users_collection,
     startUp,
 )
 from server.app.mcp.middleware import McpAuthorizationHeaderMiddleware
 from server.app.mcp.server import create_mcp_server
+from server.app.quiz.repositories.live_quiz_aggregate_repository import LiveQuizAggregateRepository
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.services.live_quiz_expiry_sweeper import build_live_quiz_expiry_sweeper
+from server.app.quiz.services.live_quiz_realtime import live_quiz_realtime_broadcaster
+from server.app.quiz.services.live_quiz_snapshot_cache import live_quiz_snapshot_cache
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.app.quiz.utils.extract_text import shutdown_extraction_pool
+from server.app.quiz.utils.inference_gateway import close_inference_gateway
+from server.app.quiz.utils.render_export import shutdown_export_pool
 
 
 logging.basicConfig(
@@ -48,12 +60,30 @@ async def lifespan(app: FastAPI):
     app.state.user_sessions_collection = get_user_sessions_collection()
     app.state.auth_events_collection = get_auth_events_collection()
     app.state.quizzes_collection = get_quizzes_collection()
+    await live_quiz_realtime_broadcaster.start(redis_client)
+    live_quiz_expiry_sweeper = build_live_quiz_expiry_sweeper(
+        LiveQuizSessionService(
+            LiveQuizSessionRepository(
+                get_quizzes_v2_collection(),
+                get_live_quiz_sessions_collection(),
+            ),
+            broadcaster=live_quiz_realtime_broadcaster,
+            snapshot_cache=live_quiz_snapshot_cache,
+            aggregates=LiveQuizAggregateRepository(get_live_quiz_aggregates_collection()),
+        )
+    )
+    await live_quiz_expiry_sweeper.start(redis_client)
 
     async with mcp_server.session_manager.run():
         yield
 
+    await live_quiz_expiry_sweeper.stop()
+    await live_quiz_realtime_broadcaster.stop()
     get_users_collection().database.client.close()
     await redis_client.close()
+    await close_inference_gateway()
+    shutdown_extraction_pool()
+    shutdown_export_pool()
 
 
 app = FastAPI(lifespan=lifespan)
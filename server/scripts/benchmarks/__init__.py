@@ -0,0 +1 @@
+"""Standalone performance benchmarks for hot server paths."""
@@ -0,0 +1,55 @@
+"""Compare per-answer grading with the batch grading engine.
+
+The input is ``--answers`` graded answers across every question type, with
+the repetition a real quiz has: many participants give the same handful of
+answers to the same questions. The legacy graders normalize and fuzzy-score
+one answer at a time; ``grade_batch`` normalizes each distinct string once
+and scores the distinct fuzzy pairs in a single rapidfuzz call.
+
+Run with ``python -m server.scripts.benchmarks.batch_grading``.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from server.app.quiz.utils.batch_grading import grade_batch
+from server.scripts.benchmarks.timing import best_time_per_call, format_table
+from server.tests.legacy_grading import legacy_grade_mock_answers, legacy_grade_with_ai
+from server.tests.quiz_factories import build_answers
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark batch answer grading")
+    parser.add_argument("--answers", type=int, default=10_000)
+    parser.add_argument("--questions", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    answers = build_answers(args.answers, questions=args.questions)
+    rows = []
+    for source, legacy in (("mock", legacy_grade_mock_answers), ("ai", legacy_grade_with_ai)):
+        assert grade_batch(answers, source).rows() == legacy(answers)
+        legacy_seconds = best_time_per_call(lambda: legacy(answers), repeat=args.repeat)
+        batch_seconds = best_time_per_call(lambda: grade_batch(answers, source), repeat=args.repeat)
+        rows_seconds = best_time_per_call(lambda: grade_batch(answers, source).rows(), repeat=args.repeat)
+        rows.append((
+            source,
+            f"{legacy_seconds * 1000:,.1f}",
+            f"{batch_seconds * 1000:,.1f}",
+            f"{rows_seconds * 1000:,.1f}",
+            f"{legacy_seconds / rows_seconds:.1f}x",
+        ))
+
+    print(f"{args.answers:,} answers to {args.questions} questions, best of {args.repeat}")
+    print(format_table(
+        ("source", "per-answer ms", "batch ms", "batch + rows ms", "speedup"),
+        rows,
+    ))
+
+
+if __name__ == "__main__":
+    main()
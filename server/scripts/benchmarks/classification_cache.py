@@ -0,0 +1,178 @@
+"""Replay AI quiz saves with and without the fingerprint check and classification cache.
+
+The model call is replaced by a sleep of ``--model-latency-ms`` and the quiz
+collection by a dict, so the numbers isolate how many classifier calls a
+stream of saves with repeated topics and repeated quizzes costs.
+
+Run with ``python -m server.scripts.benchmarks.classification_cache``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+from bson import ObjectId
+
+from server.app.quiz.repositories import ai_generated_quiz_repository
+from server.app.quiz.services import category_taxonomy_service
+from server.app.quiz.services.canonical_quiz_service import CanonicalQuizWriteService
+from server.app.quiz.services.category_taxonomy_service import (
+    build_classification,
+    classify_quiz_taxonomy,
+    get_taxonomy_entries,
+    normalize_quiz_type,
+)
+from server.app.quiz.services.taxonomy_classification_cache import TaxonomyClassificationCache
+from server.scripts.benchmarks.timing import format_table
+from server.tests.redis_fake import FakeRedis
+
+
+class InMemoryQuizRepository:
+    def __init__(self):
+        self.by_fingerprint = {}
+
+    async def find_by_content_fingerprint(self, content_fingerprint):
+        return self.by_fingerprint.get(content_fingerprint)
+
+    async def find_or_create_by_fingerprint(self, quiz):
+        existing = self.by_fingerprint.get(quiz.content_fingerprint)
+        if existing:
+            return existing
+        stored = quiz.model_copy(update={"id": ObjectId()})
+        self.by_fingerprint[quiz.content_fingerprint] = stored
+        return stored
+
+
+async def legacy_save_ai_generated_quiz(quiz_data: dict, canonical_service: CanonicalQuizWriteService):
+    quiz_type = normalize_quiz_type(quiz_data.get("question_type", "multichoice"))
+    classification = await classify_quiz_taxonomy(
+        quiz_type=quiz_type,
+        title=quiz_data.get("profession") or "General Knowledge",
+        profession=quiz_data.get("profession"),
+        custom_instruction=quiz_data.get("custom_instruction"),
+        questions=quiz_data.get("questions", []),
+        token=quiz_data.get("token"),
+        use_ai=True,
+    )
+    taxonomy_fields = classification.to_quiz_fields() if classification else {}
+    quiz_document = canonical_service.build_quiz_document(
+        title=quiz_data.get("profession") or "General Knowledge",
+        description=quiz_data.get("custom_instruction"),
+        quiz_type=quiz_type,
+        owner_user_id=quiz_data.get("user_id"),
+        source="ai",
+        questions=quiz_data["questions"],
+        tags=taxonomy_fields.get("tags"),
+        category=taxonomy_fields.get("category"),
+        category_slug=taxonomy_fields.get("category_slug"),
+        subcategory=taxonomy_fields.get("subcategory"),
+        subcategory_slug=taxonomy_fields.get("subcategory_slug"),
+        classification=taxonomy_fields.get("classification"),
+    )
+    return await canonical_service.find_or_create_quiz_v2_by_fingerprint(quiz_document)
+
+
+def build_save_stream(saves: int, topics: int, *, duplicate_ratio: float, seed: int = 7) -> list[dict]:
+    """Saves over ``topics`` topics; ``duplicate_ratio`` of them resave an earlier quiz."""
+    rng = random.Random(seed)
+    stream: list[dict] = []
+    for _ in range(saves):
+        if stream and rng.random() < duplicate_ratio:
+            stream.append(rng.choice(stream))
+            continue
+        topic = rng.randrange(topics)
+        stream.append(
+            {
+                "profession": f"Topic {topic} specialist",
+                "question_type": "multichoice",
+                "custom_instruction": f"Cover topic {topic} fundamentals",
+                "token": "benchmark-token",
+                "user_id": "benchmark-user",
+                "questions": [
+                    {
+                        "question": f"Topic {topic} question",
+                        # Option order changes the quiz fingerprint but not its topic.
+                        "options": rng.sample(["alpha", "beta", "gamma", "delta"], 4),
+                        "answer": "alpha",
+                    }
+                ],
+            }
+        )
+    return stream
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the quiz classification cache")
+    parser.add_argument("--saves", type=int, default=200)
+    parser.add_argument("--topics", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--duplicate-ratio", type=float, default=0.3)
+    parser.add_argument("--model-latency-ms", type=float, default=40.0)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    entry = get_taxonomy_entries()[0]
+    model_calls = 0
+
+    async def fake_model(text, quiz_type, token):
+        nonlocal model_calls
+        model_calls += 1
+        await asyncio.sleep(args.model_latency_ms / 1000)
+        return build_classification(entry, quiz_type, method="ai", confidence=0.9)
+
+    category_taxonomy_service.classify_with_huggingface = fake_model
+    rows = []
+
+    for topics in args.topics:
+        stream = build_save_stream(args.saves, topics, duplicate_ratio=args.duplicate_ratio)
+
+        for label in ("classify every save", "fingerprint + cache"):
+            canonical_service = CanonicalQuizWriteService(repository=InMemoryQuizRepository())
+            ai_generated_quiz_repository.canonical_service = canonical_service
+            redis_client = FakeRedis()
+
+            async def redis_factory():
+                return redis_client
+
+            cache = TaxonomyClassificationCache(redis_client_factory=redis_factory)
+            model_calls = 0
+
+            async def replay():
+                for quiz_data in stream:
+                    if label == "classify every save":
+                        await legacy_save_ai_generated_quiz(quiz_data, canonical_service)
+                    else:
+                        await ai_generated_quiz_repository.save_ai_generated_quiz(
+                            quiz_data, classification_cache=cache
+                        )
+
+            started = time.perf_counter()
+            asyncio.run(replay())
+            seconds = time.perf_counter() - started
+            stats = cache.stats
+            rows.append(
+                (
+                    topics,
+                    label,
+                    model_calls,
+                    stats.stored_quiz_hits,
+                    stats.memory_hits + stats.redis_hits,
+                    f"{seconds * 1000:.0f}",
+                )
+            )
+
+    print(f"{args.saves} saves, {args.duplicate_ratio:.0%} exact resaves, {args.model_latency_ms:.0f} ms model latency")
+    print(
+        format_table(
+            ("topics", "save path", "model calls", "stored-quiz hits", "cache hits", "wall ms"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
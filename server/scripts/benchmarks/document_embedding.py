@@ -0,0 +1,106 @@
+"""Compare serial and batched document embedding against a stub endpoint.
+
+The stub charges a fixed per-request latency (network + scheduling) plus a
+per-input latency (model compute), which is where batching pays off.
+
+Run with ``python -m server.scripts.benchmarks.document_embedding``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from server.app.quiz.utils.embedding_client import BatchEmbeddingClient
+from server.app.quiz.utils.inference_gateway import InferenceGateway
+from server.scripts.benchmarks.timing import format_table
+from server.tests.inference_stub import StubInferenceServer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark document chunk embedding")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[24, 100])
+    parser.add_argument("--request-latency-ms", type=float, default=80.0)
+    parser.add_argument("--input-latency-ms", type=float, default=2.0)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    return parser.parse_args()
+
+
+async def _time_embedding(client: BatchEmbeddingClient, texts: list[str]) -> float:
+    started = time.perf_counter()
+    await client.embed(texts)
+    return time.perf_counter() - started
+
+
+async def _time_serial_path(client: BatchEmbeddingClient, texts: list[str]) -> float:
+    # One request per chunk, then one for the query: the pre-batching flow.
+    started = time.perf_counter()
+    for text in texts:
+        await client.embed([text])
+    return time.perf_counter() - started
+
+
+def main():
+    args = parse_args()
+    rows = []
+    with StubInferenceServer(
+        dimensions=384,
+        latency_seconds=args.request_latency_ms / 1000,
+        per_input_latency_seconds=args.input_latency_ms / 1000,
+    ) as stub:
+        inference_client = InferenceGateway().session("benchmark-token")
+        serial_client = BatchEmbeddingClient(
+            inference_client,
+            model=stub.url,
+            batch_size=1,
+            max_concurrency=1,
+        )
+        batched_client = BatchEmbeddingClient(
+            inference_client,
+            model=stub.url,
+            batch_size=args.batch_size,
+            max_concurrency=args.max_concurrency,
+        )
+
+        for chunk_count in args.chunks:
+            texts = [f"chunk {index} " * 40 for index in range(chunk_count)]
+            texts.append("retrieval query")
+
+            stub.requests.clear()
+            serial_seconds = asyncio.run(_time_serial_path(serial_client, texts))
+            serial_requests = len(stub.requests)
+
+            stub.requests.clear()
+            batched_seconds = asyncio.run(_time_embedding(batched_client, texts))
+            batched_requests = len(stub.requests)
+
+            rows.append(
+                (
+                    chunk_count,
+                    serial_requests,
+                    f"{serial_seconds * 1000:.0f}",
+                    batched_requests,
+                    f"{batched_seconds * 1000:.0f}",
+                    f"{serial_seconds / batched_seconds:.1f}x",
+                )
+            )
+
+    print(
+        format_table(
+            (
+                "chunks",
+                "serial requests",
+                "serial ms",
+                "batched requests",
+                "batched ms",
+                "speedup",
+            ),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Compare in-loop and page-parallel extraction of a large synthetic PDF.
+
+Besides wall time, each async variant reports the worst event-loop lag seen
+by a 10 ms heartbeat task while extraction runs; the in-loop baseline holds
+the loop for the entire document. The chunked variant is what the document
+quiz route runs: pages are chunked as they arrive and extraction stops at
+``--max-chunks``.
+
+Run with ``python -m server.scripts.benchmarks.document_extraction``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from server.app.quiz.utils.extract_text import (
+    extract_chunks_from_bytes_async,
+    extract_text_from_bytes,
+    extract_text_from_bytes_async,
+)
+from server.scripts.benchmarks.timing import format_table
+from server.tests.document_factories import build_synthetic_pdf
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark document text extraction")
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--pages-per-task", type=int, default=8)
+    parser.add_argument(
+        "--budget-chars",
+        type=int,
+        default=(24 + 2) * 1600,
+        help="Early-stop budget; the default matches the stock RAG chunk settings.",
+    )
+    parser.add_argument("--max-chunks", type=int, default=24)
+    return parser.parse_args()
+
+
+async def _measure(coroutine_factory) -> tuple[float, float]:
+    """Run a coroutine alongside a heartbeat; return (seconds, worst lag ms)."""
+    worst_lag = 0.0
+    running = True
+
+    async def heartbeat():
+        nonlocal worst_lag
+        interval = 0.01
+        while running:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            worst_lag = max(worst_lag, time.perf_counter() - expected)
+
+    monitor = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await coroutine_factory()
+    elapsed = time.perf_counter() - started
+    running = False
+    await monitor
+    return elapsed, worst_lag * 1000
+
+
+async def _run(args, pdf_bytes: bytes, executor: ProcessPoolExecutor):
+    async def in_loop():
+        extract_text_from_bytes(file_bytes=pdf_bytes, filename="synthetic.pdf")
+
+    async def pooled(max_characters=None):
+        return await extract_text_from_bytes_async(
+            file_bytes=pdf_bytes,
+            filename="synthetic.pdf",
+            executor=executor,
+            max_workers=args.workers,
+            pages_per_task=args.pages_per_task,
+            max_characters=max_characters,
+        )
+
+    # Spin the workers up so pool start-up cost is not billed to a variant.
+    await pooled(max_characters=1)
+
+    rows = []
+    seconds, lag = await _measure(in_loop)
+    rows.append(("sync, in event loop", args.pages, f"{seconds * 1000:.0f}", f"{lag:.0f}"))
+
+    full = await pooled()
+    seconds, lag = await _measure(pooled)
+    rows.append(
+        ("process pool, full", full.extraction.pages_extracted, f"{seconds * 1000:.0f}", f"{lag:.0f}")
+    )
+
+    budgeted = await pooled(args.budget_chars)
+    seconds, lag = await _measure(lambda: pooled(args.budget_chars))
+    rows.append(
+        (
+            "process pool, early stop",
+            budgeted.extraction.pages_extracted,
+            f"{seconds * 1000:.0f}",
+            f"{lag:.0f}",
+        )
+    )
+
+    async def chunked():
+        return await extract_chunks_from_bytes_async(
+            file_bytes=pdf_bytes,
+            filename="synthetic.pdf",
+            executor=executor,
+            max_workers=args.workers,
+            pages_per_task=args.pages_per_task,
+            max_chunks=args.max_chunks,
+        )
+
+    document, _ = await chunked()
+    seconds, lag = await _measure(chunked)
+    rows.append(
+        (
+            "process pool, chunked",
+            document.extraction.pages_extracted,
+            f"{seconds * 1000:.0f}",
+            f"{lag:.0f}",
+        )
+    )
+    return rows
+
+
+def main():
+    args = parse_args()
+    pdf_bytes = build_synthetic_pdf(args.pages)
+    print(f"{args.pages}-page PDF, {len(pdf_bytes):,} bytes, {args.workers} workers")
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        rows = asyncio.run(_run(args, pdf_bytes, executor))
+
+    print(format_table(("variant", "pages read", "wall ms", "max loop lag ms"), rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Compare document_rag_cache entry size and decode time across formats.
+
+Decode time covers BSON decoding (what the driver does on ``find_one``) plus
+turning the entry into chunks and an embedding matrix.
+
+Run with ``python -m server.scripts.benchmarks.document_rag_cache``.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import bson
+import numpy as np
+
+from server.app.quiz.repositories.document_rag_repository import (
+    _deserialize_cached_document,
+    _deserialize_legacy_cached_chunks,
+    _serialize_cache_payload,
+)
+from server.app.quiz.utils.chunk_text import TextChunk
+from server.scripts.benchmarks.timing import best_time_per_call, format_table
+
+
+def _legacy_payload(chunks: list[TextChunk], embeddings: np.ndarray) -> dict:
+    return {
+        "chunks": [
+            {
+                "chunk_id": chunk.chunk_id,
+                "content": chunk.content,
+                "char_count": chunk.char_count,
+                "embedding": [float(value) for value in embedding],
+            }
+            for chunk, embedding in zip(chunks, embeddings)
+        ]
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark RAG cache encodings")
+    parser.add_argument("--chunks", type=int, default=24)
+    parser.add_argument("--chunk-chars", type=int, default=1600)
+    parser.add_argument("--dimensions", type=int, default=384)
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    generator = np.random.default_rng(7)
+    embeddings = generator.standard_normal((args.chunks, args.dimensions)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    chunks = [
+        TextChunk(chunk_id=index, content="x" * args.chunk_chars, char_count=args.chunk_chars)
+        for index in range(args.chunks)
+    ]
+
+    def embedding_bytes(payload: dict) -> int:
+        # Size of the entry minus the chunk text, which every format shares.
+        without_text = {
+            **payload,
+            "chunks": [{**chunk, "content": ""} for chunk in payload["chunks"]],
+        }
+        return len(bson.encode(without_text))
+
+    legacy_raw = bson.encode(_legacy_payload(chunks, embeddings))
+    rows = [
+        (
+            "v1 array",
+            len(legacy_raw),
+            embedding_bytes(_legacy_payload(chunks, embeddings)),
+            f"{best_time_per_call(lambda: _deserialize_legacy_cached_chunks(bson.decode(legacy_raw)['chunks']), repeat=args.repeat) * 1000:.3f}",
+        )
+    ]
+    for encoding in ("float32", "int8"):
+        payload = _serialize_cache_payload(
+            chunks=chunks,
+            chunk_embeddings=embeddings,
+            embedding_encoding=encoding,
+        )
+        raw = bson.encode(payload)
+        rows.append(
+            (
+                f"v2 {encoding}",
+                len(raw),
+                embedding_bytes(payload),
+                f"{best_time_per_call(lambda: _deserialize_cached_document(bson.decode(raw)), repeat=args.repeat) * 1000:.3f}",
+            )
+        )
+
+    print(
+        f"{args.chunks} chunks x {args.dimensions} dims, "
+        f"{args.chunk_chars} chars of text per chunk"
+    )
+    print(
+        format_table(
+            ("format", "entry bytes", "bytes excl. text", "decode ms"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Load-test concurrent identical uploads with and without single-flight.
+
+The document cache is an in-memory dict and the embedding endpoint is the
+test stub, so the numbers isolate how many embedding calls N simultaneous
+uploads of the same handout cost.
+
+Run with ``python -m server.scripts.benchmarks.embedding_single_flight``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from server.app.quiz.utils import ai_generate
+from server.app.quiz.utils.chunk_text import TextChunk
+from server.app.quiz.utils.embedding_client import BatchEmbeddingClient
+from server.app.quiz.utils.extract_text import ExtractedDocument
+from server.app.quiz.utils.inference_gateway import InferenceGateway
+from server.app.quiz.utils.single_flight import SingleFlight
+from server.scripts.benchmarks.timing import format_table
+from server.tests.inference_stub import StubInferenceServer
+from server.tests.redis_fake import FakeRedis
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark coalesced document embedding")
+    parser.add_argument("--uploads", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--chunks", type=int, default=24)
+    parser.add_argument("--request-latency-ms", type=float, default=80.0)
+    return parser.parse_args()
+
+
+def _install_memory_cache() -> None:
+    entries: dict[str, np.ndarray] = {}
+
+    async def get_cached(*, document, **_):
+        return entries.get(document.text)
+
+    async def upsert(*, document, chunk_embeddings, **_):
+        entries[document.text] = np.asarray(chunk_embeddings, dtype=np.float32)
+
+    ai_generate.settings.DOCUMENT_RAG_CACHE_ENABLED = True
+    ai_generate.settings.DOCUMENT_CHUNK_EMBEDDING_CACHE_ENABLED = False
+    ai_generate.get_cached_document_embeddings = get_cached
+    ai_generate.upsert_document_embeddings = upsert
+
+
+async def _uncoalesced_upload(client, document, chunks):
+    # Pre-coalescing flow: check the cache, miss, embed, write back.
+    return await ai_generate._run_document_embedding_job(
+        embedding_client=client,
+        document=document,
+        chunks=chunks,
+        retrieval_query="Handout quiz",
+        job_key="unused",
+        redis_client=None,
+    )
+
+
+async def _coalesced_upload(client, document, chunks, redis_client):
+    return await ai_generate._resolve_chunk_embeddings(
+        embedding_client=client,
+        document=document,
+        chunks=chunks,
+        retrieval_query="Handout quiz",
+        redis_client=redis_client,
+    )
+
+
+async def _run_uploads(uploads: int, upload_factory) -> float:
+    started = time.perf_counter()
+    await asyncio.gather(*(upload_factory() for _ in range(uploads)))
+    return time.perf_counter() - started
+
+
+def main():
+    args = parse_args()
+    _install_memory_cache()
+    rows = []
+
+    with StubInferenceServer(
+        dimensions=384,
+        latency_seconds=args.request_latency_ms / 1000,
+    ) as stub:
+        client = BatchEmbeddingClient(InferenceGateway().session("benchmark-token"), model=stub.url)
+
+        for uploads in args.uploads:
+            for label in ("independent", "single-flight"):
+                # A fresh document per run so every run starts with a cold cache.
+                chunks = [
+                    TextChunk(chunk_id=index, content=f"{label} {uploads} chunk {index}", char_count=0)
+                    for index in range(args.chunks)
+                ]
+                document = ExtractedDocument(
+                    text="\n\n".join(chunk.content for chunk in chunks),
+                    source_document_name="handout.pdf",
+                    source_document_type="pdf",
+                    title="Handout",
+                    source_characters=0,
+                )
+                ai_generate._document_embedding_jobs = SingleFlight()
+                redis_client = FakeRedis()
+                stub.requests.clear()
+
+                if label == "independent":
+                    factory = lambda: _uncoalesced_upload(client, document, chunks)  # noqa: E731
+                else:
+                    factory = lambda: _coalesced_upload(client, document, chunks, redis_client)  # noqa: E731
+                seconds = asyncio.run(_run_uploads(uploads, factory))
+
+                rows.append(
+                    (
+                        uploads,
+                        label,
+                        len(stub.requests),
+                        len(stub.embedded_texts),
+                        f"{seconds * 1000:.0f}",
+                    )
+                )
+
+    print(
+        format_table(
+            ("uploads", "mode", "embedding requests", "texts embedded", "wall ms"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Folder listing and folder title search, per-folder queries versus batched reads.
+
+The user has ``--folders`` folders of ``--items-per-folder`` quizzes with
+``--questions`` questions each. The legacy paths are the library service
+methods as they were: ``list_folders`` read every folder's items to count
+them, and ``find_quiz_in_folders_by_title`` built the full ``get_folder``
+payload, quizzes and questions included, for each folder before scoring
+titles one pair at a time. The batched paths group item ids in one
+aggregation, read items, quiz titles and saved references in one query
+each, score all titles in one ``process.extract`` pass per scorer and load
+full quizzes only for the matches.
+
+Run with ``python -m server.scripts.benchmarks.folder_library``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from server.scripts.benchmarks.timing import format_table
+from server.tests.library_fake import LibraryCollections, build_folders, library_services
+
+
+USER_ID = "user-with-many-folders"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark folder listing and folder title search")
+    parser.add_argument("--folders", type=int, default=100)
+    parser.add_argument("--items-per-folder", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.5)
+    return parser.parse_args()
+
+
+async def _run(args) -> list[tuple[Any, ...]]:
+    collections = LibraryCollections(latency=args.latency_ms / 1000)
+    titles = build_folders(
+        collections,
+        user_id=USER_ID,
+        folders=args.folders,
+        items_per_folder=args.items_per_folder,
+        questions=args.questions,
+    )
+    query = titles[len(titles) // 2].split()[0]
+    services = library_services(collections)
+    operations = {
+        "list_folders": lambda service: service.list_folders(user_id=USER_ID),
+        f"find by title {query!r}": lambda service: service.find_quiz_in_folders_by_title(user_id=USER_ID, title=query),
+    }
+
+    rows = []
+    for operation, call in operations.items():
+        expected = await call(services["legacy"])
+        baseline = None
+        for label, service in services.items():
+            assert await call(service) == expected
+            collections.reset_counts()
+            started = time.perf_counter()
+            for _ in range(args.calls):
+                await call(service)
+            seconds = (time.perf_counter() - started) / args.calls
+            baseline = baseline or seconds
+            rows.append((
+                operation,
+                label,
+                f"{seconds * 1000:.1f}",
+                f"{collections.round_trips / args.calls:.0f}",
+                f"{baseline / seconds:.1f}x",
+            ))
+    return rows
+
+
+def main():
+    args = parse_args()
+    rows = asyncio.run(_run(args))
+    print(
+        f"{args.folders} folders x {args.items_per_folder} quizzes of {args.questions} questions, "
+        f"{args.calls} calls each, {args.latency_ms:g} ms per database round trip"
+    )
+    print(format_table(("operation", "path", "ms/call", "db round trips", "speedup"), rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Load-test chat completions: per-request sync clients vs the shared gateway.
+
+The legacy path builds an ``InferenceClient`` per call and runs it in the
+default thread pool, as the quiz, classification and document routes used
+to. Both paths hit the same local stub endpoint.
+
+Run with ``python -m server.scripts.benchmarks.inference_gateway``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import time
+
+from huggingface_hub import InferenceClient
+
+from server.app.quiz.utils.inference_gateway import InferenceGateway
+from server.scripts.benchmarks.timing import format_table
+from server.tests.inference_stub import StubInferenceServer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the shared inference client")
+    parser.add_argument("--requests", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--per-host", type=int, default=16)
+    return parser.parse_args()
+
+
+async def _legacy_calls(model_url: str, count: int) -> None:
+    loop = asyncio.get_event_loop()
+
+    async def call(index: int):
+        client = InferenceClient(token=f"token-{index % 5}")
+        return await loop.run_in_executor(
+            None,
+            functools.partial(
+                client.chat_completion,
+                model=model_url,
+                messages=[{"role": "user", "content": "hello"}],
+                max_tokens=16,
+                temperature=0,
+            ),
+        )
+
+    await asyncio.gather(*(call(index) for index in range(count)))
+
+
+async def _gateway_calls(gateway: InferenceGateway, model_url: str, count: int) -> None:
+    async def call(index: int):
+        return await gateway.session(f"token-{index % 5}").chat_completion(
+            model=model_url,
+            messages=[{"role": "user", "content": "hello"}],
+            max_tokens=16,
+            temperature=0,
+        )
+
+    await asyncio.gather(*(call(index) for index in range(count)))
+    await gateway.aclose()
+
+
+def main():
+    args = parse_args()
+    rows = []
+
+    for count in args.requests:
+        with StubInferenceServer(latency_seconds=args.latency_ms / 1000) as stub:
+            started = time.perf_counter()
+            asyncio.run(_legacy_calls(stub.chat_model_url, count))
+            legacy_seconds = time.perf_counter() - started
+            rows.append(
+                (
+                    count,
+                    "InferenceClient + executor",
+                    f"{legacy_seconds * 1000:.0f}",
+                    stub.connections,
+                    stub.max_in_flight,
+                )
+            )
+
+        with StubInferenceServer(latency_seconds=args.latency_ms / 1000) as stub:
+            gateway = InferenceGateway(max_connections_per_host=args.per_host)
+            started = time.perf_counter()
+            asyncio.run(_gateway_calls(gateway, stub.chat_model_url, count))
+            gateway_seconds = time.perf_counter() - started
+            rows.append(
+                (
+                    count,
+                    "shared gateway",
+                    f"{gateway_seconds * 1000:.0f}",
+                    stub.connections,
+                    stub.max_in_flight,
+                )
+            )
+
+    print(
+        format_table(
+            ("requests", "client", "wall ms", "connections opened", "peak in flight"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
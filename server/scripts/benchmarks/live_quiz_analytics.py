@@ -0,0 +1,190 @@
+"""Dashboard analytics reads for a large live quiz, full scan versus summary.
+
+A quiz with ``--participants`` sessions, most of them submitted, is read
+``--refreshes`` times the way the creator dashboard does. The scan mode is
+the previous read path: ``list_quiz_sessions`` capped at 500 documents, one
+``_analytics_row`` per session and ``_quiz_status`` over the same list.
+The uncapped scan is the same path reading every session, to show what
+counting them all by scanning costs. The summary mode reads the quiz's
+aggregate document plus one ``--page-size`` page of participant rows
+through ``get_analytics_page``.
+
+The join/submit phase that builds the quiz is timed too, with and without
+the summary updates, to show what the incremental writes cost.
+
+Run with ``python -m server.scripts.benchmarks.live_quiz_analytics``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from server.app.quiz.repositories.live_quiz_aggregate_repository import LiveQuizAggregateRepository
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.scripts.benchmarks.timing import format_table
+from server.tests.mongo_fake import FakeMongoCollection
+
+
+CREATOR_ID = "creator-1"
+QUESTIONS = [
+    {"question": f"Question {index}?", "options": ["A", "B", "C", "D"], "answer": "A"}
+    for index in range(10)
+]
+
+
+class BenchmarkRepository(LiveQuizSessionRepository):
+    def __init__(self, sessions: FakeMongoCollection):
+        super().__init__(FakeMongoCollection(), sessions)
+        self.quiz = {
+            "_id": "quiz-1",
+            "title": "Benchmark",
+            "created_by": CREATOR_ID,
+            "live_quiz_enabled": True,
+            "access_code_expires_at": datetime.now(timezone.utc) + timedelta(days=1),
+            "time_limit_minutes": 30,
+            "questions": QUESTIONS,
+        }
+
+    async def get_quiz_by_id(self, quiz_id: str):
+        return self.quiz
+
+    async def get_quiz_by_access_code(self, access_code: str):
+        return self.quiz
+
+
+class LegacyScanRepository(BenchmarkRepository):
+    """The session listing as it was, truncated at 500 documents."""
+
+    async def list_quiz_sessions(self, quiz_id: str):
+        cursor = self.sessions_collection.find({"quiz_id": quiz_id}).sort("created_at", -1)
+        return await cursor.to_list(length=500)
+
+
+class UncappedScanRepository(BenchmarkRepository):
+    """The session listing reading every session of the quiz."""
+
+    async def list_quiz_sessions(self, quiz_id: str, limit: Optional[int] = None):
+        cursor = self.sessions_collection.find({"quiz_id": quiz_id}).sort("created_at", -1)
+        return await cursor.to_list(length=None)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark live quiz dashboard analytics")
+    parser.add_argument("--participants", type=int, default=5_000)
+    parser.add_argument("--refreshes", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0.5)
+    return parser.parse_args()
+
+
+async def _populate(
+    service: LiveQuizSessionService,
+    participants: int,
+) -> float:
+    """Join every participant, answer two questions and submit most of them."""
+
+    async def participant(index: int) -> None:
+        joined = await service.start_session("ABC123", f"Participant {index}", None)
+        session_id, token = joined["session_id"], joined["participant_token"]
+        await service.save_answer(session_id, token, 0, "A" if index % 3 else "B", 1)
+        await service.save_answer(session_id, token, 1, "A", 2)
+        if index % 10:
+            await service.submit_session(session_id, token)
+
+    started = time.perf_counter()
+    for offset in range(0, participants, 500):
+        await asyncio.gather(*(participant(index) for index in range(offset, min(offset + 500, participants))))
+    return time.perf_counter() - started
+
+
+async def _run(mode: str, args) -> dict[str, Any]:
+    latency = args.latency_ms / 1000
+    sessions = FakeMongoCollection(latency=latency)
+    aggregates: Optional[FakeMongoCollection] = None
+    if mode == "scan":
+        service = LiveQuizSessionService(LegacyScanRepository(sessions))
+    elif mode == "uncapped":
+        service = LiveQuizSessionService(UncappedScanRepository(sessions))
+    else:
+        aggregates = FakeMongoCollection(latency=latency)
+        service = LiveQuizSessionService(
+            BenchmarkRepository(sessions),
+            aggregates=LiveQuizAggregateRepository(aggregates),
+        )
+        await service.aggregates.ensure("quiz-1")
+
+    populate_seconds = await _populate(service, args.participants)
+
+    sessions.reset_counts()
+    if aggregates is not None:
+        aggregates.reset_counts()
+    started = time.perf_counter()
+    for _ in range(args.refreshes):
+        if mode in {"scan", "uncapped"}:
+            await service._get_owned_quiz("quiz-1", CREATOR_ID)
+            sessions_read = await service.repository.list_quiz_sessions("quiz-1")
+            rows = [service._analytics_row(session) for session in sessions_read]
+            scanned = await service.repository.list_quiz_sessions("quiz-1")
+            service._quiz_status(service.repository.quiz, scanned)
+            counted, row_count = len(rows), len(rows)
+        else:
+            page = await service.get_analytics_page("quiz-1", CREATOR_ID, limit=args.page_size)
+            counted, row_count = page["participant_count"], len(page["participants"])
+    seconds = time.perf_counter() - started
+
+    round_trips = sessions.round_trips + (aggregates.round_trips if aggregates is not None else 0)
+    return {
+        "populate_seconds": populate_seconds,
+        "counted": counted,
+        "rows": row_count,
+        "round_trips": round_trips / args.refreshes,
+        "refresh_ms": seconds / args.refreshes * 1000,
+    }
+
+
+def main():
+    args = parse_args()
+    rows = []
+    for label, mode in (
+        ("full scan (500 cap)", "scan"),
+        ("full scan (uncapped)", "uncapped"),
+        ("aggregate + page", "aggregate"),
+    ):
+        result = asyncio.run(_run(mode, args))
+        rows.append(
+            (
+                label,
+                f"{result['counted']:,}",
+                f"{result['rows']:,}",
+                f"{result['round_trips']:.1f}",
+                f"{result['refresh_ms']:,.1f}",
+                f"{result['populate_seconds']:,.2f}",
+            )
+        )
+
+    print(
+        f"{args.participants:,} participants, {args.refreshes} dashboard refreshes, "
+        f"page size {args.page_size}, {args.latency_ms:g} ms per round trip"
+    )
+    print(
+        format_table(
+            (
+                "read path",
+                "participants counted",
+                "rows/refresh",
+                "round trips/refresh",
+                "ms/refresh",
+                "join+submit s",
+            ),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Count Mongo round trips and event bytes per live quiz answer.
+
+A classroom of ``--participants`` answers every question concurrently
+against the real ``LiveQuizSessionRepository`` over a counting in-memory
+collection, with one dashboard watching. The re-read mode is the old
+publish path: every event re-fetches the session and broadcasts its full
+analytics row.
+
+Run with ``python -m server.scripts.benchmarks.live_quiz_answer_round_trips``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict
+
+from bson import ObjectId
+
+import server.app.quiz.services.live_session_service as live_session_service
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.services.live_quiz_realtime import LiveQuizRealtimeBroadcaster
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.scripts.benchmarks.timing import format_table
+from server.tests.live_quiz_cluster import RecordingWebSocket
+from server.tests.mongo_fake import FakeMongoCollection
+
+
+class RereadingLiveQuizSessionService(LiveQuizSessionService):
+    """Publishes the way the service did before delta events."""
+
+    async def _publish_participant_event(
+        self,
+        quiz_id: str,
+        session: Dict[str, Any],
+        event_type: str,
+    ) -> None:
+        if not self.broadcaster:
+            return
+        session = await self.repository.get_session(str(session["_id"]))
+        if not session:
+            return
+        await self.broadcaster.publish(
+            quiz_id,
+            {
+                "type": event_type,
+                "quiz_id": quiz_id,
+                "participant": self._analytics_row(session),
+            },
+        )
+
+
+class ByteCountingWebSocket(RecordingWebSocket):
+    def __init__(self):
+        super().__init__("dashboard")
+        self.bytes_received = 0
+
+    async def send_text(self, text: str) -> None:
+        self.bytes_received += len(text.encode("utf-8"))
+        await super().send_text(text)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Count Mongo round trips per live quiz answer")
+    parser.add_argument("--participants", type=int, default=500)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--snapshot-interval", type=float, default=30.0)
+    return parser.parse_args()
+
+
+def _seed_sessions(sessions: FakeMongoCollection, participants: int, questions: int) -> list[tuple[str, str]]:
+    now = datetime.now(timezone.utc)
+    seeded = []
+    for index in range(participants):
+        session_id, token = ObjectId(), f"token-{index}"
+        sessions.documents[session_id] = {
+            "_id": session_id,
+            "quiz_id": "quiz-1",
+            "participant_name": f"Participant {index}",
+            "participant_email": f"participant{index}@example.com",
+            "participant_token_hash": live_session_service._hash_token(token),
+            "started_at": now,
+            "joined_at": now,
+            "expires_at": now + timedelta(hours=1),
+            "submitted_at": None,
+            "status": "joined",
+            "current_question_index": 0,
+            "answers": [],
+            "score": None,
+            "total_questions": questions,
+            "auto_submitted": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        seeded.append((str(session_id), token))
+    return seeded
+
+
+async def _run(service_class, args) -> dict[str, Any]:
+    sessions = FakeMongoCollection()
+    seeded = _seed_sessions(sessions, args.participants, args.questions)
+    # The in-memory collection never yields, so the dashboard's writer only
+    # runs between answers; size its queue to hold the whole run.
+    broadcaster = LiveQuizRealtimeBroadcaster(
+        send_queue_size=args.participants * args.questions * 2,
+        snapshot_interval_seconds=args.snapshot_interval,
+    )
+    service = service_class(
+        LiveQuizSessionRepository(FakeMongoCollection(), sessions),
+        broadcaster=broadcaster,
+    )
+    dashboard = ByteCountingWebSocket()
+    await broadcaster.connect("quiz-1", dashboard, accepted=True)
+
+    async def participant(session_id: str, token: str) -> None:
+        for question in range(args.questions):
+            next_index = min(question + 1, args.questions - 1)
+            await service.save_answer(session_id, token, question, "A", next_question_index=next_index)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(participant(session_id, token) for session_id, token in seeded))
+    seconds = time.perf_counter() - started
+    while broadcaster.queue_depth:
+        await asyncio.sleep(0.001)
+    await broadcaster.stop()
+
+    answers = args.participants * args.questions
+    return {
+        "answers": answers,
+        "round_trips": sessions.round_trips,
+        "operations": {name: sessions.operations.count(name) for name in sorted(set(sessions.operations))},
+        "seconds": seconds,
+        "bytes": dashboard.bytes_received,
+        "events": len(dashboard.sent),
+    }
+
+
+def main():
+    args = parse_args()
+    rows = []
+    for label, service_class in (
+        ("re-read + full row", RereadingLiveQuizSessionService),
+        ("returned doc + delta", LiveQuizSessionService),
+    ):
+        result = asyncio.run(_run(service_class, args))
+        rows.append(
+            (
+                label,
+                f"{result['round_trips']:,}",
+                f"{result['round_trips'] / result['answers']:.2f}",
+                json.dumps(result["operations"]),
+                f"{result['bytes'] / max(result['events'], 1):.0f}",
+                f"{result['seconds'] * 1000:.0f}",
+            )
+        )
+
+    print(f"{args.participants} participants x {args.questions} answers, one dashboard")
+    print(
+        format_table(
+            ("publish path", "round trips", "per answer", "by operation", "bytes/event", "wall ms"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
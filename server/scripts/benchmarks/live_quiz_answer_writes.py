@@ -0,0 +1,180 @@
+"""Latency, round trips and lost answers for live quiz answer writes.
+
+The read-modify-write mode is the old path: authorize with one read, read
+the session again, rebuild the answers list in Python and write it back.
+The atomic mode checks and writes in one pipeline update.
+
+Each participant answers ``--questions`` questions, ``--burst`` at a time,
+the way a double click or a flaky network retry sends overlapping requests.
+Without ``--mongo-url`` the collection is the in-memory stand-in with
+``--latency-ms`` per round trip; with it, round trips are counted by a
+pymongo command listener.
+
+Run with ``python -m server.scripts.benchmarks.live_quiz_answer_writes``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from bson import ObjectId
+from pymongo import monitoring
+
+import server.app.quiz.services.live_session_service as live_session_service
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.scripts.benchmarks.timing import format_table
+from server.tests.legacy_live_quiz import LegacyAnswerRepository, LegacyAnswerService
+from server.tests.mongo_fake import FakeMongoCollection
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.commands: list[str] = []
+
+    def started(self, event):
+        if event.command_name in {"find", "findAndModify", "insert", "update"}:
+            self.commands.append(event.command_name)
+
+    def succeeded(self, event):
+        return None
+
+    def failed(self, event):
+        return None
+
+
+def build_session(token: str, questions: int) -> dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "_id": ObjectId(),
+        "quiz_id": "benchmark-quiz",
+        "participant_name": "Participant",
+        "participant_token_hash": live_session_service._hash_token(token),
+        "started_at": now,
+        "joined_at": now,
+        "expires_at": now + timedelta(hours=1),
+        "submitted_at": None,
+        "status": "joined",
+        "current_question_index": 0,
+        "answers": [],
+        "score": None,
+        "total_questions": questions,
+        "auto_submitted": False,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark live quiz answer writes")
+    parser.add_argument("--participants", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--burst", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=0.5)
+    parser.add_argument("--mongo-url", default=None)
+    return parser.parse_args()
+
+
+async def _run(label: str, args) -> dict[str, Any]:
+    counter = CommandCounter()
+    client = None
+    if args.mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(args.mongo_url, event_listeners=[counter], tz_aware=True)
+        sessions = client.live_quiz_benchmark.live_quiz_sessions
+        await sessions.drop()
+    else:
+        sessions = FakeMongoCollection(latency=args.latency_ms / 1000)
+
+    legacy = label == "read-modify-write"
+    repository_class = LegacyAnswerRepository if legacy else LiveQuizSessionRepository
+    service_class = LegacyAnswerService if legacy else LiveQuizSessionService
+    service = service_class(repository_class(FakeMongoCollection(), sessions))
+
+    seeded = []
+    for index in range(args.participants):
+        token = f"token-{index}"
+        document = build_session(token, args.questions)
+        if client is not None:
+            await sessions.insert_one(document)
+        else:
+            sessions.documents[document["_id"]] = document
+        seeded.append((str(document["_id"]), token))
+    counter.commands.clear()
+    if client is None:
+        sessions.reset_counts()
+
+    latencies: list[float] = []
+
+    async def answer(session_id: str, token: str, question: int) -> None:
+        started = time.perf_counter()
+        await service.save_answer(session_id, token, question, "A", next_question_index=question)
+        latencies.append(time.perf_counter() - started)
+
+    async def participant(session_id: str, token: str) -> None:
+        for first in range(0, args.questions, args.burst):
+            burst = range(first, min(first + args.burst, args.questions))
+            await asyncio.gather(*(answer(session_id, token, question) for question in burst))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(participant(session_id, token) for session_id, token in seeded))
+    seconds = time.perf_counter() - started
+
+    if client is not None:
+        stored = await sessions.find({}).to_list(length=None)
+        round_trips = len(counter.commands)
+        await sessions.drop()
+        client.close()
+    else:
+        stored = list(sessions.documents.values())
+        round_trips = sessions.round_trips
+
+    latencies.sort()
+    answers = args.participants * args.questions
+    return {
+        "seconds": seconds,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "round_trips": round_trips / answers,
+        "kept": sum(len(document["answers"]) for document in stored),
+        "answers": answers,
+    }
+
+
+def main():
+    args = parse_args()
+    rows = []
+    for label in ("read-modify-write", "atomic pipeline"):
+        result = asyncio.run(_run(label, args))
+        rows.append(
+            (
+                label,
+                f"{result['round_trips']:.2f}",
+                f"{result['p50_ms']:.2f}",
+                f"{result['p95_ms']:.2f}",
+                f"{result['kept']:,} / {result['answers']:,}",
+                f"{result['seconds'] * 1000:.0f}",
+            )
+        )
+
+    target = args.mongo_url or f"in-memory, {args.latency_ms:g} ms per round trip"
+    print(
+        f"{args.participants} participants x {args.questions} answers, "
+        f"{args.burst} in flight per participant ({target})"
+    )
+    print(
+        format_table(
+            ("write path", "round trips/answer", "p50 ms", "p95 ms", "answers kept", "wall ms"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Broadcast live quiz events to a mix of fast and deliberately slow dashboards.
+
+The sequential mode is the old broadcaster: ``publish`` awaits ``send_json``
+on every socket in turn, so one slow dashboard holds up the participant's
+request and every dashboard after it. The queued mode is
+``LiveQuizRealtimeBroadcaster`` without Redis, once per slow-consumer policy.
+
+Participants publish concurrently, ``--events-per-participant`` events each.
+Slow sockets take ``--slow-send-ms`` per frame.
+
+Run with ``python -m server.scripts.benchmarks.live_quiz_broadcast``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any
+
+from fastapi import WebSocket
+from fastapi.encoders import jsonable_encoder
+
+from server.app.quiz.services.live_quiz_realtime import LiveQuizRealtimeBroadcaster
+from server.scripts.benchmarks.timing import format_table
+from server.tests.live_quiz_cluster import LiveQuizCluster, RecordingWebSocket
+
+
+class LegacySequentialBroadcaster:
+    """The broadcaster before per-socket queues, kept as the baseline."""
+
+    def __init__(self):
+        self._connections: dict[str, set[WebSocket]] = {}
+
+    async def connect(self, quiz_id: str, websocket: WebSocket, *, accepted: bool = False) -> None:
+        if not accepted:
+            await websocket.accept()
+        self._connections.setdefault(quiz_id, set()).add(websocket)
+
+    def disconnect(self, quiz_id: str, websocket: WebSocket) -> None:
+        connections = self._connections.get(quiz_id)
+        if not connections:
+            return
+        connections.discard(websocket)
+        if not connections:
+            self._connections.pop(quiz_id, None)
+
+    async def publish(self, quiz_id: str, event: dict[str, Any]) -> None:
+        stale = []
+        for websocket in list(self._connections.get(quiz_id, set())):
+            try:
+                await websocket.send_json(jsonable_encoder(event))
+            except Exception:
+                stale.append(websocket)
+        for websocket in stale:
+            self.disconnect(quiz_id, websocket)
+
+    async def stop(self) -> None:
+        return None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark live quiz broadcasts with slow dashboards")
+    parser.add_argument("--participants", type=int, default=200)
+    parser.add_argument("--events-per-participant", type=int, default=5)
+    parser.add_argument("--fast-watchers", type=int, default=20)
+    parser.add_argument("--slow-watchers", type=int, default=2)
+    parser.add_argument("--slow-send-ms", type=float, default=5.0)
+    parser.add_argument("--queue-size", type=int, default=256)
+    return parser.parse_args()
+
+
+async def _run(broadcaster, args) -> dict[str, Any]:
+    fast = [RecordingWebSocket(f"fast-{index}") for index in range(args.fast_watchers)]
+    slow = [
+        RecordingWebSocket(f"slow-{index}", delay=args.slow_send_ms / 1000)
+        for index in range(args.slow_watchers)
+    ]
+    # Slow sockets connect first so the sequential baseline meets them early.
+    for socket in slow + fast:
+        await broadcaster.connect("quiz-1", socket, accepted=True)
+
+    publish_seconds: list[float] = []
+
+    async def participant(index: int) -> None:
+        for step in range(args.events_per_participant):
+            event = {
+                "type": "participant_progress",
+                "quiz_id": "quiz-1",
+                "participant": {"session_id": f"session-{index}", "answered": step},
+            }
+            started = time.perf_counter()
+            await broadcaster.publish("quiz-1", event)
+            publish_seconds.append(time.perf_counter() - started)
+            await asyncio.sleep(0)
+
+    expected = args.participants * args.events_per_participant
+    started = time.perf_counter()
+    await asyncio.gather(*(participant(index) for index in range(args.participants)))
+    await LiveQuizCluster.wait_for(fast, expected, timeout=600)
+    fast_seconds = time.perf_counter() - started
+
+    # Let slow sockets drain whatever their queues still hold.
+    while getattr(broadcaster, "queue_depth", 0):
+        await asyncio.sleep(args.slow_send_ms / 1000)
+    await asyncio.sleep(args.slow_send_ms / 1000 * 2)
+    all_seconds = time.perf_counter() - started
+    await broadcaster.stop()
+
+    return {
+        "fast_seconds": fast_seconds,
+        "all_seconds": all_seconds,
+        "publish_p50_ms": statistics.median(publish_seconds) * 1000,
+        "publish_max_ms": max(publish_seconds) * 1000,
+        "slow_delivered": sum(len(socket.sent) for socket in slow),
+        "slow_closed": sum(socket.closed_with is not None for socket in slow),
+        "metrics": getattr(broadcaster, "metrics", None),
+    }
+
+
+def main():
+    args = parse_args()
+    expected = args.participants * args.events_per_participant
+    modes = [("sequential send_json", LegacySequentialBroadcaster)]
+    for policy in ("coalesce", "drop_oldest", "disconnect"):
+        modes.append(
+            (
+                f"queued ({policy})",
+                lambda policy=policy: LiveQuizRealtimeBroadcaster(
+                    send_queue_size=args.queue_size,
+                    slow_consumer_policy=policy,
+                ),
+            )
+        )
+
+    rows = []
+    for label, factory in modes:
+        result = asyncio.run(_run(factory(), args))
+        metrics = result["metrics"]
+        rows.append(
+            (
+                label,
+                f"{result['fast_seconds'] * 1000:.0f}",
+                f"{result['all_seconds'] * 1000:.0f}",
+                f"{result['publish_p50_ms']:.2f}",
+                f"{result['publish_max_ms']:.1f}",
+                f"{result['slow_delivered']:,} / {expected * args.slow_watchers:,}",
+                result["slow_closed"],
+                metrics.max_queue_depth if metrics else "-",
+                metrics.coalesced if metrics else "-",
+                metrics.dropped if metrics else "-",
+            )
+        )
+
+    print(
+        f"{args.participants} participants x {args.events_per_participant} events, "
+        f"{args.fast_watchers} fast + {args.slow_watchers} slow watchers "
+        f"({args.slow_send_ms:g} ms per frame), queue size {args.queue_size}"
+    )
+    print(
+        format_table(
+            (
+                "mode",
+                "fast watchers done ms",
+                "all drained ms",
+                "publish p50 ms",
+                "publish max ms",
+                "slow delivered",
+                "slow closed",
+                "max queue",
+                "coalesced",
+                "dropped",
+            ),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
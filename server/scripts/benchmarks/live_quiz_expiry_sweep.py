@@ -0,0 +1,175 @@
+"""Finalize a backlog of expired live quiz sessions.
+
+``--sessions`` abandoned sessions spread over ``--quizzes`` quizzes are all
+past ``expires_at``. The per-session mode closes them the way the lazy path
+does, one ``_finalize_session`` write and one quiz read per session; the
+sweeper mode uses ``LiveQuizExpirySweeper``'s batched read, bulk write and
+read-back. Both grade through ``_grade_session`` and publish one
+``participant_submitted`` event per session to a watching dashboard.
+
+Run with ``python -m server.scripts.benchmarks.live_quiz_expiry_sweep``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from bson import ObjectId
+
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.services.live_quiz_expiry_sweeper import LiveQuizExpirySweeper
+from server.app.quiz.services.live_quiz_realtime import LiveQuizRealtimeBroadcaster
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.scripts.benchmarks.timing import format_table
+from server.tests.live_quiz_cluster import RecordingWebSocket
+from server.tests.mongo_fake import FakeMongoCollection
+
+
+QUESTIONS = [
+    {"question": f"Question {index}?", "options": ["A", "B", "C", "D"], "answer": "A"}
+    for index in range(10)
+]
+
+
+class BenchmarkRepository(LiveQuizSessionRepository):
+    def __init__(self, sessions: FakeMongoCollection):
+        super().__init__(FakeMongoCollection(), sessions)
+        self.quiz_reads = 0
+
+    async def get_quiz_by_id(self, quiz_id: str):
+        self.quiz_reads += 1
+        await self.sessions_collection._round_trip("quiz find_one")
+        return {"_id": quiz_id, "title": "Benchmark", "questions": QUESTIONS, "time_limit_minutes": 10}
+
+
+class PerSessionSweeper(LiveQuizExpirySweeper):
+    """Closes each due session on its own, the way a participant poll does."""
+
+    async def sweep(self) -> int:
+        repository = self.service.repository
+        closed = 0
+        while True:
+            due = await repository.find_expired_sessions(self._clock(), self._batch_size)
+            if not due:
+                return closed
+            for session in due:
+                snapshot = await self.service._get_quiz_snapshot(session["quiz_id"])
+                finalized = await self.service._finalize_session(session, snapshot, auto_submitted=True)
+                await self.service._publish_participant_event(
+                    finalized["quiz_id"],
+                    finalized,
+                    "participant_submitted",
+                )
+                closed += 1
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the live quiz expiry sweeper")
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--quizzes", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.5)
+    return parser.parse_args()
+
+
+def _seed(args) -> FakeMongoCollection:
+    sessions = FakeMongoCollection(latency=args.latency_ms / 1000)
+    now = datetime.now(timezone.utc)
+    for index in range(args.sessions):
+        session_id = ObjectId()
+        sessions.documents[session_id] = {
+            "_id": session_id,
+            "quiz_id": f"quiz-{index % args.quizzes}",
+            "participant_name": f"Participant {index}",
+            "participant_token_hash": "hash",
+            "started_at": now - timedelta(hours=2),
+            "joined_at": now - timedelta(hours=2),
+            "expires_at": now - timedelta(hours=1, seconds=index),
+            "submitted_at": None,
+            "status": "active",
+            "current_question_index": index % len(QUESTIONS),
+            "answers": [
+                {"question_index": question, "selected_answer": "A", "answered_at": now}
+                for question in range(index % len(QUESTIONS))
+            ],
+            "score": None,
+            "total_questions": len(QUESTIONS),
+            "auto_submitted": False,
+            "created_at": now - timedelta(hours=2),
+            "updated_at": now - timedelta(hours=2),
+        }
+    return sessions
+
+
+async def _run(sweeper_class, args) -> dict[str, Any]:
+    sessions = _seed(args)
+    repository = BenchmarkRepository(sessions)
+    # Full snapshots never come due, so both modes publish exactly one event per session.
+    broadcaster = LiveQuizRealtimeBroadcaster(
+        send_queue_size=args.sessions * 2,
+        snapshot_interval_seconds=float("inf"),
+    )
+    dashboards = [RecordingWebSocket(f"dashboard-{index}") for index in range(args.quizzes)]
+    for index, dashboard in enumerate(dashboards):
+        await broadcaster.connect(f"quiz-{index}", dashboard, accepted=True)
+    sweeper = sweeper_class(
+        LiveQuizSessionService(repository, broadcaster=broadcaster),
+        batch_size=args.batch_size,
+        max_batches_per_sweep=args.sessions,
+    )
+
+    started = time.perf_counter()
+    closed = await sweeper.sweep()
+    seconds = time.perf_counter() - started
+    while broadcaster.queue_depth:
+        await asyncio.sleep(0.001)
+    await broadcaster.stop()
+
+    still_open = sum(1 for document in sessions.documents.values() if document["status"] != "submitted")
+    return {
+        "closed": closed,
+        "still_open": still_open,
+        "seconds": seconds,
+        "round_trips": sessions.round_trips,
+        "events": sum(len(dashboard.sent) for dashboard in dashboards),
+    }
+
+
+def main():
+    args = parse_args()
+    rows = []
+    for label, sweeper_class in (
+        ("per-session finalize", PerSessionSweeper),
+        ("bulk sweeper", LiveQuizExpirySweeper),
+    ):
+        result = asyncio.run(_run(sweeper_class, args))
+        rows.append(
+            (
+                label,
+                f"{result['closed']:,}",
+                f"{result['still_open']:,}",
+                f"{result['round_trips']:,}",
+                f"{result['events']:,}",
+                f"{result['seconds'] * 1000:,.0f}",
+                f"{result['closed'] / result['seconds']:,.0f}",
+            )
+        )
+
+    print(
+        f"{args.sessions:,} expired sessions over {args.quizzes} quizzes, batches of {args.batch_size}, "
+        f"{args.latency_ms:g} ms per round trip"
+    )
+    print(
+        format_table(
+            ("finalize path", "closed", "left open", "round trips", "events", "wall ms", "sessions/s"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Fan live quiz events out to dashboards spread over several workers.
+
+Participants are spread round-robin over the workers and publish through
+the worker that served them; dashboard watchers are spread the same way.
+The per-process mode is the old behaviour: each worker only reaches its own
+sockets. The Redis mode uses the in-memory stand-in unless ``--redis-url``
+points at a real server.
+
+Run with ``python -m server.scripts.benchmarks.live_quiz_fanout``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from server.app.quiz.services.live_quiz_realtime import LiveQuizRealtimeBroadcaster
+from server.scripts.benchmarks.timing import format_table
+from server.tests.live_quiz_cluster import LiveQuizCluster, RecordingWebSocket
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark live quiz event fan-out")
+    parser.add_argument("--participants", type=int, default=1000)
+    parser.add_argument("--watchers", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--events-per-participant", type=int, default=3)
+    parser.add_argument("--redis-url", default=None)
+    return parser.parse_args()
+
+
+def _participant_events(participant: int, count: int) -> list[dict]:
+    return [
+        {
+            "type": "participant_progress",
+            "quiz_id": "quiz-1",
+            "participant": {"session_id": f"session-{participant}", "answered": step},
+        }
+        for step in range(count)
+    ]
+
+
+async def _publish_all(workers: list[LiveQuizRealtimeBroadcaster], args) -> None:
+    async def participant(index: int) -> None:
+        worker = workers[index % len(workers)]
+        for event in _participant_events(index, args.events_per_participant):
+            await worker.publish("quiz-1", event)
+
+    await asyncio.gather(*(participant(index) for index in range(args.participants)))
+
+
+async def _run_per_process(args) -> tuple[float, list[RecordingWebSocket]]:
+    workers = [LiveQuizRealtimeBroadcaster() for _ in range(args.workers)]
+    watchers = []
+    for index in range(args.watchers):
+        socket = RecordingWebSocket()
+        await workers[index % len(workers)].connect("quiz-1", socket, accepted=True)
+        watchers.append(socket)
+
+    started = time.perf_counter()
+    await _publish_all(workers, args)
+    return time.perf_counter() - started, watchers
+
+
+async def _run_redis(args) -> tuple[float, list[RecordingWebSocket]]:
+    redis_client = None
+    if args.redis_url:
+        from redis.asyncio import Redis
+
+        redis_client = Redis.from_url(args.redis_url, decode_responses=True)
+        await redis_client.delete("live-quiz:{quiz-1}:seq", "live-quiz:{quiz-1}:backlog")
+
+    expected = args.participants * args.events_per_participant
+    async with LiveQuizCluster(
+        args.workers,
+        redis_client=redis_client,
+        backlog_size=expected,
+    ) as cluster:
+        watchers = await cluster.connect_watchers("quiz-1", args.watchers)
+        started = time.perf_counter()
+        await _publish_all(cluster.workers, args)
+        await cluster.wait_for(watchers, expected, timeout=120)
+        seconds = time.perf_counter() - started
+
+    if redis_client is not None:
+        await redis_client.aclose()
+    return seconds, watchers
+
+
+def main():
+    args = parse_args()
+    events = args.participants * args.events_per_participant
+    expected_deliveries = events * args.watchers
+    rows = []
+
+    for label, runner in (
+        ("per-process dict", _run_per_process),
+        ("redis pub/sub" + (" (server)" if args.redis_url else " (in-memory)"), _run_redis),
+    ):
+        seconds, watchers = asyncio.run(runner(args))
+        delivered = sum(len(socket.sent) for socket in watchers)
+        rows.append(
+            (
+                label,
+                f"{seconds * 1000:.0f}",
+                f"{events / seconds:,.0f}",
+                f"{delivered:,}",
+                f"{delivered / expected_deliveries:.0%}",
+            )
+        )
+
+    print(
+        f"{args.participants} participants x {args.events_per_participant} events, "
+        f"{args.watchers} watchers over {args.workers} workers"
+    )
+    print(
+        format_table(
+            ("mode", "wall ms", "events/s", "deliveries", "of expected"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Session-state polls per second with and without the live quiz snapshot cache.
+
+A classroom of ``--participants`` polls ``get_session_state`` ``--polls``
+times each against the real ``LiveQuizSessionRepository``, over in-memory
+collections that take ``--latency-ms`` per round trip. Without the cache
+every poll reads the quiz, validates it into ``QuizDocumentV2`` and dumps it
+back to a dict; with it the quiz is read once per TTL.
+
+Run with ``python -m server.scripts.benchmarks.live_quiz_session_state_polls``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from bson import ObjectId
+
+import server.app.quiz.services.live_session_service as live_session_service
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.repositories.v2.models.quiz_models import QuizDocumentV2
+from server.app.quiz.services.live_quiz_snapshot_cache import LiveQuizSnapshotCache
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.scripts.benchmarks.timing import format_table
+from server.tests.mongo_fake import FakeMongoCollection
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark live quiz session-state polls")
+    parser.add_argument("--participants", type=int, default=200)
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=0.5)
+    return parser.parse_args()
+
+
+def _seed(args) -> tuple[FakeMongoCollection, FakeMongoCollection, list[tuple[str, str]]]:
+    latency = args.latency_ms / 1000
+    quizzes = FakeMongoCollection(latency=latency)
+    sessions = FakeMongoCollection(latency=latency)
+    quiz = QuizDocumentV2(
+        title="Benchmark quiz",
+        quiz_type="multichoice",
+        questions=[
+            {
+                "question": f"Question {index} about a reasonably long topic?",
+                "options": [f"Option {option}" for option in "ABCD"],
+                "correct_answer": "Option A",
+            }
+            for index in range(args.questions)
+        ],
+        live_quiz_enabled=True,
+        time_limit_minutes=30,
+    ).model_dump(by_alias=True)
+    quizzes.documents[quiz["_id"]] = quiz
+
+    now = datetime.now(timezone.utc)
+    seeded = []
+    for index in range(args.participants):
+        session_id, token = ObjectId(), f"token-{index}"
+        sessions.documents[session_id] = {
+            "_id": session_id,
+            "quiz_id": str(quiz["_id"]),
+            "participant_name": f"Participant {index}",
+            "participant_token_hash": live_session_service._hash_token(token),
+            "started_at": now,
+            "joined_at": now,
+            "expires_at": now + timedelta(hours=1),
+            "submitted_at": None,
+            "status": "active",
+            "current_question_index": index % args.questions,
+            "answers": [
+                {"question_index": question, "selected_answer": "Option A", "answered_at": now}
+                for question in range(index % args.questions)
+            ],
+            "score": None,
+            "total_questions": args.questions,
+            "auto_submitted": False,
+            "created_at": now,
+            "updated_at": now,
+        }
+        seeded.append((str(session_id), token))
+    return quizzes, sessions, seeded
+
+
+async def _run(cache: Optional[LiveQuizSnapshotCache], args) -> dict[str, Any]:
+    quizzes, sessions, seeded = _seed(args)
+    service = LiveQuizSessionService(
+        LiveQuizSessionRepository(quizzes, sessions),
+        snapshot_cache=cache,
+    )
+
+    async def participant(session_id: str, token: str) -> None:
+        for _ in range(args.polls):
+            await service.get_session_state(session_id, token)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(participant(session_id, token) for session_id, token in seeded))
+    seconds = time.perf_counter() - started
+    polls = args.participants * args.polls
+    return {
+        "polls_per_second": polls / seconds,
+        "quiz_reads": quizzes.round_trips,
+        "round_trips": (quizzes.round_trips + sessions.round_trips) / polls,
+    }
+
+
+def main():
+    args = parse_args()
+    rows = []
+    for label, cache in (("uncached", None), ("snapshot cache", LiveQuizSnapshotCache())):
+        result = asyncio.run(_run(cache, args))
+        rows.append(
+            (
+                label,
+                f"{result['polls_per_second']:,.0f}",
+                f"{result['quiz_reads']:,}",
+                f"{result['round_trips']:.2f}",
+            )
+        )
+
+    print(
+        f"{args.participants} participants x {args.polls} polls, {args.questions} questions, "
+        f"{args.latency_ms:g} ms per round trip"
+    )
+    print(format_table(("quiz source", "polls/s", "quiz reads", "round trips/poll"), rows))
+
+
+if __name__ == "__main__":
+    main()
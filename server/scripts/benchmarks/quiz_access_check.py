@@ -0,0 +1,87 @@
+"""``get_owned_or_library_quiz`` for a user with a large library, scan versus access index.
+
+The user has ``--folders`` folders of ``--items-per-folder`` quizzes each,
+plus saved quizzes and history entries. The scan path is the check as it was
+before ``quiz_access_v2``: list the user's saved quizzes and history, then
+list the items of every folder until the quiz turns up. The index path reads
+the quiz and one ``(user_id, quiz_id)`` row, and falls back to the scan when
+there is no row. Each case is timed for a quiz reached through a saved
+reference, through the last folder scanned, and for a quiz the user cannot
+open, which is the scan's worst case and, through that fallback, the
+index's too. The fake
+collections filter by scanning, so round trips are the figure that carries
+over to Mongo; the timings add ``--latency-ms`` per round trip on top.
+
+Run with ``python -m server.scripts.benchmarks.quiz_access_check``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from server.app.core.config import settings
+from server.app.quiz.services.quiz_access_index import backfill_quiz_access_index
+from server.scripts.benchmarks.timing import format_table
+from server.tests.library_fake import LibraryCollections, build_library
+
+
+USER_ID = "user-with-a-large-library"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark library quiz access checks")
+    parser.add_argument("--folders", type=int, default=500)
+    parser.add_argument("--items-per-folder", type=int, default=4)
+    parser.add_argument("--checks", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.5)
+    return parser.parse_args()
+
+
+async def _run(args) -> list[tuple[Any, ...]]:
+    collections = LibraryCollections(latency=args.latency_ms / 1000)
+    samples = build_library(
+        collections,
+        user_id=USER_ID,
+        folders=args.folders,
+        items_per_folder=args.items_per_folder,
+    )
+    await backfill_quiz_access_index(collections.reference_repository())
+
+    rows = []
+    for case, quiz_id in samples.items():
+        timings = {}
+        for label, indexed in (("scan", False), ("access index", True)):
+            settings.QUIZ_ACCESS_INDEX_READS_ENABLED = indexed
+            service = collections.library_service(indexed=indexed)
+            collections.reset_counts()
+            started = time.perf_counter()
+            for _ in range(args.checks):
+                quiz = await service.get_owned_or_library_quiz(user_id=USER_ID, quiz_id=quiz_id)
+            seconds = (time.perf_counter() - started) / args.checks
+            assert (quiz is not None) == (case != "no access")
+            timings[label] = seconds
+            rows.append((
+                case,
+                label,
+                f"{seconds * 1000:.2f}",
+                f"{collections.round_trips / args.checks:.0f}",
+                f"{timings['scan'] / seconds:.1f}x",
+            ))
+    return rows
+
+
+def main():
+    args = parse_args()
+    rows = asyncio.run(_run(args))
+    print(
+        f"{args.folders} folders x {args.items_per_folder} quizzes, {args.checks} checks per case, "
+        f"{args.latency_ms:g} ms per database round trip"
+    )
+    print(format_table(("quiz reached via", "check", "ms/check", "db round trips", "speedup"), rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Submission grading throughput, full quiz load versus compiled answer key.
+
+Every submission answers all ``--questions`` questions of one quiz. The
+legacy path is ``grade_submission`` as it was: load the quiz document,
+validate it into ``QuizDocumentV2``, rebuild a dict keyed by full question
+text and grade the payload. The answer-key paths read only the quiz's
+``updated_at`` and grade against the compiled key, found in process memory
+or, for a worker that has not seen the quiz yet, in Redis.
+
+Run with ``python -m server.scripts.benchmarks.quiz_answer_key``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+from server.app.quiz.repositories.v2.repositories.quiz_repository import QuizV2Repository
+from server.app.quiz.services.quiz_answer_key_cache import QuizAnswerKeyCache
+from server.app.quiz.services.quiz_grading_service import QuizGradingService
+from server.scripts.benchmarks.timing import format_table
+from server.tests.legacy_grading import LegacyGradingService
+from server.tests.mongo_fake import FakeMongoCollection
+from server.tests.quiz_factories import build_quiz, build_submission
+from server.tests.redis_fake import FakeRedis
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark stored-quiz submission grading")
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--submissions", type=int, default=2_000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    return parser.parse_args()
+
+
+async def _run(mode: str, args) -> dict[str, Any]:
+    collection = FakeMongoCollection(latency=args.latency_ms / 1000)
+    quiz = build_quiz(args.questions)
+    collection.documents[quiz["_id"]] = quiz
+    submission = build_submission(quiz)
+    repository = QuizV2Repository(collection)
+    redis_client = FakeRedis()
+
+    async def redis_factory():
+        return redis_client
+
+    answer_keys = QuizAnswerKeyCache(redis_client_factory=redis_factory)
+    service_class = LegacyGradingService if mode == "legacy" else QuizGradingService
+    service = service_class(
+        quiz_repository=repository,
+        reference_repository=object(),
+        answer_keys=answer_keys,
+    )
+    expected = await LegacyGradingService(
+        quiz_repository=repository,
+        reference_repository=object(),
+        answer_keys=answer_keys,
+    ).grade_submission(str(quiz["_id"]), submission)
+    assert await service.grade_submission(str(quiz["_id"]), submission) == expected
+
+    collection.reset_counts()
+    started = time.perf_counter()
+    for _ in range(args.submissions):
+        if mode == "redis":
+            # Every submission lands on a worker that has not seen the quiz.
+            answer_keys.clear()
+        await service.grade_submission(str(quiz["_id"]), submission)
+    seconds = time.perf_counter() - started
+    return {
+        "per_second": args.submissions / seconds,
+        "ms": seconds / args.submissions * 1000,
+        "round_trips": collection.round_trips / args.submissions,
+    }
+
+
+def main():
+    args = parse_args()
+    rows = []
+    baseline = None
+    for label, mode in (
+        ("load + validate quiz", "legacy"),
+        ("answer key (memory)", "memory"),
+        ("answer key (Redis)", "redis"),
+    ):
+        result = asyncio.run(_run(mode, args))
+        baseline = baseline or result["per_second"]
+        rows.append((
+            label,
+            f"{result['per_second']:,.0f}",
+            f"{result['ms']:.3f}",
+            f"{result['round_trips']:.1f}",
+            f"{result['per_second'] / baseline:.1f}x",
+        ))
+
+    print(
+        f"{args.submissions:,} submissions to a {args.questions}-question quiz, "
+        f"{args.latency_ms:g} ms per database round trip"
+    )
+    print(format_table(("grading path", "submissions/s", "ms/submission", "db round trips", "speedup"), rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Concurrent PDF downloads of one stored quiz, rendered per request versus cached.
+
+``--downloads`` requests for the PDF of the same ``--questions`` question
+quiz arrive at once. The legacy path is ``download_quiz_by_id`` as it was:
+every request renders the PDF with reportlab on the event loop. The cached
+path asks ``QuizExportCache`` for it: the first request renders it once in
+the export process pool while the others wait on that render, and later
+rounds are served from the file on disk. Each row shows the wall time of
+the round, per-request latency measured from when all requests arrived,
+how many renders ran and the longest the event loop went without running
+a heartbeat task.
+
+Run with ``python -m server.scripts.benchmarks.quiz_export_cache``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from typing import Any, Awaitable, Callable
+
+from server.app.quiz.services.quiz_export_cache import QuizExportCache, export_cache_key
+from server.app.quiz.utils.render_export import get_export_pool, render_export, shutdown_export_pool
+from server.scripts.benchmarks.timing import format_table
+from server.tests.quiz_factories import build_quiz, download_payload
+
+
+async def legacy_download(payload: dict[str, Any], file_format: str) -> bytes:
+    """``download_quiz_by_id``'s render as it was: the same generators, synchronous, on the event loop."""
+    return render_export(payload, file_format)
+
+
+async def cached_download(cache: QuizExportCache, key: str, payload: dict[str, Any], file_format: str) -> bytes:
+    export = await cache.get_or_render(key, file_format, payload)
+    return export.path.read_bytes()
+
+
+async def _concurrent_round(download: Callable[[], Awaitable[bytes]], downloads: int) -> dict[str, Any]:
+    stalls = [0.0]
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stalls[0] = max(stalls[0], now - last)
+            last = now
+
+    async def timed():
+        body = await download()
+        return time.perf_counter() - started, body
+
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    # Latency is from when every request arrived, not from when its coroutine first ran.
+    started = time.perf_counter()
+    results = await asyncio.gather(*(timed() for _ in range(downloads)))
+    wall = time.perf_counter() - started
+    stop.set()
+    await ticker
+    latencies = sorted(seconds for seconds, _ in results)
+    return {
+        "wall": wall,
+        "p50": statistics.median(latencies),
+        "p95": latencies[max(0, int(len(latencies) * 0.95) - 1)],
+        "stall": stalls[0],
+        "body": results[0][1],
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent quiz PDF downloads with and without the export cache")
+    parser.add_argument("--downloads", type=int, default=100)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    return parser.parse_args()
+
+
+async def _run(args, directory: str) -> list[tuple[Any, ...]]:
+    quiz = build_quiz(args.questions, "multichoice")
+    quiz["quiz_type"] = quiz["quiz_type"].value
+    payload = download_payload(quiz)
+    key = export_cache_key("benchmark-fingerprint", quiz["updated_at"], "pdf")
+    pool = get_export_pool(args.workers)
+    # Start the worker processes so the cold round measures the render, not process spawning.
+    await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(pool, int) for _ in range(args.workers)))
+    cache = QuizExportCache(directory, max_bytes=64 * 1024 * 1024, executor=pool)
+
+    rounds = [("legacy", "per request", lambda: legacy_download(payload, "pdf"), lambda: args.downloads)]
+    for label in ("cold", "warm"):
+        rounds.append(("cached", label, lambda: cached_download(cache, key, payload, "pdf"), None))
+
+    rows = []
+    baseline = None
+    for path, label, download, legacy_renders in rounds:
+        renders_before = cache.stats.renders
+        result = await _concurrent_round(download, args.downloads)
+        renders = legacy_renders() if legacy_renders else cache.stats.renders - renders_before
+        baseline = baseline or result
+        rows.append((
+            path,
+            label,
+            f"{result['wall'] * 1000:,.1f}",
+            f"{result['p50'] * 1000:,.1f}",
+            f"{result['p95'] * 1000:,.1f}",
+            f"{result['stall'] * 1000:,.1f}",
+            renders,
+            f"{baseline['wall'] / result['wall']:,.1f}x",
+        ))
+    # The cached file is the bytes the legacy path streamed, apart from the PDF's creation timestamp and id.
+    assert abs(len(result["body"]) - len(baseline["body"])) < 64
+    return rows
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory(prefix="quiz_exports_") as directory:
+        try:
+            rows = asyncio.run(_run(args, directory))
+        finally:
+            shutdown_export_pool()
+    print(f"{args.downloads} concurrent PDF downloads of one {args.questions} question quiz, {args.workers} export workers")
+    print(
+        format_table(
+            ("path", "round", "wall ms", "p50 ms", "p95 ms", "max loop stall ms", "renders", "speedup"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Library listings with full questions versus summary rows.
+
+The user has ``--quizzes`` quizzes of up to ``--questions`` questions, all
+saved, all in their history and all in one folder. The full listings are
+``list_saved_quizzes``, ``list_quiz_history_items`` and ``get_folder`` as
+they were: every quiz is read whole and validated into ``QuizDocumentV2``
+so each row can carry its questions. The summary listings read
+``QUIZ_SUMMARY_PROJECTION``, which leaves the questions in Mongo and counts
+them there, and return ``question_count`` instead. Each row shows the time
+per call, the JSON response size and the bytes read from the quiz
+collection.
+
+Run with ``python -m server.scripts.benchmarks.quiz_summaries``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+import bson
+
+from server.app.quiz.repositories.v2.models.quiz_summary_models import QUIZ_SUMMARY_PROJECTION
+from server.scripts.benchmarks.timing import format_table
+from server.tests.library_fake import LibraryCollections, build_library_listings, listings, response_bytes
+
+
+USER_ID = "user-with-a-long-history"
+
+
+async def quiz_bytes_read(collections: LibraryCollections, *, summary: bool) -> int:
+    """BSON size of every quiz document as the listing reads it."""
+    projection = QUIZ_SUMMARY_PROJECTION if summary else None
+    documents = await collections.quizzes.find({}, projection).to_list(length=None)
+    return sum(len(bson.encode(document)) for document in documents)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark library listings with and without questions")
+    parser.add_argument("--quizzes", type=int, default=100)
+    parser.add_argument("--questions", type=int, default=30)
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.5)
+    return parser.parse_args()
+
+
+async def _run(args) -> list[tuple[Any, ...]]:
+    collections = LibraryCollections(latency=args.latency_ms / 1000)
+    folder_id = build_library_listings(
+        collections,
+        user_id=USER_ID,
+        quizzes=args.quizzes,
+        questions=args.questions,
+    )
+    service = collections.library_service()
+
+    rows = []
+    for listing, call in listings(user_id=USER_ID, folder_id=folder_id).items():
+        baseline = None
+        for mode, summary in (("full", False), ("summary", True)):
+            payload = await call(service, summary)
+            started = time.perf_counter()
+            for _ in range(args.calls):
+                await call(service, summary)
+            seconds = (time.perf_counter() - started) / args.calls
+            baseline = baseline or (seconds, response_bytes(payload))
+            rows.append((
+                listing,
+                mode,
+                f"{seconds * 1000:.2f}",
+                f"{response_bytes(payload) / 1024:.1f}",
+                f"{await quiz_bytes_read(collections, summary=summary) / 1024:.1f}",
+                f"{baseline[0] / seconds:.1f}x",
+                f"{baseline[1] / response_bytes(payload):.0f}x",
+            ))
+    return rows
+
+
+def main():
+    args = parse_args()
+    rows = asyncio.run(_run(args))
+    print(
+        f"{args.quizzes} quizzes of up to {args.questions} questions, {args.calls} calls each, "
+        f"{args.latency_ms:g} ms per database round trip"
+    )
+    print(
+        format_table(
+            ("listing", "rows", "ms/call", "response KiB", "quiz KiB read", "speedup", "smaller"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
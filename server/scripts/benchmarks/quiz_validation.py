@@ -0,0 +1,85 @@
+"""What re-validating a stored quiz costs on each read, by quiz size.
+
+For each ``--sizes`` question count a stored quiz document, as Motor
+returns it, is turned into what two read-only callers need. The live
+session repository used to validate it into ``QuizDocumentV2`` and
+``model_dump(by_alias=True)`` it straight back into a dict; it now returns
+the raw document. The shared quiz payload used to be built from a
+validated model; it is now built from the raw document. Times are per
+quiz and exclude the database read.
+
+``QuizDocumentV2.model_construct`` was measured too and is no faster than
+validating: pydantic-core validation costs about what building the
+question models in Python does, so skipping validation only pays when no
+model is built at all.
+
+Run with ``python -m server.scripts.benchmarks.quiz_validation``.
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Any
+
+from server.app.quiz.repositories.v2.models.quiz_models import QuizDocumentV2
+from server.app.share.services import SharedQuizReadService, build_default_description
+from server.scripts.benchmarks.timing import best_time_per_call, format_table
+from server.tests.quiz_factories import stored_quiz
+
+
+def legacy_shared_quiz_payload(quiz_doc: QuizDocumentV2) -> dict[str, Any]:
+    """``SharedQuizReadService._normalize_v2_quiz`` as it was, on a validated model."""
+    topic = quiz_doc.title or "General Knowledge"
+    return {
+        "id": str(quiz_doc.id),
+        "title": quiz_doc.title,
+        "description": quiz_doc.description or build_default_description(topic),
+        "quiz_type": quiz_doc.quiz_type.value,
+        "questions": [
+            {
+                "question": question.question,
+                "options": question.options,
+            }
+            for question in quiz_doc.questions
+        ],
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark stored quiz validation against raw reads")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200, 1000])
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    rows = []
+    for size in args.sizes:
+        document = stored_quiz(size)
+        reads = {
+            "live session quiz": {
+                "validate + model_dump": lambda: QuizDocumentV2(**document).model_dump(by_alias=True),
+                "raw document": lambda: document,
+            },
+            "shared quiz payload": {
+                "validate + build": lambda: legacy_shared_quiz_payload(QuizDocumentV2(**document)),
+                "build from raw": lambda: SharedQuizReadService._normalize_v2_quiz(document),
+            },
+        }
+        assert legacy_shared_quiz_payload(QuizDocumentV2(**document)) == SharedQuizReadService._normalize_v2_quiz(
+            document
+        )
+        for read, paths in reads.items():
+            baseline = None
+            for label, call in paths.items():
+                seconds = best_time_per_call(call, repeat=args.repeat, number=args.number)
+                baseline = baseline or seconds
+                rows.append((size, read, label, f"{seconds * 1_000_000:,.2f}", f"{baseline / seconds:,.0f}x"))
+    print(f"best of {args.repeat} x {args.number} reads per path")
+    print(format_table(("questions", "read", "path", "us/quiz", "speedup"), rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare list-based and matrix-backed RAG chunk selection.
+
+Run with ``python -m server.scripts.benchmarks.rag_retrieval``.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from server.app.quiz.utils.rag_retrieval import ChunkEmbeddingIndex
+from server.scripts.benchmarks.timing import best_time_per_call, format_table
+from server.tests.document_factories import random_unit_vectors
+from server.tests.legacy_documents import legacy_select_indices
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark RAG chunk selection")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[24, 200, 2000])
+    parser.add_argument("--dimensions", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    rows = []
+    for size in args.sizes:
+        embeddings = random_unit_vectors(size, args.dimensions, seed=size)
+        query = random_unit_vectors(1, args.dimensions, seed=-size)[0]
+
+        legacy_seconds = best_time_per_call(
+            lambda: legacy_select_indices(embeddings, query, top_k=args.top_k),
+            repeat=args.repeat,
+        )
+        # "from lists" includes converting the nested lists into the matrix;
+        # "prebuilt" measures scoring alone, as when embeddings arrive as arrays.
+        from_lists_seconds = best_time_per_call(
+            lambda: ChunkEmbeddingIndex(embeddings).select(query, top_k=args.top_k),
+            repeat=args.repeat,
+        )
+        index = ChunkEmbeddingIndex(embeddings)
+        prebuilt_seconds = best_time_per_call(
+            lambda: index.select(query, top_k=args.top_k),
+            repeat=args.repeat,
+        )
+        rows.append(
+            (
+                size,
+                f"{legacy_seconds * 1000:.2f}",
+                f"{from_lists_seconds * 1000:.2f}",
+                f"{prebuilt_seconds * 1000:.3f}",
+                f"{legacy_seconds / from_lists_seconds:.1f}x",
+                f"{legacy_seconds / prebuilt_seconds:.0f}x",
+            )
+        )
+
+    print(
+        format_table(
+            (
+                "chunks",
+                "legacy ms",
+                "from lists ms",
+                "prebuilt ms",
+                "speedup",
+                "speedup (prebuilt)",
+            ),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
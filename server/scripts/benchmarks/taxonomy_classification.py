@@ -0,0 +1,79 @@
+"""Compare the full-scan taxonomy classifier with the precompiled index.
+
+Inputs are built from the seed question banks, the same text an AI quiz
+save classifies: one text per bank plus a long text joining every bank.
+
+Run with ``python -m server.scripts.benchmarks.taxonomy_classification``.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from server.app.quiz.services.category_taxonomy_service import (
+    classify_deterministically,
+    get_taxonomy_entries,
+    get_taxonomy_index,
+)
+from server.scripts.benchmarks.timing import best_time_per_call, format_table
+from server.tests.legacy_taxonomy import (
+    legacy_classify_deterministically,
+    seed_classification_texts,
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark deterministic taxonomy classification")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    texts = seed_classification_texts()
+    workloads = {
+        "one bank (avg)": list(texts.values()),
+        "all banks joined": [" ".join(texts.values())],
+        "short prompt": ["Generate a software engineering quiz about coding algorithms."],
+    }
+    index_build_seconds = best_time_per_call(
+        lambda: get_taxonomy_index.__wrapped__(), repeat=args.repeat
+    )
+    rows = []
+
+    for label, inputs in workloads.items():
+        average_chars = sum(len(text) for text in inputs) // len(inputs)
+        timings = {}
+        for name, classify in (
+            ("full scan", legacy_classify_deterministically),
+            ("index", classify_deterministically),
+        ):
+            seconds = best_time_per_call(
+                lambda: [classify(text, "multichoice") for text in inputs],
+                repeat=args.repeat,
+                number=args.number,
+            )
+            timings[name] = seconds / len(inputs)
+
+        rows.append(
+            (
+                label,
+                average_chars,
+                f"{timings['full scan'] * 1e6:.0f}",
+                f"{timings['index'] * 1e6:.0f}",
+                f"{timings['full scan'] / timings['index']:.1f}x",
+            )
+        )
+
+    print(f"{len(get_taxonomy_entries())} taxonomy entries, index built in {index_build_seconds * 1000:.2f} ms")
+    print(
+        format_table(
+            ("input", "chars", "full scan us/call", "index us/call", "speedup"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare the re-joining chunker with the incremental one.
+
+The input is many short paragraphs, where the old implementation re-joins
+the whole window for every segment it considers.
+
+Run with ``python -m server.scripts.benchmarks.text_chunking``.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from server.app.quiz.utils.chunk_text import iter_text_chunks, split_text_into_chunks
+from server.scripts.benchmarks.timing import best_time_per_call, format_table
+from server.tests.document_factories import build_short_paragraph_text
+from server.tests.legacy_documents import legacy_split_text_into_chunks
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark text chunking")
+    parser.add_argument("--chars", type=int, default=50_000)
+    parser.add_argument("--chunk-size", type=int, default=1600)
+    parser.add_argument("--overlap", type=int, default=220)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    text = build_short_paragraph_text(args.chars)
+    options = {"max_chars": args.chunk_size, "overlap_chars": args.overlap}
+    rows = []
+
+    for label, max_chunks in (("chunk limit 24", 24), ("no practical limit", 10**9)):
+        expected = legacy_split_text_into_chunks(text, max_chunks=max_chunks, **options)
+        actual = split_text_into_chunks(text, max_chunks=max_chunks, **options)
+        assert actual == expected, "chunkers disagree"
+
+        legacy_seconds = best_time_per_call(
+            lambda: legacy_split_text_into_chunks(text, max_chunks=max_chunks, **options),
+            repeat=args.repeat,
+        )
+        incremental_seconds = best_time_per_call(
+            lambda: split_text_into_chunks(text, max_chunks=max_chunks, **options),
+            repeat=args.repeat,
+        )
+        first_chunk_seconds = best_time_per_call(
+            lambda: next(iter_text_chunks(text, max_chunks=max_chunks, **options)),
+            repeat=args.repeat,
+        )
+        rows.append(
+            (
+                label,
+                len(actual),
+                f"{legacy_seconds * 1000:.2f}",
+                f"{incremental_seconds * 1000:.2f}",
+                f"{legacy_seconds / incremental_seconds:.1f}x",
+                f"{first_chunk_seconds * 1000:.3f}",
+            )
+        )
+
+    print(f"{len(text):,} characters, {text.count(chr(10) * 2) + 1:,} paragraphs")
+    print(
+        format_table(
+            ("case", "chunks", "legacy ms", "incremental ms", "speedup", "first chunk ms"),
+            rows,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
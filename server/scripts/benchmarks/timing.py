@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Sequence
+
+
+def best_time_per_call(
+    func: Callable[[], Any],
+    *,
+    repeat: int = 5,
+    number: int = 1,
+) -> float:
+    """Return the fastest observed per-call wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+def format_table(headers: Sequence[str], rows: Sequence[Sequence[Any]]) -> str:
+    cells = [[str(header) for header in headers]]
+    cells.extend([str(value) for value in row] for row in rows)
+    widths = [max(len(row[column]) for row in cells) for column in range(len(headers))]
+    lines = [
+        "  ".join(value.rjust(width) for value, width in zip(row, widths))
+        for row in cells
+    ]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
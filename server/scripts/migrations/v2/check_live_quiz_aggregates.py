@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+
+from server.app.db.core.connection import database
+from server.app.quiz.repositories.live_quiz_aggregate_repository import LiveQuizAggregateRepository
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.scripts.migrations.v2.migration.logging import log_migration_event
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check live quiz summaries against a recount of their sessions")
+    parser.add_argument("--quiz-id", action="append", dest="quiz_ids", help="Check only this quiz; repeatable")
+    parser.add_argument("--repair", action="store_true", help="Rebuild missing and drifted summaries")
+    parser.add_argument("--sample-size", type=int, default=20)
+    return parser.parse_args()
+
+
+def configure_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
+
+
+async def main():
+    configure_logging()
+    args = parse_args()
+    aggregates = LiveQuizAggregateRepository(database["live_quiz_aggregates"])
+    service = LiveQuizSessionService(
+        LiveQuizSessionRepository(database["quizzes_v2"], database["live_quiz_sessions"]),
+        aggregates=aggregates,
+    )
+    quiz_ids = args.quiz_ids or await aggregates.list_quiz_ids()
+    log_migration_event("live_quiz_aggregate_check_started", repair=args.repair, quizzes=len(quiz_ids))
+    drifted = [
+        quiz_id
+        for quiz_id in quiz_ids
+        if not await service.check_aggregate(quiz_id, repair=args.repair)
+    ]
+    log_migration_event(
+        "live_quiz_aggregate_check_completed",
+        repair=args.repair,
+        checked=len(quiz_ids),
+        drifted=len(drifted),
+    )
+    print(json.dumps(
+        {
+            "checked": len(quiz_ids),
+            "drifted": len(drifted),
+            "repaired": len(drifted) if args.repair else 0,
+            "consistent": not drifted,
+            "samples": drifted[:args.sample_size],
+        },
+        indent=2,
+    ))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
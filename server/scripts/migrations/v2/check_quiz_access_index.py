@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+
+from server.app.db.core.connection import database
+from server.app.quiz.repositories.v2.repositories.reference_repository import ReferenceV2Repository
+from server.app.quiz.services.quiz_access_index import check_quiz_access_index
+from server.scripts.migrations.v2.migration.logging import log_migration_event
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check quiz_access_v2 against the V2 reference collections")
+    parser.add_argument("--repair", action="store_true", help="Rewrite missing, stale and mismatched rows")
+    parser.add_argument("--sample-size", type=int, default=20)
+    return parser.parse_args()
+
+
+def configure_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    )
+
+
+async def main():
+    configure_logging()
+    args = parse_args()
+    reference_repository = ReferenceV2Repository(
+        database["folders_v2"],
+        database["folder_items_v2"],
+        database["saved_quizzes_v2"],
+        database["quiz_history_v2"],
+        database["quiz_access_v2"],
+    )
+    log_migration_event("quiz_access_index_check_started", repair=args.repair)
+    report = await check_quiz_access_index(reference_repository, repair=args.repair)
+    summary = report.to_dict(sample_size=args.sample_size)
+    log_migration_event(
+        "quiz_access_index_check_completed",
+        repair=args.repair,
+        consistent=report.consistent,
+        repaired=report.repaired,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -88,6 +88,7 @@ def build_migration_context(
         database["folder_items_v2"],
         database["saved_quizzes_v2"],
         database["quiz_history_v2"],
+        database["quiz_access_v2"],
     )
     resolver = LegacyQuizResolver(
         canonical_service=canonical_service,
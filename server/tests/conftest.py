@@ -8,3 +8,15 @@ os.environ.setdefault("ASSISTANT_INTERNAL_MCP_SECRET", "test-internal-mcp-secret
 # renderer tests assert on the sender address.
 os.environ.setdefault("SENDER_EMAIL", "test-sender@example.com")
 os.environ.setdefault("SENDER_PASSWORD", "test-password")
+
+# Settings are read when server.app.core.config is imported. CI exports
+# these; the defaults let the suite and single test files run without them.
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("email_sender", "test@example.com")
+os.environ.setdefault("email_password", "password")
+os.environ.setdefault("email_host", "smtp.example.com")
+os.environ.setdefault("email_port", "587")
+os.environ.setdefault("share_url", "http://localhost:3000")
+os.environ.setdefault("db_name", "test")
+os.environ.setdefault("mongo_url", "mongodb://localhost:27017")
+os.environ.setdefault("FERNET_KEY", "l65zsWSMsTUO0VNMNxhXCQ0UKlTuBXZH8QC0a5F18fM=")
@@ -0,0 +1,54 @@
+"""Synthetic documents and embeddings for the document pipeline tests.
+
+The benchmarks in ``server/scripts/benchmarks`` build their inputs with the
+same helpers.
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import random
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+
+def build_synthetic_pdf(page_count: int, *, lines_per_page: int = 40) -> bytes:
+    """Render ``page_count`` pages of numbered, sentence-like text lines."""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for page_number in range(page_count):
+        text = pdf.beginText(54, 740)
+        text.setFont("Helvetica", 10)
+        for line_number in range(lines_per_page):
+            text.textLine(
+                f"Page {page_number + 1} line {line_number + 1}: "
+                "the mitochondria converts nutrients into usable cellular energy."
+            )
+        pdf.drawText(text)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def build_short_paragraph_text(total_chars: int, *, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = ["cell", "energy", "membrane", "protein", "enzyme", "nucleus", "signal", "gene"]
+    paragraphs: list[str] = []
+    length = 0
+    while length < total_chars:
+        paragraph = " ".join(rng.choice(words) for _ in range(rng.randint(1, 6))) + "."
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:total_chars]
+
+
+def random_unit_vectors(count: int, dimensions: int, *, seed: int) -> list[list[float]]:
+    generator = random.Random(seed)
+    vectors: list[list[float]] = []
+    for _ in range(count):
+        values = [generator.gauss(0.0, 1.0) for _ in range(dimensions)]
+        norm = math.sqrt(sum(value * value for value in values))
+        vectors.append([value / norm for value in values])
+    return vectors
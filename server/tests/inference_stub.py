@@ -0,0 +1,164 @@
+"""In-process stand-in for Hugging Face feature-extraction and chat endpoints.
+
+Point a ``BatchEmbeddingClient`` at ``StubInferenceServer.url`` (HF Inference
+accepts a URL as the model id) to exercise the real request path offline.
+Chat completions are served under ``chat_model_url`` and answer with
+``chat_response``. The server speaks HTTP/1.1, so ``connections`` counts how
+many TCP connections clients actually opened.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def stub_embedding(text: str, dimensions: int) -> list[float]:
+    """Deterministic pseudo-embedding derived from the text's SHA-256."""
+    values: list[float] = []
+    counter = 0
+    while len(values) < dimensions:
+        digest = hashlib.sha256(f"{counter}:{text}".encode("utf-8")).digest()
+        for offset in range(0, len(digest), 4):
+            (raw,) = struct.unpack_from(">I", digest, offset)
+            values.append((raw / 0xFFFFFFFF) * 2.0 - 1.0)
+        counter += 1
+    return values[:dimensions]
+
+
+class StubInferenceServer:
+    def __init__(
+        self,
+        *,
+        dimensions: int = 8,
+        latency_seconds: float = 0.0,
+        per_input_latency_seconds: float = 0.0,
+        failures_before_success: int = 0,
+        failure_status: int = 503,
+        chat_response: str = "{}",
+    ):
+        self.dimensions = dimensions
+        self.latency_seconds = latency_seconds
+        self.per_input_latency_seconds = per_input_latency_seconds
+        self.failures_remaining = failures_before_success
+        self.failure_status = failure_status
+        self.chat_response = chat_response
+        self.requests: list[list[str]] = []
+        self.chat_requests: list[dict] = []
+        self.authorizations: list[str] = []
+        self.connections = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._build_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/feature-extraction"
+
+    @property
+    def chat_model_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/chat"
+
+    @property
+    def embedded_texts(self) -> list[str]:
+        return [text for batch in self.requests for text in batch]
+
+    def __enter__(self) -> "StubInferenceServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+
+    def _handle(self, payload: dict) -> tuple[int, object]:
+        is_chat = "messages" in payload
+        inputs = payload.get("inputs")
+        batch = [inputs] if isinstance(inputs, str) else list(inputs or [])
+
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            delay = self.latency_seconds + self.per_input_latency_seconds * len(batch)
+            if delay:
+                time.sleep(delay)
+            with self._lock:
+                if self.failures_remaining > 0:
+                    self.failures_remaining -= 1
+                    return self.failure_status, {"error": "stub failure"}
+                if is_chat:
+                    self.chat_requests.append(payload)
+                else:
+                    self.requests.append(batch)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        if is_chat:
+            return 200, {
+                "id": f"stub-{len(self.chat_requests)}",
+                "object": "chat.completion",
+                "created": 0,
+                "model": payload.get("model"),
+                "system_fingerprint": "stub",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": self.chat_response},
+                    }
+                ],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }
+
+        if isinstance(inputs, str):
+            return 200, stub_embedding(inputs, self.dimensions)
+        return 200, [stub_embedding(text, self.dimensions) for text in batch]
+
+    def _build_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_POST(self):  # noqa: N802 - http.server naming
+                length = int(self.headers.get("content-length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                with stub._lock:
+                    stub.authorizations.append(self.headers.get("authorization", ""))
+                status, body = stub._handle(payload)
+                encoded = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(encoded)))
+                self.end_headers()
+                try:
+                    self.wfile.write(encoded)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up (e.g. a timeout test); nothing to do.
+                    self.close_connection = True
+
+            def log_message(self, format, *args):  # noqa: A002
+                return
+
+        return Handler
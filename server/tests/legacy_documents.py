@@ -0,0 +1,209 @@
+"""Pre-rewrite chunking and RAG selection, kept as equivalence oracles.
+
+Property tests compare the production code against these on generated
+inputs, and the benchmarks time them as the baseline.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+
+from server.app.quiz.utils.chunk_text import TextChunk
+
+
+_SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+def _join_segments(segments: list[str]) -> str:
+    return "\n\n".join(segment.strip() for segment in segments if segment.strip()).strip()
+
+
+def _select_overlap_segments(segments: list[str], overlap_size: int) -> list[str]:
+    if overlap_size <= 0:
+        return []
+
+    overlap_segments: list[str] = []
+    total_length = 0
+
+    for segment in reversed(segments):
+        segment = segment.strip()
+        if not segment:
+            continue
+
+        separator_length = 2 if overlap_segments else 0
+        projected_length = total_length + separator_length + len(segment)
+
+        if overlap_segments and projected_length > overlap_size:
+            break
+
+        overlap_segments.append(segment)
+        total_length = projected_length
+
+        if total_length >= overlap_size:
+            break
+
+    return list(reversed(overlap_segments))
+
+
+def _split_long_paragraph(paragraph: str, max_chars: int) -> list[str]:
+    sentences = _SENTENCE_BOUNDARY_PATTERN.split(paragraph)
+    if len(sentences) == 1:
+        return [
+            paragraph[index : index + max_chars]
+            for index in range(0, len(paragraph), max_chars)
+        ]
+
+    chunks: list[str] = []
+    current = ""
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+
+        candidate = f"{current} {sentence}".strip() if current else sentence
+        if current and len(candidate) > max_chars:
+            chunks.append(current.strip())
+            current = sentence
+        else:
+            current = candidate
+
+    if current.strip():
+        chunks.append(current.strip())
+    return chunks
+
+
+def legacy_split_text_into_chunks(
+    text: str,
+    *,
+    max_chars: int,
+    overlap_chars: int,
+    max_chunks: int,
+) -> list[TextChunk]:
+    """The original implementation, kept verbatim as an equivalence oracle."""
+    chunk_size = max_chars
+    overlap_size = overlap_chars
+    chunk_limit = max_chunks
+
+    paragraphs = [segment.strip() for segment in re.split(r"\n\s*\n", text) if segment.strip()]
+    prepared_segments: list[str] = []
+
+    for paragraph in paragraphs:
+        if len(paragraph) <= chunk_size:
+            prepared_segments.append(paragraph)
+        else:
+            prepared_segments.extend(_split_long_paragraph(paragraph, chunk_size))
+
+    chunks: list[TextChunk] = []
+    current_segments: list[str] = []
+
+    for segment in prepared_segments:
+        candidate_segments = [*current_segments, segment]
+        candidate = _join_segments(candidate_segments)
+
+        if current_segments and len(candidate) > chunk_size:
+            current_content = _join_segments(current_segments)
+            chunks.append(
+                TextChunk(
+                    chunk_id=len(chunks),
+                    content=current_content,
+                    char_count=len(current_content),
+                )
+            )
+
+            overlap_segments = _select_overlap_segments(current_segments, overlap_size)
+            current_segments = [*overlap_segments, segment]
+
+            while len(_join_segments(current_segments)) > chunk_size and len(current_segments) > 1:
+                current_segments = current_segments[1:]
+        else:
+            current_segments = candidate_segments
+
+        if len(chunks) >= chunk_limit:
+            break
+
+    current_content = _join_segments(current_segments)
+    if current_content and len(chunks) < chunk_limit:
+        chunks.append(
+            TextChunk(
+                chunk_id=len(chunks),
+                content=current_content,
+                char_count=len(current_content),
+            )
+        )
+
+    return chunks
+
+
+def _cosine_similarity(left: list[float], right: list[float]) -> float:
+    if not left or not right:
+        return 0.0
+
+    dot_product = sum(a * b for a, b in zip(left, right))
+    left_norm = math.sqrt(sum(value * value for value in left))
+    right_norm = math.sqrt(sum(value * value for value in right))
+    if left_norm == 0 or right_norm == 0:
+        return 0.0
+    return dot_product / (left_norm * right_norm)
+
+
+def _mean_embedding(vectors: list[list[float]]) -> list[float]:
+    if not vectors:
+        return []
+    dimensions = len(vectors[0])
+    return [
+        sum(vector[index] for vector in vectors) / len(vectors)
+        for index in range(dimensions)
+    ]
+
+
+def legacy_select_indices(
+    chunk_embeddings: list[list[float]],
+    query_embedding: list[float],
+    *,
+    top_k: int,
+) -> list[tuple[int, float]]:
+    """The pure-Python selection that ``ChunkEmbeddingIndex`` replaced.
+
+    Kept verbatim (minus the ``TextChunk`` wrapping) as the benchmark baseline
+    and as the equivalence oracle for the retrieval tests.
+    """
+    centroid = _mean_embedding(chunk_embeddings)
+    scored_candidates: list[tuple[int, float, float, float]] = []
+
+    for index, chunk_embedding in enumerate(chunk_embeddings):
+        query_score = _cosine_similarity(query_embedding, chunk_embedding)
+        centroid_score = _cosine_similarity(centroid, chunk_embedding)
+        hybrid_score = (0.7 * query_score) + (0.3 * centroid_score)
+        scored_candidates.append((index, hybrid_score, query_score, centroid_score))
+
+    ranked = sorted(scored_candidates, key=lambda item: item[1], reverse=True)
+    pool = ranked[: max(top_k * 3, top_k)]
+    selected_indices: list[int] = []
+
+    for index, hybrid_score, _, _ in pool:
+        if len(selected_indices) >= top_k:
+            break
+        if not selected_indices:
+            selected_indices.append(index)
+            continue
+
+        diversity_penalty = max(
+            _cosine_similarity(chunk_embeddings[index], chunk_embeddings[selected])
+            for selected in selected_indices
+        )
+        mmr_score = (0.7 * hybrid_score) - (0.3 * diversity_penalty)
+        if mmr_score > -1:
+            selected_indices.append(index)
+
+    if len(selected_indices) < min(top_k, len(chunk_embeddings)):
+        for index, _, _, _ in ranked:
+            if index not in selected_indices:
+                selected_indices.append(index)
+            if len(selected_indices) >= min(top_k, len(chunk_embeddings)):
+                break
+
+    return [
+        (index, next(score for idx, score, _, _ in scored_candidates if idx == index))
+        for index in selected_indices
+    ]
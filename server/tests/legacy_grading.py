@@ -0,0 +1,162 @@
+"""Per-answer graders and the document-loading grading service, as they were.
+
+``grade_batch`` and the compiled answer keys replaced these; the tests
+compare against them on generated quizzes and the benchmarks time them as
+the baseline.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Optional
+
+from rapidfuzz import fuzz
+
+from server.app.quiz.repositories.v2.models.quiz_models import QuizDocumentV2
+from server.app.quiz.services.quiz_answer_key_cache import normalize_true_false
+from server.app.quiz.services.quiz_grading_service import QuizGradingService, SubmissionMismatchError
+
+
+def _result_row(question, user_answer, correct_answer, question_type, is_correct, accuracy=None):
+    row = {
+        "question": question,
+        "user_answer": user_answer,
+        "correct_answer": correct_answer,
+        "question_type": question_type,
+    }
+    if accuracy is not None:
+        row["accuracy_percentage"] = accuracy
+    row["is_correct"] = is_correct
+    row["result"] = "Correct" if is_correct else "Incorrect"
+    return row
+
+
+def _legacy_normalize_answer(ans: Any) -> str:
+    ans = str(ans).strip()
+    ans = re.sub(r"^[A-D]\)\s*", "", ans, flags=re.IGNORECASE)
+    ans = re.sub(r"^correct answer[:\-]?\s*", "", ans, flags=re.IGNORECASE)
+    return ans.strip()
+
+
+def legacy_grade_with_ai(user_answers: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """``grade_with_ai`` as it was: one regex pass and one fuzzy call per answer."""
+    result = []
+    for answer in user_answers:
+        question = answer.get("question", "")
+        question_type = answer.get("question_type", "").strip().lower()
+        if question_type == "true-false":
+            try:
+                user_answer = int(answer.get("user_answer", -1))
+                correct_answer = int(answer.get("correct_answer", -1))
+            except ValueError:
+                result.append({
+                    "question": question,
+                    "user_answer": answer.get("user_answer", ""),
+                    "correct_answer": answer.get("correct_answer", ""),
+                    "question_type": question_type,
+                    "is_correct": False,
+                    "result": "Invalid format",
+                })
+                continue
+            result.append(_result_row(
+                question, user_answer, correct_answer, question_type, user_answer == correct_answer
+            ))
+            continue
+
+        user_answer = _legacy_normalize_answer(answer.get("user_answer", ""))
+        correct_answer = _legacy_normalize_answer(answer.get("correct_answer", ""))
+        if not correct_answer:
+            continue
+        result.append(_legacy_score(question, user_answer, correct_answer, question_type, ("multichoice",)))
+    return result
+
+
+def legacy_grade_mock_answers(user_answers: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """``grade_mock_answers`` as it was."""
+    result = []
+    for answer in user_answers:
+        question_type = answer.get("question_type", "").strip()
+        user_answer = str(answer.get("user_answer", "")).strip()
+        correct_answer = str(answer.get("correct_answer", "")).strip()
+        if not correct_answer:
+            continue
+        result.append(_legacy_score(
+            answer.get("question", ""),
+            user_answer,
+            correct_answer,
+            question_type,
+            ("multichoice", "true-false"),
+        ))
+    return result
+
+
+def _legacy_score(question, user_answer, correct_answer, question_type, exact_types):
+    thresholds = {"open-ended": 50, "short-answer": 80}
+    if question_type in thresholds:
+        accuracy = fuzz.token_set_ratio(str(user_answer), str(correct_answer))
+        return _result_row(
+            question,
+            user_answer,
+            correct_answer,
+            question_type,
+            accuracy >= thresholds[question_type],
+            accuracy,
+        )
+    is_correct = question_type in exact_types and user_answer.lower() == correct_answer.lower()
+    return _result_row(question, user_answer, correct_answer, question_type, is_correct)
+
+
+def legacy_grade_against_stored_questions(
+    stored_questions: list[dict[str, Any]],
+    submitted_answers: list[dict[str, Any]],
+    *,
+    quiz_type: str,
+    source: str = "mock",
+) -> list[dict[str, Any]]:
+    """``grade_against_stored_questions`` as it was, with the per-answer graders."""
+    questions_by_text = {q["question"]: q for q in stored_questions}
+    grading_payload = []
+    for submitted in submitted_answers:
+        stored = questions_by_text.get(submitted.get("question"))
+        if stored is None:
+            raise SubmissionMismatchError("Submitted answers do not match this quiz's questions.")
+        user_answer = submitted.get("user_answer")
+        correct_answer = stored["correct_answer"]
+        if quiz_type == "true-false":
+            user_answer = normalize_true_false(user_answer)
+            correct_answer = normalize_true_false(correct_answer)
+        grading_payload.append({
+            "question": stored["question"],
+            "user_answer": user_answer,
+            "correct_answer": correct_answer,
+            "question_type": quiz_type,
+        })
+    grader = legacy_grade_with_ai if source == "ai" else legacy_grade_mock_answers
+    return grader(grading_payload)
+
+
+class LegacyGradingService(QuizGradingService):
+    """``grade_submission`` as it was: a validated document per submission."""
+
+    async def _resolve_quiz(self, quiz_id: str) -> Optional[QuizDocumentV2]:
+        quiz_doc = await self.quiz_repository.find_by_id(quiz_id)
+        if not quiz_doc:
+            saved_reference = await self.reference_repository.get_saved_quiz_by_public_id(quiz_id)
+            if saved_reference:
+                quiz_doc = await self.quiz_repository.find_by_id(saved_reference.quiz_id)
+        return quiz_doc
+
+    async def grade_submission(self, quiz_id, submitted_answers, *, source="mock"):
+        quiz_doc = await self._resolve_quiz(quiz_id)
+        if quiz_doc is None:
+            return None
+        stored_questions = [
+            {"question": question.question, "correct_answer": question.correct_answer}
+            for question in quiz_doc.questions
+        ]
+        return legacy_grade_against_stored_questions(
+            stored_questions,
+            submitted_answers,
+            quiz_type=quiz_doc.quiz_type.value,
+            source=source,
+        )
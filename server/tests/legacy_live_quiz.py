@@ -0,0 +1,94 @@
+"""Read-modify-write answer saving, as it was before the atomic update.
+
+Kept to show the lost-update race in tests and as the benchmark baseline.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+
+
+class LegacyAnswerRepository(LiveQuizSessionRepository):
+    async def save_answer(
+        self,
+        session_id: str,
+        question_index: int,
+        selected_answer: str,
+        next_question_index: int,
+    ) -> Optional[Dict[str, Any]]:
+        session = await self.get_session(session_id)
+        if not session:
+            return None
+
+        now = datetime.now(timezone.utc)
+        answers = [
+            answer
+            for answer in session.get("answers", [])
+            if answer.get("question_index") != question_index
+        ]
+        answers.append(
+            {
+                "question_index": question_index,
+                "selected_answer": selected_answer,
+                "answered_at": now,
+            }
+        )
+        answers.sort(key=lambda answer: answer["question_index"])
+        return await self.update_session(
+            session_id,
+            {
+                "answers": answers,
+                "current_question_index": next_question_index,
+                "status": "active",
+            },
+        )
+
+
+class LegacyAnswerService(LiveQuizSessionService):
+    """``save_answer`` as it was before the atomic write; needs ``LegacyAnswerRepository``."""
+
+    async def save_answer(
+        self,
+        session_id: str,
+        participant_token: str,
+        question_index: int,
+        selected_answer: str,
+        next_question_index: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        session = await self._get_authorized_session(session_id, participant_token)
+        if session.get("status") not in {"active", "joined", "disconnected"}:
+            raise HTTPException(status_code=409, detail="Session is not active")
+        if self._is_expired(session):
+            snapshot = await self._get_quiz_snapshot(session["quiz_id"])
+            if snapshot:
+                await self._finalize_session(session, snapshot, auto_submitted=True)
+            raise HTTPException(status_code=409, detail="Session has expired")
+        if question_index < 0 or question_index >= session["total_questions"]:
+            raise HTTPException(status_code=400, detail="Invalid question index")
+
+        next_index = (
+            next_question_index
+            if next_question_index is not None
+            else session["current_question_index"]
+        )
+        if next_index < 0 or next_index >= session["total_questions"]:
+            raise HTTPException(status_code=400, detail="Invalid next question index")
+        updated = await self.repository.save_answer(
+            session_id,
+            question_index,
+            selected_answer,
+            next_index,
+        )
+        if not updated:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return {
+            "status": updated["status"],
+            "current_question_index": updated["current_question_index"],
+            "remaining_seconds": self._remaining_seconds(updated["expires_at"]),
+        }
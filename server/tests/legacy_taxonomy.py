@@ -0,0 +1,68 @@
+"""Pre-index taxonomy classifier, kept as an equivalence oracle.
+
+The seed bank tests compare ``classify_deterministically`` against this full
+scan on every bundled question, and the benchmark times it as the baseline.
+"""
+
+from __future__ import annotations
+
+from server.app.quiz.services.category_seed_service import load_questions_from_file
+from server.app.quiz.services.category_taxonomy_service import (
+    SEED_CATEGORIES_DIR,
+    TAXONOMY_ALIASES,
+    TaxonomyClassification,
+    TaxonomyEntry,
+    build_classification,
+    build_classification_text,
+    get_taxonomy_entries,
+    normalize_text,
+    tokenize,
+)
+
+
+def legacy_classify_deterministically(text: str, quiz_type: str) -> TaxonomyClassification | None:
+    entries = get_taxonomy_entries()
+    if not entries or not text.strip():
+        return None
+
+    normalized_text = normalize_text(text)
+    input_tokens = tokenize(text)
+    best_entry: TaxonomyEntry | None = None
+    best_score = 0.0
+
+    for entry in entries:
+        category_phrase = normalize_text(entry.category)
+        subcategory_phrase = normalize_text(entry.subcategory)
+        category_tokens = tokenize(entry.category)
+        subcategory_tokens = tokenize(entry.subcategory)
+        aliases = TAXONOMY_ALIASES.get(entry.subcategory_slug, set())
+
+        score = 0.0
+        if subcategory_phrase and subcategory_phrase in normalized_text:
+            score += 0.65
+        if category_phrase and category_phrase in normalized_text:
+            score += 0.2
+        if subcategory_tokens:
+            score += 0.45 * (len(subcategory_tokens & input_tokens) / len(subcategory_tokens))
+        if category_tokens:
+            score += 0.15 * (len(category_tokens & input_tokens) / len(category_tokens))
+        alias_hits = len(aliases & input_tokens)
+        if alias_hits:
+            score += min(0.45, alias_hits * 0.18)
+
+        if score > best_score:
+            best_score = score
+            best_entry = entry
+
+    if not best_entry or best_score < 0.35:
+        return None
+    return build_classification(best_entry, quiz_type, method="deterministic", confidence=best_score)
+
+
+def seed_classification_texts() -> dict[str, str]:
+    """Classification text for every seed question bank, keyed by its path."""
+    texts = {}
+    for questions_file in sorted(SEED_CATEGORIES_DIR.glob("*/*/questions.py")):
+        label = str(questions_file.parent.relative_to(SEED_CATEGORIES_DIR))
+        texts[label] = build_classification_text(questions=load_questions_from_file(questions_file))
+    return texts
@@ -0,0 +1,333 @@
+"""In-memory library collections and the users' references filed in them.
+
+``LibraryCollections`` holds one ``FakeMongoCollection`` per collection the
+library service reads; the ``build_*`` helpers write a user's folders, saved
+quizzes and history straight into them. ``LegacyFolderLibraryService`` keeps
+the per-folder reads the batched listing replaced.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable
+
+from bson import ObjectId
+from rapidfuzz import fuzz
+
+from server.app.quiz.repositories.v2.repositories.quiz_repository import QuizV2Repository
+from server.app.quiz.repositories.v2.repositories.reference_repository import ReferenceV2Repository
+from server.app.quiz.services.quiz_user_library_service import QuizUserLibraryService
+from server.tests.mongo_fake import FakeMongoCollection
+from server.tests.quiz_factories import build_quiz
+
+
+class LibraryCollections:
+    def __init__(self, *, latency: float = 0.0):
+        self.quizzes = FakeMongoCollection(latency=latency)
+        self.folders = FakeMongoCollection(latency=latency)
+        self.folder_items = FakeMongoCollection(latency=latency)
+        self.saved_quizzes = FakeMongoCollection(latency=latency)
+        self.quiz_history = FakeMongoCollection(latency=latency)
+        self.quiz_access = FakeMongoCollection(latency=latency)
+
+    def all(self) -> list[FakeMongoCollection]:
+        return [
+            self.quizzes,
+            self.folders,
+            self.folder_items,
+            self.saved_quizzes,
+            self.quiz_history,
+            self.quiz_access,
+        ]
+
+    @property
+    def round_trips(self) -> int:
+        return sum(collection.round_trips for collection in self.all())
+
+    def reset_counts(self) -> None:
+        for collection in self.all():
+            collection.reset_counts()
+
+    def reference_repository(self, *, indexed: bool = True) -> ReferenceV2Repository:
+        return ReferenceV2Repository(
+            self.folders,
+            self.folder_items,
+            self.saved_quizzes,
+            self.quiz_history,
+            self.quiz_access if indexed else None,
+        )
+
+    def library_service(self, *, indexed: bool = True) -> QuizUserLibraryService:
+        quiz_repository = QuizV2Repository(self.quizzes)
+        return QuizUserLibraryService(
+            canonical_service=object(),
+            quiz_repository=quiz_repository,
+            reference_repository=self.reference_repository(indexed=indexed),
+        )
+
+
+def add_quiz(collections: LibraryCollections, seed: int) -> str:
+    quiz = build_quiz(2, seed=seed)
+    quiz["quiz_type"] = quiz["quiz_type"].value
+    collections.quizzes.documents[quiz["_id"]] = quiz
+    return str(quiz["_id"])
+
+
+def build_library(
+    collections: LibraryCollections,
+    *,
+    user_id: str,
+    folders: int = 500,
+    items_per_folder: int = 4,
+    saved: int = 200,
+    history: int = 300,
+    seed: int = 0,
+) -> dict[str, str]:
+    """Write the user's references straight into the collections; returns sample quiz ids."""
+    rng = random.Random(seed)
+    quiz_ids = [add_quiz(collections, seed + index) for index in range(max(folders * items_per_folder, saved, history))]
+    # Only the last folder reaches its quizzes, so the scan has to get there.
+    last_folder_quiz_ids = quiz_ids[(folders - 1) * items_per_folder:folders * items_per_folder]
+    referenceable = [quiz_id for quiz_id in quiz_ids if quiz_id not in last_folder_quiz_ids]
+    now = datetime(2025, 1, 1)
+    for folder_index in range(folders):
+        folder_id = ObjectId()
+        collections.folders.documents[folder_id] = {
+            "_id": folder_id,
+            "user_id": user_id,
+            "name": f"Folder {folder_index}",
+            "created_at": now,
+            "updated_at": now,
+            "deleted_at": None,
+        }
+        for position in range(items_per_folder):
+            item_id = ObjectId()
+            collections.folder_items.documents[item_id] = {
+                "_id": item_id,
+                "folder_id": str(folder_id),
+                "quiz_id": quiz_ids[folder_index * items_per_folder + position],
+                "position": position,
+                "created_at": now,
+                "deleted_at": None,
+            }
+    for collection, count, fields in (
+        (collections.saved_quizzes, saved, {"saved_at": now}),
+        (collections.quiz_history, history, {"action": "generated", "created_at": now}),
+    ):
+        for quiz_id in rng.sample(referenceable, count):
+            document_id = ObjectId()
+            collection.documents[document_id] = {
+                "_id": document_id,
+                "user_id": user_id,
+                "quiz_id": quiz_id,
+                **fields,
+                "deleted_at": None,
+            }
+    return {
+        "saved quiz": next(iter(collections.saved_quizzes.documents.values()))["quiz_id"],
+        "last folder": last_folder_quiz_ids[0],
+        "no access": add_quiz(collections, seed - 1),
+    }
+
+
+_TITLE_WORDS = (
+    "cell biology photosynthesis algebra geometry french revolution organic chemistry "
+    "world war poetry grammar statistics genetics ecology calculus physics optics"
+).split()
+
+
+class LegacyFolderLibraryService(QuizUserLibraryService):
+    """``list_folders`` and ``find_quiz_in_folders_by_title`` as they were."""
+
+    async def list_folders(self, *, user_id: str) -> list[dict[str, Any]]:
+        folders = await self.reference_repository.list_folders_for_user(user_id)
+        payloads: list[dict[str, Any]] = []
+        for folder in sorted(folders, key=lambda item: (item.created_at, str(item.id))):
+            items = await self.reference_repository.list_folder_items_for_folder(str(folder.id))
+            payloads.append(
+                {
+                    "id": str(folder.id),
+                    "user_id": folder.user_id,
+                    "name": folder.name,
+                    "created_at": self._isoformat(folder.created_at),
+                    "updated_at": self._isoformat(folder.updated_at),
+                    "quizzes": [{"id": str(item.id)} for item in items],
+                    "quiz_count": len(items),
+                }
+            )
+        return payloads
+
+    async def find_quiz_in_folders_by_title(self, *, user_id: str, title: str) -> dict[str, Any]:
+        normalized_title = title.strip().casefold()
+        matches: list[dict[str, Any]] = []
+        folders = await self.reference_repository.list_folders_for_user(user_id)
+        for folder in folders:
+            folder_payload = await self.get_folder(folder_id=str(folder.id), user_id=user_id)
+            if not folder_payload:
+                continue
+            for quiz in folder_payload.get("quizzes", []):
+                quiz_title = str(quiz.get("title") or "")
+                normalized_quiz_title = quiz_title.casefold()
+                similarity = max(
+                    fuzz.partial_ratio(normalized_title, normalized_quiz_title),
+                    fuzz.token_set_ratio(normalized_title, normalized_quiz_title),
+                )
+                if normalized_title in normalized_quiz_title or similarity >= 85:
+                    matches.append(
+                        {
+                            "folder_id": folder_payload["id"],
+                            "folder_name": folder_payload["name"],
+                            "folder_item_id": quiz.get("id"),
+                            "quiz_id": quiz.get("quiz_id"),
+                            "title": quiz_title,
+                            "question_type": quiz.get("question_type"),
+                            "questions": quiz.get("questions") or [],
+                            "match_score": similarity,
+                        }
+                    )
+        return {
+            "query": title,
+            "found": bool(matches),
+            "matches": matches,
+        }
+
+
+def library_services(collections: LibraryCollections) -> dict[str, QuizUserLibraryService]:
+    batched = collections.library_service(indexed=False)
+    legacy = LegacyFolderLibraryService(
+        canonical_service=object(),
+        quiz_repository=batched.quiz_repository,
+        reference_repository=batched.reference_repository,
+    )
+    return {"legacy": legacy, "batched": batched}
+
+
+def build_folders(
+    collections: LibraryCollections,
+    *,
+    user_id: str,
+    folders: int = 100,
+    items_per_folder: int = 10,
+    questions: int = 20,
+    seed: int = 0,
+) -> list[str]:
+    """Write folders, items, quizzes and some saved references; returns the quiz titles used."""
+    rng = random.Random(seed)
+    started = datetime(2025, 1, 1)
+    titles = []
+    for folder_index in range(folders):
+        folder_id = ObjectId()
+        collections.folders.documents[folder_id] = {
+            "_id": folder_id,
+            "user_id": user_id,
+            "name": f"Folder {folder_index}",
+            "created_at": started + timedelta(minutes=rng.randrange(folders)),
+            "updated_at": started,
+            "deleted_at": None,
+        }
+        for position in range(items_per_folder):
+            quiz = build_quiz(questions, seed=rng.randrange(1 << 30))
+            quiz["quiz_type"] = quiz["quiz_type"].value
+            quiz["title"] = " ".join(rng.sample(_TITLE_WORDS, 3)).title()
+            collections.quizzes.documents[quiz["_id"]] = quiz
+            titles.append(quiz["title"])
+            saved_quiz_id = None
+            if rng.random() < 0.3:
+                saved_id = ObjectId()
+                saved_quiz_id = str(saved_id)
+                collections.saved_quizzes.documents[saved_id] = {
+                    "_id": saved_id,
+                    "user_id": user_id,
+                    "quiz_id": str(quiz["_id"]),
+                    "display_title": f"My {quiz['title']}" if rng.random() < 0.5 else None,
+                    "saved_at": started,
+                    "deleted_at": None,
+                }
+            item_id = ObjectId()
+            collections.folder_items.documents[item_id] = {
+                "_id": item_id,
+                "folder_id": str(folder_id),
+                "quiz_id": str(quiz["_id"]),
+                "saved_quiz_id": saved_quiz_id,
+                "position": rng.choice([None, position]),
+                "display_title": f"Item {position}" if rng.random() < 0.1 else None,
+                "created_at": started + timedelta(seconds=rng.randrange(1000)),
+                "deleted_at": datetime(2025, 2, 1) if rng.random() < 0.05 else None,
+            }
+    return titles
+
+
+Listing = Callable[[QuizUserLibraryService, bool], Awaitable[Any]]
+
+
+def build_library_listings(
+    collections: LibraryCollections,
+    *,
+    user_id: str,
+    quizzes: int = 100,
+    questions: int = 30,
+    seed: int = 0,
+) -> str:
+    """Save every quiz, log it in the history and file it in one folder; returns the folder id."""
+    rng = random.Random(seed)
+    started = datetime(2025, 1, 1)
+    folder_id = ObjectId()
+    collections.folders.documents[folder_id] = {
+        "_id": folder_id,
+        "user_id": user_id,
+        "name": "Everything",
+        "created_at": started,
+        "updated_at": started,
+        "deleted_at": None,
+    }
+    for index in range(quizzes):
+        quiz = build_quiz(rng.randint(max(1, questions // 2), questions), seed=rng.randrange(1 << 30))
+        quiz["quiz_type"] = quiz["quiz_type"].value
+        quiz["title"] = f"Quiz {index}"
+        collections.quizzes.documents[quiz["_id"]] = quiz
+        quiz_id = str(quiz["_id"])
+        created_at = started + timedelta(minutes=index)
+        saved_id = ObjectId()
+        collections.saved_quizzes.documents[saved_id] = {
+            "_id": saved_id,
+            "user_id": user_id,
+            "quiz_id": quiz_id,
+            "display_title": f"My quiz {index}" if rng.random() < 0.3 else None,
+            "saved_at": created_at,
+            "deleted_at": None,
+        }
+        history_id = ObjectId()
+        collections.quiz_history.documents[history_id] = {
+            "_id": history_id,
+            "user_id": user_id,
+            "quiz_id": quiz_id,
+            "action": "generated",
+            "metadata": {"difficulty_level": rng.choice(["easy", "medium", "hard"]), "topic": "Biology"},
+            "created_at": created_at,
+            "deleted_at": None,
+        }
+        item_id = ObjectId()
+        collections.folder_items.documents[item_id] = {
+            "_id": item_id,
+            "folder_id": str(folder_id),
+            "quiz_id": quiz_id,
+            "saved_quiz_id": str(saved_id) if rng.random() < 0.5 else None,
+            "position": index,
+            "created_at": created_at,
+            "deleted_at": None,
+        }
+    return str(folder_id)
+
+
+def listings(*, user_id: str, folder_id: str) -> dict[str, Listing]:
+    return {
+        "saved quizzes": lambda service, summary: service.list_saved_quizzes(user_id=user_id, summary=summary),
+        "quiz history": lambda service, summary: service.list_quiz_history_items(user_id=user_id, summary=summary),
+        "folder": lambda service, summary: service.get_folder(folder_id=folder_id, user_id=user_id, summary=summary),
+    }
+
+
+def response_bytes(payload: Any) -> int:
+    return len(json.dumps(payload, default=str).encode())
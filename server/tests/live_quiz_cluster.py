@@ -0,0 +1,86 @@
+"""Several ``LiveQuizRealtimeBroadcaster`` workers sharing one Redis stand-in.
+
+Each broadcaster plays the part of a uvicorn worker process; dashboard
+sockets are ``RecordingWebSocket`` objects that keep what they were sent,
+optionally taking ``delay`` seconds per frame to stand in for a slow client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, Optional
+
+# redis_fake sets the environment the broadcaster's settings import needs.
+from server.tests.redis_fake import FakeRedis
+from server.app.quiz.services.live_quiz_realtime import LiveQuizRealtimeBroadcaster
+
+
+class RecordingWebSocket:
+    def __init__(self, name: str = "socket", *, delay: float = 0.0):
+        self.name = name
+        self.delay = delay
+        self.sent: list[dict[str, Any]] = []
+        self.closed_with: Optional[int] = None
+
+    async def accept(self) -> None:
+        return None
+
+    async def send_json(self, data: Any) -> None:
+        if self.closed_with is not None:
+            raise RuntimeError("Cannot call send once a close message has been sent.")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+    async def send_text(self, text: str) -> None:
+        await self.send_json(json.loads(text))
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+class LiveQuizCluster:
+    def __init__(
+        self,
+        workers: int,
+        *,
+        redis_client: Any = None,
+        **broadcaster_options: Any,
+    ):
+        self.redis = redis_client if redis_client is not None else FakeRedis()
+        broadcaster_options.setdefault("reconnect_initial_seconds", 0.01)
+        broadcaster_options.setdefault("poll_timeout_seconds", 0.05)
+        self.workers = [LiveQuizRealtimeBroadcaster(**broadcaster_options) for _ in range(workers)]
+
+    async def __aenter__(self) -> "LiveQuizCluster":
+        for worker in self.workers:
+            await worker.start(self.redis)
+        await self.wait_until_subscribed()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        for worker in self.workers:
+            await worker.stop()
+
+    async def wait_until_subscribed(self) -> None:
+        await asyncio.gather(*(worker.wait_until_subscribed() for worker in self.workers))
+
+    async def connect_watchers(self, quiz_id: str, count: int) -> list[RecordingWebSocket]:
+        """Spread ``count`` dashboard sockets round-robin over the workers."""
+        sockets = []
+        for index in range(count):
+            socket = RecordingWebSocket(f"{quiz_id}-watcher-{index}")
+            await self.workers[index % len(self.workers)].connect(quiz_id, socket, accepted=True)
+            sockets.append(socket)
+        return sockets
+
+    @staticmethod
+    async def wait_for(sockets: list[RecordingWebSocket], count: int, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        while any(len(socket.sent) < count for socket in sockets):
+            if time.monotonic() > deadline:
+                received = sorted(len(socket.sent) for socket in sockets)
+                raise AssertionError(f"Expected {count} events per socket, got {received}")
+            await asyncio.sleep(0.001)
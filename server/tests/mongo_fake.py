@@ -0,0 +1,442 @@
+"""In-memory stand-in for the subset of Motor's collection API the live quiz repository uses.
+
+Every awaited call counts as one round trip in ``round_trips`` and is named
+in ``operations``, so tests and benchmarks can check how many times a code
+path goes to Mongo. Each call yields to the event loop first, after
+``latency`` seconds, so concurrent callers interleave between round trips
+as they would against a server; the operation itself applies atomically.
+
+Filters support equality, ``$and``, ``$or``, ``$nor`` and ``$ne``, ``$in``,
+``$gt``, ``$gte``, ``$lt``, ``$lte``, ``$not`` and ``$exists``; cursors sort on one key
+or a list of keys and can be iterated with ``async for``. Updates support
+``$set``, ``$setOnInsert`` with ``upsert``, ``$inc`` on dotted paths and
+``$push`` with ``$each``/``$sort``/``$slice``, and pipeline updates made of
+``$set`` stages with the expression operators the live quiz repository
+uses. ``bulk_write`` takes ``UpdateOne`` (with ``upsert``) and ``DeleteOne``
+requests and counts as a single round trip. Reads honour inclusion and
+exclusion projections, including dotted paths into embedded lists, and
+computed fields such as ``{"$size": "$questions"}`` in inclusion projections.
+``aggregate`` runs ``$match``, ``$group`` (``$sum``, ``$push``, ``$first``),
+``$sort`` and ``$limit`` stages in one round trip.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from types import SimpleNamespace
+from typing import Any, Iterable, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+
+def _matches(document: dict[str, Any], query: dict[str, Any]) -> bool:
+    for field, condition in query.items():
+        if field == "$and":
+            if not all(_matches(document, clause) for clause in condition):
+                return False
+            continue
+        if field == "$or":
+            if not any(_matches(document, clause) for clause in condition):
+                return False
+            continue
+        if field == "$nor":
+            if any(_matches(document, clause) for clause in condition):
+                return False
+            continue
+        value = document.get(field)
+        if isinstance(condition, dict) and any(key.startswith("$") for key in condition):
+            for operator, operand in condition.items():
+                if operator == "$ne" and value == operand:
+                    return False
+                if operator == "$in" and value not in operand:
+                    return False
+                if operator == "$gt" and (value is None or not value > operand):
+                    return False
+                if operator == "$not" and _matches(document, {field: operand}):
+                    return False
+                if operator == "$gte" and (value is None or not value >= operand):
+                    return False
+                if operator == "$lt" and (value is None or not value < operand):
+                    return False
+                if operator == "$lte" and (value is None or not value <= operand):
+                    return False
+                if operator == "$exists" and (field in document) != bool(operand):
+                    return False
+                if operator not in {"$ne", "$in", "$gt", "$gte", "$lt", "$lte", "$not", "$exists"}:
+                    raise NotImplementedError(f"FakeMongoCollection does not support {operator}")
+        elif value != condition:
+            return False
+    return True
+
+
+def _without_set_on_insert(update: Any) -> Any:
+    if isinstance(update, list):
+        return update
+    return {key: value for key, value in update.items() if key != "$setOnInsert"}
+
+
+def _evaluate(expression: Any, document: dict[str, Any], this: Any = None) -> Any:
+    if isinstance(expression, str):
+        if expression.startswith("$$this."):
+            return (this or {}).get(expression[len("$$this."):])
+        if expression.startswith("$"):
+            return document.get(expression[1:])
+        return expression
+    if isinstance(expression, list):
+        return [_evaluate(item, document, this) for item in expression]
+    if not isinstance(expression, dict):
+        return expression
+    if len(expression) != 1 or not next(iter(expression)).startswith("$"):
+        return {key: _evaluate(value, document, this) for key, value in expression.items()}
+
+    operator, operand = next(iter(expression.items()))
+    if operator == "$literal":
+        return copy.deepcopy(operand)
+    if operator == "$ifNull":
+        value = _evaluate(operand[0], document, this)
+        return value if value is not None else _evaluate(operand[1], document, this)
+    if operator == "$ne":
+        return _evaluate(operand[0], document, this) != _evaluate(operand[1], document, this)
+    if operator == "$lt":
+        return _evaluate(operand[0], document, this) < _evaluate(operand[1], document, this)
+    if operator == "$cond":
+        branch = operand[1] if _evaluate(operand[0], document, this) else operand[2]
+        return _evaluate(branch, document, this)
+    if operator == "$size":
+        return len(_evaluate(operand, document, this))
+    if operator == "$concatArrays":
+        return [item for part in operand for item in _evaluate(part, document, this)]
+    if operator == "$filter":
+        items = _evaluate(operand["input"], document, this)
+        return [item for item in items if _evaluate(operand["cond"], document, item)]
+    if operator == "$sortArray":
+        items = _evaluate(operand["input"], document, this)
+        for key, direction in reversed(list(operand["sortBy"].items())):
+            items = sorted(items, key=lambda item: item.get(key), reverse=direction < 0)
+        return items
+    raise NotImplementedError(f"FakeMongoCollection does not support {operator}")
+
+
+def _include(value: Any, path: list[str]) -> Any:
+    if isinstance(value, list):
+        return [
+            included
+            for included in (_include(item, path) for item in value if isinstance(item, (dict, list)))
+            if included is not None
+        ]
+    if not isinstance(value, dict):
+        return None
+    head, rest = path[0], path[1:]
+    if head not in value:
+        return {}
+    return {head: _include(value[head], rest) if rest else value[head]}
+
+
+def _merge(target: dict[str, Any], source: dict[str, Any]) -> None:
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        elif isinstance(value, list) and isinstance(target.get(key), list):
+            for into, item in zip(target[key], value):
+                _merge(into, item)
+        else:
+            target[key] = value
+
+
+def _project(document: dict[str, Any], projection: Any) -> dict[str, Any]:
+    if not projection:
+        return document
+    fields = {field: value for field, value in dict(projection).items() if field != "_id"}
+    if fields and not any(fields.values()):
+        projected = {key: value for key, value in document.items() if key not in fields}
+    else:
+        projected = {"_id": document["_id"]} if "_id" in document else {}
+        for field, value in fields.items():
+            if isinstance(value, dict):
+                projected[field] = _evaluate(value, document)
+                continue
+            _merge(projected, _include(document, field.split(".")))
+    if not dict(projection).get("_id", 1):
+        projected.pop("_id", None)
+    return projected
+
+
+class FakeMongoCursor:
+    def __init__(
+        self,
+        collection: "FakeMongoCollection",
+        query: dict[str, Any],
+        projection: Any = None,
+    ):
+        self._collection = collection
+        self._query = query
+        self._projection = projection
+        self._sort: list[tuple[str, int]] = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key: Any, direction: int = 1) -> "FakeMongoCursor":
+        self._sort = list(key) if isinstance(key, list) else [(key, direction)]
+        return self
+
+    def skip(self, skip: int) -> "FakeMongoCursor":
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int) -> "FakeMongoCursor":
+        self._limit = limit
+        return self
+
+    async def to_list(self, length: Optional[int] = None) -> list[dict[str, Any]]:
+        await self._collection._round_trip("find")
+        documents = [
+            document
+            for document in self._collection._candidates(self._query)
+            if _matches(document, self._query)
+        ]
+        for key, direction in reversed(self._sort):
+            # Missing values sort before any other, as on the server.
+            documents.sort(
+                key=lambda document: (document.get(key) is not None, document.get(key)),
+                reverse=direction < 0,
+            )
+        documents = documents[self._skip:]
+        for bound in (self._limit, length):
+            if bound:
+                documents = documents[:bound]
+        return [copy.deepcopy(_project(document, self._projection)) for document in documents]
+
+    async def __aiter__(self):
+        for document in await self.to_list():
+            yield document
+
+
+def _group(documents: list[dict[str, Any]], spec: dict[str, Any]) -> list[dict[str, Any]]:
+    accumulators = {
+        field: next(iter(accumulator.items())) for field, accumulator in spec.items() if field != "_id"
+    }
+    groups: dict[str, dict[str, Any]] = {}
+    for document in documents:
+        key = _evaluate(spec["_id"], document)
+        group = groups.get(repr(key))
+        first = group is None
+        if first:
+            group = groups[repr(key)] = {"_id": key}
+        for field, (operator, expression) in accumulators.items():
+            value = _evaluate(expression, document)
+            if operator == "$sum":
+                group[field] = group.get(field, 0) + value
+            elif operator == "$push":
+                group.setdefault(field, []).append(value)
+            elif operator == "$first":
+                if first:
+                    group[field] = value
+            else:
+                raise NotImplementedError(f"FakeMongoCollection does not support {operator}")
+    return list(groups.values())
+
+
+class FakeAggregationCursor:
+    def __init__(self, collection: "FakeMongoCollection", pipeline: list[dict[str, Any]]):
+        self._collection = collection
+        self._pipeline = pipeline
+
+    async def to_list(self, length: Optional[int] = None) -> list[dict[str, Any]]:
+        await self._collection._round_trip("aggregate")
+        documents = list(self._collection.documents.values())
+        for stage in self._pipeline:
+            (operator, spec), = stage.items()
+            if operator == "$match":
+                documents = [document for document in documents if _matches(document, spec)]
+            elif operator == "$group":
+                documents = _group(documents, spec)
+            elif operator == "$sort":
+                for key, direction in reversed(list(spec.items())):
+                    documents.sort(key=lambda document: document.get(key), reverse=direction < 0)
+            elif operator == "$limit":
+                documents = documents[:spec]
+            else:
+                raise NotImplementedError(f"FakeMongoCollection does not support stage {operator}")
+        return copy.deepcopy(documents[:length] if length else documents)
+
+    async def __aiter__(self):
+        for document in await self.to_list():
+            yield document
+
+
+class FakeMongoCollection:
+    def __init__(self, *, latency: float = 0.0):
+        self.documents: dict[Any, dict[str, Any]] = {}
+        self.operations: list[str] = []
+        self.latency = latency
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.operations)
+
+    def reset_counts(self) -> None:
+        self.operations.clear()
+
+    async def _round_trip(self, operation: str) -> None:
+        self.operations.append(operation)
+        await asyncio.sleep(self.latency)
+
+    def _candidates(self, query: dict[str, Any]) -> Iterable[dict[str, Any]]:
+        # Look ``_id`` filters up directly, as the server would use its index.
+        document_id = query.get("_id")
+        if document_id is None:
+            return self.documents.values()
+        ids = document_id.get("$in") if isinstance(document_id, dict) else [document_id]
+        if ids is None:
+            return self.documents.values()
+        return [self.documents[key] for key in dict.fromkeys(ids) if key in self.documents]
+
+    def _find(self, query: dict[str, Any]) -> Optional[dict[str, Any]]:
+        return next(
+            (document for document in self._candidates(query) if _matches(document, query)),
+            None,
+        )
+
+    async def insert_one(self, document: dict[str, Any]) -> SimpleNamespace:
+        await self._round_trip("insert_one")
+        document.setdefault("_id", ObjectId())
+        if document["_id"] in self.documents:
+            raise DuplicateKeyError(f"duplicate _id {document['_id']!r}")
+        self.documents[document["_id"]] = copy.deepcopy(document)
+        return SimpleNamespace(inserted_id=document["_id"])
+
+    async def find_one(self, query: dict[str, Any], projection: Any = None) -> Optional[dict[str, Any]]:
+        await self._round_trip("find_one")
+        document = self._find(query)
+        return copy.deepcopy(_project(document, projection)) if document is not None else None
+
+    def find(self, query: Optional[dict[str, Any]] = None, projection: Any = None) -> FakeMongoCursor:
+        return FakeMongoCursor(self, query or {}, projection)
+
+    def aggregate(self, pipeline: list[dict[str, Any]], **_: Any) -> FakeAggregationCursor:
+        return FakeAggregationCursor(self, pipeline)
+
+    async def find_one_and_update(
+        self,
+        query: dict[str, Any],
+        update: Any,
+        return_document: ReturnDocument = ReturnDocument.BEFORE,
+        upsert: bool = False,
+        **_: Any,
+    ) -> Optional[dict[str, Any]]:
+        await self._round_trip("find_one_and_update")
+        document = self._find(query)
+        if document is None:
+            if not upsert:
+                return None
+            document = self._upsert(query, update)
+            return copy.deepcopy(document) if return_document == ReturnDocument.AFTER else None
+        before = copy.deepcopy(document)
+        self._apply(document, _without_set_on_insert(update))
+        return copy.deepcopy(document if return_document == ReturnDocument.AFTER else before)
+
+    async def update_one(
+        self,
+        query: dict[str, Any],
+        update: Any,
+        upsert: bool = False,
+        **_: Any,
+    ) -> SimpleNamespace:
+        await self._round_trip("update_one")
+        document = self._find(query)
+        if document is not None:
+            self._apply(document, _without_set_on_insert(update))
+        elif upsert:
+            self._upsert(query, update)
+        return SimpleNamespace(
+            matched_count=int(document is not None),
+            modified_count=int(document is not None),
+        )
+
+    async def update_many(self, query: dict[str, Any], update: Any, **_: Any) -> SimpleNamespace:
+        await self._round_trip("update_many")
+        documents = [document for document in self._candidates(query) if _matches(document, query)]
+        for document in documents:
+            self._apply(document, _without_set_on_insert(update))
+        return SimpleNamespace(matched_count=len(documents), modified_count=len(documents))
+
+    async def delete_one(self, query: dict[str, Any]) -> SimpleNamespace:
+        await self._round_trip("delete_one")
+        document = self._find(query)
+        if document is not None:
+            del self.documents[document["_id"]]
+        return SimpleNamespace(deleted_count=int(document is not None))
+
+    async def delete_many(self, query: dict[str, Any]) -> SimpleNamespace:
+        await self._round_trip("delete_many")
+        documents = [document for document in self._candidates(query) if _matches(document, query)]
+        for document in documents:
+            del self.documents[document["_id"]]
+        return SimpleNamespace(deleted_count=len(documents))
+
+    async def bulk_write(self, requests: list[Any], ordered: bool = True, **_: Any) -> SimpleNamespace:
+        await self._round_trip("bulk_write")
+        matched = upserted = deleted = 0
+        for request in requests:
+            document = self._find(request._filter)
+            if not hasattr(request, "_doc"):
+                if document is not None:
+                    del self.documents[document["_id"]]
+                    deleted += 1
+            elif document is not None:
+                self._apply(document, _without_set_on_insert(request._doc))
+                matched += 1
+            elif getattr(request, "_upsert", False):
+                self._upsert(request._filter, request._doc)
+                upserted += 1
+        return SimpleNamespace(
+            matched_count=matched,
+            modified_count=matched,
+            upserted_count=upserted,
+            deleted_count=deleted,
+        )
+
+    def _upsert(self, query: dict[str, Any], update: Any) -> dict[str, Any]:
+        inserted = {key: value for key, value in query.items() if not key.startswith("$") and not isinstance(value, dict)}
+        if isinstance(update, dict):
+            inserted.update(copy.deepcopy(update.get("$setOnInsert", {})))
+        inserted.setdefault("_id", ObjectId())
+        self._apply(inserted, _without_set_on_insert(update))
+        self.documents[inserted["_id"]] = inserted
+        return inserted
+
+    @staticmethod
+    def _apply(document: dict[str, Any], update: Any) -> None:
+        if isinstance(update, list):
+            for stage in update:
+                for operator, fields in stage.items():
+                    if operator != "$set":
+                        raise NotImplementedError(f"FakeMongoCollection does not support stage {operator}")
+                    values = {field: _evaluate(value, document) for field, value in fields.items()}
+                    document.update(values)
+            return
+        for operator, fields in update.items():
+            if operator == "$set":
+                document.update(copy.deepcopy(fields))
+            elif operator == "$inc":
+                for path, amount in fields.items():
+                    *parents, leaf = path.split(".")
+                    target = document
+                    for key in parents:
+                        target = target.setdefault(key, {})
+                    target[leaf] = target.get(leaf, 0) + amount
+            elif operator == "$push":
+                for field, spec in fields.items():
+                    if not (isinstance(spec, dict) and "$each" in spec):
+                        spec = {"$each": [spec]}
+                    items = document.setdefault(field, [])
+                    items.extend(copy.deepcopy(spec["$each"]))
+                    for key, direction in reversed(list(spec.get("$sort", {}).items())):
+                        items.sort(key=lambda item: item.get(key), reverse=direction < 0)
+                    if "$slice" in spec:
+                        del items[spec["$slice"]:]
+            else:
+                raise NotImplementedError(f"FakeMongoCollection does not support {operator}")
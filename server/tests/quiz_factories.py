@@ -0,0 +1,113 @@
+"""Quiz documents, submissions and graded answers for tests and benchmarks.
+
+Question texts and answers are drawn from small word lists with a seeded
+generator, so the same arguments always build the same content.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from bson import ObjectId
+
+from server.app.quiz.repositories.v2.models.quiz_models import QuizDocumentV2
+from server.app.quiz.services.download_service import _build_download_payload
+
+
+_QUIZ_WORDS = (
+    "cells divide by mitosis while gametes form through meiosis and the nucleus "
+    "holds chromosomes made of dna wrapped around histone proteins in eukaryotes"
+).split()
+
+
+def build_quiz(questions: int, quiz_type: str = "short-answer", *, seed: int = 0) -> dict[str, Any]:
+    """A stored quiz document with long question texts, as generated quizzes have."""
+    rng = random.Random(seed)
+    quiz = QuizDocumentV2(
+        _id=ObjectId(),
+        title="Cell biology",
+        quiz_type=quiz_type,
+        description="Benchmark quiz",
+        tags=["biology", "cells"],
+        questions=[
+            {
+                "question": f"{index}. " + " ".join(rng.choices(_QUIZ_WORDS, k=30)) + "?",
+                "correct_answer": (
+                    rng.choice(["True", "False", "1", "0"]) if quiz_type == "true-false"
+                    else " ".join(rng.sample(_QUIZ_WORDS, 3))
+                ),
+                "options": [" ".join(rng.sample(_QUIZ_WORDS, 3)) for _ in range(4)],
+            }
+            for index in range(questions)
+        ],
+        updated_at=datetime(2025, 1, 1),
+    )
+    return quiz.model_dump(by_alias=True)
+
+
+def build_submission(quiz: dict[str, Any], *, seed: int = 0) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "question": question["question"],
+            "user_answer": question["correct_answer"] if rng.random() < 0.6 else " ".join(rng.sample(_QUIZ_WORDS, 3)),
+        }
+        for question in quiz["questions"]
+    ]
+
+
+def stored_quiz(questions: int, quiz_type: str = "multichoice", *, seed: int = 0) -> dict[str, Any]:
+    """A quiz document as Motor returns it: enums stored as their string values."""
+    document = build_quiz(questions, quiz_type, seed=seed)
+    return {key: value.value if isinstance(value, Enum) else value for key, value in document.items()}
+
+
+def download_payload(quiz: dict[str, Any]) -> dict[str, Any]:
+    return _build_download_payload(
+        title=quiz.get("title"),
+        description=quiz.get("description"),
+        quiz_type=quiz.get("quiz_type"),
+        questions=quiz.get("questions", []),
+    )
+
+
+_ANSWER_WORDS = (
+    "photosynthesis converts light energy into chemical energy stored in glucose "
+    "the mitochondria produce atp through cellular respiration in eukaryotic cells "
+    "water moves across membranes by osmosis from low to high solute concentration"
+).split()
+
+
+def build_answers(count: int, *, questions: int = 40, seed: int = 0) -> list[dict[str, Any]]:
+    """Answers from ``count // questions`` participants to a mixed quiz."""
+    rng = random.Random(seed)
+    quiz = []
+    for index in range(questions):
+        question_type = ("multichoice", "true-false", "short-answer", "open-ended")[index % 4]
+        if question_type == "multichoice":
+            options = [" ".join(rng.sample(_ANSWER_WORDS, 2)) for _ in range(4)]
+            correct = f"{'ABCD'[index % 4]}) {options[index % 4]}"
+            choices = [f"{letter}) {option}" for letter, option in zip("ABCD", options)]
+        elif question_type == "true-false":
+            correct, choices = str(index % 2), ["0", "1", "true"]
+        else:
+            length = 3 if question_type == "short-answer" else 12
+            correct = " ".join(rng.sample(_ANSWER_WORDS, length))
+            choices = [correct] + [
+                " ".join(rng.sample(_ANSWER_WORDS, length)) for _ in range(5)
+            ] + [f"Correct answer: {correct}"]
+        quiz.append((f"Question {index}?", question_type, correct, choices))
+
+    answers = []
+    for position in range(count):
+        question, question_type, correct, choices = quiz[position % questions]
+        answers.append({
+            "question": question,
+            "question_type": question_type,
+            "correct_answer": correct,
+            "user_answer": rng.choice(choices),
+        })
+    return answers
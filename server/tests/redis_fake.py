@@ -0,0 +1,266 @@
+"""In-memory stand-in for the subset of ``redis.asyncio.Redis`` the app uses.
+
+Values are stored as strings, as with ``decode_responses=True``. Expiry is
+checked lazily against ``clock`` so tests can move time forward by hand.
+
+Pattern pub/sub and streams are supported for the live quiz broadcaster.
+Several broadcasters sharing one instance behave like workers sharing a
+Redis server; ``go_down``/``come_back`` and ``drop_subscribers`` simulate
+outages.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import time
+from typing import Any, Callable, Optional
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from server.app.db.core.redis_lease import EXTEND_SCRIPT, RELEASE_SCRIPT
+from server.app.quiz.services.live_quiz_realtime import PUBLISH_SCRIPT
+
+
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis"):
+        self._redis = redis
+        self._patterns: set[str] = set()
+        self._messages: asyncio.Queue = asyncio.Queue()
+        self._dropped = False
+
+    @property
+    def subscribed(self) -> bool:
+        return bool(self._patterns)
+
+    async def psubscribe(self, *patterns: str) -> None:
+        self._redis._check_available()
+        self._patterns.update(patterns)
+        self._redis._subscribers.add(self)
+
+    async def punsubscribe(self, *patterns: str) -> None:
+        self._patterns.difference_update(patterns or set(self._patterns))
+
+    def _matches(self, channel: str) -> Optional[str]:
+        for pattern in self._patterns:
+            if fnmatch.fnmatchcase(channel, pattern):
+                return pattern
+        return None
+
+    def _drop(self) -> None:
+        self._dropped = True
+        self._messages.put_nowait(None)
+
+    async def get_message(
+        self,
+        ignore_subscribe_messages: bool = False,
+        timeout: Optional[float] = 0.0,
+    ) -> Optional[dict[str, Any]]:
+        if self._dropped:
+            raise RedisConnectionError("Connection closed by server.")
+        if not self._patterns:
+            raise RuntimeError("pubsub connection not set: did you forget to call subscribe() or psubscribe()?")
+        try:
+            message = await asyncio.wait_for(self._messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if message is None:
+            raise RedisConnectionError("Connection closed by server.")
+        return message
+
+    async def aclose(self) -> None:
+        self._patterns.clear()
+        self._redis._subscribers.discard(self)
+
+
+class FakeRedis:
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._values: dict[str, str] = {}
+        self._streams: dict[str, list[tuple[str, dict[str, str]]]] = {}
+        self._expires_at: dict[str, float] = {}
+        self._subscribers: set[FakePubSub] = set()
+        self._last_stream_id = (0, 0)
+        self.available = True
+        self.commands: list[str] = []
+
+    def _check_available(self) -> None:
+        if not self.available:
+            raise RedisConnectionError("Error 111 connecting to localhost:6379. Connection refused.")
+
+    def go_down(self) -> None:
+        """Refuse commands and drop every subscriber, like a restarting server."""
+        self.available = False
+        self.drop_subscribers()
+
+    def come_back(self) -> None:
+        self.available = True
+
+    def drop_subscribers(self) -> None:
+        for pubsub in list(self._subscribers):
+            pubsub._drop()
+        self._subscribers.clear()
+
+    def _expire_stale(self, key: str) -> None:
+        expires_at = self._expires_at.get(key)
+        if expires_at is not None and self._clock() >= expires_at:
+            self._values.pop(key, None)
+            self._streams.pop(key, None)
+            self._expires_at.pop(key, None)
+
+    async def get(self, key: str) -> Optional[str]:
+        self.commands.append("get")
+        self._check_available()
+        self._expire_stale(key)
+        return self._values.get(key)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        *,
+        nx: bool = False,
+        px: Optional[int] = None,
+        ex: Optional[int] = None,
+    ) -> Optional[bool]:
+        self.commands.append("set")
+        self._check_available()
+        self._expire_stale(key)
+        if nx and key in self._values:
+            return None
+        self._values[key] = str(value)
+        self._expires_at.pop(key, None)
+        if px is not None:
+            self._expires_at[key] = self._clock() + px / 1000
+        elif ex is not None:
+            self._expires_at[key] = self._clock() + ex
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        self.commands.append("delete")
+        self._check_available()
+        removed = 0
+        for key in keys:
+            self._expire_stale(key)
+            if self._values.pop(key, None) is not None:
+                removed += 1
+            self._expires_at.pop(key, None)
+        return removed
+
+    async def exists(self, *keys: str) -> int:
+        self.commands.append("exists")
+        self._check_available()
+        count = 0
+        for key in keys:
+            self._expire_stale(key)
+            count += key in self._values
+        return count
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        self.commands.append("eval")
+        self._check_available()
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        if script == RELEASE_SCRIPT:
+            self._expire_stale(keys[0])
+            if self._values.get(keys[0]) == str(args[0]):
+                return await self.delete(keys[0])
+            return 0
+        if script == EXTEND_SCRIPT:
+            self._expire_stale(keys[0])
+            if self._values.get(keys[0]) == str(args[0]):
+                self._pexpire(keys[0], int(args[1]))
+                return 1
+            return 0
+        if script == PUBLISH_SCRIPT:
+            event, maxlen, ttl_ms, channel, coalesce_key = args
+            seq = self._incr(keys[0])
+            stream_id = self._xadd(
+                keys[1],
+                {"seq": str(seq), "key": coalesce_key, "event": event},
+                maxlen=int(maxlen),
+            )
+            self._pexpire(keys[0], int(ttl_ms))
+            self._pexpire(keys[1], int(ttl_ms))
+            self._publish(channel, f"{seq} {stream_id} {coalesce_key} {event}")
+            return seq
+        raise NotImplementedError("FakeRedis does not interpret this script")
+
+    def _incr(self, key: str) -> int:
+        self._expire_stale(key)
+        value = int(self._values.get(key, "0")) + 1
+        self._values[key] = str(value)
+        return value
+
+    def _pexpire(self, key: str, milliseconds: int) -> None:
+        if key in self._values or key in self._streams:
+            self._expires_at[key] = self._clock() + milliseconds / 1000
+
+    def _next_stream_id(self) -> str:
+        milliseconds = int(self._clock() * 1000)
+        last_milliseconds, last_sequence = self._last_stream_id
+        if milliseconds <= last_milliseconds:
+            self._last_stream_id = (last_milliseconds, last_sequence + 1)
+        else:
+            self._last_stream_id = (milliseconds, 0)
+        return "%d-%d" % self._last_stream_id
+
+    def _xadd(self, key: str, fields: dict[str, str], *, maxlen: Optional[int] = None) -> str:
+        self._expire_stale(key)
+        stream = self._streams.setdefault(key, [])
+        stream_id = self._next_stream_id()
+        stream.append((stream_id, dict(fields)))
+        if maxlen is not None and len(stream) > maxlen:
+            del stream[: len(stream) - maxlen]
+        return stream_id
+
+    def _publish(self, channel: str, message: str) -> int:
+        receivers = 0
+        for pubsub in list(self._subscribers):
+            pattern = pubsub._matches(channel)
+            if pattern is not None:
+                pubsub._messages.put_nowait(
+                    {"type": "pmessage", "pattern": pattern, "channel": channel, "data": message}
+                )
+                receivers += 1
+        return receivers
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self)
+
+    async def publish(self, channel: str, message: str) -> int:
+        self.commands.append("publish")
+        self._check_available()
+        return self._publish(channel, message)
+
+    def trim_stream(self, key: str, maxlen: int) -> None:
+        stream = self._streams.get(key, [])
+        del stream[: max(0, len(stream) - maxlen)]
+
+    @staticmethod
+    def _stream_bound(value: str, default: tuple[int, int]) -> tuple[int, int]:
+        if value in ("-", "+"):
+            return default
+        milliseconds, _, sequence = value.partition("-")
+        return int(milliseconds), int(sequence or 0)
+
+    def _stream_entries(self, key: str, low: str, high: str) -> list[tuple[str, dict[str, str]]]:
+        self._expire_stale(key)
+        low_bound = self._stream_bound(low, (0, 0))
+        high_bound = self._stream_bound(high, (2**63, 2**63))
+        return [
+            (stream_id, dict(fields))
+            for stream_id, fields in self._streams.get(key, [])
+            if low_bound <= self._stream_bound(stream_id, (0, 0)) <= high_bound
+        ]
+
+    async def xrange(self, name: str, min: str = "-", max: str = "+", count: Optional[int] = None):
+        self.commands.append("xrange")
+        self._check_available()
+        entries = self._stream_entries(name, min, max)
+        return entries[:count] if count is not None else entries
+
+    async def xrevrange(self, name: str, max: str = "+", min: str = "-", count: Optional[int] = None):
+        self.commands.append("xrevrange")
+        self._check_available()
+        entries = list(reversed(self._stream_entries(name, min, max)))
+        return entries[:count] if count is not None else entries
@@ -0,0 +1,164 @@
+import random
+
+import pytest
+
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.app.quiz.utils.batch_grading import grade_batch, normalize_answer
+from server.app.quiz.utils.grading import grade_answers
+from server.tests.legacy_grading import legacy_grade_mock_answers, legacy_grade_with_ai
+from server.tests.quiz_factories import build_answers
+
+
+LEGACY_GRADERS = {"mock": legacy_grade_mock_answers, "ai": legacy_grade_with_ai}
+
+EDGE_CASES = [
+    {"question": "TF", "question_type": "true-false", "user_answer": "yes", "correct_answer": "1"},
+    {"question": "TF", "question_type": " True-False ", "user_answer": 1, "correct_answer": True},
+    {"question": "TF", "question_type": "true-false", "user_answer": " 0 ", "correct_answer": "0"},
+    {"question": "TF", "question_type": "true-false", "correct_answer": "1"},
+    {"question": "MC", "question_type": "multichoice", "user_answer": "b) Paris", "correct_answer": "B) paris"},
+    {"question": "MC", "question_type": "MultiChoice", "user_answer": "Paris", "correct_answer": "Paris"},
+    {"question": "MC", "question_type": "multichoice", "user_answer": None, "correct_answer": "None"},
+    {"question": "SA", "question_type": "short-answer", "user_answer": "Correct answer: Mitochondria",
+     "correct_answer": "the mitochondria"},
+    {"question": "SA", "question_type": "short-answer", "user_answer": "", "correct_answer": "osmosis"},
+    {"question": "OE", "question_type": "open-ended", "user_answer": "CORRECT ANSWER- light into sugar",
+     "correct_answer": "Light energy becomes chemical energy"},
+    {"question": "OE", "question_type": "open-ended", "user_answer": "anything", "correct_answer": "  "},
+    {"question": "OE", "question_type": "open-ended", "user_answer": "x", "correct_answer": "A) "},
+    {"question": "OE", "question_type": "open-ended", "user_answer": 1.0, "correct_answer": 1},
+    {"question": "??", "question_type": "matching", "user_answer": "a", "correct_answer": "a"},
+    {"question_type": "short-answer", "user_answer": "a-b", "correct_answer": "a b"},
+    {"user_answer": "a", "correct_answer": "a"},
+]
+
+# (user_answer, correct_answer, question_type, accuracy_percentage, result)
+EXPECTED_EDGE_CASE_ROWS = {
+    "mock": [
+        ("yes", "1", "true-false", None, "Incorrect"),
+        ("1", "True", "True-False", None, "Incorrect"),
+        ("0", "0", "true-false", None, "Correct"),
+        ("", "1", "true-false", None, "Incorrect"),
+        ("b) Paris", "B) paris", "multichoice", None, "Correct"),
+        ("Paris", "Paris", "MultiChoice", None, "Incorrect"),
+        ("None", "None", "multichoice", None, "Correct"),
+        ("Correct answer: Mitochondria", "the mitochondria", "short-answer", 59.09, "Incorrect"),
+        ("", "osmosis", "short-answer", 0.0, "Incorrect"),
+        ("CORRECT ANSWER- light into sugar", "Light energy becomes chemical energy", "open-ended", 26.23, "Incorrect"),
+        ("x", "A)", "open-ended", 0.0, "Incorrect"),
+        ("1.0", "1", "open-ended", 50.0, "Correct"),
+        ("a", "a", "matching", None, "Incorrect"),
+        ("a-b", "a b", "short-answer", 66.67, "Incorrect"),
+        ("a", "a", "", None, "Incorrect"),
+    ],
+    "ai": [
+        ("yes", "1", "true-false", None, "Invalid format"),
+        (1, 1, "true-false", None, "Correct"),
+        (0, 0, "true-false", None, "Correct"),
+        (-1, 1, "true-false", None, "Incorrect"),
+        ("Paris", "paris", "multichoice", None, "Correct"),
+        ("Paris", "Paris", "multichoice", None, "Correct"),
+        ("None", "None", "multichoice", None, "Correct"),
+        ("Mitochondria", "the mitochondria", "short-answer", 78.57, "Incorrect"),
+        ("", "osmosis", "short-answer", 0.0, "Incorrect"),
+        ("light into sugar", "Light energy becomes chemical energy", "open-ended", 35.56, "Incorrect"),
+        ("1.0", "1", "open-ended", 50.0, "Correct"),
+        ("a", "a", "matching", None, "Incorrect"),
+        ("a-b", "a b", "short-answer", 66.67, "Incorrect"),
+        ("a", "a", "", None, "Incorrect"),
+    ],
+}
+
+
+@pytest.mark.parametrize("source", ["mock", "ai"])
+def test_batch_grading_on_edge_cases(source):
+    rows = grade_answers(EDGE_CASES, source)
+
+    assert [
+        (
+            row["user_answer"],
+            row["correct_answer"],
+            row["question_type"],
+            None if "accuracy_percentage" not in row else round(row["accuracy_percentage"], 2),
+            row["result"],
+        )
+        for row in rows
+    ] == EXPECTED_EDGE_CASE_ROWS[source]
+    assert all(row["is_correct"] == (row["result"] == "Correct") for row in rows)
+    assert [row["question"] for row in rows[-2:]] == ["", ""]
+    # Key order is part of the response shape clients see.
+    assert list(rows[7]) == [
+        "question",
+        "user_answer",
+        "correct_answer",
+        "question_type",
+        "accuracy_percentage",
+        "is_correct",
+        "result",
+    ]
+
+
+@pytest.mark.parametrize("source", ["mock", "ai"])
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_grading_matches_the_per_answer_graders_on_random_quizzes(source, seed):
+    answers = build_answers(2_000, questions=37, seed=seed)
+    random.Random(seed).shuffle(answers)
+
+    graded = grade_batch(answers, source)
+
+    assert graded.rows() == LEGACY_GRADERS[source](answers)
+    # Key order is part of the response shape clients see.
+    assert [list(row) for row in graded.rows()] == [list(row) for row in LEGACY_GRADERS[source](answers)]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("A) B) x", "B) x"),
+        ("c)Correct answer:  y ", "y"),
+        ("correct answer-z", "z"),
+        ("D)", ""),
+        ("E) no", "E) no"),
+        ("  correct answerz ", "z"),
+        (7, "7"),
+    ],
+)
+def test_normalize_answer_strips_one_option_letter_then_the_correct_answer_label(value, expected):
+    assert normalize_answer(value) == expected
+
+
+def test_source_index_points_past_skipped_answers():
+    answers = [
+        {"question_type": "multichoice", "user_answer": "A", "correct_answer": ""},
+        {"question_type": "multichoice", "user_answer": "A", "correct_answer": "A"},
+        {"question_type": "short-answer", "user_answer": "osmosis", "correct_answer": "osmosis"},
+        {"question_type": "open-ended", "user_answer": "x", "correct_answer": ""},
+        {"question_type": "multichoice", "user_answer": "B", "correct_answer": "A"},
+    ]
+
+    graded = grade_batch(answers, "mock")
+
+    assert graded.source_index == [1, 2, 4]
+    assert graded.correct_source_indexes == [1, 2]
+    assert graded.accuracy_percentage == [None, 100.0, None]
+
+
+def test_live_session_credits_questions_after_an_unkeyed_question():
+    class Snapshot:
+        answer_key = [
+            {"question": "Q1", "question_type": "multichoice", "correct_answer": ""},
+            {"question": "Q2", "question_type": "multichoice", "correct_answer": "B"},
+            {"question": "Q3", "question_type": "multichoice", "correct_answer": "C"},
+        ]
+
+    session = {
+        "answers": [
+            {"question_index": 1, "selected_answer": "B"},
+            {"question_index": 2, "selected_answer": "A"},
+        ]
+    }
+
+    graded = LiveQuizSessionService(None)._grade_session(session, Snapshot())
+
+    assert graded["score"] == 1
+    assert graded["correct_question_indexes"] == [1]
@@ -1,12 +1,23 @@
 import pytest
 
+from server.app.quiz.services.category_seed_service import load_questions_from_file
 from server.app.quiz.services.category_taxonomy_service import (
+    SEED_CATEGORIES_DIR,
+    TaxonomyEntry,
+    build_classification_text,
+    build_taxonomy_index,
     classify_deterministically,
     display_name_from_path,
+    get_taxonomy_entries,
+    get_taxonomy_index,
     normalize_quiz_type,
     quiz_type_to_api_label,
     slugify,
 )
+from server.tests.legacy_taxonomy import (
+    legacy_classify_deterministically,
+    seed_classification_texts,
+)
 
 
 def test_seed_path_display_and_slug_normalization():
@@ -39,3 +50,82 @@ def test_deterministic_classifier_matches_known_taxonomy():
     assert classification.subcategory_slug == "programming"
     assert classification.method == "deterministic"
     assert "programming" in classification.tags
+
+
+def test_indexed_classifier_matches_full_scan_on_every_seed_bank():
+    texts = seed_classification_texts()
+    assert len(texts) == len(get_taxonomy_entries())
+
+    for label, text in texts.items():
+        assert classify_deterministically(text, "multichoice") == legacy_classify_deterministically(
+            text, "multichoice"
+        ), label
+    joined = " ".join(texts.values())
+    assert classify_deterministically(joined, "multichoice") == legacy_classify_deterministically(
+        joined, "multichoice"
+    )
+
+
+def test_indexed_classifier_matches_full_scan_on_every_seed_question():
+    for questions_file in sorted(SEED_CATEGORIES_DIR.glob("*/*/questions.py")):
+        for question in load_questions_from_file(questions_file):
+            text = build_classification_text(title=questions_file.parent.name, questions=[question])
+            assert classify_deterministically(text, "true-false") == legacy_classify_deterministically(
+                text, "true-false"
+            ), text
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("", None),
+        ("   ", None),
+        ("Restart the engines", None),  # "art" only inside a word
+        ("Physics and chemistry and biology", ("science", "biology", 1)),  # ties keep the first entry
+        ("Art and Literature: poetry, poems and poets", ("art-and-literature", "poetry", 1)),
+        ("World capitals of countries and their flags", ("geography", "world-capitals", 1)),
+        ("HTML, CSS and HTTP for the web", ("technology-and-computing", "internet-and-web", 0.675)),
+    ],
+)
+def test_indexed_classifier_on_edge_cases(text, expected):
+    classification = classify_deterministically(text, "multichoice")
+
+    if expected is None:
+        assert classification is None
+        return
+    category_slug, subcategory_slug, confidence = expected
+    assert classification.category_slug == category_slug
+    assert classification.subcategory_slug == subcategory_slug
+    assert classification.confidence == pytest.approx(confidence)
+
+
+def test_taxonomy_index_is_built_once_and_dedupes_category_phrases():
+    index = get_taxonomy_index()
+
+    assert get_taxonomy_index() is index
+    assert len(index.entries) == len(get_taxonomy_entries())
+    science_positions = [
+        position for position, _ in index.phrase_postings["science"]
+    ]
+    assert len(science_positions) == sum(
+        1 for entry in get_taxonomy_entries() if entry.category_slug == "science"
+    )
+    with pytest.raises(TypeError):
+        index.token_postings["new-token"] = ()
+
+
+def test_taxonomy_index_includes_aliases_in_token_postings():
+    index = build_taxonomy_index(
+        [
+            TaxonomyEntry(
+                category="Sports",
+                category_slug="sports",
+                subcategory="Basketball",
+                subcategory_slug="basketball",
+            )
+        ]
+    )
+
+    assert index.token_postings["nba"] == ((0, 2),)
+    assert index.token_postings["basketball"] == ((0, 0),)
+    assert index.token_postings["sports"] == ((0, 1),)
@@ -0,0 +1,246 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from server.app.quiz.repositories import chunk_embedding_cache_repository
+from server.app.quiz.utils import ai_generate
+from server.app.quiz.utils.chunk_text import split_text_into_chunks
+from server.app.quiz.utils.embedding_client import BatchEmbeddingClient
+from server.app.quiz.utils.extract_text import ExtractedDocument
+from server.app.quiz.utils.inference_gateway import InferenceGateway
+from server.tests.inference_stub import StubInferenceServer
+
+
+class _Cursor:
+    def __init__(self, documents):
+        self._documents = list(documents)
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self._documents.sort(key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self._documents = self._documents[:count]
+        return self
+
+    def __aiter__(self):
+        self._iterator = iter(self._documents)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _DeleteResult:
+    def __init__(self, deleted_count):
+        self.deleted_count = deleted_count
+
+
+class InMemoryChunkCacheCollection:
+    """Just enough of a Motor collection for the chunk embedding repository."""
+
+    def __init__(self):
+        self.documents: dict[tuple[str, str], dict] = {}
+        self._next_id = 0
+
+    def _matches(self, document, query):
+        for field, condition in query.items():
+            if isinstance(condition, dict) and "$in" in condition:
+                if document.get(field) not in condition["$in"]:
+                    return False
+            elif document.get(field) != condition:
+                return False
+        return True
+
+    def find(self, query, projection=None):
+        return _Cursor(doc for doc in self.documents.values() if self._matches(doc, query))
+
+    async def update_many(self, query, update):
+        for document in self.documents.values():
+            if self._matches(document, query):
+                document.update(update["$set"])
+                document["access_count"] += update["$inc"]["access_count"]
+
+    async def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            query, update = operation._filter, operation._doc
+            key = (query["embedding_model"], query["content_hash"])
+            document = self.documents.get(key)
+            if document is None:
+                self._next_id += 1
+                document = {"_id": self._next_id, **query, "access_count": 0}
+                document.update(update["$setOnInsert"])
+                self.documents[key] = document
+            document.update(update["$set"])
+            document["access_count"] += update["$inc"]["access_count"]
+
+    async def estimated_document_count(self):
+        return len(self.documents)
+
+    async def delete_many(self, query):
+        doomed = [key for key, doc in self.documents.items() if self._matches(doc, query)]
+        for key in doomed:
+            del self.documents[key]
+        return _DeleteResult(len(doomed))
+
+
+@pytest.fixture
+def chunk_cache(monkeypatch):
+    collection = InMemoryChunkCacheCollection()
+    monkeypatch.setattr(
+        chunk_embedding_cache_repository,
+        "get_chunk_embedding_cache_collection",
+        lambda: collection,
+    )
+    monkeypatch.setattr(
+        chunk_embedding_cache_repository,
+        "_stats",
+        chunk_embedding_cache_repository.ChunkEmbeddingCacheStats(),
+    )
+    return collection
+
+
+def _syllabus(paragraph_overrides=None) -> str:
+    paragraphs = [
+        f"Section {index}. " + " ".join(f"Topic {index} sentence {n}." for n in range(30))
+        for index in range(48)
+    ]
+    for index, replacement in (paragraph_overrides or {}).items():
+        paragraphs[index] = replacement
+    return "\n\n".join(paragraphs)
+
+
+async def _resolve(stub, text):
+    document = ExtractedDocument(
+        text=text,
+        source_document_name="syllabus.txt",
+        source_document_type="txt",
+        title="Syllabus",
+        source_characters=len(text),
+    )
+    chunks = split_text_into_chunks(text, max_chars=1600, overlap_chars=220, max_chunks=24)
+    embedding_client = BatchEmbeddingClient(
+        InferenceGateway().session("test-token"),
+        model=stub.url,
+        batch_size=16,
+    )
+    stub.requests.clear()
+    chunk_embeddings, _, _ = await ai_generate._resolve_chunk_embeddings(
+        embedding_client=embedding_client,
+        document=document,
+        chunks=chunks,
+        retrieval_query="syllabus quiz",
+    )
+    return chunks, chunk_embeddings
+
+
+@pytest.mark.asyncio
+async def test_editing_one_paragraph_only_reembeds_affected_chunks(monkeypatch, chunk_cache):
+    monkeypatch.setattr(ai_generate.settings, "DOCUMENT_RAG_CACHE_ENABLED", False)
+    monkeypatch.setattr(ai_generate.settings, "DOCUMENT_CHUNK_EMBEDDING_CACHE_ENABLED", True)
+
+    with StubInferenceServer() as stub:
+        original_chunks, original_embeddings = await _resolve(stub, _syllabus())
+        assert len(original_chunks) == 24
+        assert sorted(stub.embedded_texts) == sorted(
+            [chunk.content for chunk in original_chunks] + ["syllabus quiz"]
+        )
+
+        # Same length as the original paragraph, so chunk boundaries hold.
+        rewritten = _syllabus().split("\n\n")[20].replace("Topic 20", "Theme 20")
+        edited_text = _syllabus({20: rewritten})
+        edited_chunks, edited_embeddings = await _resolve(stub, edited_text)
+
+    original_contents = {chunk.content for chunk in original_chunks}
+    changed = [chunk.content for chunk in edited_chunks if chunk.content not in original_contents]
+    assert changed
+    assert all("Theme 20" in content for content in changed)
+    assert sorted(stub.embedded_texts) == sorted(changed + ["syllabus quiz"])
+
+    stats = chunk_embedding_cache_repository.get_chunk_embedding_cache_stats()
+    assert stats.misses == 24 + len(changed)
+    assert stats.hits == 24 - len(changed)
+
+    unchanged_positions = [
+        index
+        for index, chunk in enumerate(edited_chunks)
+        if chunk.content == original_chunks[index].content
+    ]
+    assert unchanged_positions
+    np.testing.assert_array_equal(
+        edited_embeddings[unchanged_positions],
+        original_embeddings[unchanged_positions],
+    )
+
+
+@pytest.mark.asyncio
+async def test_identical_chunks_are_shared_across_documents(monkeypatch, chunk_cache):
+    monkeypatch.setattr(ai_generate.settings, "DOCUMENT_RAG_CACHE_ENABLED", False)
+    monkeypatch.setattr(ai_generate.settings, "DOCUMENT_CHUNK_EMBEDDING_CACHE_ENABLED", True)
+
+    with StubInferenceServer() as stub:
+        await _resolve(stub, _syllabus())
+        # Same material with a different cover page prepended.
+        await _resolve(stub, "Cover page for term two.\n\n" + _syllabus())
+        reembedded = set(stub.embedded_texts)
+
+    assert len(reembedded) <= 3
+    assert "syllabus quiz" in reembedded
+
+
+@pytest.mark.asyncio
+async def test_eviction_drops_least_recently_used_entries(chunk_cache):
+    await chunk_embedding_cache_repository.upsert_chunk_embeddings(
+        contents=["alpha", "beta", "gamma"],
+        embeddings=[[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]],
+        embedding_model="model",
+        max_entries=10,
+    )
+    now = datetime.now(timezone.utc)
+    for offset, content in enumerate(["beta", "alpha", "gamma"]):
+        key = ("model", chunk_embedding_cache_repository.build_chunk_content_hash(content))
+        chunk_cache.documents[key]["last_accessed_at"] = now - timedelta(days=10 - offset)
+
+    await chunk_embedding_cache_repository.upsert_chunk_embeddings(
+        contents=["delta"],
+        embeddings=[[0.5, 0.5]],
+        embedding_model="model",
+        max_entries=3,
+    )
+
+    remaining = {
+        content
+        for content in ["alpha", "beta", "gamma", "delta"]
+        if ("model", chunk_embedding_cache_repository.build_chunk_content_hash(content))
+        in chunk_cache.documents
+    }
+    assert remaining == {"alpha", "gamma", "delta"}
+    assert chunk_embedding_cache_repository.get_chunk_embedding_cache_stats().evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_lookup_counts_hits_and_misses_and_touches_hits(chunk_cache):
+    await chunk_embedding_cache_repository.upsert_chunk_embeddings(
+        contents=["alpha"],
+        embeddings=[[0.6, 0.8]],
+        embedding_model="model",
+        max_entries=0,
+    )
+
+    cached = await chunk_embedding_cache_repository.get_cached_chunk_embeddings(
+        contents=["alpha", "beta", "alpha"],
+        embedding_model="model",
+    )
+
+    alpha_hash = chunk_embedding_cache_repository.build_chunk_content_hash("alpha")
+    assert list(cached) == [alpha_hash]
+    np.testing.assert_allclose(cached[alpha_hash], [0.6, 0.8])
+    stats = chunk_embedding_cache_repository.get_chunk_embedding_cache_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert chunk_cache.documents[("model", alpha_hash)]["access_count"] == 2
@@ -0,0 +1,132 @@
+import asyncio
+from itertools import islice
+
+import pytest
+from hypothesis import given, settings as hypothesis_settings, strategies as st
+
+from server.app.quiz.utils import chunk_text as chunk_text_module
+from server.app.quiz.utils.chunk_text import aiter_page_chunks, iter_text_chunks, split_text_into_chunks
+from server.app.quiz.utils.extract_text import _normalize_whitespace, sanitize_document_text
+from server.tests.document_factories import build_short_paragraph_text
+from server.tests.legacy_documents import legacy_split_text_into_chunks
+
+
+# Text built from the pieces the chunker reacts to: words, sentence ends,
+# single and blank-line breaks, and runs of spaces and tabs.
+_document_pieces = st.sampled_from(
+    ["word", "Cells", "x" * 37, ".", "!", "?", " ", "  ", "\t", "\n", "\n\n", "\n \n", "\r\n"]
+)
+_documents = st.lists(_document_pieces, max_size=400).map("".join)
+
+
+@hypothesis_settings(max_examples=400, deadline=None)
+@given(
+    text=_documents,
+    max_chars=st.integers(min_value=1, max_value=120),
+    overlap_chars=st.integers(min_value=0, max_value=80),
+    max_chunks=st.integers(min_value=-1, max_value=12),
+)
+def test_matches_legacy_chunker_on_generated_text(text, max_chars, overlap_chars, max_chunks):
+    options = {"max_chars": max_chars, "overlap_chars": overlap_chars, "max_chunks": max_chunks}
+    expected = legacy_split_text_into_chunks(
+        text,
+        max_chars=max_chars,
+        # The public function substitutes defaults for 0; mirror that here.
+        overlap_chars=overlap_chars or chunk_text_module.settings.DOCUMENT_CHUNK_OVERLAP_CHARS,
+        max_chunks=max_chunks or chunk_text_module.settings.DOCUMENT_RAG_MAX_CHUNKS,
+    )
+
+    assert split_text_into_chunks(text, **options) == expected
+
+
+@hypothesis_settings(max_examples=200, deadline=None)
+@given(text=st.text(max_size=600), max_chars=st.integers(min_value=1, max_value=200))
+def test_matches_legacy_chunker_on_arbitrary_unicode(text, max_chars):
+    expected = legacy_split_text_into_chunks(
+        text,
+        max_chars=max_chars,
+        overlap_chars=max_chars // 4 or 1,
+        max_chunks=50,
+    )
+
+    assert (
+        split_text_into_chunks(
+            text,
+            max_chars=max_chars,
+            overlap_chars=max_chars // 4 or 1,
+            max_chunks=50,
+        )
+        == expected
+    )
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_legacy_chunker_with_default_settings(seed):
+    text = build_short_paragraph_text(20_000, seed=seed)
+
+    expected = legacy_split_text_into_chunks(
+        text,
+        max_chars=chunk_text_module.settings.DOCUMENT_CHUNK_SIZE_CHARS,
+        overlap_chars=chunk_text_module.settings.DOCUMENT_CHUNK_OVERLAP_CHARS,
+        max_chunks=chunk_text_module.settings.DOCUMENT_RAG_MAX_CHUNKS,
+    )
+
+    assert split_text_into_chunks(text) == expected
+
+
+def test_iterator_stops_without_scanning_the_rest_of_the_text(monkeypatch):
+    text = build_short_paragraph_text(50_000)
+    consumed_segments = 0
+    original = chunk_text_module._iter_segments
+
+    def counting_segments(*args):
+        nonlocal consumed_segments
+        for segment in original(*args):
+            consumed_segments += 1
+            yield segment
+
+    monkeypatch.setattr(chunk_text_module, "_iter_segments", counting_segments)
+
+    chunks = list(islice(iter_text_chunks(text, max_chars=400, max_chunks=1000), 2))
+
+    assert [chunk.chunk_id for chunk in chunks] == [0, 1]
+    assert consumed_segments < 100
+    assert text.count("\n\n") > 1_000
+
+
+async def _page_stream(pages, read):
+    for page in pages:
+        read.append(page)
+        yield page
+
+
+def _chunk_pages(pages, read=None, **options):
+    async def collect():
+        return [chunk async for chunk in aiter_page_chunks(_page_stream(pages, read if read is not None else []), **options)]
+
+    return asyncio.run(collect())
+
+
+@hypothesis_settings(max_examples=400, deadline=None)
+@given(
+    pages=st.lists(_documents.map(_normalize_whitespace), min_size=1, max_size=6),
+    max_chars=st.integers(min_value=1, max_value=120),
+    overlap_chars=st.integers(min_value=0, max_value=80),
+    max_chunks=st.integers(min_value=1, max_value=12),
+)
+def test_page_chunks_match_chunking_the_joined_document(pages, max_chars, overlap_chars, max_chunks):
+    options = {"max_chars": max_chars, "overlap_chars": overlap_chars, "max_chunks": max_chunks}
+
+    assert _chunk_pages(pages, **options) == split_text_into_chunks(
+        sanitize_document_text("\n".join(pages)), **options
+    )
+
+
+def test_page_chunks_stop_reading_pages_at_the_chunk_limit():
+    pages = [build_short_paragraph_text(5_000, seed=seed) for seed in range(40)]
+    read = []
+
+    chunks = _chunk_pages(pages, read, max_chars=800, max_chunks=6)
+
+    assert len(chunks) == 6
+    assert len(read) < 3
@@ -1,6 +1,8 @@
 from unittest.mock import AsyncMock
 
+import numpy as np
 import pytest
+from bson.binary import Binary
 
 from server.app.quiz.repositories import document_rag_repository
 from server.app.quiz.utils.chunk_text import TextChunk
@@ -51,3 +53,162 @@ async def test_upsert_document_embeddings_avoids_conflicting_access_count_update
     assert update_doc["$inc"] == {"access_count": 1}
     assert "access_count" not in update_doc["$setOnInsert"]
     assert "created_at" in update_doc["$setOnInsert"]
+
+
+def _document_and_chunks(count: int = 3):
+    chunks = [
+        TextChunk(chunk_id=index, content=f"Chunk {index} text.", char_count=14)
+        for index in range(count)
+    ]
+    document = ExtractedDocument(
+        text="\n\n".join(chunk.content for chunk in chunks),
+        source_document_name="notes.txt",
+        source_document_type="txt",
+        title="Notes",
+        source_characters=0,
+    )
+    return document, chunks
+
+
+_CACHE_KEY = dict(
+    embedding_model="test-embedding-model",
+    chunk_size_chars=800,
+    chunk_overlap_chars=100,
+    chunk_limit=12,
+)
+
+
+@pytest.mark.asyncio
+async def test_upsert_stores_embeddings_as_packed_float32_binary(monkeypatch):
+    collection = AsyncMock()
+    monkeypatch.setattr(
+        document_rag_repository,
+        "get_document_rag_cache_collection",
+        lambda: collection,
+    )
+    document, chunks = _document_and_chunks()
+    embeddings = [[0.1, 0.2, 0.3, 0.4], [0.5, 0.6, 0.7, 0.8], [-0.1, 0.0, 0.1, 0.2]]
+
+    await document_rag_repository.upsert_document_embeddings(
+        document=document,
+        chunks=chunks,
+        chunk_embeddings=embeddings,
+        **_CACHE_KEY,
+    )
+
+    _, update_doc = collection.update_one.await_args.args
+    stored = update_doc["$set"]
+    assert stored["cache_format_version"] == document_rag_repository.CACHE_FORMAT_VERSION
+    assert isinstance(stored["embeddings"], Binary)
+    assert len(stored["embeddings"]) == 3 * 4 * 4
+    assert all("embedding" not in chunk for chunk in stored["chunks"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("encoding", "tolerance"), [("float32", 0.0), ("int8", 0.01)])
+async def test_cached_embeddings_round_trip_into_a_matrix(monkeypatch, encoding, tolerance):
+    document, chunks = _document_and_chunks()
+    embeddings = np.array(
+        [[0.1, 0.2, 0.3, 0.4], [0.5, -0.6, 0.7, 0.8], [0.0, 0.0, 0.0, 0.0]],
+        dtype=np.float32,
+    )
+    stored_document = {
+        "_id": "cache-id",
+        **document_rag_repository._serialize_cache_payload(
+            chunks=chunks,
+            chunk_embeddings=embeddings,
+            embedding_encoding=encoding,
+        ),
+    }
+    collection = AsyncMock()
+    collection.find_one.return_value = stored_document
+    monkeypatch.setattr(
+        document_rag_repository,
+        "get_document_rag_cache_collection",
+        lambda: collection,
+    )
+
+    cached = await document_rag_repository.get_cached_document_embeddings(
+        document=document,
+        chunks=chunks,
+        **_CACHE_KEY,
+    )
+
+    assert cached.shape == (3, 4)
+    np.testing.assert_allclose(cached, embeddings, atol=tolerance)
+    if encoding == "float32":
+        # Decoded straight from the BSON bytes, without a copy.
+        assert cached.flags.owndata is False
+    _, update_doc = collection.update_one.await_args.args
+    assert "chunks" not in update_doc["$set"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_array_cache_entries_are_migrated_on_read(monkeypatch):
+    document, chunks = _document_and_chunks(2)
+    legacy_embeddings = [[0.25, 0.5, 0.75], [1.0, 0.0, -1.0]]
+    collection = AsyncMock()
+    collection.find_one.return_value = {
+        "_id": "legacy-id",
+        "chunks": [
+            {
+                "chunk_id": chunk.chunk_id,
+                "content": chunk.content,
+                "char_count": chunk.char_count,
+                "embedding": embedding,
+            }
+            for chunk, embedding in zip(chunks, legacy_embeddings)
+        ],
+    }
+    monkeypatch.setattr(
+        document_rag_repository,
+        "get_document_rag_cache_collection",
+        lambda: collection,
+    )
+
+    cached = await document_rag_repository.get_cached_document_embeddings(
+        document=document,
+        chunks=chunks,
+        **_CACHE_KEY,
+    )
+
+    np.testing.assert_array_equal(cached, np.array(legacy_embeddings, dtype=np.float32))
+    filter_doc, update_doc = collection.update_one.await_args.args
+    assert filter_doc == {"_id": "legacy-id"}
+    migrated = update_doc["$set"]
+    assert migrated["cache_format_version"] == document_rag_repository.CACHE_FORMAT_VERSION
+    assert migrated["embedding_encoding"] == "float32"
+    assert all("embedding" not in chunk for chunk in migrated["chunks"])
+    assert update_doc["$inc"] == {"access_count": 1}
+
+
+@pytest.mark.asyncio
+async def test_cache_entry_with_mismatched_row_count_is_a_miss(monkeypatch):
+    document, chunks = _document_and_chunks(3)
+    stored_document = {
+        "_id": "cache-id",
+        **document_rag_repository._serialize_cache_payload(
+            chunks=chunks[:2],
+            chunk_embeddings=[[0.1, 0.2], [0.3, 0.4]],
+            embedding_encoding="float32",
+        ),
+    }
+    stored_document["chunks"] = [
+        document_rag_repository._serialize_chunk_metadata(chunk) for chunk in chunks
+    ]
+    collection = AsyncMock()
+    collection.find_one.return_value = stored_document
+    monkeypatch.setattr(
+        document_rag_repository,
+        "get_document_rag_cache_collection",
+        lambda: collection,
+    )
+
+    cached = await document_rag_repository.get_cached_document_embeddings(
+        document=document,
+        chunks=chunks,
+        **_CACHE_KEY,
+    )
+
+    assert cached is None
+    collection.update_one.assert_not_awaited()
@@ -0,0 +1,122 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from huggingface_hub.errors import HfHubHTTPError
+
+from server.app.quiz.utils import ai_generate
+from server.app.quiz.utils.chunk_text import TextChunk
+from server.app.quiz.utils.embedding_client import (
+    BatchEmbeddingClient,
+    normalize_embedding,
+    split_batch_embedding_payload,
+)
+from server.app.quiz.utils.extract_text import ExtractedDocument
+from server.app.quiz.utils.inference_gateway import InferenceGateway
+from server.tests.inference_stub import StubInferenceServer, stub_embedding
+
+
+def _client_for(stub: StubInferenceServer, **kwargs) -> BatchEmbeddingClient:
+    kwargs.setdefault("retry_backoff_seconds", 0.01)
+    return BatchEmbeddingClient(
+        InferenceGateway().session("test-token"),
+        model=stub.url,
+        **kwargs,
+    )
+
+
+def test_embed_batches_inputs_and_preserves_order():
+    texts = [f"passage {index}" for index in range(11)]
+
+    with StubInferenceServer() as stub:
+        embeddings = asyncio.run(_client_for(stub, batch_size=4).embed(texts))
+
+    assert sorted(len(batch) for batch in stub.requests) == [3, 4, 4]
+    assert sorted(stub.embedded_texts) == sorted(texts)
+    assert embeddings == [
+        pytest.approx(normalize_embedding(stub_embedding(text, stub.dimensions)))
+        for text in texts
+    ]
+
+
+def test_embed_bounds_concurrent_batches():
+    texts = [f"passage {index}" for index in range(12)]
+
+    with StubInferenceServer(latency_seconds=0.05) as stub:
+        asyncio.run(_client_for(stub, batch_size=2, max_concurrency=2).embed(texts))
+
+    assert len(stub.requests) == 6
+    assert stub.max_in_flight == 2
+
+
+def test_embed_retries_transient_batch_failures():
+    with StubInferenceServer(failures_before_success=2) as stub:
+        embeddings = asyncio.run(
+            _client_for(stub, batch_size=8, max_attempts=3).embed(["a", "b"])
+        )
+
+    assert len(embeddings) == 2
+    assert stub.requests == [["a", "b"]]
+
+
+def test_embed_does_not_retry_client_errors():
+    with StubInferenceServer(failures_before_success=5, failure_status=400) as stub:
+        with pytest.raises(HfHubHTTPError):
+            asyncio.run(_client_for(stub, max_attempts=3).embed(["a"]))
+
+    assert stub.failures_remaining == 4
+
+
+def test_split_batch_payload_accepts_squeezed_single_vector():
+    assert split_batch_embedding_payload([0.1, 0.2], 1) == [[0.1, 0.2]]
+
+    with pytest.raises(ValueError):
+        split_batch_embedding_payload([[0.1, 0.2]], 2)
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_embeds_query_in_the_same_batches_as_chunks(monkeypatch):
+    monkeypatch.setattr(ai_generate.settings, "DOCUMENT_RAG_CACHE_ENABLED", True)
+    monkeypatch.setattr(
+        ai_generate.settings,
+        "DOCUMENT_CHUNK_EMBEDDING_CACHE_ENABLED",
+        False,
+    )
+    monkeypatch.setattr(
+        ai_generate,
+        "get_cached_document_embeddings",
+        AsyncMock(return_value=None),
+    )
+    upsert = AsyncMock()
+    monkeypatch.setattr(ai_generate, "upsert_document_embeddings", upsert)
+
+    chunks = [
+        TextChunk(chunk_id=index, content=f"chunk {index}", char_count=7)
+        for index in range(24)
+    ]
+    document = ExtractedDocument(
+        text="\n\n".join(chunk.content for chunk in chunks),
+        source_document_name="notes.txt",
+        source_document_type="txt",
+        title="Notes",
+        source_characters=0,
+    )
+
+    with StubInferenceServer() as stub:
+        chunk_embeddings, query_embedding, cache_hit = (
+            await ai_generate._resolve_chunk_embeddings(
+                embedding_client=_client_for(stub, batch_size=16),
+                document=document,
+                chunks=chunks,
+                retrieval_query="the query",
+            )
+        )
+
+    assert cache_hit is False
+    assert sorted(len(batch) for batch in stub.requests) == [9, 16]
+    assert any("the query" in batch and "chunk 23" in batch for batch in stub.requests)
+    assert len(chunk_embeddings) == 24
+    assert query_embedding == pytest.approx(
+        normalize_embedding(stub_embedding("the query", stub.dimensions))
+    )
+    assert upsert.await_args.kwargs["chunk_embeddings"] is chunk_embeddings
@@ -0,0 +1,302 @@
+import asyncio
+from collections import Counter
+
+import numpy as np
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from server.app.db.core.redis_lease import EXTEND_SCRIPT, RedisLease
+from server.app.quiz.utils import ai_generate
+from server.app.quiz.utils.chunk_text import TextChunk
+from server.app.quiz.utils.embedding_client import BatchEmbeddingClient
+from server.app.quiz.utils.extract_text import ExtractedDocument
+from server.app.quiz.utils.inference_gateway import InferenceGateway
+from server.app.quiz.utils.single_flight import SingleFlight
+from server.tests.inference_stub import StubInferenceServer
+from server.tests.redis_fake import FakeRedis
+
+
+class InMemoryDocumentCache:
+    def __init__(self):
+        self.entries: dict[str, np.ndarray] = {}
+        self.upserts = 0
+
+    async def get(self, *, document, **_):
+        return self.entries.get(document.text)
+
+    async def upsert(self, *, document, chunk_embeddings, **_):
+        self.upserts += 1
+        self.entries[document.text] = np.asarray(chunk_embeddings, dtype=np.float32)
+
+
+class UnreachableRedis:
+    async def set(self, *args, **kwargs):
+        raise RedisConnectionError("Connection refused")
+
+    async def eval(self, *args, **kwargs):
+        raise RedisConnectionError("Connection refused")
+
+
+@pytest.fixture
+def document_cache(monkeypatch):
+    cache = InMemoryDocumentCache()
+    monkeypatch.setattr(ai_generate.settings, "DOCUMENT_RAG_CACHE_ENABLED", True)
+    monkeypatch.setattr(ai_generate.settings, "DOCUMENT_CHUNK_EMBEDDING_CACHE_ENABLED", False)
+    monkeypatch.setattr(ai_generate.settings, "DOCUMENT_EMBEDDING_LEASE_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(ai_generate, "get_cached_document_embeddings", cache.get)
+    monkeypatch.setattr(ai_generate, "upsert_document_embeddings", cache.upsert)
+    monkeypatch.setattr(ai_generate, "_document_embedding_jobs", SingleFlight())
+    return cache
+
+
+def _document(chunk_count: int = 20) -> tuple[ExtractedDocument, list[TextChunk]]:
+    chunks = [
+        TextChunk(chunk_id=index, content=f"handout paragraph {index}", char_count=20)
+        for index in range(chunk_count)
+    ]
+    document = ExtractedDocument(
+        text="\n\n".join(chunk.content for chunk in chunks),
+        source_document_name="handout.pdf",
+        source_document_type="pdf",
+        title="Handout",
+        source_characters=0,
+    )
+    return document, chunks
+
+
+def _client_for(stub: StubInferenceServer) -> BatchEmbeddingClient:
+    return BatchEmbeddingClient(InferenceGateway().session("test-token"), model=stub.url, batch_size=8)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_runs_one_job_per_key():
+    flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    async def job():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(flight.run("key", job) for _ in range(5)))
+
+    assert calls == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert {value for value, _ in results} == {42}
+    assert "key" not in flight
+    assert (flight.stats.started, flight.stats.coalesced) == (1, 4)
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_failures_and_survives_waiter_cancellation():
+    flight: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def job():
+        await release.wait()
+        raise ValueError("embedding failed")
+
+    leader = asyncio.create_task(flight.run("key", job))
+    follower = asyncio.create_task(flight.run("key", job))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    with pytest.raises(ValueError, match="embedding failed"):
+        await follower
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert "key" not in flight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_uploads_embed_the_document_once(document_cache):
+    document, chunks = _document()
+
+    with StubInferenceServer(latency_seconds=0.05) as stub:
+        client = _client_for(stub)
+        results = await asyncio.gather(
+            *(
+                ai_generate._resolve_chunk_embeddings(
+                    embedding_client=client,
+                    document=document,
+                    chunks=chunks,
+                    retrieval_query="Handout quiz",
+                    redis_client=FakeRedis(),
+                )
+                for _ in range(12)
+            )
+        )
+
+    embedded = Counter(stub.embedded_texts)
+    assert all(embedded[chunk.content] == 1 for chunk in chunks)
+    # Every caller asked the same question, so the query rode along once too.
+    assert embedded["Handout quiz"] == 1
+    assert len(stub.requests) == 3
+    assert document_cache.upserts == 1
+    assert sorted(cache_hit for _, _, cache_hit in results) == [False] + [True] * 11
+    first_matrix = np.asarray(results[0][0])
+    assert all(np.array_equal(np.asarray(matrix), first_matrix) for matrix, _, _ in results)
+
+
+@pytest.mark.asyncio
+async def test_coalesced_callers_embed_their_own_query(document_cache):
+    document, chunks = _document(4)
+
+    with StubInferenceServer(latency_seconds=0.02) as stub:
+        client = _client_for(stub)
+        await asyncio.gather(
+            *(
+                ai_generate._resolve_chunk_embeddings(
+                    embedding_client=client,
+                    document=document,
+                    chunks=chunks,
+                    retrieval_query=f"focus {index}",
+                )
+                for index in range(3)
+            )
+        )
+
+    embedded = Counter(stub.embedded_texts)
+    assert all(embedded[chunk.content] == 1 for chunk in chunks)
+    assert [embedded[f"focus {index}"] for index in range(3)] == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_redis_lease_coalesces_jobs_across_workers(document_cache):
+    document, chunks = _document(10)
+    redis_client = FakeRedis()
+
+    async def worker_job(client):
+        # Each call stands in for a separate process: no shared SingleFlight.
+        return await ai_generate._run_document_embedding_job(
+            embedding_client=client,
+            document=document,
+            chunks=chunks,
+            retrieval_query="Handout quiz",
+            job_key="job",
+            redis_client=redis_client,
+        )
+
+    with StubInferenceServer(latency_seconds=0.05) as stub:
+        client = _client_for(stub)
+        results = await asyncio.gather(*(worker_job(client) for _ in range(4)))
+
+    embedded = Counter(stub.embedded_texts)
+    assert all(embedded[chunk.content] == 1 for chunk in chunks)
+    assert sorted(result.cache_hit for result in results) == [False, True, True, True]
+    assert document_cache.upserts == 1
+    assert await redis_client.get("document-embedding-lease:job") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_from_a_dead_worker_is_taken_over(document_cache):
+    document, chunks = _document(3)
+    now = [0.0]
+    redis_client = FakeRedis(clock=lambda: now[0])
+    stale = RedisLease(redis_client, "document-embedding-lease:job", ttl_seconds=30)
+    assert await stale.acquire()
+
+    async def advance_clock():
+        await asyncio.sleep(0.05)
+        now[0] += 31
+
+    with StubInferenceServer() as stub:
+        result, _ = await asyncio.gather(
+            ai_generate._run_document_embedding_job(
+                embedding_client=_client_for(stub),
+                document=document,
+                chunks=chunks,
+                retrieval_query="Handout quiz",
+                job_key="job",
+                redis_client=redis_client,
+            ),
+            advance_clock(),
+        )
+
+    assert result.cache_hit is False
+    assert document_cache.upserts == 1
+
+
+class ExtendCountingRedis(FakeRedis):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.extends = 0
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        result = await super().eval(script, numkeys, *keys_and_args)
+        if script == EXTEND_SCRIPT and result:
+            self.extends += 1
+        return result
+
+
+@pytest.mark.asyncio
+async def test_lease_is_renewed_while_a_slow_job_runs(document_cache, monkeypatch):
+    monkeypatch.setattr(ai_generate.settings, "DOCUMENT_EMBEDDING_LEASE_SECONDS", 0.06)
+    document, chunks = _document(3)
+    # The clock stands still, so only the heartbeat is under test, not its timing.
+    redis_client = ExtendCountingRedis(clock=lambda: 0.0)
+
+    with StubInferenceServer(latency_seconds=0.25) as stub:
+        result = await ai_generate._run_document_embedding_job(
+            embedding_client=_client_for(stub),
+            document=document,
+            chunks=chunks,
+            retrieval_query="Handout quiz",
+            job_key="job",
+            redis_client=redis_client,
+        )
+
+    assert result.cache_hit is False
+    # The job outlasted the 60 ms TTL and renewed the lease on its way.
+    assert redis_client.extends >= 1
+    assert await redis_client.get("document-embedding-lease:job") is None
+    extends = redis_client.extends
+    await asyncio.sleep(0.05)
+    assert redis_client.extends == extends
+
+
+@pytest.mark.asyncio
+async def test_waiter_stops_waiting_on_a_stuck_lease(document_cache, monkeypatch):
+    monkeypatch.setattr(ai_generate.settings, "DOCUMENT_EMBEDDING_LEASE_WAIT_SECONDS", 0.05)
+    document, chunks = _document(3)
+    redis_client = FakeRedis()
+    stuck = RedisLease(redis_client, "document-embedding-lease:job", ttl_seconds=300)
+    assert await stuck.acquire()
+
+    with StubInferenceServer() as stub:
+        result = await asyncio.wait_for(
+            ai_generate._run_document_embedding_job(
+                embedding_client=_client_for(stub),
+                document=document,
+                chunks=chunks,
+                retrieval_query="Handout quiz",
+                job_key="job",
+                redis_client=redis_client,
+            ),
+            timeout=5,
+        )
+
+    assert result.cache_hit is False
+    assert document_cache.upserts == 1
+    # The waiter never held the lease, so it leaves the other holder's key alone.
+    assert await redis_client.get("document-embedding-lease:job") is not None
+
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_falls_back_to_local_embedding(document_cache):
+    document, chunks = _document(3)
+
+    with StubInferenceServer() as stub:
+        chunk_embeddings, _, cache_hit = await ai_generate._resolve_chunk_embeddings(
+            embedding_client=_client_for(stub),
+            document=document,
+            chunks=chunks,
+            retrieval_query="Handout quiz",
+            redis_client=UnreachableRedis(),
+        )
+
+    assert cache_hit is False
+    assert len(chunk_embeddings) == 3
+    assert document_cache.upserts == 1
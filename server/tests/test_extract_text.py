@@ -0,0 +1,235 @@
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from docx import Document as DocxDocument
+
+from server.app.quiz.utils import extract_text as extract_text_module
+from server.app.quiz.utils.chunk_text import split_text_into_chunks
+from server.app.quiz.utils.extract_text import (
+    extract_chunks_from_bytes_async,
+    extract_text_from_bytes,
+    extract_text_from_bytes_async,
+    stream_document_pages,
+)
+from server.tests.document_factories import build_synthetic_pdf
+
+
+@pytest.fixture(params=["fitz", "pypdf"])
+def pdf_backend(request, monkeypatch):
+    if request.param == "pypdf":
+        monkeypatch.setattr(extract_text_module, "fitz", None)
+    elif extract_text_module.fitz is None:
+        pytest.skip("PyMuPDF is not installed")
+    return request.param
+
+
+def _build_docx(paragraphs: list[str]) -> bytes:
+    document = DocxDocument()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+async def _collect_pages(**kwargs) -> list[str]:
+    return [page async for page in stream_document_pages(**kwargs)]
+
+
+def test_pdf_pages_stream_in_order(pdf_backend):
+    pdf_bytes = build_synthetic_pdf(10, lines_per_page=3)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        pages = asyncio.run(
+            _collect_pages(
+                file_bytes=pdf_bytes,
+                filename="notes.pdf",
+                executor=executor,
+                pages_per_task=3,
+            )
+        )
+
+    assert len(pages) == 10
+    assert [page.split(" line ", 1)[0] for page in pages] == [
+        f"Page {number}" for number in range(1, 11)
+    ]
+
+
+def test_async_extraction_matches_sync_text(pdf_backend):
+    pdf_bytes = build_synthetic_pdf(6, lines_per_page=5)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        streamed = asyncio.run(
+            extract_text_from_bytes_async(
+                file_bytes=pdf_bytes,
+                filename="notes.pdf",
+                executor=executor,
+                pages_per_task=4,
+            )
+        )
+    whole = extract_text_from_bytes(file_bytes=pdf_bytes, filename="notes.pdf")
+
+    assert streamed.text == whole.text
+    assert streamed.title == whole.title
+    assert streamed.extraction.page_count == 6
+    assert streamed.extraction.pages_extracted == 6
+    assert streamed.extraction.stopped_early is False
+
+
+def test_early_stop_reads_only_pages_within_budget(monkeypatch):
+    pdf_bytes = build_synthetic_pdf(40, lines_per_page=30)
+    extracted_ranges: list[tuple[int, int]] = []
+    original = extract_text_module._extract_pdf_page_range
+
+    def recording_extract(path, start, stop):
+        extracted_ranges.append((start, stop))
+        return original(path, start, stop)
+
+    monkeypatch.setattr(extract_text_module, "_extract_pdf_page_range", recording_extract)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        document = asyncio.run(
+            extract_text_from_bytes_async(
+                file_bytes=pdf_bytes,
+                filename="notes.pdf",
+                executor=executor,
+                pages_per_task=2,
+                max_characters=5_000,
+            )
+        )
+
+    assert document.extraction.stopped_early is True
+    assert document.extraction.page_count == 40
+    assert document.extraction.pages_extracted < 10
+    assert len(document.text) >= 5_000
+    # Only one range per worker may run ahead of the consumer.
+    assert max(stop for _, stop in extracted_ranges) <= (document.extraction.pages_extracted + 4)
+
+
+def test_budgeted_extraction_produces_the_same_chunks():
+    pdf_bytes = build_synthetic_pdf(60, lines_per_page=40)
+    budget = (6 + 2) * 800
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        budgeted = asyncio.run(
+            extract_text_from_bytes_async(
+                file_bytes=pdf_bytes,
+                filename="notes.pdf",
+                executor=executor,
+                max_characters=budget,
+            )
+        )
+    whole = extract_text_from_bytes(file_bytes=pdf_bytes, filename="notes.pdf")
+
+    assert budgeted.extraction.stopped_early is True
+    assert split_text_into_chunks(
+        budgeted.text, max_chars=800, overlap_chars=120, max_chunks=6
+    ) == split_text_into_chunks(whole.text, max_chars=800, overlap_chars=120, max_chunks=6)
+
+
+def test_chunked_extraction_stops_at_the_chunk_limit():
+    pdf_bytes = build_synthetic_pdf(60, lines_per_page=40)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        document, chunks = asyncio.run(
+            extract_chunks_from_bytes_async(
+                file_bytes=pdf_bytes,
+                filename="notes.pdf",
+                executor=executor,
+                max_workers=2,
+                pages_per_task=2,
+                max_chars=800,
+                overlap_chars=120,
+                max_chunks=6,
+            )
+        )
+    whole = extract_text_from_bytes(file_bytes=pdf_bytes, filename="notes.pdf")
+
+    assert chunks == split_text_into_chunks(whole.text, max_chars=800, overlap_chars=120, max_chunks=6)
+    assert document.extraction.page_count == 60
+    assert document.extraction.stopped_early is True
+    assert document.extraction.pages_extracted < 10
+    assert whole.text.startswith(document.text)
+
+
+def test_chunked_extraction_reads_a_short_document_whole():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        document, chunks = asyncio.run(
+            extract_chunks_from_bytes_async(
+                file_bytes="Photosynthesis\n\nLight   becomes sugar.".encode("utf-8"),
+                filename="plants.txt",
+                executor=executor,
+            )
+        )
+
+    assert document.text == "Photosynthesis\n\nLight becomes sugar."
+    assert document.extraction.stopped_early is False
+    assert chunks == split_text_into_chunks(document.text)
+
+
+def test_docx_and_txt_extract_through_the_async_path():
+    docx_bytes = _build_docx(["Cell Biology", "", "Cells are the unit of life."])
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        docx_document = asyncio.run(
+            extract_text_from_bytes_async(
+                file_bytes=docx_bytes,
+                filename="biology.docx",
+                executor=executor,
+            )
+        )
+        txt_document = asyncio.run(
+            extract_text_from_bytes_async(
+                file_bytes="Photosynthesis\n\nLight   becomes sugar.".encode("utf-8"),
+                filename="plants.txt",
+                executor=executor,
+            )
+        )
+
+    assert docx_document.text == "Cell Biology\nCells are the unit of life."
+    assert docx_document.source_document_type == "docx"
+    assert txt_document.text == "Photosynthesis\n\nLight becomes sugar."
+    assert txt_document.extraction.page_count == 1
+
+
+def test_async_extraction_rejects_unsupported_and_empty_documents():
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(ValueError, match="Unsupported file type"):
+            asyncio.run(
+                extract_text_from_bytes_async(
+                    file_bytes=b"data",
+                    filename="slides.pptx",
+                    executor=executor,
+                )
+            )
+        with pytest.raises(ValueError, match="No readable text"):
+            asyncio.run(
+                extract_text_from_bytes_async(
+                    file_bytes=b"   \n\n  ",
+                    filename="blank.txt",
+                    executor=executor,
+                )
+            )
+
+
+def test_pdf_extraction_runs_in_spawned_worker_processes():
+    pdf_bytes = build_synthetic_pdf(4, lines_per_page=2)
+
+    with ProcessPoolExecutor(
+        max_workers=2,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        document = asyncio.run(
+            extract_text_from_bytes_async(
+                file_bytes=pdf_bytes,
+                filename="notes.pdf",
+                executor=executor,
+                pages_per_task=1,
+            )
+        )
+
+    assert document.extraction.pages_extracted == 4
+    assert document.text.startswith("Page 1 line 1")
@@ -0,0 +1,73 @@
+import pytest
+from bson import ObjectId
+
+from server.tests.library_fake import LibraryCollections, build_folders, library_services
+
+
+USER_ID = "user-1"
+
+
+def _library(folders: int, *, seed: int = 0, **kwargs):
+    collections = LibraryCollections()
+    titles = build_folders(
+        collections, user_id=USER_ID, folders=folders, items_per_folder=4, questions=3, seed=seed, **kwargs
+    )
+    return collections, titles, library_services(collections)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", range(3))
+async def test_list_folders_matches_the_per_folder_listing(seed):
+    collections, _, services = _library(12, seed=seed)
+
+    assert await services["batched"].list_folders(user_id=USER_ID) == (
+        await services["legacy"].list_folders(user_id=USER_ID)
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", range(3))
+async def test_folder_title_search_matches_the_per_folder_search(seed):
+    collections, titles, services = _library(12, seed=seed)
+    # A quiz whose document disappeared is skipped, as get_folder skipped it.
+    del collections.quizzes.documents[next(iter(collections.quizzes.documents))]
+
+    for query in [titles[0], titles[5].split()[1], "my " + titles[7].lower(), "  Item 1 ", "zzz unrelated", ""]:
+        expected = await services["legacy"].find_quiz_in_folders_by_title(user_id=USER_ID, title=query)
+        assert await services["batched"].find_quiz_in_folders_by_title(user_id=USER_ID, title=query) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("folders", [1, 10, 60])
+async def test_folder_reads_use_a_fixed_number_of_queries(folders):
+    collections, _, services = _library(folders)
+    service = services["batched"]
+
+    collections.reset_counts()
+    listed = await service.list_folders(user_id=USER_ID)
+    assert len(listed) == folders
+    assert collections.round_trips == 2
+    assert collections.folder_items.operations == ["aggregate"]
+
+    active_item = next(item for item in collections.folder_items.documents.values() if item["deleted_at"] is None)
+    title = collections.quizzes.documents[ObjectId(active_item["quiz_id"])]["title"]
+    collections.reset_counts()
+    found = await service.find_quiz_in_folders_by_title(user_id=USER_ID, title=title)
+    assert found["found"] is True
+    # Folders, items, quiz titles, saved references and the matched quizzes.
+    assert collections.round_trips == 5
+    assert collections.quizzes.operations == ["find", "find"]
+
+
+@pytest.mark.asyncio
+async def test_empty_library_reads_only_the_folders():
+    collections = LibraryCollections()
+    service = library_services(collections)["batched"]
+
+    assert await service.list_folders(user_id=USER_ID) == []
+    assert await service.find_quiz_in_folders_by_title(user_id=USER_ID, title="Biology") == {
+        "query": "Biology",
+        "found": False,
+        "matches": [],
+    }
+    assert collections.round_trips == 2
@@ -0,0 +1,168 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from huggingface_hub.errors import InferenceTimeoutError
+
+from server.app.quiz.services import category_taxonomy_service
+from server.app.quiz.utils import huggingface_utils
+from server.app.quiz.utils.inference_gateway import (
+    InferenceBackpressureError,
+    InferenceGateway,
+)
+from server.tests.inference_stub import StubInferenceServer
+
+
+async def _chat(gateway: InferenceGateway, stub: StubInferenceServer, token: str = "token-a"):
+    return await gateway.session(token).chat_completion(
+        model=stub.chat_model_url,
+        messages=[{"role": "user", "content": "hello"}],
+        max_tokens=16,
+        temperature=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_goes_through_the_shared_pool():
+    gateway = InferenceGateway()
+
+    with StubInferenceServer(chat_response='{"ok": true}') as stub:
+        first = await _chat(gateway, stub, token="token-a")
+        second = await _chat(gateway, stub, token="token-b")
+        await gateway.aclose()
+
+    assert first.choices[0].message.content == '{"ok": true}'
+    assert second.choices[0].message.content == '{"ok": true}'
+    assert stub.authorizations == ["Bearer token-a", "Bearer token-b"]
+    assert stub.chat_requests[0]["max_tokens"] == 16
+    # Both tokens reused the one keep-alive connection.
+    assert stub.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_load_respects_per_host_limit_and_reuses_connections():
+    gateway = InferenceGateway(max_connections_per_host=8, max_keepalive_connections=8)
+
+    with StubInferenceServer(latency_seconds=0.01) as stub:
+        responses = await asyncio.gather(
+            *(_chat(gateway, stub, token=f"token-{index % 5}") for index in range(200))
+        )
+        await gateway.aclose()
+
+    assert len(responses) == 200
+    assert len(stub.chat_requests) == 200
+    assert stub.max_in_flight <= 8
+    assert stub.connections <= 8
+    assert gateway.metrics.requests == 200
+    assert gateway.metrics.max_in_flight == 8
+    assert gateway.metrics.max_waiting >= 150
+    assert gateway.metrics.in_flight == gateway.metrics.waiting == 0
+    assert gateway.metrics.failures == gateway.metrics.rejected == 0
+
+
+@pytest.mark.asyncio
+async def test_requests_beyond_the_wait_queue_fail_fast():
+    gateway = InferenceGateway(max_connections_per_host=1, max_waiting_per_host=2)
+
+    with StubInferenceServer(latency_seconds=0.1) as stub:
+        results = await asyncio.gather(
+            *(_chat(gateway, stub) for _ in range(5)),
+            return_exceptions=True,
+        )
+        await gateway.aclose()
+
+    rejected = [result for result in results if isinstance(result, InferenceBackpressureError)]
+    assert len(rejected) == 2
+    assert len(stub.chat_requests) == 3
+    assert gateway.metrics.rejected == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_responses_raise_inference_timeout():
+    gateway = InferenceGateway(timeout_seconds=0.05)
+
+    with StubInferenceServer(latency_seconds=0.3) as stub:
+        with pytest.raises(InferenceTimeoutError):
+            await _chat(gateway, stub)
+        await gateway.aclose()
+
+    assert gateway.metrics.timeouts == 1
+    assert gateway.metrics.in_flight == 0
+
+
+def test_sessions_are_cached_per_token_with_a_bound():
+    gateway = InferenceGateway(max_sessions=2)
+
+    first = gateway.session("token-a")
+    assert gateway.session("token-a") is first
+    gateway.session("token-b")
+    gateway.session("token-c")
+
+    assert gateway.session("token-a") is not first
+
+
+def test_gateway_recreates_the_pool_for_a_new_event_loop():
+    gateway = InferenceGateway()
+
+    with StubInferenceServer() as stub:
+        asyncio.run(_chat(gateway, stub))
+        asyncio.run(_chat(gateway, stub))
+
+    assert gateway.metrics.clients_created == 2
+    assert len(stub.chat_requests) == 2
+
+
+class _StubChatSession:
+    def __init__(self, content: str):
+        self.chat_completion = AsyncMock(
+            return_value=type(
+                "Response",
+                (),
+                {
+                    "choices": [
+                        type("Choice", (), {"message": type("Message", (), {"content": content})()})()
+                    ]
+                },
+            )()
+        )
+
+
+@pytest.mark.asyncio
+async def test_generate_quiz_with_huggingface_uses_the_shared_session(monkeypatch):
+    session = _StubChatSession(
+        "1. What is 2 + 2?\nA) 3\nB) 4\nC) 5\nD) 6\nAnswer: B) 4"
+    )
+    requested_tokens = []
+
+    def fake_get_session(token):
+        requested_tokens.append(token)
+        return session
+
+    monkeypatch.setattr(huggingface_utils, "get_inference_session", fake_get_session)
+
+    result = await huggingface_utils.generate_quiz_with_huggingface(
+        {"token": "user-token", "question_type": "multichoice", "num_questions": 1}
+    )
+
+    assert requested_tokens == ["user-token"]
+    assert session.chat_completion.await_args.kwargs["max_tokens"] == 2048
+    assert result["source"] == "temporary_token"
+
+
+@pytest.mark.asyncio
+async def test_classify_with_huggingface_uses_the_shared_session(monkeypatch):
+    entry = category_taxonomy_service.get_taxonomy_entries()[0]
+    session = _StubChatSession(
+        f'{{"category_slug": "{entry.category_slug}", '
+        f'"subcategory_slug": "{entry.subcategory_slug}", "confidence": 0.9}}'
+    )
+    monkeypatch.setattr(category_taxonomy_service, "get_inference_session", lambda token: session)
+
+    classification = await category_taxonomy_service.classify_with_huggingface(
+        "Some quiz text",
+        "multichoice",
+        "user-token",
+    )
+
+    assert classification is not None
+    assert session.chat_completion.await_args.kwargs["temperature"] == 0
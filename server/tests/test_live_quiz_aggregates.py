@@ -0,0 +1,350 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from server.app.quiz.repositories.live_quiz_aggregate_repository import LiveQuizAggregateRepository
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.schemas.live_session_schemas import LiveQuizAnalyticsPage
+from server.app.quiz.services.live_quiz_expiry_sweeper import LiveQuizExpirySweeper
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.tests.mongo_fake import FakeMongoCollection
+
+
+CREATOR_ID = "creator-1"
+NOW = datetime.now(timezone.utc)
+QUESTIONS = [
+    {"question": "Q1", "options": ["A", "B"], "answer": "A"},
+    {"question": "Q2", "options": ["A", "B"], "answer": "B"},
+    {"question": "Q3", "options": ["A", "B"], "answer": "A"},
+]
+
+
+def _quiz(quiz_id: str = "quiz-1"):
+    return {
+        "_id": quiz_id,
+        "title": f"Quiz {quiz_id}",
+        "created_by": CREATOR_ID,
+        "live_quiz_enabled": True,
+        "access_code": "ABC123",
+        "access_code_expires_at": NOW + timedelta(days=1),
+        "time_limit_minutes": 10,
+        "questions": QUESTIONS,
+    }
+
+
+class QuizStubRepository(LiveQuizSessionRepository):
+    def __init__(self, sessions: FakeMongoCollection, quiz_ids=("quiz-1",)):
+        super().__init__(FakeMongoCollection(), sessions)
+        self.quizzes = {quiz_id: _quiz(quiz_id) for quiz_id in quiz_ids}
+
+    async def get_quiz_by_id(self, quiz_id):
+        return self.quizzes.get(quiz_id)
+
+    async def get_quiz_by_access_code(self, access_code):
+        return self.quizzes["quiz-1"]
+
+    async def list_live_quizzes_by_creator(self, creator_user_id):
+        return list(self.quizzes.values())
+
+
+def _service(sessions, aggregates=None, **kwargs) -> LiveQuizSessionService:
+    return LiveQuizSessionService(
+        QuizStubRepository(sessions, **kwargs),
+        aggregates=LiveQuizAggregateRepository(aggregates) if aggregates is not None else None,
+    )
+
+
+def _seed_session(sessions, index: int, *, quiz_id="quiz-1", status="submitted", score=2, **overrides):
+    session_id = ObjectId()
+    sessions.documents[session_id] = {
+        "_id": session_id,
+        "quiz_id": quiz_id,
+        "participant_name": f"Participant {index}",
+        "participant_token_hash": "hash",
+        "started_at": NOW - timedelta(minutes=10),
+        "joined_at": NOW - timedelta(minutes=10),
+        "expires_at": NOW + timedelta(minutes=10),
+        "submitted_at": NOW if status == "submitted" else None,
+        "status": status,
+        "current_question_index": 0,
+        "answers": [
+            {"question_index": 0, "selected_answer": "A", "answered_at": NOW},
+            {"question_index": 1, "selected_answer": "B" if score > 1 else "A", "answered_at": NOW},
+        ],
+        "score": score if status == "submitted" else None,
+        "percentage": None,
+        "total_questions": len(QUESTIONS),
+        "duration_used_seconds": 60 + index if status == "submitted" else None,
+        "auto_submitted": False,
+        "created_at": NOW + timedelta(seconds=index),
+        "updated_at": NOW,
+        **overrides,
+    }
+    return session_id
+
+
+def _without_timestamps(aggregate):
+    return {key: value for key, value in aggregate.items() if key not in {"updated_at", "version", "rebuilding"}}
+
+
+async def _aenumerate(iterable):
+    index = 0
+    async for item in iterable:
+        yield index, item
+        index += 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_aggregate_matches_a_rebuild_from_sessions():
+    sessions, aggregates = FakeMongoCollection(), FakeMongoCollection()
+    service = _service(sessions, aggregates)
+    await service.aggregates.ensure("quiz-1")
+
+    started = [await service.start_session("ABC123", f"P{index}", None) for index in range(5)]
+    for index, joined in enumerate(started[:4]):
+        await service.save_answer(joined["session_id"], joined["participant_token"], 0, "A", 1)
+        if index % 2:
+            await service.save_answer(joined["session_id"], joined["participant_token"], 1, "B", 2)
+    await service.mark_disconnected(started[3]["session_id"], started[3]["participant_token"])
+    for joined in started[:3]:
+        await service.submit_session(joined["session_id"], joined["participant_token"])
+
+    stored = aggregates.documents["quiz-1"]
+    assert stored["participant_count"] == 5
+    assert stored["status_counts"] == {"joined": 1, "active": 0, "disconnected": 1, "submitted": 3}
+    assert stored["score_histogram"] == {"1": 2, "2": 1}
+    assert stored["questions"]["0"] == {"answered": 3, "correct": 3}
+    assert stored["questions"]["1"] == {"answered": 1, "correct": 1}
+    assert [entry["score"] for entry in stored["leaderboard"]] == [2, 1, 1]
+
+    rebuilt = await service._build_aggregate("quiz-1")
+    assert _without_timestamps(stored) == _without_timestamps(rebuilt)
+
+
+@pytest.mark.asyncio
+async def test_analytics_page_is_not_capped_and_rebuilds_a_missing_summary_once():
+    sessions, aggregates = FakeMongoCollection(), FakeMongoCollection()
+    for index in range(700):
+        _seed_session(sessions, index, status="submitted" if index % 2 else "active", score=index % 3)
+    service = _service(sessions, aggregates)
+
+    page = await service.get_analytics_page("quiz-1", CREATOR_ID, limit=300)
+    pages = [page]
+    while pages[-1]["next_cursor"]:
+        pages.append(
+            await service.get_analytics_page(
+                "quiz-1", CREATOR_ID, limit=300, cursor=pages[-1]["next_cursor"]
+            )
+        )
+
+    assert page["participant_count"] == 700
+    assert page["status_counts"]["submitted"] == 350
+    assert page["status_counts"]["in_progress"] == 350
+    assert page["status"] == "in_progress"
+    assert [len(each["participants"]) for each in pages] == [300, 300, 100]
+    assert pages[-1]["participants"][-1]["participant_name"] == "Participant 0"
+    assert sum(bucket["count"] for bucket in page["score_histogram"]) == 350
+    LiveQuizAnalyticsPage.model_validate(page)
+
+    # The summary was stored, so the next read does not scan the sessions.
+    sessions.reset_counts()
+    await service.get_analytics_page("quiz-1", CREATOR_ID, limit=10)
+    assert sessions.operations == ["find"]
+    assert list(aggregates.documents) == ["quiz-1"]
+
+
+@pytest.mark.asyncio
+async def test_writes_during_a_rebuild_are_not_lost():
+    sessions, aggregates = FakeMongoCollection(), FakeMongoCollection()
+    for index in range(4):
+        _seed_session(sessions, index)
+    service = _service(sessions, aggregates)
+    scan_sessions = service.repository.iter_quiz_sessions
+    scans = []
+
+    async def iter_with_a_join_midway(quiz_id):
+        scans.append(quiz_id)
+        async for index, session in _aenumerate(scan_sessions(quiz_id)):
+            if len(scans) == 1 and index == 2:
+                # Joins after the scan passed its position; only the summary update records it.
+                await service.start_session("ABC123", "Late", None)
+            yield session
+
+    service.repository.iter_quiz_sessions = iter_with_a_join_midway
+
+    page = await service.get_analytics_page("quiz-1", CREATOR_ID)
+
+    assert len(scans) == 2
+    assert page["participant_count"] == 5
+    assert aggregates.documents["quiz-1"]["rebuilding"] is False
+    service.repository.iter_quiz_sessions = scan_sessions
+    assert await service.check_aggregate("quiz-1")
+
+
+@pytest.mark.asyncio
+async def test_a_read_during_a_rebuild_does_not_see_the_partial_summary():
+    sessions, aggregates = FakeMongoCollection(), FakeMongoCollection()
+    _seed_session(sessions, 0)
+    service = _service(sessions, aggregates)
+    await service.aggregates.begin_rebuild("quiz-1")
+
+    assert await service.aggregates.get("quiz-1") is None
+    assert await service.aggregates.get_many(["quiz-1"]) == {}
+    page = await service.get_analytics_page("quiz-1", CREATOR_ID)
+    assert page["participant_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_check_aggregate_finds_and_repairs_a_drifted_summary():
+    sessions, aggregates = FakeMongoCollection(), FakeMongoCollection()
+    for index in range(3):
+        _seed_session(sessions, index)
+    service = _service(sessions, aggregates)
+    await service.get_analytics_page("quiz-1", CREATOR_ID)
+    assert await service.check_aggregate("quiz-1")
+
+    # A summary update that failed after its session write succeeded.
+    aggregates.documents["quiz-1"]["participant_count"] -= 1
+
+    assert not await service.check_aggregate("quiz-1")
+    assert not await service.check_aggregate("quiz-1")
+    assert not await service.check_aggregate("quiz-1", repair=True)
+    assert await service.check_aggregate("quiz-1")
+    assert aggregates.documents["quiz-1"]["participant_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_keeps_the_top_entries_by_score_then_duration():
+    sessions, aggregates = FakeMongoCollection(), FakeMongoCollection()
+    scores = [1, 3, 2, 3, 0]
+    for index, score in enumerate(scores):
+        _seed_session(sessions, index, score=score, duration_used_seconds=100 - index)
+    service = LiveQuizSessionService(
+        QuizStubRepository(sessions),
+        aggregates=LiveQuizAggregateRepository(aggregates, leaderboard_size=3),
+    )
+
+    page = await service.get_analytics_page("quiz-1", CREATOR_ID)
+
+    assert [(entry["rank"], entry["participant_name"]) for entry in page["leaderboard"]] == [
+        (1, "Participant 3"),
+        (2, "Participant 1"),
+        (3, "Participant 2"),
+    ]
+    assert page["average_score"] == 1.8
+
+
+@pytest.mark.asyncio
+async def test_racing_submits_count_the_participant_once():
+    sessions, aggregates = FakeMongoCollection(), FakeMongoCollection()
+    service = _service(sessions, aggregates)
+    await service.aggregates.ensure("quiz-1")
+    joined = await service.start_session("ABC123", "Ada", None)
+
+    results = await asyncio.gather(
+        *(service.submit_session(joined["session_id"], joined["participant_token"]) for _ in range(3))
+    )
+
+    assert {result["score"] for result in results} == {0}
+    stored = aggregates.documents["quiz-1"]
+    assert stored["status_counts"]["submitted"] == 1
+    assert stored["status_counts"]["joined"] == 0
+    assert stored["scored_count"] == 1
+    assert len(stored["leaderboard"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_sweeper_updates_each_quiz_summary_once_per_batch():
+    sessions, aggregates = FakeMongoCollection(), FakeMongoCollection()
+    service = _service(sessions, aggregates, quiz_ids=("quiz-1", "quiz-2"))
+    for index in range(6):
+        _seed_session(
+            sessions,
+            index,
+            quiz_id=f"quiz-{index % 2 + 1}",
+            status="active",
+            expires_at=NOW - timedelta(seconds=index + 1),
+        )
+    for quiz_id in ("quiz-1", "quiz-2"):
+        await service._get_aggregate(quiz_id)
+    aggregates.reset_counts()
+
+    assert await LiveQuizExpirySweeper(service).sweep() == 6
+
+    assert aggregates.operations == ["bulk_write"]
+    for quiz_id in ("quiz-1", "quiz-2"):
+        stored = aggregates.documents[quiz_id]
+        assert stored["status_counts"]["active"] == 0
+        assert stored["status_counts"]["submitted"] == 3
+        assert stored["timed_out_count"] == 3
+        assert _without_timestamps(stored) == _without_timestamps(
+            await service._build_aggregate(quiz_id)
+        )
+
+
+@pytest.mark.asyncio
+async def test_creator_listing_reads_summaries_instead_of_sessions():
+    sessions, aggregates = FakeMongoCollection(), FakeMongoCollection()
+    for index in range(8):
+        _seed_session(
+            sessions,
+            index,
+            quiz_id=f"quiz-{index % 2 + 1}",
+            status="submitted" if index < 6 else "disconnected",
+            score=index % 3,
+        )
+    quiz_ids = ("quiz-1", "quiz-2")
+
+    scanned = await _service(sessions, quiz_ids=quiz_ids).list_creator_live_quizzes(CREATOR_ID)
+    service = _service(sessions, aggregates, quiz_ids=quiz_ids)
+    assert await service.list_creator_live_quizzes(CREATOR_ID) == scanned
+
+    sessions.reset_counts()
+    assert await service.list_creator_live_quizzes(CREATOR_ID) == scanned
+    assert sessions.operations == []
+    assert [row["completed_count"] for row in scanned] == [3, 3]
+
+
+@pytest.mark.asyncio
+async def test_only_the_owner_reads_the_analytics_page():
+    service = _service(FakeMongoCollection(), FakeMongoCollection())
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.get_analytics_page("quiz-1", "someone-else")
+
+    assert exc_info.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_participants_snapshot_is_the_summary_and_first_page():
+    sessions, aggregates = FakeMongoCollection(), FakeMongoCollection()
+    for index in range(700):
+        _seed_session(sessions, index)
+    service = _service(sessions, aggregates)
+    await service.get_analytics_page("quiz-1", CREATOR_ID, limit=1)
+
+    sessions.reset_counts()
+    snapshot = await service.get_participants_snapshot("quiz-1", CREATOR_ID)
+
+    assert snapshot["type"] == "participants_snapshot"
+    assert snapshot["participant_count"] == 700
+    assert len(snapshot["participants"]) == 50
+    assert snapshot["participants"][0]["participant_name"] == "Participant 699"
+    assert snapshot["next_cursor"] is not None
+    assert sessions.operations == ["find"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_session_listing_stays_bounded():
+    sessions = FakeMongoCollection()
+    for index in range(700):
+        _seed_session(sessions, index)
+    repository = QuizStubRepository(sessions)
+
+    listed = await repository.list_quiz_sessions("quiz-1")
+
+    assert len(listed) == 500
+    assert listed[0]["participant_name"] == "Participant 699"
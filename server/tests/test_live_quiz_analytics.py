@@ -8,6 +8,7 @@ Tests cover:
 - score appears after submission
 """
 
+import json
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
@@ -68,10 +69,12 @@ class FakeAnalyticsRepository:
     async def get_quiz_by_id(self, quiz_id):
         return self.quiz
 
-    async def update_session(self, session_id, updates):
-        if session_id in self.sessions:
-            self.sessions[session_id] = {**self.sessions[session_id], **updates}
-        return self.sessions.get(session_id)
+    async def transition_session(self, session_id, from_statuses, updates):
+        session = self.sessions.get(session_id)
+        if not session or session["status"] not in from_statuses:
+            return None
+        self.sessions[session_id] = {**session, **updates, "previous_status": session["status"]}
+        return self.sessions[session_id]
 
     async def save_answer(
         self,
@@ -79,10 +82,15 @@ class FakeAnalyticsRepository:
         question_index,
         selected_answer,
         next_question_index,
+        *,
+        participant_token_hash,
+        now,
     ):
         session = self.sessions.get(session_id)
-        if not session:
+        if not session or session["participant_token_hash"] != participant_token_hash:
             return None
+        if next_question_index is None:
+            next_question_index = session["current_question_index"]
         answers = [
             answer
             for answer in session.get("answers", [])
@@ -92,7 +100,7 @@ class FakeAnalyticsRepository:
             {
                 "question_index": question_index,
                 "selected_answer": selected_answer,
-                "answered_at": datetime.now(timezone.utc),
+                "answered_at": now,
             }
         )
         session.update(
@@ -104,12 +112,23 @@ class FakeAnalyticsRepository:
         )
         return session
 
-    async def list_quiz_sessions(self, quiz_id):
+    async def list_quiz_sessions(self, quiz_id, limit=500):
         """Match the real repository's method signature."""
         return [
             sess for sess in self.sessions.values()
             if sess.get("quiz_id") == quiz_id
+        ][:limit]
+
+    async def iter_quiz_sessions(self, quiz_id):
+        for session in await self.list_quiz_sessions(quiz_id, limit=None):
+            yield session
+
+    async def list_quiz_sessions_by_creator(self, quiz_id, creator_user_id, limit=100, cursor=None):
+        sessions = [
+            sess for sess in self.sessions.values()
+            if sess.get("quiz_id") == quiz_id and sess.get("creator_user_id") == creator_user_id
         ]
+        return sessions[:limit], None
 
 
 @pytest.mark.asyncio
@@ -126,7 +145,7 @@ async def test_participant_joins_and_appears_in_analytics(monkeypatch):
         participant_email="alice@example.com",
     )
 
-    rows = await service.list_analytics("quiz-1", "creator-1")
+    rows = (await service.list_sessions_page("quiz-1", "creator-1"))["participants"]
     assert len(rows) == 1
     assert rows[0]["participant_name"] == "Alice"
     assert rows[0]["participant_email"] == "alice@example.com"
@@ -166,7 +185,7 @@ async def test_participant_submits_and_score_appears_in_analytics(monkeypatch):
         auto_submitted=True,
     )
 
-    rows = await service.list_analytics("quiz-1", "creator-1")
+    rows = (await service.list_sessions_page("quiz-1", "creator-1"))["participants"]
     assert len(rows) == 1
     assert rows[0]["participant_name"] == "Bob"
     assert rows[0]["status"] == "timed_out"
@@ -185,7 +204,7 @@ async def test_non_owner_cannot_fetch_analytics(monkeypatch):
 
     # Non-creator user
     with pytest.raises(HTTPException) as exc:
-        await service.list_analytics("quiz-1", "intruder-1")
+        await service.list_sessions_page("quiz-1", "intruder-1")
     assert exc.value.status_code == 403
 
 
@@ -216,7 +235,7 @@ async def test_analytics_shows_multiple_participants(monkeypatch):
     current_time["value"] = fixed_now + timedelta(minutes=15)
     await service.submit_session(r3["session_id"], r3["participant_token"], auto_submitted=True)
 
-    rows = await service.list_analytics("quiz-1", "creator-1")
+    rows = (await service.list_sessions_page("quiz-1", "creator-1"))["participants"]
     assert len(rows) == 3
 
     alice = next(r for r in rows if r["participant_name"] == "Alice")
@@ -244,7 +263,7 @@ async def test_empty_analytics_before_any_participants(monkeypatch):
     repository = FakeAnalyticsRepository()
     service = LiveQuizSessionService(repository)
 
-    rows = await service.list_analytics("quiz-1", "creator-1")
+    rows = (await service.list_sessions_page("quiz-1", "creator-1"))["participants"]
     assert rows == []
 
 
@@ -269,7 +288,7 @@ async def test_answer_progress_updates_status_and_percent(monkeypatch):
         next_question_index=1,
     )
 
-    rows = await service.list_analytics("quiz-1", "creator-1")
+    rows = (await service.list_sessions_page("quiz-1", "creator-1"))["participants"]
     assert rows[0]["status"] == "in_progress"
     assert rows[0]["progress"] == 1
     assert rows[0]["current_question_number"] == 2
@@ -367,10 +386,10 @@ class FakeCreatorLiveQuizzesRepository:
     async def list_live_quizzes_by_creator(self, creator_user_id):
         return self.quizzes
 
-    async def list_quiz_sessions(self, quiz_id):
+    async def list_quiz_sessions(self, quiz_id, limit=500):
         return [
             session for session in self.sessions if session.get("quiz_id") == quiz_id
-        ]
+        ][:limit]
 
     async def get_quiz_by_id(self, quiz_id):
         return {
@@ -499,6 +518,9 @@ class FakeWebSocket:
     async def send_json(self, payload):
         self.sent_json.append(payload)
 
+    async def send_text(self, text):
+        self.sent_json.append(json.loads(text))
+
     async def receive_text(self):
         raise WebSocketDisconnect()
 
@@ -557,10 +579,10 @@ async def test_live_quiz_websocket_authenticates_with_first_message():
             return None
 
     class FakeLiveQuizService:
-        async def list_analytics(self, quiz_id, creator_id):
+        async def get_participants_snapshot(self, quiz_id, creator_id):
             assert quiz_id == "quiz-1"
             assert creator_id == str(user_id)
-            return []
+            return {"type": "participants_snapshot", "quiz_id": "quiz-1", "participants": []}
 
     websocket = FakeWebSocket({"type": "authenticate", "token": token})
 
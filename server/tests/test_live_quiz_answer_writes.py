@@ -0,0 +1,294 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from bson import ObjectId
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+import server.app.quiz.services.live_session_service as live_quiz_session_service
+from server.app.quiz.repositories.live_quiz_aggregate_repository import LiveQuizAggregateRepository
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.tests.legacy_live_quiz import LegacyAnswerRepository, LegacyAnswerService
+from server.tests.mongo_fake import FakeMongoCollection
+
+
+FIXED_NOW = datetime(2025, 6, 1, 10, 30, tzinfo=timezone.utc)
+QUESTIONS = [
+    {"question": f"Q{index}", "options": ["A", "B"], "answer": "A"}
+    for index in range(4)
+]
+
+
+class QuizStubRepository(LiveQuizSessionRepository):
+    async def get_quiz_by_id(self, quiz_id):
+        return {"_id": quiz_id, "questions": QUESTIONS}
+
+
+def _session_document(**overrides):
+    return {
+        "_id": ObjectId(),
+        "quiz_id": "quiz-1",
+        "participant_name": "Alice",
+        "participant_token_hash": live_quiz_session_service._hash_token("token-a"),
+        "started_at": FIXED_NOW,
+        "joined_at": FIXED_NOW,
+        "expires_at": FIXED_NOW + timedelta(minutes=10),
+        "submitted_at": None,
+        "status": "joined",
+        "current_question_index": 0,
+        "answers": [],
+        "score": None,
+        "total_questions": len(QUESTIONS),
+        "auto_submitted": False,
+        "created_at": FIXED_NOW,
+        "updated_at": FIXED_NOW,
+        **overrides,
+    }
+
+
+def _seed_session(sessions: FakeMongoCollection, **overrides) -> str:
+    document = _session_document(**overrides)
+    sessions.documents[document["_id"]] = document
+    return str(document["_id"])
+
+
+def _service(sessions: FakeMongoCollection, repository_class=QuizStubRepository, service_class=LiveQuizSessionService):
+    return service_class(repository_class(FakeMongoCollection(), sessions))
+
+
+@pytest.fixture
+def fixed_now(monkeypatch):
+    monkeypatch.setattr(live_quiz_session_service, "_utc_now", lambda: FIXED_NOW)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_answers_from_one_participant_are_all_kept(fixed_now):
+    sessions = FakeMongoCollection(latency=0.001)
+    session_id = _seed_session(sessions)
+    service = _service(sessions)
+
+    await asyncio.gather(
+        *(
+            service.save_answer(session_id, "token-a", index, "A", next_question_index=index)
+            for index in reversed(range(len(QUESTIONS)))
+        )
+    )
+
+    answers = sessions.documents[ObjectId(session_id)]["answers"]
+    assert [answer["question_index"] for answer in answers] == [0, 1, 2, 3]
+    assert sessions.operations == ["find_one_and_update"] * len(QUESTIONS)
+
+
+@pytest.mark.asyncio
+async def test_read_modify_write_oracle_loses_concurrent_answers(fixed_now):
+    sessions = FakeMongoCollection(latency=0.001)
+    session_id = _seed_session(sessions)
+    service = _service(sessions, LegacyAnswerRepository, LegacyAnswerService)
+
+    await asyncio.gather(
+        *(service.save_answer(session_id, "token-a", index, "A") for index in range(len(QUESTIONS)))
+    )
+
+    assert len(sessions.documents[ObjectId(session_id)]["answers"]) < len(QUESTIONS)
+
+
+@pytest.mark.asyncio
+async def test_answering_again_replaces_the_earlier_answer(fixed_now):
+    sessions = FakeMongoCollection()
+    session_id = _seed_session(sessions)
+    service = _service(sessions)
+
+    await service.save_answer(session_id, "token-a", 1, "A", next_question_index=2)
+    result = await service.save_answer(session_id, "token-a", 1, "B")
+
+    stored = sessions.documents[ObjectId(session_id)]
+    assert stored["answers"] == [{"question_index": 1, "selected_answer": "B", "answered_at": FIXED_NOW}]
+    assert stored["status"] == "active"
+    assert result["current_question_index"] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("token", "overrides", "question_index", "next_index", "status_code", "detail"),
+    [
+        ("token-b", {}, 0, 1, 403, "Invalid participant token"),
+        ("token-a", {"status": "submitted"}, 0, 1, 409, "Session is not active"),
+        ("token-a", {}, 4, None, 400, "Invalid question index"),
+        ("token-a", {}, -1, None, 400, "Invalid question index"),
+        ("token-a", {}, 0, 4, 400, "Invalid next question index"),
+    ],
+)
+async def test_refused_writes_report_why_and_leave_the_session_alone(
+    fixed_now, token, overrides, question_index, next_index, status_code, detail
+):
+    sessions = FakeMongoCollection()
+    session_id = _seed_session(sessions, **overrides)
+    before = dict(sessions.documents[ObjectId(session_id)])
+    service = _service(sessions)
+
+    with pytest.raises(HTTPException) as error:
+        await service.save_answer(session_id, token, question_index, "A", next_question_index=next_index)
+
+    assert (error.value.status_code, error.value.detail) == (status_code, detail)
+    assert sessions.documents[ObjectId(session_id)] == before
+
+
+@pytest.mark.asyncio
+async def test_unknown_session_is_not_found(fixed_now):
+    service = _service(FakeMongoCollection())
+
+    for session_id in (str(ObjectId()), "not-an-object-id"):
+        with pytest.raises(HTTPException) as error:
+            await service.save_answer(session_id, "token-a", 0, "A")
+        assert error.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_expired_session_is_finalized_instead_of_answered(fixed_now):
+    sessions = FakeMongoCollection()
+    session_id = _seed_session(
+        sessions,
+        expires_at=FIXED_NOW - timedelta(seconds=1),
+        answers=[{"question_index": 0, "selected_answer": "A", "answered_at": FIXED_NOW}],
+    )
+    service = _service(sessions)
+
+    with pytest.raises(HTTPException) as error:
+        await service.save_answer(session_id, "token-a", 1, "A")
+
+    assert (error.value.status_code, error.value.detail) == (409, "Session has expired")
+    stored = sessions.documents[ObjectId(session_id)]
+    assert stored["status"] == "submitted"
+    assert stored["auto_submitted"] is True
+    assert stored["score"] == 1
+    assert len(stored["answers"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_write_refused_by_a_race_is_retried_once(fixed_now):
+    class FlakyRepository(QuizStubRepository):
+        def __init__(self, *args):
+            super().__init__(*args)
+            self.attempts = 0
+
+        async def save_answer(self, *args, **kwargs):
+            self.attempts += 1
+            if self.attempts == 1:
+                return None
+            return await super().save_answer(*args, **kwargs)
+
+    sessions = FakeMongoCollection()
+    session_id = _seed_session(sessions)
+    repository = FlakyRepository(FakeMongoCollection(), sessions)
+    service = LiveQuizSessionService(repository)
+
+    result = await service.save_answer(session_id, "token-a", 0, "A", next_question_index=1)
+
+    assert repository.attempts == 2
+    assert result["current_question_index"] == 1
+    assert sessions.operations == ["find_one", "find_one_and_update"]
+
+
+@pytest_asyncio.fixture
+async def mongo_database():
+    """A scratch database on the server at MONGO_URI, dropped afterwards."""
+    client = AsyncIOMotorClient(
+        os.environ.get("MONGO_URI", "mongodb://localhost:27017"),
+        serverSelectionTimeoutMS=500,
+        tz_aware=True,
+    )
+    try:
+        await client.admin.command("ping")
+    except PyMongoError:
+        client.close()
+        pytest.skip("MongoDB is not reachable; the answer pipeline checks need a server")
+    database = client[f"live_answer_writes_{uuid.uuid4().hex[:8]}"]
+    try:
+        yield database
+    finally:
+        await client.drop_database(database.name)
+        client.close()
+
+
+@pytest.mark.asyncio
+async def test_answer_pipeline_on_mongodb(mongo_database):
+    sessions = mongo_database["live_quiz_sessions"]
+    document = _session_document()
+    await sessions.insert_one(document)
+    repository = LiveQuizSessionRepository(mongo_database["quizzes_v2"], sessions)
+    token_hash = document["participant_token_hash"]
+
+    async def save(question_index, selected_answer, next_question_index=None, **kwargs):
+        return await repository.save_answer(
+            str(document["_id"]),
+            question_index,
+            selected_answer,
+            next_question_index,
+            participant_token_hash=kwargs.get("token_hash", token_hash),
+            now=FIXED_NOW,
+        )
+
+    first = await save(2, "$price", 3)
+    assert first["previous_status"] == "joined"
+    assert (first["status"], first["current_question_index"]) == ("active", 3)
+
+    await save(0, "A")
+    updated = await save(2, "{'$gt': 1}")
+
+    # Answers stay sorted, the re-answered question is replaced, and
+    # operator-looking answers are stored as plain strings.
+    assert updated["answers"] == [
+        {"question_index": 0, "selected_answer": "A", "answered_at": FIXED_NOW},
+        {"question_index": 2, "selected_answer": "{'$gt': 1}", "answered_at": FIXED_NOW},
+    ]
+    assert updated["current_question_index"] == 3
+    assert updated["previous_status"] == "active"
+
+    assert await save(1, "A", token_hash="someone-else") is None
+    assert await save(4, "A") is None
+    assert await save(0, "A", 4) is None
+    assert (await sessions.find_one({"_id": document["_id"]}))["answers"] == updated["answers"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_answers_and_double_submits_on_mongodb(mongo_database, fixed_now):
+    sessions = mongo_database["live_quiz_sessions"]
+    document = _session_document()
+    await sessions.insert_one(document)
+    session_id = str(document["_id"])
+    service = LiveQuizSessionService(
+        QuizStubRepository(mongo_database["quizzes_v2"], sessions),
+        aggregates=LiveQuizAggregateRepository(mongo_database["live_quiz_aggregates"]),
+    )
+    await service.aggregates.ensure("quiz-1")
+
+    # A double-clicked answer and answers to every other question, all at once.
+    await asyncio.gather(
+        service.save_answer(session_id, "token-a", 0, "A", next_question_index=1),
+        service.save_answer(session_id, "token-a", 0, "B", next_question_index=1),
+        *(
+            service.save_answer(session_id, "token-a", index, "A", next_question_index=index)
+            for index in range(1, len(QUESTIONS))
+        ),
+    )
+    stored = await sessions.find_one({"_id": document["_id"]})
+    assert [answer["question_index"] for answer in stored["answers"]] == [0, 1, 2, 3]
+
+    submitted = await asyncio.gather(
+        service.submit_session(session_id, "token-a"),
+        service.submit_session(session_id, "token-a"),
+    )
+
+    expected_score = 3 + (stored["answers"][0]["selected_answer"] == "A")
+    assert [result["score"] for result in submitted] == [expected_score] * 2
+    aggregate = await service.aggregates.get("quiz-1")
+    # The racing submits finalize and count the session once.
+    assert aggregate["scored_count"] == 1
+    assert aggregate["score_histogram"] == {str(expected_score): 1}
+    assert len(aggregate["leaderboard"]) == 1
@@ -0,0 +1,303 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+from server.tests.redis_fake import FakeRedis
+
+from server.app.db.core.redis_lease import RedisLease
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.services.live_quiz_expiry_sweeper import LEASE_KEY, LiveQuizExpirySweeper
+from server.app.quiz.services.live_quiz_realtime import LiveQuizRealtimeBroadcaster
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.tests.live_quiz_cluster import LiveQuizCluster, RecordingWebSocket
+from server.tests.mongo_fake import FakeMongoCollection
+
+
+START = datetime(2025, 6, 1, 10, 0, tzinfo=timezone.utc)
+QUESTIONS = [
+    {"question": "Q1", "options": ["A", "B"], "answer": "A"},
+    {"question": "Q2", "options": ["A", "B"], "answer": "B"},
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = START
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class QuizStubRepository(LiveQuizSessionRepository):
+    def __init__(self, sessions: FakeMongoCollection, quiz_ids=("quiz-1",)):
+        super().__init__(FakeMongoCollection(), sessions)
+        self.quiz_ids = set(quiz_ids)
+
+    async def get_quiz_by_id(self, quiz_id):
+        if quiz_id not in self.quiz_ids:
+            return None
+        return {"_id": quiz_id, "title": "Quiz", "questions": QUESTIONS, "time_limit_minutes": 10}
+
+
+def _seed_session(
+    sessions: FakeMongoCollection,
+    expires_in: timedelta,
+    *,
+    quiz_id: str = "quiz-1",
+    status: str = "active",
+    answers=(),
+) -> ObjectId:
+    session_id = ObjectId()
+    sessions.documents[session_id] = {
+        "_id": session_id,
+        "quiz_id": quiz_id,
+        "participant_name": f"Participant {len(sessions.documents)}",
+        "participant_token_hash": "hash",
+        "started_at": START - timedelta(minutes=10),
+        "joined_at": START - timedelta(minutes=10),
+        "expires_at": START + expires_in,
+        "submitted_at": None,
+        "status": status,
+        "current_question_index": 0,
+        "answers": [
+            {"question_index": index, "selected_answer": answer, "answered_at": START}
+            for index, answer in answers
+        ],
+        "score": None,
+        "total_questions": len(QUESTIONS),
+        "auto_submitted": False,
+        "created_at": START - timedelta(minutes=10),
+        "updated_at": START - timedelta(minutes=10),
+    }
+    return session_id
+
+
+def _sweeper(sessions, clock, *, broadcaster=None, repository=None, **kwargs) -> LiveQuizExpirySweeper:
+    service = LiveQuizSessionService(
+        repository or QuizStubRepository(sessions),
+        broadcaster=broadcaster,
+    )
+    return LiveQuizExpirySweeper(service, clock=clock, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_sweep_closes_only_sessions_past_their_expiry():
+    sessions = FakeMongoCollection()
+    clock = FakeClock()
+    expired = _seed_session(sessions, timedelta(seconds=-1), answers=[(0, "A"), (1, "B")])
+    later = _seed_session(sessions, timedelta(minutes=5), answers=[(0, "B")])
+    finished = _seed_session(sessions, timedelta(seconds=-30), status="submitted")
+    broadcaster = LiveQuizRealtimeBroadcaster()
+    watcher = RecordingWebSocket()
+    await broadcaster.connect("quiz-1", watcher, accepted=True)
+    sweeper = _sweeper(sessions, clock, broadcaster=broadcaster)
+
+    assert await sweeper.sweep() == 1
+    closed = sessions.documents[expired]
+    assert (closed["status"], closed["auto_submitted"], closed["score"], closed["percentage"]) == (
+        "submitted",
+        True,
+        2,
+        100.0,
+    )
+    assert closed["submitted_at"] == START
+    assert closed["duration_used_seconds"] == 600
+    assert sessions.documents[later]["status"] == "active"
+    assert sessions.documents[finished]["auto_submitted"] is False
+
+    clock.now = START + timedelta(minutes=5)
+    assert await sweeper.sweep() == 1
+    assert sessions.documents[later]["score"] == 0
+    assert await sweeper.sweep() == 0
+
+    await LiveQuizCluster.wait_for([watcher], 2)
+    assert [event["type"] for event in watcher.sent] == ["participant_submitted"] * 2
+    assert [event["participant"]["session_id"] for event in watcher.sent] == [str(expired), str(later)]
+    assert watcher.sent[0]["participant"]["status"] == "timed_out"
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_sweep_drains_due_sessions_in_bulk_batches():
+    sessions = FakeMongoCollection()
+    for offset in range(5):
+        _seed_session(sessions, timedelta(seconds=-offset - 1))
+    sweeper = _sweeper(sessions, FakeClock(), batch_size=2)
+
+    assert await sweeper.sweep() == 5
+
+    # Each batch is one indexed read, one bulk write and one read-back.
+    assert sessions.operations == ["find", "bulk_write", "find"] * 3
+    assert sweeper.stats.as_dict() == {
+        "sweeps": 1,
+        "batches": 3,
+        "finalized": 5,
+        "lease_busy": 0,
+        "lease_lost": 0,
+        "failures": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_session_submitted_during_the_sweep_is_not_closed_again():
+    class RacingRepository(QuizStubRepository):
+        async def find_expired_sessions(self, now, limit):
+            due = await super().find_expired_sessions(now, limit)
+            # The participant's own submit lands between the read and the write.
+            raced = self.sessions_collection.documents[due[0]["_id"]]
+            raced.update(status="submitted", submitted_at=now - timedelta(seconds=1), score=1)
+            return due
+
+    sessions = FakeMongoCollection()
+    clock = FakeClock()
+    raced = _seed_session(sessions, timedelta(seconds=-2))
+    swept = _seed_session(sessions, timedelta(seconds=-1))
+    broadcaster = LiveQuizRealtimeBroadcaster()
+    watcher = RecordingWebSocket()
+    await broadcaster.connect("quiz-1", watcher, accepted=True)
+    sweeper = _sweeper(
+        sessions,
+        clock,
+        broadcaster=broadcaster,
+        repository=RacingRepository(sessions),
+    )
+
+    assert await sweeper.sweep() == 1
+
+    assert sessions.documents[raced]["score"] == 1
+    assert sessions.documents[raced]["auto_submitted"] is False
+    assert sessions.documents[swept]["auto_submitted"] is True
+    await LiveQuizCluster.wait_for([watcher], 1)
+    assert [event["participant"]["session_id"] for event in watcher.sent] == [str(swept)]
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_session_of_a_removed_quiz_is_closed_without_a_score():
+    sessions = FakeMongoCollection()
+    orphan = _seed_session(sessions, timedelta(seconds=-1), quiz_id="gone", answers=[(0, "A")])
+    sweeper = _sweeper(sessions, FakeClock())
+
+    assert await sweeper.sweep() == 1
+    assert sessions.documents[orphan]["status"] == "submitted"
+    assert sessions.documents[orphan]["score"] is None
+
+
+@pytest.mark.asyncio
+async def test_only_the_lease_holder_sweeps():
+    redis = FakeRedis()
+    sessions = FakeMongoCollection()
+    _seed_session(sessions, timedelta(seconds=-1))
+    first = _sweeper(sessions, FakeClock())
+    second = _sweeper(sessions, FakeClock())
+    first._redis = second._redis = redis
+
+    other_worker = RedisLease(redis, LEASE_KEY, ttl_seconds=60)
+    assert await other_worker.acquire()
+    assert await first.run_once() == 0
+    assert first.stats.lease_busy == 1
+
+    await other_worker.release()
+    assert await second.run_once() == 1
+    # The lease is released after each sweep.
+    assert await redis.get(LEASE_KEY) is None
+
+
+class SlowBatchRepository(QuizStubRepository):
+    """Lets ``during_batch`` run while each batch is in flight."""
+
+    def __init__(self, sessions, during_batch):
+        super().__init__(sessions)
+        self.during_batch = during_batch
+
+    async def find_expired_sessions(self, now, limit):
+        await self.during_batch()
+        return await super().find_expired_sessions(now, limit)
+
+
+@pytest.mark.asyncio
+async def test_lease_is_extended_between_batches():
+    seconds = [0.0]
+    redis = FakeRedis(clock=lambda: seconds[0])
+    sessions = FakeMongoCollection()
+    for offset in range(4):
+        _seed_session(sessions, timedelta(seconds=-offset - 1))
+    held = []
+
+    async def during_batch():
+        # Each batch takes most of the TTL; four of them outlast it.
+        held.append(await redis.get(LEASE_KEY) is not None)
+        seconds[0] += 40
+
+    sweeper = _sweeper(
+        sessions,
+        FakeClock(),
+        repository=SlowBatchRepository(sessions, during_batch),
+        batch_size=1,
+    )
+    sweeper._redis = redis
+
+    assert await sweeper.run_once() == 4
+    assert all(held)
+    assert sweeper.stats.lease_lost == 0
+
+
+@pytest.mark.asyncio
+async def test_sweep_stops_once_the_lease_lapses():
+    seconds = [0.0]
+    redis = FakeRedis(clock=lambda: seconds[0])
+    sessions = FakeMongoCollection()
+    for offset in range(4):
+        _seed_session(sessions, timedelta(seconds=-offset - 1))
+
+    async def during_batch():
+        # The batch outlives the TTL and another worker takes the lease.
+        seconds[0] += 61
+        await RedisLease(redis, LEASE_KEY, ttl_seconds=60).acquire()
+
+    sweeper = _sweeper(
+        sessions,
+        FakeClock(),
+        repository=SlowBatchRepository(sessions, during_batch),
+        batch_size=1,
+    )
+    sweeper._redis = redis
+
+    assert await sweeper.run_once() == 1
+    assert sweeper.stats.lease_lost == 1
+    # Releasing the lapsed lease leaves the other worker's key alone.
+    assert await redis.get(LEASE_KEY) is not None
+
+
+@pytest.mark.asyncio
+async def test_sweeps_without_the_lease_when_redis_is_down():
+    redis = FakeRedis()
+    redis.go_down()
+    sessions = FakeMongoCollection()
+    _seed_session(sessions, timedelta(seconds=-1))
+    sweeper = _sweeper(sessions, FakeClock())
+    sweeper._redis = redis
+
+    assert await sweeper.run_once() == 1
+
+
+@pytest.mark.asyncio
+async def test_background_loop_sweeps_until_stopped():
+    sessions = FakeMongoCollection()
+    expired = _seed_session(sessions, timedelta(seconds=-1))
+    sweeper = _sweeper(sessions, FakeClock(), interval_seconds=0.01)
+
+    await sweeper.start(FakeRedis())
+    async with asyncio.timeout(5):
+        while sweeper.stats.sweeps < 2:
+            await asyncio.sleep(0.005)
+    await sweeper.stop()
+
+    assert sessions.documents[expired]["status"] == "submitted"
+    assert sweeper._task is None
+
+    disabled = _sweeper(sessions, FakeClock(), interval_seconds=0)
+    await disabled.start(FakeRedis())
+    assert disabled._task is None
@@ -0,0 +1,218 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+import server.app.quiz.services.live_session_service as live_quiz_session_service
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.services.live_quiz_realtime import LiveQuizRealtimeBroadcaster
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.tests.live_quiz_cluster import LiveQuizCluster, RecordingWebSocket
+from server.tests.mongo_fake import FakeMongoCollection
+
+
+FIXED_NOW = datetime(2025, 6, 1, 10, 30, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _seed_session(sessions: FakeMongoCollection, name: str, token: str) -> str:
+    document = {
+        "quiz_id": "quiz-1",
+        "participant_name": name,
+        "participant_email": f"{name.lower()}@example.com",
+        "participant_token_hash": live_quiz_session_service._hash_token(token),
+        "started_at": FIXED_NOW,
+        "joined_at": FIXED_NOW,
+        "expires_at": FIXED_NOW + timedelta(minutes=10),
+        "submitted_at": None,
+        "status": "joined",
+        "current_question_index": 0,
+        "answers": [],
+        "score": None,
+        "total_questions": 4,
+        "auto_submitted": False,
+        "created_at": FIXED_NOW,
+        "updated_at": FIXED_NOW,
+    }
+    session_id = ObjectId()
+    sessions.documents[session_id] = {**document, "_id": session_id}
+    return str(session_id)
+
+
+class QuizStubRepository(LiveQuizSessionRepository):
+    def __init__(self, sessions: FakeMongoCollection):
+        super().__init__(FakeMongoCollection(), sessions)
+
+    async def get_quiz_by_id(self, quiz_id):
+        questions = [{"question": f"Q{index}", "options": ["A", "B"], "answer": "A"} for index in range(4)]
+        return {"_id": quiz_id, "title": "Quiz", "questions": questions, "time_limit_minutes": 10}
+
+
+async def _watch(broadcaster: LiveQuizRealtimeBroadcaster) -> RecordingWebSocket:
+    watcher = RecordingWebSocket()
+    await broadcaster.connect("quiz-1", watcher, accepted=True)
+    return watcher
+
+
+@pytest.fixture
+def fixed_now(monkeypatch):
+    monkeypatch.setattr(live_quiz_session_service, "_utc_now", lambda: FIXED_NOW)
+
+
+@pytest.mark.asyncio
+async def test_save_answer_publishes_progress_delta_without_rereading_the_session(fixed_now):
+    sessions = FakeMongoCollection()
+    session_id = _seed_session(sessions, "Alice", "token-a")
+    broadcaster = LiveQuizRealtimeBroadcaster()
+    service = LiveQuizSessionService(
+        LiveQuizSessionRepository(FakeMongoCollection(), sessions),
+        broadcaster=broadcaster,
+    )
+    watcher = await _watch(broadcaster)
+
+    await service.save_answer(session_id, "token-a", 0, "A", next_question_index=1)
+    await LiveQuizCluster.wait_for([watcher], 1)
+
+    # The write returns the document the event is built from.
+    assert sessions.operations == ["find_one_and_update"]
+    event = watcher.sent[0]
+    assert event["type"] == "participant_progress"
+    assert event["participant"] == {
+        "session_id": session_id,
+        "progress": 1,
+        "current_question_number": 2,
+        "progress_percentage": 25.0,
+        "status": "in_progress",
+        "updated_at": event["participant"]["updated_at"],
+    }
+    stored = sessions.documents[ObjectId(session_id)]
+    assert event["participant"]["updated_at"] == stored["updated_at"].isoformat()
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_progress_delta_matches_the_full_analytics_row(fixed_now):
+    sessions = FakeMongoCollection()
+    session_id = _seed_session(sessions, "Alice", "token-a")
+    service = LiveQuizSessionService(LiveQuizSessionRepository(FakeMongoCollection(), sessions))
+
+    await service.save_answer(session_id, "token-a", 0, "A", next_question_index=1)
+    await service.save_answer(session_id, "token-a", 1, "B", next_question_index=3)
+
+    session = sessions.documents[ObjectId(session_id)]
+    row = service._analytics_row(session)
+    delta = service._progress_delta(session)
+    assert delta.items() <= row.items()
+
+
+@pytest.mark.asyncio
+async def test_join_and_submit_events_carry_the_written_document(fixed_now):
+    class JoinRepository:
+        def __init__(self):
+            self.quiz = {
+                "_id": "quiz-1",
+                "live_quiz_enabled": True,
+                "time_limit_minutes": 10,
+                "access_code_expires_at": FIXED_NOW + timedelta(days=1),
+                "questions": [{"question": "Q1", "options": ["A", "B"], "answer": "A"}],
+            }
+            self.session = None
+            self.reads = 0
+
+        async def get_quiz_by_access_code(self, access_code):
+            return self.quiz
+
+        async def get_quiz_by_id(self, quiz_id):
+            return self.quiz
+
+        async def create_session(self, session_data):
+            self.session = {**session_data, "_id": "session-1"}
+            return "session-1"
+
+        async def get_session(self, session_id):
+            self.reads += 1
+            return self.session
+
+        async def transition_session(self, session_id, from_statuses, updates):
+            if self.session["status"] not in from_statuses:
+                return None
+            self.session = {**self.session, **updates, "previous_status": self.session["status"]}
+            return self.session
+
+    repository = JoinRepository()
+    broadcaster = LiveQuizRealtimeBroadcaster()
+    service = LiveQuizSessionService(repository, broadcaster=broadcaster)
+    watcher = await _watch(broadcaster)
+
+    started = await service.start_session("ABC123", "Bob", "bob@example.com")
+    assert repository.reads == 0
+    await service.submit_session(started["session_id"], started["participant_token"])
+    await LiveQuizCluster.wait_for([watcher], 2)
+
+    # The submit path reads once, to authorize the participant.
+    assert repository.reads == 1
+    joined, submitted = watcher.sent
+    assert joined["type"] == "participant_joined"
+    assert joined["participant"]["participant_name"] == "Bob"
+    assert joined["participant"]["status"] == "joined"
+    assert submitted["type"] == "participant_submitted"
+    assert submitted["participant"]["status"] == "submitted"
+    assert submitted["participant"]["score"] == 0
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_snapshot_follows_progress_once_the_interval_elapses(fixed_now):
+    sessions = FakeMongoCollection()
+    alice = _seed_session(sessions, "Alice", "token-a")
+    bob = _seed_session(sessions, "Bob", "token-b")
+    clock = FakeClock()
+    broadcaster = LiveQuizRealtimeBroadcaster(snapshot_interval_seconds=30, clock=clock)
+    service = LiveQuizSessionService(QuizStubRepository(sessions), broadcaster=broadcaster)
+    watcher = await _watch(broadcaster)
+
+    await service.save_answer(alice, "token-a", 0, "A", next_question_index=1)
+    clock.now += 10
+    await service.save_answer(bob, "token-b", 0, "A", next_question_index=1)
+    clock.now += 25
+    await service.save_answer(alice, "token-a", 1, "B", next_question_index=2)
+    await LiveQuizCluster.wait_for([watcher], 4)
+
+    assert [event["type"] for event in watcher.sent] == [
+        "participant_progress",
+        "participant_progress",
+        "participant_progress",
+        "participants_snapshot",
+    ]
+    snapshot = watcher.sent[-1]
+    assert {row["participant_name"]: row["progress"] for row in snapshot["participants"]} == {"Alice": 2, "Bob": 1}
+    assert (snapshot["participant_count"], snapshot["status_counts"]["in_progress"]) == (2, 2)
+    assert snapshot["next_cursor"] is None
+    # One page of rows; without a stored summary, one pass over the sessions rebuilds it.
+    assert sessions.operations.count("find") == 2
+    await broadcaster.stop()
+
+
+def test_claim_snapshot_starts_each_quiz_clock_on_first_use():
+    clock = FakeClock()
+    broadcaster = LiveQuizRealtimeBroadcaster(snapshot_interval_seconds=30, clock=clock)
+
+    assert broadcaster.claim_snapshot("quiz-1") is False
+    clock.now += 29
+    assert broadcaster.claim_snapshot("quiz-1") is False
+    assert broadcaster.claim_snapshot("quiz-2") is False
+    clock.now += 1
+    assert broadcaster.claim_snapshot("quiz-1") is True
+    assert broadcaster.claim_snapshot("quiz-1") is False
+
+    # A quiz quiet for two intervals is forgotten and starts over.
+    clock.now += 60
+    assert broadcaster.claim_snapshot("quiz-2") is False
+    assert list(broadcaster._snapshot_clock) == ["quiz-2"]
@@ -0,0 +1,306 @@
+import asyncio
+
+import pytest
+
+from server.app.quiz.services.live_quiz_realtime import (
+    RESYNC_CLOSE_CODE,
+    SLOW_CONSUMER_CLOSE_CODE,
+    LiveQuizRealtimeBroadcaster,
+)
+from server.tests.live_quiz_cluster import LiveQuizCluster, RecordingWebSocket
+
+
+def _event(index: int, session_id: str | None = None) -> dict:
+    participant = {"answered": index}
+    if session_id is not None:
+        participant["session_id"] = session_id
+    return {"type": "participant_progress", "quiz_id": "quiz-1", "participant": participant}
+
+
+def _answered(socket: RecordingWebSocket) -> list[int]:
+    return [event["participant"]["answered"] for event in socket.sent]
+
+
+async def _until(predicate, timeout: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not predicate():
+        assert loop.time() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.005)
+
+
+class BrokenWebSocket(RecordingWebSocket):
+    async def send_text(self, text):
+        raise RuntimeError("socket closed")
+
+
+@pytest.mark.asyncio
+async def test_without_redis_publish_reaches_local_sockets_and_drops_stale_ones():
+    broadcaster = LiveQuizRealtimeBroadcaster()
+    healthy, broken = RecordingWebSocket(), BrokenWebSocket()
+    await broadcaster.connect("quiz-1", healthy, accepted=True)
+    await broadcaster.connect("quiz-1", broken, accepted=True)
+
+    await broadcaster.publish("quiz-1", _event(1))
+    await broadcaster.publish("quiz-1", _event(2))
+    await LiveQuizCluster.wait_for([healthy], 2)
+    await _until(lambda: broadcaster.connection_count("quiz-1") == 1)
+
+    assert _answered(healthy) == [1, 2]
+    assert set(broadcaster._connections["quiz-1"]) == {healthy}
+    assert broadcaster.metrics.send_failures == 1
+
+
+@pytest.mark.asyncio
+async def test_events_published_on_one_worker_reach_watchers_on_every_worker():
+    async with LiveQuizCluster(3) as cluster:
+        watchers = await cluster.connect_watchers("quiz-1", 6)
+        other_quiz = await cluster.connect_watchers("quiz-2", 3)
+
+        for index in range(1, 21):
+            await cluster.workers[index % 3].publish("quiz-1", _event(index))
+        await cluster.wait_for(watchers, 20)
+
+    assert all(_answered(socket) == list(range(1, 21)) for socket in watchers)
+    assert all(socket.sent == [] for socket in other_quiz)
+    assert sum(worker.metrics.published for worker in cluster.workers) == 20
+    assert all(worker.metrics.duplicates == 0 for worker in cluster.workers)
+
+
+@pytest.mark.asyncio
+async def test_workers_without_sockets_for_a_quiz_ignore_its_events():
+    async with LiveQuizCluster(2) as cluster:
+        watcher = RecordingWebSocket()
+        await cluster.workers[0].connect("quiz-1", watcher, accepted=True)
+
+        await cluster.workers[1].publish("quiz-1", _event(1))
+        await cluster.wait_for([watcher], 1)
+
+    assert cluster.workers[0].metrics.received == 1
+    assert cluster.workers[1].metrics.received == 0
+
+
+@pytest.mark.asyncio
+async def test_late_watchers_start_from_the_current_position():
+    async with LiveQuizCluster(2) as cluster:
+        early = await cluster.connect_watchers("quiz-1", 2)
+        await cluster.workers[0].publish("quiz-1", _event(1))
+        await cluster.wait_for(early, 1)
+
+        late = await cluster.connect_watchers("quiz-1", 2)
+        await cluster.workers[1].publish("quiz-1", _event(2))
+        await cluster.wait_for(early + late, 1)
+        await cluster.wait_for(early, 2)
+
+    assert all(_answered(socket) == [1, 2] for socket in early)
+    assert all(_answered(socket) == [2] for socket in late)
+
+
+@pytest.mark.asyncio
+async def test_events_missed_while_the_subscriber_reconnects_are_replayed_in_order():
+    async with LiveQuizCluster(2) as cluster:
+        watchers = await cluster.connect_watchers("quiz-1", 4)
+        await cluster.workers[0].publish("quiz-1", _event(1))
+        await cluster.wait_for(watchers, 1)
+
+        cluster.redis.drop_subscribers()
+        for index in range(2, 6):
+            await cluster.workers[index % 2].publish("quiz-1", _event(index))
+        await cluster.wait_until_subscribed()
+        await cluster.workers[0].publish("quiz-1", _event(6))
+        await cluster.wait_for(watchers, 6)
+
+    assert all(_answered(socket) == [1, 2, 3, 4, 5, 6] for socket in watchers)
+    assert all(worker.metrics.reconnects == 1 for worker in cluster.workers)
+    assert sum(worker.metrics.replayed for worker in cluster.workers) >= 2
+
+
+@pytest.mark.asyncio
+async def test_trimmed_backlog_closes_sockets_so_dashboards_resync():
+    async with LiveQuizCluster(1, backlog_size=3) as cluster:
+        watchers = await cluster.connect_watchers("quiz-1", 2)
+        await cluster.workers[0].publish("quiz-1", _event(1))
+        await cluster.wait_for(watchers, 1)
+
+        cluster.redis.drop_subscribers()
+        for index in range(2, 8):
+            await cluster.workers[0].publish("quiz-1", _event(index))
+        await _until(lambda: all(socket.closed_with is not None for socket in watchers))
+
+    assert all(socket.closed_with == RESYNC_CLOSE_CODE for socket in watchers)
+    assert all(_answered(socket) == [1] for socket in watchers)
+    assert cluster.workers[0].metrics.resyncs == 1
+    assert "quiz-1" not in cluster.workers[0]._connections
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_falls_back_to_local_delivery_and_recovers():
+    async with LiveQuizCluster(2) as cluster:
+        local, remote = RecordingWebSocket("local"), RecordingWebSocket("remote")
+        await cluster.workers[0].connect("quiz-1", local, accepted=True)
+        await cluster.workers[1].connect("quiz-1", remote, accepted=True)
+
+        cluster.redis.go_down()
+        await cluster.workers[0].publish("quiz-1", _event(1))
+        await cluster.wait_for([local], 1)
+        assert remote.sent == []
+
+        cluster.redis.come_back()
+        await cluster.wait_until_subscribed()
+        await cluster.workers[0].publish("quiz-1", _event(2))
+        await cluster.wait_for([local, remote], 1)
+        await cluster.wait_for([local], 2)
+
+    assert _answered(local) == [1, 2]
+    assert _answered(remote) == [2]
+    assert cluster.workers[0].metrics.publish_errors == 1
+
+
+@pytest.mark.asyncio
+async def test_initial_event_is_sent_before_broadcasts():
+    broadcaster = LiveQuizRealtimeBroadcaster()
+    watcher = RecordingWebSocket(delay=0.01)
+    snapshot = {"type": "participants_snapshot", "quiz_id": "quiz-1", "participants": []}
+
+    connecting = asyncio.create_task(
+        broadcaster.connect("quiz-1", watcher, accepted=True, initial_event=snapshot)
+    )
+    await asyncio.sleep(0)
+    await broadcaster.publish("quiz-1", _event(1))
+    await connecting
+    await LiveQuizCluster.wait_for([watcher], 2)
+
+    assert watcher.sent[0] == snapshot
+    assert watcher.sent[1]["participant"] == {"answered": 1}
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_slow_socket_does_not_delay_other_watchers():
+    broadcaster = LiveQuizRealtimeBroadcaster(send_queue_size=100)
+    fast = RecordingWebSocket("fast")
+    slow = RecordingWebSocket("slow", delay=0.05)
+    await broadcaster.connect("quiz-1", slow, accepted=True)
+    await broadcaster.connect("quiz-1", fast, accepted=True)
+
+    for index in range(1, 11):
+        await broadcaster.publish("quiz-1", _event(index))
+    await LiveQuizCluster.wait_for([fast], 10, timeout=0.3)
+
+    assert _answered(fast) == list(range(1, 11))
+    assert len(slow.sent) < 10
+    assert broadcaster.metrics.max_queue_depth >= 9
+
+    await LiveQuizCluster.wait_for([slow], 10)
+    await _until(lambda: broadcaster.metrics.sent == 20)
+    assert _answered(slow) == list(range(1, 11))
+    assert broadcaster.queue_depth == 0
+    assert broadcaster.metrics.sent == 20
+    assert broadcaster.metrics.max_send_seconds >= 0.05
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_policy_keeps_latest_event_per_participant():
+    broadcaster = LiveQuizRealtimeBroadcaster(send_queue_size=2, slow_consumer_policy="coalesce")
+    slow = RecordingWebSocket(delay=0.05)
+    await broadcaster.connect("quiz-1", slow, accepted=True)
+
+    await broadcaster.publish("quiz-1", _event(1, "a"))
+    await asyncio.sleep(0.01)  # the writer is now busy sending the first event
+    await broadcaster.publish("quiz-1", _event(2, "a"))
+    await broadcaster.publish("quiz-1", _event(3, "b"))
+    await broadcaster.publish("quiz-1", _event(4, "a"))
+    await LiveQuizCluster.wait_for([slow], 3)
+
+    assert _answered(slow) == [1, 3, 4]
+    assert slow.closed_with is None
+    assert broadcaster.metrics.coalesced == 1
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_policy_disconnects_when_nothing_can_be_replaced():
+    broadcaster = LiveQuizRealtimeBroadcaster(send_queue_size=2, slow_consumer_policy="coalesce")
+    slow, fast = RecordingWebSocket("slow", delay=0.05), RecordingWebSocket("fast")
+    await broadcaster.connect("quiz-1", slow, accepted=True)
+    await broadcaster.connect("quiz-1", fast, accepted=True)
+
+    await broadcaster.publish("quiz-1", _event(1, "a"))
+    await asyncio.sleep(0.01)
+    for index, session_id in ((2, "b"), (3, "c"), (4, "d")):
+        await broadcaster.publish("quiz-1", _event(index, session_id))
+        await asyncio.sleep(0)  # lets the fast writer keep its queue empty
+    await _until(lambda: slow.closed_with is not None)
+    await LiveQuizCluster.wait_for([fast], 4)
+
+    assert slow.closed_with == SLOW_CONSUMER_CLOSE_CODE
+    assert set(broadcaster._connections["quiz-1"]) == {fast}
+    assert broadcaster.metrics.slow_consumers_disconnected == 1
+    assert broadcaster.metrics.dropped == 2
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy_keeps_the_socket_and_newest_events():
+    broadcaster = LiveQuizRealtimeBroadcaster(send_queue_size=2, slow_consumer_policy="drop_oldest")
+    slow = RecordingWebSocket(delay=0.05)
+    await broadcaster.connect("quiz-1", slow, accepted=True)
+
+    await broadcaster.publish("quiz-1", _event(1))
+    await asyncio.sleep(0.01)
+    for index in range(2, 7):
+        await broadcaster.publish("quiz-1", _event(index))
+    await LiveQuizCluster.wait_for([slow], 3)
+
+    assert _answered(slow) == [1, 5, 6]
+    assert slow.closed_with is None
+    assert broadcaster.metrics.dropped == 3
+    await broadcaster.stop()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_policy_closes_a_full_socket():
+    broadcaster = LiveQuizRealtimeBroadcaster(send_queue_size=1, slow_consumer_policy="disconnect")
+    slow = RecordingWebSocket(delay=0.05)
+    await broadcaster.connect("quiz-1", slow, accepted=True)
+
+    await broadcaster.publish("quiz-1", _event(1, "a"))
+    await asyncio.sleep(0.01)
+    await broadcaster.publish("quiz-1", _event(2, "a"))
+    await broadcaster.publish("quiz-1", _event(3, "a"))
+    await _until(lambda: slow.closed_with is not None)
+
+    assert slow.closed_with == SLOW_CONSUMER_CLOSE_CODE
+    assert broadcaster.connection_count("quiz-1") == 0
+    assert broadcaster.metrics.coalesced == 0
+
+
+@pytest.mark.asyncio
+async def test_send_timeout_disconnects_a_stalled_socket():
+    broadcaster = LiveQuizRealtimeBroadcaster(send_timeout_seconds=0.02)
+    stalled = RecordingWebSocket(delay=1.0)
+    await broadcaster.connect("quiz-1", stalled, accepted=True)
+
+    await broadcaster.publish("quiz-1", _event(1))
+    await _until(lambda: stalled.closed_with is not None)
+
+    assert stalled.closed_with == SLOW_CONSUMER_CLOSE_CODE
+    assert stalled.sent == []
+    assert broadcaster.metrics.send_failures == 1
+    assert broadcaster.metrics.slow_consumers_disconnected == 1
+
+
+@pytest.mark.asyncio
+async def test_events_are_encoded_once_and_coalesce_keys_survive_replay():
+    async with LiveQuizCluster(1) as cluster:
+        watchers = await cluster.connect_watchers("quiz-1", 3)
+        await cluster.workers[0].publish("quiz-1", _event(1, "a"))
+        await cluster.wait_for(watchers, 1)
+
+    entries = await cluster.redis.xrange("live-quiz:{quiz-1}:backlog", min="-", max="+")
+    assert [fields["key"] for _, fields in entries] == ["a"]
+    assert entries[0][1]["event"] == (
+        '{"type":"participant_progress","quiz_id":"quiz-1",'
+        '"participant":{"answered":1,"session_id":"a"}}'
+    )
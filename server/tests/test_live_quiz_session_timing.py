@@ -39,8 +39,10 @@ class FakeLiveQuizRepository:
     async def get_quiz_by_id(self, quiz_id):
         return self.quiz
 
-    async def update_session(self, session_id, updates):
-        self.session = {**self.session, **updates}
+    async def transition_session(self, session_id, from_statuses, updates):
+        if self.session["status"] not in from_statuses:
+            return None
+        self.session = {**self.session, **updates, "previous_status": self.session["status"]}
         return self.session
 
 
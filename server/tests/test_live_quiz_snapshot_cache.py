@@ -0,0 +1,347 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+
+import server.app.quiz.services.live_session_service as live_quiz_session_service
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.repositories.v2.models.quiz_models import (
+    QuizDocumentV2,
+    QuizMetadataUpdateV2,
+    QuizQuestionsUpdateV2,
+)
+from server.app.quiz.repositories.v2.repositories.quiz_repository import QuizV2Repository
+from server.app.quiz.services.canonical_quiz_service import CanonicalQuizWriteService
+from server.app.quiz.services.live_quiz_snapshot_cache import (
+    LiveQuizSnapshotCache,
+    build_live_quiz_snapshot,
+    live_quiz_snapshot_cache,
+)
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.tests.mongo_fake import FakeMongoCollection
+
+
+FIXED_NOW = datetime(2025, 6, 1, 10, 30, tzinfo=timezone.utc)
+QUIZ_ID = str(ObjectId())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _quiz(version: datetime = FIXED_NOW, **overrides):
+    return {
+        "_id": QUIZ_ID,
+        "title": "Capitals",
+        "quiz_type": "multichoice",
+        "time_limit_minutes": 10,
+        "updated_at": version,
+        "questions": [
+            {"question": "Capital of France?", "options": ["Paris", "Rome"], "answer": "Paris"},
+            {
+                "question": "Capital of Italy?",
+                "options": ["Paris", "Rome"],
+                "correct_answer": "Rome",
+                "question_type": "true-false",
+            },
+        ],
+        **overrides,
+    }
+
+
+class CountingRepository(LiveQuizSessionRepository):
+    def __init__(self, sessions: FakeMongoCollection, quiz=None):
+        super().__init__(FakeMongoCollection(), sessions)
+        self.quiz = quiz or _quiz()
+        self.quiz_reads = 0
+
+    async def get_quiz_by_id(self, quiz_id):
+        self.quiz_reads += 1
+        await asyncio.sleep(0)
+        return dict(self.quiz) if quiz_id == QUIZ_ID else None
+
+
+def _seed_session(sessions: FakeMongoCollection, **overrides) -> str:
+    session_id = ObjectId()
+    sessions.documents[session_id] = {
+        "_id": session_id,
+        "quiz_id": QUIZ_ID,
+        "participant_name": "Alice",
+        "participant_token_hash": live_quiz_session_service._hash_token("token-a"),
+        "started_at": FIXED_NOW,
+        "joined_at": FIXED_NOW,
+        "expires_at": FIXED_NOW + timedelta(minutes=10),
+        "submitted_at": None,
+        "status": "joined",
+        "current_question_index": 1,
+        "answers": [{"question_index": 1, "selected_answer": "Rome", "answered_at": FIXED_NOW}],
+        "score": None,
+        "total_questions": 2,
+        "auto_submitted": False,
+        "created_at": FIXED_NOW,
+        "updated_at": FIXED_NOW,
+        **overrides,
+    }
+    return str(session_id)
+
+
+@pytest.fixture
+def fixed_now(monkeypatch):
+    monkeypatch.setattr(live_quiz_session_service, "_utc_now", lambda: FIXED_NOW)
+
+
+@pytest.mark.asyncio
+async def test_session_state_polls_read_the_quiz_once(fixed_now):
+    sessions = FakeMongoCollection()
+    session_id = _seed_session(sessions)
+    repository = CountingRepository(sessions)
+    cache = LiveQuizSnapshotCache()
+    service = LiveQuizSessionService(repository, snapshot_cache=cache)
+
+    states = [await service.get_session_state(session_id, "token-a") for _ in range(5)]
+
+    assert repository.quiz_reads == 1
+    assert cache.stats.as_dict()["hits"] == 4
+    assert states[0] == states[-1]
+    assert states[0]["title"] == "Capitals"
+    assert states[0]["question"] == {
+        "question_index": 1,
+        "question": "Capital of Italy?",
+        "options": ["Paris", "Rome"],
+        "question_type": "true-false",
+        "selected_answer": "Rome",
+    }
+
+
+@pytest.mark.asyncio
+async def test_cached_and_uncached_services_grade_the_same(fixed_now):
+    results = []
+    for cache in (None, LiveQuizSnapshotCache()):
+        sessions = FakeMongoCollection()
+        session_id = _seed_session(sessions)
+        service = LiveQuizSessionService(CountingRepository(sessions), snapshot_cache=cache)
+        await service.get_session_state(session_id, "token-a")
+        results.append(await service.submit_session(session_id, "token-a"))
+
+    assert results[0] == results[1]
+    assert (results[0]["score"], results[0]["percentage"]) == (1, 50.0)
+
+
+def test_snapshot_precomputes_public_questions_and_answer_key():
+    snapshot = build_live_quiz_snapshot(_quiz())
+
+    assert snapshot.version == FIXED_NOW
+    assert [question["question_type"] for question in snapshot.public_questions] == [
+        "multichoice",
+        "true-false",
+    ]
+    assert all("answer" not in question for question in snapshot.public_questions)
+    assert [entry["correct_answer"] for entry in snapshot.answer_key] == ["Paris", "Rome"]
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = LiveQuizSnapshotCache(ttl_seconds=30, clock=clock)
+    repository = CountingRepository(FakeMongoCollection())
+
+    def load():
+        return repository.get_quiz_by_id(QUIZ_ID)
+
+    await cache.get_or_load(QUIZ_ID, load)
+    clock.now += 29
+    await cache.get_or_load(QUIZ_ID, load)
+    assert repository.quiz_reads == 1
+
+    clock.now += 1
+    await cache.get_or_load(QUIZ_ID, load)
+    assert repository.quiz_reads == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load_and_missing_quizzes_are_not_cached():
+    cache = LiveQuizSnapshotCache()
+    repository = CountingRepository(FakeMongoCollection())
+
+    snapshots = await asyncio.gather(
+        *(cache.get_or_load(QUIZ_ID, lambda: repository.get_quiz_by_id(QUIZ_ID)) for _ in range(20))
+    )
+
+    assert repository.quiz_reads == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert cache.stats.shared_loads == 19
+
+    missing = str(ObjectId())
+    for _ in range(2):
+        assert await cache.get_or_load(missing, lambda: repository.get_quiz_by_id(missing)) is None
+    assert repository.quiz_reads == 3
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_load_that_overlaps_an_invalidation_is_not_stored():
+    cache = LiveQuizSnapshotCache()
+    release = asyncio.Event()
+
+    async def slow_load():
+        await release.wait()
+        return _quiz()
+
+    pending = asyncio.create_task(cache.get_or_load(QUIZ_ID, slow_load))
+    await asyncio.sleep(0)
+    cache.invalidate(QUIZ_ID)
+    release.set()
+
+    assert (await pending).quiz["title"] == "Capitals"
+    assert len(cache) == 0
+    assert cache.stats.discarded_loads == 1
+
+
+@pytest.mark.asyncio
+async def test_an_older_version_never_replaces_a_newer_one():
+    clock = FakeClock()
+    cache = LiveQuizSnapshotCache(ttl_seconds=30, clock=clock)
+    newer = FIXED_NOW + timedelta(minutes=1)
+
+    async def load_newer():
+        return _quiz(version=newer, title="Edited")
+
+    async def load_older():
+        return _quiz(title="Stale")
+
+    await cache.get_or_load(QUIZ_ID, load_newer)
+    cache._remember(QUIZ_ID, build_live_quiz_snapshot(await load_older()))
+
+    snapshot = await cache.get_or_load(QUIZ_ID, load_older)
+    assert (snapshot.version, snapshot.quiz["title"]) == (newer, "Edited")
+
+
+@pytest.mark.asyncio
+async def test_invalidating_one_quiz_keeps_other_loads():
+    cache = LiveQuizSnapshotCache()
+    other_id = str(ObjectId())
+    release = asyncio.Event()
+
+    async def slow_load():
+        await release.wait()
+        return _quiz(_id=other_id)
+
+    pending = asyncio.create_task(cache.get_or_load(other_id, slow_load))
+    await asyncio.sleep(0)
+    cache.invalidate(QUIZ_ID)
+    release.set()
+    await pending
+
+    assert cache._lookup(other_id) is not None
+    assert cache.stats.discarded_loads == 0
+
+
+async def _stored_quiz(service: CanonicalQuizWriteService) -> QuizDocumentV2:
+    quiz = service.build_quiz_document(
+        title="Capitals",
+        quiz_type="multichoice",
+        questions=[{"question": "Capital of France?", "options": ["Paris", "Rome"], "answer": "Paris"}],
+        legacy_source_collection="quizzes",
+        legacy_quiz_id="legacy-1",
+    )
+    return await service.repository.insert_quiz(quiz)
+
+
+async def _cached(cache: LiveQuizSnapshotCache, quiz: QuizDocumentV2) -> None:
+    async def load():
+        return quiz.model_dump(by_alias=True)
+
+    await cache.get_or_load(str(quiz.id), load)
+    assert cache._lookup(str(quiz.id)) is not None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda service, quiz: service.update_quiz_questions_v2(
+            str(quiz.id),
+            QuizQuestionsUpdateV2(questions=[{"question": "Q", "correct_answer": "A"}]),
+        ),
+        lambda service, quiz: service.update_quiz_metadata_v2(str(quiz.id), QuizMetadataUpdateV2(title="New")),
+        lambda service, quiz: service.upsert_quiz_v2_by_legacy_mapping(quiz.model_copy(update={"title": "New"})),
+        lambda service, quiz: service.upsert_quiz_v2_by_legacy_mapping_with_status(
+            quiz.model_copy(update={"title": "New"})
+        ),
+        lambda service, quiz: service.soft_delete_quiz_v2(str(quiz.id)),
+        lambda service, quiz: service.soft_delete_quiz_v2_by_legacy_mapping("quizzes", "legacy-1"),
+    ],
+    ids=[
+        "update_questions",
+        "update_metadata",
+        "upsert_by_legacy_mapping",
+        "upsert_by_legacy_mapping_with_status",
+        "soft_delete",
+        "soft_delete_by_legacy_mapping",
+    ],
+)
+async def test_quiz_writes_invalidate_the_snapshot_cache(write):
+    cache = LiveQuizSnapshotCache()
+    service = CanonicalQuizWriteService(QuizV2Repository(FakeMongoCollection()), snapshot_cache=cache)
+    quiz = await _stored_quiz(service)
+    await _cached(cache, quiz)
+
+    await write(service, quiz)
+
+    assert cache._lookup(str(quiz.id)) is None
+
+
+@pytest.mark.asyncio
+async def test_unchanged_legacy_upsert_keeps_the_cached_snapshot():
+    cache = LiveQuizSnapshotCache()
+    service = CanonicalQuizWriteService(QuizV2Repository(FakeMongoCollection()), snapshot_cache=cache)
+    quiz = await _stored_quiz(service)
+    await _cached(cache, quiz)
+
+    _, status = await service.upsert_quiz_v2_by_legacy_mapping_with_status(quiz)
+
+    assert status == "unchanged"
+    assert cache._lookup(str(quiz.id)) is not None
+
+
+class EnablingRepository:
+    def __init__(self):
+        self.quiz = _quiz(owner_user_id="creator-1")
+
+    async def get_quiz_by_id(self, quiz_id):
+        return self.quiz
+
+    async def access_code_exists(self, access_code):
+        return False
+
+    async def enable_live_quiz(self, **kwargs):
+        self.quiz = {
+            **self.quiz,
+            "live_quiz_enabled": True,
+            "access_code": kwargs["access_code"],
+            "access_code_expires_at": kwargs["access_code_expires_at"],
+        }
+        return self.quiz
+
+
+@pytest.mark.asyncio
+async def test_enabling_a_live_quiz_invalidates_the_process_cache(fixed_now):
+    async def load():
+        return _quiz()
+
+    await live_quiz_snapshot_cache.get_or_load(QUIZ_ID, load)
+    assert live_quiz_snapshot_cache._lookup(QUIZ_ID) is not None
+
+    await LiveQuizSessionService(EnablingRepository()).generate_access_code(
+        quiz_id=QUIZ_ID,
+        access_code_expires_at=FIXED_NOW + timedelta(days=1),
+        creator_id="creator-1",
+        time_limit_minutes=10,
+    )
+
+    assert live_quiz_snapshot_cache._lookup(QUIZ_ID) is None
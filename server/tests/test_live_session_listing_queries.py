@@ -0,0 +1,245 @@
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+from server.app.db.core.connection import ensure_live_quiz_session_indexes
+from server.app.quiz.repositories.live_session_queries import (
+    CREATOR_QUIZ_SESSIONS,
+    PARTICIPANT_SESSIONS,
+    QUIZ_SESSIONS,
+    SESSION_LISTINGS,
+    InvalidSessionCursor,
+)
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.schemas.live_session_schemas import LiveQuizHistoryPage, LiveQuizSessionPage
+from server.app.quiz.services.live_session_service import LiveQuizSessionService
+from server.tests.mongo_fake import FakeMongoCollection
+
+
+START = datetime(2025, 6, 1, 10, 0, tzinfo=timezone.utc)
+LISTING_VALUES = {
+    QUIZ_SESSIONS: {"quiz_id": "quiz-1"},
+    CREATOR_QUIZ_SESSIONS: {"quiz_id": "quiz-1", "creator_user_id": "creator-1"},
+    PARTICIPANT_SESSIONS: {"participant_email": "ada@example.com"},
+}
+
+
+def _documents(count: int):
+    """Sessions in few distinct timestamps, so pages split inside runs of ties."""
+    documents = []
+    for index in range(count):
+        documents.append({
+            "_id": ObjectId(),
+            "quiz_id": "quiz-1" if index % 4 else "quiz-2",
+            "creator_user_id": "creator-1",
+            "participant_email": "ada@example.com" if index % 3 else "bob@example.com",
+            "created_at": START + timedelta(minutes=index // 7),
+            "submitted_at": START + timedelta(minutes=index // 5) if index % 8 else None,
+            "status": "submitted" if index % 6 else "active",
+        })
+    return documents
+
+
+def _expected_order(documents, listing):
+    rows = [
+        document
+        for document in documents
+        if all(document.get(field) == value for field, value in LISTING_VALUES[listing].items())
+    ]
+    # Newest first, missing sort values last, then ``_id`` descending.
+    return [
+        row["_id"]
+        for row in sorted(
+            rows,
+            key=lambda row: (row[listing.sort_field] is not None, row[listing.sort_field], row["_id"]),
+            reverse=True,
+        )
+    ]
+
+
+async def _walk_pages(repository, listing, limit):
+    pages, cursor = [], None
+    while True:
+        if listing is QUIZ_SESSIONS:
+            rows, cursor = await repository.list_quiz_sessions_page("quiz-1", limit, cursor)
+        elif listing is CREATOR_QUIZ_SESSIONS:
+            rows, cursor = await repository.list_quiz_sessions_by_creator(
+                "quiz-1", "creator-1", limit, cursor
+            )
+        else:
+            rows, cursor = await repository.find_live_quiz_sessions_for_user(
+                " Ada@Example.com ", limit, cursor
+            )
+        pages.append([row["_id"] for row in rows])
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("listing", SESSION_LISTINGS, ids=lambda listing: listing.index_name)
+@pytest.mark.parametrize("limit", [1, 4, 25, 500])
+async def test_keyset_pages_return_every_row_once_in_sort_order(listing, limit):
+    sessions = FakeMongoCollection()
+    sessions.documents = {document["_id"]: document for document in _documents(90)}
+    repository = LiveQuizSessionRepository(FakeMongoCollection(), sessions)
+
+    pages = await _walk_pages(repository, listing, limit)
+
+    expected = _expected_order(sessions.documents.values(), listing)
+    assert [row for page in pages for row in page] == expected
+    assert all(len(page) == limit for page in pages[:-1])
+    # Every page is one bounded read; nothing is skipped over server-side.
+    assert len(sessions.operations) == len(pages)
+
+
+def test_listing_indexes_lead_with_equality_fields_then_the_sort():
+    for listing in SESSION_LISTINGS:
+        equality = [(field, 1) for field in listing.equality_fields]
+        assert listing.index_keys == equality + listing.sort
+        assert listing.sort[-1] == ("_id", -1)
+
+        cursor = listing.next_cursor({"_id": ObjectId(), listing.sort_field: START})
+        query = listing.query(LISTING_VALUES[listing], cursor)
+        fields = set(query) - {"$nor"} | {field for clause in query["$nor"] for field in clause}
+        assert fields <= {field for field, _ in listing.index_keys}
+        assert query[listing.sort_field] == {"$not": {"$gt": START}}
+
+
+@pytest.mark.asyncio
+async def test_session_indexes_include_one_compound_index_per_listing():
+    class RecordingCollection:
+        def __init__(self):
+            self.indexes = {}
+
+        async def create_index(self, keys, name=None, **_):
+            self.indexes[name or str(keys)] = keys
+
+    collection = RecordingCollection()
+    await ensure_live_quiz_session_indexes(collection)
+
+    for listing in SESSION_LISTINGS:
+        assert collection.indexes[listing.index_name] == listing.index_keys
+    assert "quiz_id" not in collection.indexes
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "eyJ2IjogbnVsbH0="])
+async def test_malformed_cursors_are_rejected(cursor):
+    repository = LiveQuizSessionRepository(FakeMongoCollection(), FakeMongoCollection())
+    with pytest.raises(InvalidSessionCursor):
+        await repository.list_quiz_sessions_page("quiz-1", 10, cursor)
+
+    service = LiveQuizSessionService(OwnedQuizRepository(FakeMongoCollection(), FakeMongoCollection()))
+    for read_page in (
+        lambda: service.get_analytics_page("quiz-1", "creator-1", cursor=cursor),
+        lambda: service.list_sessions_page("quiz-1", "creator-1", cursor=cursor),
+        lambda: service.list_participant_history("ada@example.com", cursor=cursor),
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            await read_page()
+        assert exc_info.value.status_code == 400
+
+
+class OwnedQuizRepository(LiveQuizSessionRepository):
+    async def get_quiz_by_id(self, quiz_id):
+        return {"_id": quiz_id, "created_by": "creator-1", "questions": []}
+
+
+def _listing_service(documents) -> LiveQuizSessionService:
+    sessions = FakeMongoCollection()
+    sessions.documents = {document["_id"]: {**document, "total_questions": 3} for document in documents}
+    return LiveQuizSessionService(OwnedQuizRepository(FakeMongoCollection(), sessions))
+
+
+@pytest.mark.asyncio
+async def test_creator_session_pages_follow_the_creator_listing():
+    documents = _documents(90)
+    documents[1]["creator_user_id"] = "creator-2"
+    service = _listing_service(documents)
+
+    pages = [await service.list_sessions_page("quiz-1", "creator-1", limit=25)]
+    while pages[-1]["next_cursor"]:
+        pages.append(
+            await service.list_sessions_page("quiz-1", "creator-1", limit=25, cursor=pages[-1]["next_cursor"])
+        )
+
+    served = [ObjectId(row["session_id"]) for page in pages for row in page["participants"]]
+    assert served == _expected_order(documents, CREATOR_QUIZ_SESSIONS)
+    assert documents[1]["_id"] not in served
+    LiveQuizSessionPage.model_validate(pages[0])
+
+
+@pytest.mark.asyncio
+async def test_participant_history_pages_follow_the_participant_listing():
+    documents = _documents(90)
+    service = _listing_service(documents)
+
+    pages = [await service.list_participant_history(" Ada@Example.com ", limit=25)]
+    while pages[-1]["next_cursor"]:
+        pages.append(
+            await service.list_participant_history("ada@example.com", limit=25, cursor=pages[-1]["next_cursor"])
+        )
+
+    served = [ObjectId(row["session_id"]) for page in pages for row in page["sessions"]]
+    assert served == _expected_order(documents, PARTICIPANT_SESSIONS)
+    assert {row["quiz_id"] for page in pages for row in page["sessions"]} == {"quiz-1", "quiz-2"}
+    LiveQuizHistoryPage.model_validate(pages[0])
+
+
+def _plan_stages(plan):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+async def _explain_collection():
+    client = AsyncIOMotorClient(
+        os.environ.get("MONGO_URI", "mongodb://localhost:27017"),
+        serverSelectionTimeoutMS=500,
+    )
+    try:
+        await client.admin.command("ping")
+    except PyMongoError:
+        client.close()
+        pytest.skip("MongoDB is not reachable; explain-plan checks need a server")
+    database = client[f"live_session_explain_{uuid.uuid4().hex[:8]}"]
+    collection = database["live_quiz_sessions"]
+    await collection.insert_many(_documents(2_000))
+    await ensure_live_quiz_session_indexes(collection)
+    return client, database, collection
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("listing", SESSION_LISTINGS, ids=lambda listing: listing.index_name)
+async def test_listing_queries_use_their_index_without_collscan_or_sort(listing):
+    client, database, collection = await _explain_collection()
+    try:
+        last = await collection.find(listing.query(LISTING_VALUES[listing])).sort(
+            listing.sort
+        ).skip(40).limit(1).to_list(length=1)
+        for cursor in (None, listing.next_cursor(last[0])):
+            explained = await collection.find(listing.query(LISTING_VALUES[listing], cursor)).sort(
+                listing.sort
+            ).limit(51).explain()
+            stages = list(_plan_stages(explained["queryPlanner"]["winningPlan"]))
+            names = {stage["stage"] for stage in stages}
+
+            assert "COLLSCAN" not in names, explained["queryPlanner"]["winningPlan"]
+            assert "SORT" not in names, explained["queryPlanner"]["winningPlan"]
+            assert {
+                stage.get("indexName") for stage in stages if stage["stage"] == "IXSCAN"
+            } == {listing.index_name}
+    finally:
+        await client.drop_database(database.name)
+        client.close()
@@ -312,8 +312,10 @@ async def test_verified_user_can_download_authenticated_quiz():
         "server.app.quiz.routes.downloads.download_quiz_by_id",
         new=AsyncMock(return_value="streaming-response"),
     ) as download_mock:
+        request = MagicMock()
+        request.headers = {"if-none-match": '"cached-export"'}
         result = await download_quiz_handler(
-            request=MagicMock(),
+            request=request,
             response=Response(),
             query=DownloadQuizQuery(
                 quiz_id=quiz_id,
@@ -329,4 +331,5 @@ async def test_verified_user_can_download_authenticated_quiz():
         quiz_id=quiz_id,
         file_format="txt",
         user_id=current_user.id,
+        if_none_match='"cached-export"',
     )
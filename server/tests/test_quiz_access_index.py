@@ -0,0 +1,245 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from server.app.core.config import settings
+from server.app.quiz.repositories.v2.models.reference_models import (
+    FolderDocumentV2,
+    FolderItemDocumentV2,
+    QuizHistoryDocumentV2,
+    SavedQuizDocumentV2,
+)
+from server.app.quiz.services.quiz_access_index import backfill_quiz_access_index, check_quiz_access_index
+from server.tests.library_fake import LibraryCollections, add_quiz, build_library
+
+
+USER_ID = "user-1"
+OTHER_USER_ID = "user-2"
+
+
+async def _assert_index_matches_references(collections: LibraryCollections):
+    report = await check_quiz_access_index(collections.reference_repository())
+    assert report.consistent, report.to_dict()
+
+
+async def _sources(collections: LibraryCollections, user_id: str, quiz_id: str) -> list[str]:
+    document = await collections.quiz_access.find_one({"user_id": user_id, "quiz_id": quiz_id})
+    return document["sources"] if document else []
+
+
+@pytest.mark.asyncio
+async def test_saved_and_history_writes_keep_the_index_current():
+    collections = LibraryCollections()
+    repository = collections.reference_repository()
+    quiz_id = add_quiz(collections, 1)
+
+    saved = await repository.insert_saved_quiz(SavedQuizDocumentV2(user_id=USER_ID, quiz_id=quiz_id))
+    history = await repository.insert_quiz_history(
+        QuizHistoryDocumentV2(user_id=USER_ID, quiz_id=quiz_id, action="generated")
+    )
+    assert await _sources(collections, USER_ID, quiz_id) == ["history", "saved"]
+
+    assert await repository.delete_saved_quiz_by_id(str(saved.id), user_id=USER_ID) == 1
+    assert await repository.delete_saved_quiz_by_id(str(saved.id), user_id=USER_ID) == 0
+    assert await _sources(collections, USER_ID, quiz_id) == ["history"]
+
+    assert await repository.soft_delete_quiz_history_by_id(str(history.id)) == 1
+    assert await _sources(collections, USER_ID, quiz_id) == []
+    await _assert_index_matches_references(collections)
+
+
+@pytest.mark.asyncio
+async def test_legacy_upserts_and_deletes_keep_the_index_current():
+    collections = LibraryCollections()
+    repository = collections.reference_repository()
+    quiz_id = add_quiz(collections, 1)
+
+    await repository.upsert_saved_quiz(
+        SavedQuizDocumentV2(user_id=USER_ID, quiz_id=quiz_id, legacy_saved_quiz_id="legacy-saved")
+    )
+    await repository.upsert_quiz_history(
+        QuizHistoryDocumentV2(user_id=USER_ID, quiz_id=quiz_id, action="generated", legacy_history_id="legacy-history")
+    )
+    assert await _sources(collections, USER_ID, quiz_id) == ["history", "saved"]
+
+    await repository.delete_saved_quiz_by_legacy_id("legacy-saved")
+    await repository.delete_quiz_history_by_legacy_id("legacy-history")
+    assert await _sources(collections, USER_ID, quiz_id) == []
+
+    await repository.upsert_saved_quiz(
+        SavedQuizDocumentV2(user_id=USER_ID, quiz_id=quiz_id, legacy_saved_quiz_id="legacy-saved"),
+        revive_deleted=True,
+    )
+    assert await _sources(collections, USER_ID, quiz_id) == ["saved"]
+    await repository.delete_saved_quiz(USER_ID, quiz_id)
+    assert await _sources(collections, USER_ID, quiz_id) == []
+    await _assert_index_matches_references(collections)
+
+
+@pytest.mark.asyncio
+async def test_folder_writes_grant_and_revoke_through_the_folder_owner():
+    collections = LibraryCollections()
+    repository = collections.reference_repository()
+    quiz_id = add_quiz(collections, 1)
+    other_quiz_id = add_quiz(collections, 2)
+    folder = await repository.insert_folder(FolderDocumentV2(user_id=USER_ID, name="Biology"))
+    other_folder = await repository.insert_folder(FolderDocumentV2(user_id=OTHER_USER_ID, name="Biology"))
+
+    item = await repository.insert_folder_item(FolderItemDocumentV2(folder_id=str(folder.id), quiz_id=quiz_id))
+    await repository.upsert_folder_item(
+        FolderItemDocumentV2(folder_id=str(folder.id), quiz_id=other_quiz_id, legacy_folder_item_id="legacy-item")
+    )
+    assert await _sources(collections, USER_ID, quiz_id) == ["folder"]
+    assert await _sources(collections, USER_ID, other_quiz_id) == ["folder"]
+
+    # Moving an item into another user's folder moves the grant with it.
+    await repository.update_folder_item(str(item.id), folder_id=str(other_folder.id))
+    assert await _sources(collections, USER_ID, quiz_id) == []
+    assert await _sources(collections, OTHER_USER_ID, quiz_id) == ["folder"]
+
+    await repository.delete_folder_item_by_legacy_id("legacy-item")
+    assert await _sources(collections, USER_ID, other_quiz_id) == []
+    await repository.delete_folder_item_by_id(str(item.id))
+    assert await _sources(collections, OTHER_USER_ID, quiz_id) == []
+    await _assert_index_matches_references(collections)
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_folder_keeps_access_granted_by_other_references():
+    collections = LibraryCollections()
+    repository = collections.reference_repository()
+    kept_quiz_id = add_quiz(collections, 1)
+    dropped_quiz_id = add_quiz(collections, 2)
+    folder = await repository.insert_folder(FolderDocumentV2(user_id=USER_ID, name="Chemistry"))
+    second_folder = await repository.insert_folder(FolderDocumentV2(user_id=USER_ID, name="Revision"))
+    for quiz_id in (kept_quiz_id, dropped_quiz_id):
+        await repository.insert_folder_item(FolderItemDocumentV2(folder_id=str(folder.id), quiz_id=quiz_id))
+    await repository.insert_folder_item(FolderItemDocumentV2(folder_id=str(second_folder.id), quiz_id=kept_quiz_id))
+    await repository.insert_saved_quiz(SavedQuizDocumentV2(user_id=USER_ID, quiz_id=kept_quiz_id))
+
+    await repository.delete_folder_by_id(str(folder.id))
+
+    assert await _sources(collections, USER_ID, kept_quiz_id) == ["folder", "saved"]
+    assert await _sources(collections, USER_ID, dropped_quiz_id) == []
+
+    await repository.delete_folder_by_public_id(str(second_folder.id))
+    assert await _sources(collections, USER_ID, kept_quiz_id) == ["saved"]
+    await _assert_index_matches_references(collections)
+
+
+@pytest.fixture
+def index_reads(monkeypatch):
+    monkeypatch.setattr(settings, "QUIZ_ACCESS_INDEX_READS_ENABLED", True)
+
+
+@pytest.mark.asyncio
+async def test_index_lookup_agrees_with_the_library_scan(index_reads):
+    collections = LibraryCollections()
+    samples = build_library(collections, user_id=USER_ID, folders=25, items_per_folder=3, saved=20, history=20, seed=7)
+    rng = random.Random(7)
+    # Soft-deleted references and folders must not grant access.
+    for collection in (collections.folders, collections.folder_items, collections.saved_quizzes, collections.quiz_history):
+        for document in rng.sample(list(collection.documents.values()), len(collection.documents) // 5):
+            document["deleted_at"] = datetime(2025, 2, 1)
+    report = await backfill_quiz_access_index(collections.reference_repository())
+    assert report.repaired == report.expected
+    await _assert_index_matches_references(collections)
+
+    scan = collections.library_service(indexed=False)
+    indexed = collections.library_service(indexed=True)
+    quiz_ids = [str(quiz_id) for quiz_id in collections.quizzes.documents] + ["not-a-quiz-id"]
+    granted = 0
+    for user_id in (USER_ID, OTHER_USER_ID):
+        for quiz_id in quiz_ids:
+            expected = await scan.get_owned_or_library_quiz(user_id=user_id, quiz_id=quiz_id)
+            actual = await indexed.get_owned_or_library_quiz(user_id=user_id, quiz_id=quiz_id)
+            assert actual == expected
+            granted += actual is not None
+    assert 0 < granted < len(quiz_ids)
+    assert await indexed.get_owned_or_library_quiz(user_id=USER_ID, quiz_id=samples["no access"]) is None
+
+
+@pytest.mark.asyncio
+async def test_index_check_costs_two_round_trips_for_a_large_library(index_reads, monkeypatch):
+    collections = LibraryCollections()
+    samples = build_library(collections, user_id=USER_ID, folders=500, items_per_folder=1, saved=1, history=1)
+    await backfill_quiz_access_index(collections.reference_repository())
+    service = collections.library_service(indexed=True)
+
+    collections.reset_counts()
+    assert await service.get_owned_or_library_quiz(user_id=USER_ID, quiz_id=samples["last folder"])
+    assert collections.round_trips == 2
+
+    monkeypatch.setattr(settings, "QUIZ_ACCESS_INDEX_READS_ENABLED", False)
+    collections.reset_counts()
+    assert await service.get_owned_or_library_quiz(user_id=USER_ID, quiz_id=samples["last folder"])
+    assert collections.round_trips > 500
+
+
+@pytest.mark.asyncio
+async def test_a_row_missing_from_the_index_falls_back_to_the_references(index_reads):
+    collections = LibraryCollections()
+    samples = build_library(collections, user_id=USER_ID, folders=3, items_per_folder=1, saved=1, history=1)
+    await backfill_quiz_access_index(collections.reference_repository())
+    await collections.quiz_access.delete_one({"quiz_id": samples["last folder"]})
+    service = collections.library_service(indexed=True)
+
+    assert await service.get_owned_or_library_quiz(user_id=USER_ID, quiz_id=samples["last folder"])
+
+
+@pytest.mark.asyncio
+async def test_a_refresh_read_before_the_last_one_does_not_overwrite_it():
+    collections = LibraryCollections()
+    access_repository = collections.reference_repository().quiz_access_repository
+    pair = (USER_ID, "quiz-1")
+    earlier, later = datetime(2025, 3, 1, 12, 0, 0), datetime(2025, 3, 1, 12, 0, 1)
+
+    await access_repository.apply_changes({pair: ["saved", "history"]}, read_at=later)
+    await access_repository.apply_changes({pair: ["saved"]}, read_at=earlier)
+    assert await _sources(collections, *pair) == ["history", "saved"]
+
+    # A pair whose last reference went away is not brought back by an older refresh.
+    await access_repository.apply_changes({}, [pair], read_at=later + timedelta(seconds=1))
+    await access_repository.apply_changes({pair: ["saved"]}, read_at=later)
+    assert not await access_repository.has_access(*pair)
+    assert await access_repository.list_all() == {}
+
+
+@pytest.mark.asyncio
+async def test_checker_reports_drift_and_repair_fixes_it():
+    collections = LibraryCollections()
+    build_library(collections, user_id=USER_ID, folders=5, items_per_folder=2, saved=3, history=3)
+    repository = collections.reference_repository()
+    await backfill_quiz_access_index(repository)
+
+    rows = list(collections.quiz_access.documents.values())
+    missing = rows[0]
+    del collections.quiz_access.documents[missing["_id"]]
+    rows[1]["sources"] = ["saved"] if rows[1]["sources"] != ["saved"] else ["history"]
+    await collections.quiz_access.insert_one(
+        {"user_id": OTHER_USER_ID, "quiz_id": missing["quiz_id"], "sources": ["saved"], "updated_at": datetime.utcnow()}
+    )
+
+    report = await check_quiz_access_index(repository)
+    assert report.missing == [(missing["user_id"], missing["quiz_id"])]
+    assert report.mismatched == [(rows[1]["user_id"], rows[1]["quiz_id"])]
+    assert report.stale == [(OTHER_USER_ID, missing["quiz_id"])]
+    assert report.to_dict()["consistent"] is False
+    assert report.repaired == 0
+
+    repaired = await check_quiz_access_index(repository, repair=True)
+    assert repaired.repaired == 3
+    await _assert_index_matches_references(collections)
+
+
+@pytest.mark.asyncio
+async def test_startup_backfill_only_runs_on_an_empty_index():
+    collections = LibraryCollections()
+    build_library(collections, user_id=USER_ID, folders=3, items_per_folder=2, saved=2, history=2)
+    service = collections.library_service(indexed=True)
+
+    first = await service.backfill_quiz_access_index(only_if_empty=True)
+    assert first is not None and first.repaired == first.expected > 0
+    assert await service.backfill_quiz_access_index(only_if_empty=True) is None
+    assert await collections.library_service(indexed=False).backfill_quiz_access_index() is None
@@ -0,0 +1,230 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from server.tests.redis_fake import FakeRedis
+
+from server.app.quiz.repositories.v2.repositories.quiz_repository import QuizV2Repository
+from server.app.quiz.services.quiz_answer_key_cache import (
+    CompiledAnswerKey,
+    QuizAnswerKeyCache,
+    compile_quiz_document,
+)
+from server.app.quiz.services.quiz_grading_service import (
+    QuizGradingService,
+    SubmissionMismatchError,
+    grade_against_stored_questions,
+)
+from server.tests.legacy_grading import LegacyGradingService
+from server.tests.mongo_fake import FakeMongoCollection
+from server.tests.quiz_factories import build_quiz, build_submission
+
+
+class SavedQuizReferences:
+    def __init__(self, saved=None):
+        self.saved = saved or {}
+        self.lookups = 0
+
+    async def get_saved_quiz_by_public_id(self, saved_quiz_id):
+        self.lookups += 1
+        quiz_id = self.saved.get(saved_quiz_id)
+        return SimpleNamespace(quiz_id=quiz_id) if quiz_id else None
+
+
+class UnreachableRedis:
+    async def get(self, *args, **kwargs):
+        raise RedisConnectionError("Connection refused")
+
+    async def set(self, *args, **kwargs):
+        raise RedisConnectionError("Connection refused")
+
+
+def _cache(redis_client=None) -> QuizAnswerKeyCache:
+    async def factory():
+        return redis_client
+
+    return QuizAnswerKeyCache(redis_client_factory=factory if redis_client is not None else None)
+
+
+def _service(collection, answer_keys=None, references=None, service_class=QuizGradingService):
+    return service_class(
+        quiz_repository=QuizV2Repository(collection),
+        reference_repository=references or SavedQuizReferences(),
+        answer_keys=answer_keys if answer_keys is not None else _cache(),
+    )
+
+
+def _stored(collection, quiz_type="short-answer", questions=50, seed=0):
+    quiz = build_quiz(questions, quiz_type, seed=seed)
+    quiz["quiz_type"] = quiz["quiz_type"].value
+    collection.documents[quiz["_id"]] = quiz
+    return quiz
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("quiz_type", ["multichoice", "true-false", "open-ended", "short-answer"])
+@pytest.mark.parametrize("source", ["mock", "ai"])
+async def test_answer_key_grading_matches_the_full_document_path(quiz_type, source):
+    collection = FakeMongoCollection()
+    quiz = _stored(collection, quiz_type, seed=len(quiz_type))
+    quiz["questions"][0]["correct_answer"] = "B) Correct answer: " + quiz["questions"][0]["correct_answer"]
+    submission = build_submission(quiz, seed=3)
+    submission[1]["user_answer"] = "c) " + str(submission[1]["user_answer"]).upper()
+    if quiz_type == "true-false":
+        submission[2]["user_answer"] = 1
+
+    expected = await _service(collection, service_class=LegacyGradingService).grade_submission(
+        str(quiz["_id"]), submission, source=source
+    )
+    service = _service(collection)
+
+    assert await service.grade_submission(str(quiz["_id"]), submission, source=source) == expected
+    # Served from the compiled key the second time.
+    assert await service.grade_submission(str(quiz["_id"]), submission, source=source) == expected
+    assert service.answer_keys.stats.memory_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_submission_reads_only_the_quiz_version():
+    collection = FakeMongoCollection()
+    quiz = _stored(collection)
+    service = _service(collection)
+    submission = build_submission(quiz)
+    await service.grade_submission(str(quiz["_id"]), submission)
+
+    collection.reset_counts()
+    await service.grade_submission(str(quiz["_id"]), submission)
+
+    assert collection.operations == ["find_one"]
+    assert await service.quiz_repository.find_version(str(quiz["_id"])) == quiz["updated_at"].isoformat()
+
+
+@pytest.mark.asyncio
+async def test_editing_the_quiz_compiles_a_new_answer_key():
+    collection = FakeMongoCollection()
+    quiz = _stored(collection, "multichoice", questions=2)
+    service = _service(collection)
+    question = quiz["questions"][0]["question"]
+    submission = [{"question": question, "user_answer": "Paris"}]
+
+    assert (await service.grade_submission(str(quiz["_id"]), submission))[0]["is_correct"] is False
+
+    quiz["questions"][0]["correct_answer"] = "Paris"
+    quiz["updated_at"] = datetime(2025, 2, 1)
+
+    graded = await service.grade_submission(str(quiz["_id"]), submission)
+    assert graded[0]["is_correct"] is True
+    assert service.answer_keys.stats.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_other_workers_reuse_the_key_compiled_into_redis():
+    collection = FakeMongoCollection()
+    quiz = _stored(collection)
+    redis_client = FakeRedis()
+    submission = build_submission(quiz)
+    expected = await _service(collection, _cache(redis_client)).grade_submission(str(quiz["_id"]), submission)
+
+    other_worker = _service(collection, _cache(redis_client))
+    collection.reset_counts()
+
+    assert await other_worker.grade_submission(str(quiz["_id"]), submission) == expected
+    assert other_worker.answer_keys.stats.redis_hits == 1
+    assert other_worker.answer_keys.stats.misses == 0
+    assert collection.operations == ["find_one"]
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_falls_back_to_compiling():
+    collection = FakeMongoCollection()
+    quiz = _stored(collection)
+    service = _service(collection, _cache(UnreachableRedis()))
+    submission = build_submission(quiz)
+
+    graded = await service.grade_submission(str(quiz["_id"]), submission)
+
+    assert len(graded) == 50
+    assert service.answer_keys.stats.redis_errors == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "raw",
+    ["not json", "[]", '{"quiz_id": "x"}', '{"correct_answers": [], "quiz_id": "x"}'],
+)
+async def test_unreadable_redis_answer_key_is_recompiled(raw):
+    collection = FakeMongoCollection()
+    quiz = _stored(collection)
+    redis_client = FakeRedis()
+    version = quiz["updated_at"].isoformat()
+    await redis_client.set(f"quiz-answer-key:{quiz['_id']}:{version}", raw)
+    service = _service(collection, _cache(redis_client))
+    submission = build_submission(quiz)
+
+    graded = await service.grade_submission(str(quiz["_id"]), submission)
+
+    assert len(graded) == 50
+    assert service.answer_keys.stats.corrupt_entries == 1
+    assert service.answer_keys.stats.misses == 1
+    # The recompiled key replaced the bad value for the other workers.
+    other_worker = _service(collection, _cache(redis_client))
+    assert await other_worker.grade_submission(str(quiz["_id"]), submission) == graded
+    assert other_worker.answer_keys.stats.redis_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_saved_quiz_ids_resolve_to_the_underlying_quiz():
+    collection = FakeMongoCollection()
+    quiz = _stored(collection)
+    references = SavedQuizReferences({"saved-1": str(quiz["_id"])})
+    service = _service(collection, references=references)
+    submission = build_submission(quiz)
+
+    assert await service.grade_submission("saved-1", submission) == await service.grade_submission(
+        str(quiz["_id"]), submission
+    )
+    assert await service.grade_submission(str(ObjectId()), submission) is None
+    assert await service.grade_submission("not-an-id", submission) is None
+
+
+@pytest.mark.asyncio
+async def test_unknown_questions_and_sources_are_rejected():
+    collection = FakeMongoCollection()
+    quiz = _stored(collection, questions=3)
+    service = _service(collection)
+
+    with pytest.raises(SubmissionMismatchError):
+        await service.grade_submission(str(quiz["_id"]), [{"question": "Injected?", "user_answer": "x"}])
+    with pytest.raises(HTTPException) as exc_info:
+        await service.grade_submission(str(quiz["_id"]), build_submission(quiz), source="teacher")
+    assert exc_info.value.status_code == 400
+
+
+def test_true_false_keys_canonicalize_and_round_trip_through_json():
+    stored = [
+        {"question": "Q1", "correct_answer": "True"},
+        {"question": "Q2", "correct_answer": "0"},
+        {"question": "Q3", "correct_answer": "false"},
+    ]
+    submission = [
+        {"question": "Q1", "user_answer": 1},
+        {"question": "Q2", "user_answer": "False"},
+        {"question": "Q3", "user_answer": "1"},
+    ]
+
+    graded = grade_against_stored_questions(stored, submission, quiz_type="true-false")
+
+    assert [(row["user_answer"], row["correct_answer"], row["result"]) for row in graded] == [
+        ("true", "true", "Correct"),
+        ("false", "false", "Correct"),
+        ("true", "false", "Incorrect"),
+    ]
+
+    quiz = build_quiz(5, "true-false")
+    compiled = compile_quiz_document(quiz)
+    assert CompiledAnswerKey.from_json(compiled.to_json()) == compiled
+    assert set(compiled.correct_answers["mock"]) <= {"true", "false"}
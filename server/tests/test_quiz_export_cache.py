@@ -0,0 +1,321 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from bson import ObjectId
+
+from fastapi.responses import StreamingResponse
+
+from server.app.quiz.services import download_service
+from server.app.quiz.services.download_service import download_quiz_by_id
+from server.app.quiz.services.quiz_export_cache import QuizExportCache, export_cache_key
+from server.app.quiz.utils.render_export import render_export
+from server.tests.quiz_factories import download_payload
+
+
+QUIZ_ID = "69e78f93594339fd166131ea"
+
+
+def _quiz(**overrides):
+    quiz = {
+        "_id": ObjectId(QUIZ_ID),
+        "title": "AI Automation Basics",
+        "quiz_type": "multichoice",
+        "content_fingerprint": "fingerprint-1",
+        "updated_at": datetime(2025, 1, 1),
+        "questions": [
+            {
+                "question": "What is the main goal of AI automation?",
+                "options": ["A) To replace all human jobs", "B) To perform tasks without human intervention"],
+                "correct_answer": "B) To perform tasks without human intervention",
+            }
+        ],
+    }
+    quiz.update(overrides)
+    return quiz
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def _cache(directory, executor, **kwargs):
+    kwargs.setdefault("max_bytes", 1024 * 1024)
+    return QuizExportCache(directory, executor=executor, **kwargs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("file_format", ["txt", "json", "docx"])
+async def test_cached_export_is_the_rendered_file(tmp_path, executor, file_format):
+    cache = _cache(tmp_path, executor)
+    payload = download_payload(_quiz())
+
+    export = await cache.get_or_render("key", file_format, payload)
+
+    assert export.path == tmp_path / f"key.{file_format}"
+    assert export.etag == '"key"'
+    if file_format != "docx":
+        assert export.path.read_bytes() == render_export(payload, file_format)
+    assert export.size == export.path.stat().st_size
+    assert [path.name for path in tmp_path.iterdir()] == [f"key.{file_format}"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_render(tmp_path, executor):
+    cache = _cache(tmp_path, executor)
+    payload = download_payload(_quiz())
+
+    exports = await asyncio.gather(*(cache.get_or_render("key", "pdf", payload) for _ in range(20)))
+
+    assert len({export.path for export in exports}) == 1
+    assert cache.stats.renders == 1
+    assert cache.stats.shared_renders == 19
+
+    await cache.get_or_render("key", "pdf", payload)
+    assert cache.stats.hits == 1
+    assert cache.stats.renders == 1
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_exports_are_evicted(tmp_path, executor):
+    payload = download_payload(_quiz())
+    size = len(render_export(payload, "txt"))
+    cache = _cache(tmp_path, executor, max_bytes=size * 3)
+
+    for key in ("a", "b", "c"):
+        await cache.get_or_render(key, "txt", payload)
+    await cache.get_or_render("a", "txt", payload)
+    await cache.get_or_render("d", "txt", payload)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.txt", "c.txt", "d.txt"]
+    assert cache.stats.evictions == 1
+    assert cache.total_bytes == size * 3
+
+
+@pytest.mark.asyncio
+async def test_an_export_larger_than_the_cache_is_still_served(tmp_path, executor):
+    cache = _cache(tmp_path, executor, max_bytes=1)
+    payload = download_payload(_quiz())
+
+    await cache.get_or_render("a", "txt", payload)
+    export = await cache.get_or_render("b", "txt", payload)
+
+    assert export.path.exists()
+    assert [path.name for path in tmp_path.iterdir()] == ["b.txt"]
+
+
+@pytest.mark.asyncio
+async def test_pinned_exports_are_not_evicted_until_released(tmp_path, executor):
+    payload = download_payload(_quiz())
+    cache = _cache(tmp_path, executor, max_bytes=len(render_export(payload, "txt")))
+
+    serving = await cache.get_or_render("a", "txt", payload, pin=True)
+    await cache.get_or_render("b", "txt", payload)
+    assert serving.path.exists()
+
+    cache.release(serving)
+    assert not serving.path.exists()
+    assert [path.name for path in tmp_path.iterdir()] == ["b.txt"]
+
+
+@pytest.mark.asyncio
+async def test_restarted_cache_adopts_files_on_disk_in_recency_order(tmp_path, executor):
+    payload = download_payload(_quiz())
+    size = len(render_export(payload, "txt"))
+    cache = _cache(tmp_path, executor, max_bytes=size * 2)
+    await cache.get_or_render("old", "txt", payload)
+    await cache.get_or_render("new", "txt", payload)
+    os.utime(tmp_path / "old.txt", (1, 1))
+    (tmp_path / ".new.txt.partial").write_bytes(b"half a render")
+
+    restarted = _cache(tmp_path, executor, max_bytes=size * 2)
+    await restarted.get_or_render("new", "txt", payload)
+    await restarted.get_or_render("newest", "txt", payload)
+
+    assert restarted.stats.hits == 1
+    assert restarted.stats.renders == 1
+    assert not (tmp_path / "old.txt").exists()
+    assert (tmp_path / "new.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_export_removed_from_disk_is_rendered_again(tmp_path, executor):
+    cache = _cache(tmp_path, executor)
+    payload = download_payload(_quiz())
+    export = await cache.get_or_render("key", "txt", payload)
+    export.path.unlink()
+
+    again = await cache.get_or_render("key", "txt", payload)
+
+    assert again.path.read_bytes() == render_export(payload, "txt")
+    assert cache.stats.renders == 2
+
+
+@pytest.mark.asyncio
+async def test_workers_sharing_a_directory_evict_from_what_is_on_disk(tmp_path, executor):
+    payload = download_payload(_quiz())
+    size = len(render_export(payload, "txt"))
+    first = _cache(tmp_path, executor, max_bytes=size * 2)
+    second = _cache(tmp_path, executor, max_bytes=size * 2)
+
+    await first.get_or_render("a", "txt", payload)
+    await second.get_or_render("b", "txt", payload)
+    os.utime(tmp_path / "b.txt", (1, 1))
+    await second.get_or_render("a", "txt", payload)
+    await second.get_or_render("c", "txt", payload)
+
+    # The second worker adopted the first one's file and evicted by on-disk recency.
+    assert (second.stats.hits, second.stats.renders) == (1, 2)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a.txt", "c.txt"]
+
+
+@pytest.mark.asyncio
+async def test_an_opened_export_reads_after_another_worker_evicts_it(tmp_path, executor):
+    cache = _cache(tmp_path, executor)
+    payload = download_payload(_quiz())
+
+    export, file = await cache.open("key", "txt", payload)
+    export.path.unlink()
+    with file:
+        assert file.read() == render_export(payload, "txt")
+    cache.release(export)
+
+
+def test_export_cache_key_changes_with_the_quiz_version_and_format():
+    key = export_cache_key("fingerprint-1", datetime(2025, 1, 1), "pdf")
+
+    assert key == export_cache_key("fingerprint-1", datetime(2025, 1, 1), "pdf")
+    assert key != export_cache_key("fingerprint-2", datetime(2025, 1, 1), "pdf")
+    assert key != export_cache_key("fingerprint-1", datetime(2025, 1, 2), "pdf")
+    assert key != export_cache_key("fingerprint-1", datetime(2025, 1, 1), "docx")
+
+
+@pytest.fixture
+def cached_download(tmp_path, executor, monkeypatch):
+    cache = _cache(tmp_path, executor)
+    monkeypatch.setattr(download_service, "quiz_export_cache", cache)
+    collection = AsyncMock()
+
+    async def download(quiz, file_format="txt", if_none_match=None):
+        collection.find_one.return_value = quiz
+        with patch(
+            "server.app.quiz.services.download_service.get_quizzes_v2_collection",
+            return_value=collection,
+        ):
+            return await download_quiz_by_id(quiz_id=QUIZ_ID, file_format=file_format, if_none_match=if_none_match)
+
+    download.cache = cache
+    return download
+
+
+@pytest.mark.asyncio
+async def test_download_by_id_serves_fingerprinted_quizzes_from_the_cache(cached_download):
+    response = await cached_download(_quiz())
+
+    assert isinstance(response, download_service._CachedExportResponse)
+    assert response.media_type == "text/plain"
+    assert response.headers["Content-Disposition"] == 'attachment; filename="AI Automation Basics.txt"'
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    etag = response.headers["ETag"]
+    assert etag == f'"{export_cache_key("fingerprint-1", datetime(2025, 1, 1), "txt")}"'
+
+    await cached_download(_quiz())
+    assert cached_download.cache.stats.as_dict() == {"hits": 1, "renders": 1, "shared_renders": 0, "evictions": 0}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("if_none_match", ["{etag}", 'W/{etag}', '"other", {etag}', "*"])
+async def test_download_by_id_answers_a_matching_if_none_match_with_304(cached_download, if_none_match):
+    etag = (await cached_download(_quiz())).headers["ETag"]
+
+    response = await cached_download(_quiz(), if_none_match=if_none_match.format(etag=etag))
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.body == b""
+
+
+@pytest.mark.asyncio
+async def test_a_matching_if_none_match_is_answered_without_rendering(cached_download):
+    etag = f'"{export_cache_key("fingerprint-1", datetime(2025, 1, 1), "pdf")}"'
+
+    response = await cached_download(_quiz(), file_format="pdf", if_none_match=etag)
+
+    assert response.status_code == 304
+    assert cached_download.cache.stats.renders == 0
+
+
+@pytest.mark.asyncio
+async def test_sending_the_download_releases_its_export(cached_download):
+    response = await cached_download(_quiz())
+    assert response.export.path.exists()
+    cached_download.cache.max_bytes = 0
+    # Another render cannot evict the file while the response still has to send it.
+    await cached_download(_quiz(updated_at=datetime(2025, 2, 1)))
+    assert response.export.path.exists()
+
+    messages = []
+
+    async def receive():
+        # The client stays connected until the response is sent.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await response({"type": "http", "method": "GET", "headers": []}, receive, send)
+
+    assert messages[0]["status"] == 200
+    assert b"".join(message.get("body", b"") for message in messages[1:]) == render_export(
+        download_payload(_quiz()), "txt"
+    )
+    assert not response.export.path.exists()
+    assert response.file.closed
+
+
+@pytest.mark.asyncio
+async def test_download_survives_the_file_being_evicted_before_it_is_sent(cached_download):
+    response = await cached_download(_quiz())
+    # Another worker sharing the directory evicts the file.
+    response.export.path.unlink()
+
+    messages = []
+
+    async def receive():
+        # The client stays connected until the response is sent.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await response({"type": "http", "method": "GET", "headers": []}, receive, send)
+
+    body = render_export(download_payload(_quiz()), "txt")
+    assert messages[0]["status"] == 200
+    assert (b"content-length", str(len(body)).encode()) in messages[0]["headers"]
+    assert b"".join(message.get("body", b"") for message in messages[1:]) == body
+
+
+@pytest.mark.asyncio
+async def test_download_by_id_revalidates_after_the_quiz_changes(cached_download):
+    etag = (await cached_download(_quiz())).headers["ETag"]
+
+    response = await cached_download(_quiz(updated_at=datetime(2025, 2, 1)), if_none_match=etag)
+
+    assert isinstance(response, download_service._CachedExportResponse)
+    assert response.headers["ETag"] != etag
+    assert cached_download.cache.stats.renders == 2
+
+
+@pytest.mark.asyncio
+async def test_download_by_id_renders_quizzes_without_a_fingerprint_uncached(cached_download):
+    response = await cached_download(_quiz(content_fingerprint=None))
+
+    assert isinstance(response, StreamingResponse)
+    assert "ETag" not in response.headers
+    assert cached_download.cache.stats.renders == 0
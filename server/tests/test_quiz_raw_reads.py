@@ -0,0 +1,69 @@
+import pytest
+from bson import ObjectId
+from pydantic import ValidationError
+
+from server.app.quiz.repositories.live_session_repository import LiveQuizSessionRepository
+from server.app.quiz.repositories.v2.models.quiz_models import QuizDocumentV2
+from server.app.quiz.repositories.v2.repositories.quiz_repository import QuizV2Repository
+from server.app.share.services import SharedQuizReadService, build_default_description
+from server.tests.mongo_fake import FakeMongoCollection
+from server.tests.quiz_factories import stored_quiz
+
+
+def _collection(*documents):
+    collection = FakeMongoCollection()
+    for document in documents:
+        collection.documents[document["_id"]] = document
+    return collection
+
+
+@pytest.mark.asyncio
+async def test_raw_reads_return_stored_documents_and_validated_reads_still_validate():
+    quiz = stored_quiz(3)
+    # A field no write path produces: raw reads pass it through, validated reads reject it.
+    broken = {**stored_quiz(2, seed=1), "unexpected": True}
+    repository = QuizV2Repository(_collection(quiz, broken))
+
+    assert await repository.find_raw_by_id(str(quiz["_id"])) == quiz
+    assert await repository.find_raw_by_id("not-an-id") is None
+    assert await repository.find_raw_by_id(str(ObjectId())) is None
+    assert (await repository.find_raw_by_id(str(broken["_id"])))["unexpected"] is True
+    assert await repository.find_by_id(str(quiz["_id"])) == QuizDocumentV2(**quiz)
+    with pytest.raises(ValidationError):
+        await repository.find_by_id(str(broken["_id"]))
+
+    requested = [str(broken["_id"]), "not-an-id", str(quiz["_id"]), str(ObjectId())]
+    assert await repository.find_raw_many_by_ids(requested) == [broken, quiz]
+
+
+@pytest.mark.asyncio
+async def test_live_session_quiz_reads_return_the_raw_document():
+    quiz = {**stored_quiz(4), "access_code": "ABC123", "live_quiz_enabled": True}
+    repository = LiveQuizSessionRepository(_collection(quiz), FakeMongoCollection())
+
+    assert await repository.get_quiz_by_id(str(quiz["_id"])) == quiz
+    assert await repository.get_quiz_by_access_code(" abc123 ") == quiz
+    assert await repository.get_quiz_by_access_code("MISSING") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("quiz_type", ["multichoice", "true-false", "open-ended", "short-answer"])
+async def test_shared_quiz_payload_is_built_from_the_raw_document(quiz_type):
+    quiz = stored_quiz(5, quiz_type, seed=3)
+    quiz["description"] = None
+    quiz["questions"][0].pop("options")
+    service = SharedQuizReadService(quiz_repository=QuizV2Repository(_collection(quiz)), reference_repository=object())
+
+    payload = await service.resolve_shared_quiz(str(quiz["_id"]))
+
+    assert payload == {
+        "id": str(quiz["_id"]),
+        "title": "Cell biology",
+        "description": build_default_description("Cell biology"),
+        "quiz_type": quiz_type,
+        "questions": [
+            {"question": question["question"], "options": question.get("options")}
+            for question in quiz["questions"]
+        ],
+    }
+    assert payload["questions"][0]["options"] is None
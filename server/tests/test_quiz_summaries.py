@@ -0,0 +1,115 @@
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from server.app.quiz.repositories.v2.models import QuizSummaryV2
+from server.app.quiz.repositories.v2.repositories.quiz_repository import QuizV2Repository
+from server.app.quiz.routes import folders as folder_routes
+from server.tests.library_fake import LibraryCollections, build_library_listings, listings, response_bytes
+
+
+USER_ID = "user-1"
+
+
+def _library(quizzes: int = 12, **kwargs):
+    collections = LibraryCollections()
+    folder_id = build_library_listings(collections, user_id=USER_ID, quizzes=quizzes, questions=6, **kwargs)
+    return collections, folder_id, collections.library_service()
+
+
+def _rows(payload):
+    return payload["quizzes"] if isinstance(payload, dict) else payload
+
+
+@pytest.mark.asyncio
+async def test_summaries_are_read_with_a_projection_in_the_order_asked():
+    collections, _, _ = _library(5)
+    repository = QuizV2Repository(collections.quizzes)
+    quiz_ids = [str(quiz_id) for quiz_id in collections.quizzes.documents]
+    requested = [quiz_ids[3], "not-an-id", quiz_ids[0], str(ObjectId())]
+
+    summaries = await repository.find_summaries_by_ids(requested)
+
+    assert [summary.id for summary in summaries] == [quiz_ids[3], quiz_ids[0]]
+    stored = collections.quizzes.documents[ObjectId(quiz_ids[3])]
+    assert summaries[0] == QuizSummaryV2(
+        id=quiz_ids[3],
+        title=stored["title"],
+        quiz_type="short-answer",
+        question_count=len(stored["questions"]),
+        created_at=stored["created_at"],
+        updated_at=stored["updated_at"],
+    )
+    assert not hasattr(summaries[0], "__dict__")
+    assert await repository.find_summaries_by_ids(["not-an-id"]) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", range(3))
+async def test_summary_rows_are_full_rows_with_a_question_count(seed):
+    collections, folder_id, service = _library(seed=seed)
+    # A quiz whose document disappeared is skipped in both modes.
+    del collections.quizzes.documents[next(iter(collections.quizzes.documents))]
+
+    for name, call in listings(user_id=USER_ID, folder_id=folder_id).items():
+        full = await call(service, False)
+        summary = await call(service, True)
+        expected = []
+        for row in _rows(full):
+            row = dict(row)
+            questions = row.pop("questions")
+            expected.append({**row, "question_count": len(questions)})
+        assert [{key: row[key] for key in sorted(row)} for row in _rows(summary)] == [
+            {key: row[key] for key in sorted(row)} for row in expected
+        ], name
+        assert len(_rows(summary)) == len(collections.quizzes.documents)
+        assert response_bytes(summary) < response_bytes(full) / 5
+
+
+@pytest.mark.asyncio
+async def test_summary_listings_never_read_questions(monkeypatch):
+    collections, folder_id, service = _library()
+
+    async def no_full_reads(quiz_ids):
+        raise AssertionError("summary listings must not load full quizzes")
+
+    monkeypatch.setattr(service.quiz_repository, "find_many_by_ids", no_full_reads)
+    for call in listings(user_id=USER_ID, folder_id=folder_id).values():
+        collections.reset_counts()
+        await call(service, True)
+        assert collections.quizzes.operations == ["find"]
+
+
+@pytest.mark.asyncio
+async def test_folder_item_detail_serves_the_questions_a_summary_left_out():
+    collections, folder_id, service = _library()
+    full = await service.get_folder(folder_id=folder_id, user_id=USER_ID)
+    summary = await service.get_folder(folder_id=folder_id, user_id=USER_ID, summary=True)
+
+    for full_item, summary_item in zip(full["quizzes"], summary["quizzes"]):
+        detail = await service.get_folder_item(folder_id=folder_id, folder_item_id=summary_item["id"], user_id=USER_ID)
+        assert detail == full_item
+
+    other_folder_id = build_library_listings(collections, user_id=USER_ID, quizzes=1, seed=9)
+    other_item_id = (await service.get_folder(folder_id=other_folder_id, user_id=USER_ID))["quizzes"][0]["id"]
+    assert await service.get_folder_item(folder_id=folder_id, folder_item_id=other_item_id, user_id=USER_ID) is None
+    assert await service.get_folder_item(folder_id=folder_id, folder_item_id="missing", user_id=USER_ID) is None
+    with pytest.raises(PermissionError):
+        await service.get_folder_item(folder_id=folder_id, folder_item_id=other_item_id, user_id="someone-else")
+
+
+@pytest.mark.asyncio
+async def test_folder_routes_pass_summary_and_serve_item_details(monkeypatch):
+    collections, folder_id, service = _library(3)
+    monkeypatch.setattr(folder_routes, "quiz_user_library_service", service)
+    user = type("User", (), {"id": USER_ID})()
+
+    listed = await folder_routes.get_folder_by_id_route(folder_id, summary=True, user=user)
+    assert all("questions" not in item and item["question_count"] for item in listed["quizzes"])
+
+    item = await folder_routes.get_folder_item_route(folder_id, listed["quizzes"][0]["id"], user=user)
+    assert len(item["questions"]) == listed["quizzes"][0]["question_count"]
+
+    with pytest.raises(HTTPException) as missing:
+        await folder_routes.get_folder_item_route(folder_id, str(ObjectId()), user=user)
+    assert missing.value.status_code == 404
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from server.app.quiz.utils.ai_generate import _select_relevant_chunks
+from server.app.quiz.utils.chunk_text import TextChunk
+from server.app.quiz.utils.rag_retrieval import ChunkEmbeddingIndex
+from server.tests.document_factories import random_unit_vectors
+from server.tests.legacy_documents import legacy_select_indices
+
+
+@pytest.mark.parametrize(
+    ("chunk_count", "top_k"),
+    [(1, 8), (5, 8), (24, 8), (24, 3), (200, 8), (200, 1)],
+)
+def test_selection_matches_list_based_implementation(chunk_count, top_k):
+    for seed in range(5):
+        embeddings = random_unit_vectors(chunk_count, 48, seed=seed * 1000 + chunk_count)
+        query = random_unit_vectors(1, 48, seed=-seed - 1)[0]
+
+        expected = legacy_select_indices(embeddings, query, top_k=top_k)
+        actual = ChunkEmbeddingIndex(embeddings).select(query, top_k=top_k)
+
+        assert [item.index for item in actual] == [index for index, _ in expected]
+        assert [item.score for item in actual] == pytest.approx(
+            [score for _, score in expected],
+            abs=1e-6,
+        )
+
+
+def test_selection_handles_unnormalized_and_zero_vectors():
+    embeddings = [
+        [3.0, 0.0, 4.0],
+        [0.0, 0.0, 0.0],
+        [1.0, 2.0, 2.0],
+        [-2.0, 1.0, 0.5],
+        [0.5, 0.5, 0.5],
+    ]
+    query = [2.0, 1.0, 0.0]
+
+    actual = ChunkEmbeddingIndex(embeddings).select(query, top_k=3)
+
+    # The zero row scores 0 against everything and is never picked.
+    assert [item.index for item in actual] == [4, 2, 0]
+    assert [item.score for item in actual] == pytest.approx(
+        [0.816282, 0.703432, 0.634915],
+        abs=1e-6,
+    )
+
+
+def test_index_stores_row_normalized_float32_matrix():
+    index = ChunkEmbeddingIndex([[3.0, 4.0], [0.0, 0.0]])
+
+    assert index.matrix.dtype == np.float32
+    assert index.matrix.flags.writeable is False
+    np.testing.assert_allclose(index.matrix, [[0.6, 0.8], [0.0, 0.0]])
+
+
+def test_empty_query_scores_on_centroid_only():
+    embeddings = random_unit_vectors(6, 16, seed=7)
+
+    expected = legacy_select_indices(embeddings, [], top_k=2)
+    actual = ChunkEmbeddingIndex(embeddings).select([], top_k=2)
+
+    assert [item.index for item in actual] == [index for index, _ in expected]
+
+
+def test_select_relevant_chunks_returns_chunks_in_document_order():
+    embeddings = random_unit_vectors(12, 32, seed=11)
+    query = random_unit_vectors(1, 32, seed=12)[0]
+    chunks = [
+        TextChunk(chunk_id=index, content=f"chunk {index}", char_count=7)
+        for index in range(12)
+    ]
+
+    retrieved = _select_relevant_chunks(chunks, embeddings, query, top_k=4)
+    expected_indices = sorted(
+        index for index, _ in legacy_select_indices(embeddings, query, top_k=4)
+    )
+
+    assert [item.chunk.chunk_id for item in retrieved] == expected_indices
@@ -0,0 +1,251 @@
+import pytest
+from bson import ObjectId
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from server.app.quiz.repositories import ai_generated_quiz_repository
+from server.app.quiz.services import taxonomy_classification_cache
+from server.app.quiz.services.canonical_quiz_service import CanonicalQuizWriteService
+from server.app.quiz.services.category_taxonomy_service import (
+    build_classification,
+    get_taxonomy_entry_by_slugs,
+)
+from server.app.quiz.services.taxonomy_classification_cache import (
+    TaxonomyClassificationCache,
+    build_classification_cache_key,
+)
+from server.tests.redis_fake import FakeRedis
+
+
+class FakeQuizRepository:
+    def __init__(self):
+        self.by_fingerprint = {}
+        self.lookups = 0
+
+    async def find_by_content_fingerprint(self, content_fingerprint):
+        self.lookups += 1
+        return self.by_fingerprint.get(content_fingerprint)
+
+    async def find_or_create_by_fingerprint(self, quiz):
+        existing = self.by_fingerprint.get(quiz.content_fingerprint)
+        if existing:
+            return existing
+        stored = quiz.model_copy(update={"id": ObjectId()})
+        self.by_fingerprint[quiz.content_fingerprint] = stored
+        return stored
+
+
+class CountingClassifier:
+    def __init__(self, subcategory_slug="programming", *, method="ai", confidence=0.9):
+        self.entry = get_taxonomy_entry_by_slugs("technology-and-computing", subcategory_slug)
+        self.method = method
+        self.confidence = confidence
+        self.calls = []
+
+    async def __call__(self, *, quiz_type, token, **kwargs):
+        self.calls.append(token)
+        return build_classification(self.entry, quiz_type, method=self.method, confidence=self.confidence)
+
+
+class UnreachableRedis:
+    async def get(self, *args, **kwargs):
+        raise RedisConnectionError("Connection refused")
+
+    async def set(self, *args, **kwargs):
+        raise RedisConnectionError("Connection refused")
+
+
+def _cache(redis_client=None, **kwargs) -> TaxonomyClassificationCache:
+    async def factory():
+        return redis_client
+
+    return TaxonomyClassificationCache(
+        redis_client_factory=factory if redis_client is not None else None,
+        **kwargs,
+    )
+
+
+def _quiz_payload(question="What does a compiler do?", *, options=None):
+    return {
+        "profession": "Software Engineer",
+        "question_type": "multichoice",
+        "custom_instruction": "Focus on programming basics",
+        "user_id": "user-1",
+        "questions": [
+            {
+                "question": question,
+                "options": options or ["Translates code", "Runs tests", "Draws UI", "Stores data"],
+                "answer": "Translates code",
+            }
+        ],
+    }
+
+
+@pytest.fixture
+def quiz_repository(monkeypatch):
+    repository = FakeQuizRepository()
+    monkeypatch.setattr(
+        ai_generated_quiz_repository,
+        "canonical_service",
+        CanonicalQuizWriteService(repository=repository),
+    )
+    return repository
+
+
+@pytest.fixture
+def user_tokens(monkeypatch):
+    requested = []
+
+    async def fake_get_user_token(user_id):
+        requested.append(user_id)
+        return "stored-token"
+
+    monkeypatch.setattr(ai_generated_quiz_repository, "get_user_token", fake_get_user_token)
+    return requested
+
+
+@pytest.mark.asyncio
+async def test_saving_a_stored_quiz_reuses_its_classification(monkeypatch, quiz_repository, user_tokens):
+    classifier = CountingClassifier()
+    monkeypatch.setattr(taxonomy_classification_cache, "classify_quiz_taxonomy", classifier)
+    cache = _cache()
+
+    first = await ai_generated_quiz_repository.save_ai_generated_quiz(
+        _quiz_payload(), classification_cache=cache
+    )
+    second = await ai_generated_quiz_repository.save_ai_generated_quiz(
+        _quiz_payload(), classification_cache=cache
+    )
+
+    assert classifier.calls == ["stored-token"]
+    assert user_tokens == ["user-1"]
+    assert second["quiz_id"] == first["quiz_id"]
+    assert second["subcategory_slug"] == "programming"
+    assert first["classification_cache"]["status"] == "miss"
+    assert second["classification_cache"]["status"] == "stored_quiz"
+    assert second["classification_cache"]["stored_quiz_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_topic_skips_the_model(monkeypatch, quiz_repository, user_tokens):
+    classifier = CountingClassifier()
+    monkeypatch.setattr(taxonomy_classification_cache, "classify_quiz_taxonomy", classifier)
+    cache = _cache()
+
+    first = await ai_generated_quiz_repository.save_ai_generated_quiz(
+        _quiz_payload(), classification_cache=cache
+    )
+    # Different options make a new quiz, but the classification text only
+    # differs in casing and punctuation.
+    second = await ai_generated_quiz_repository.save_ai_generated_quiz(
+        _quiz_payload("what does a COMPILER do", options=["Translates code", "Sleeps"]),
+        classification_cache=cache,
+    )
+
+    assert second["quiz_id"] != first["quiz_id"]
+    assert len(classifier.calls) == 1
+    assert user_tokens == ["user-1"]
+    assert second["subcategory_slug"] == "programming"
+    assert second["classification"]["method"] == "ai"
+    assert second["classification_cache"]["status"] == "memory"
+    assert second["classification_cache"]["memory_hits"] == 1
+    assert second["classification_cache"]["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_shares_classifications_across_workers(monkeypatch):
+    classifier = CountingClassifier()
+    monkeypatch.setattr(taxonomy_classification_cache, "classify_quiz_taxonomy", classifier)
+    redis_client = FakeRedis()
+    worker_a, worker_b = _cache(redis_client), _cache(redis_client)
+
+    first, first_status = await taxonomy_classification_cache.classify_quiz_taxonomy_cached(
+        worker_a, quiz_type="multichoice", title="Programming", token="token"
+    )
+    second, second_status = await taxonomy_classification_cache.classify_quiz_taxonomy_cached(
+        worker_b, quiz_type="multiple choice", title="programming!", token="token"
+    )
+
+    assert (first_status, second_status) == ("miss", "redis")
+    assert second == first
+    assert len(classifier.calls) == 1
+    assert len(worker_b) == 1
+    assert worker_b.stats.redis_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_low_confidence_fallbacks_are_not_cached(monkeypatch):
+    classifier = CountingClassifier(method="deterministic", confidence=0.5)
+    monkeypatch.setattr(taxonomy_classification_cache, "classify_quiz_taxonomy", classifier)
+    cache = _cache()
+
+    for _ in range(2):
+        await taxonomy_classification_cache.classify_quiz_taxonomy_cached(
+            cache, quiz_type="multichoice", title="Programming"
+        )
+
+    assert len(classifier.calls) == 2
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_is_bounded_lru(monkeypatch):
+    classifier = CountingClassifier()
+    monkeypatch.setattr(taxonomy_classification_cache, "classify_quiz_taxonomy", classifier)
+    cache = _cache(max_entries=2)
+
+    for title in ("alpha", "beta", "alpha", "gamma", "alpha", "beta"):
+        await taxonomy_classification_cache.classify_quiz_taxonomy_cached(
+            cache, quiz_type="multichoice", title=title
+        )
+
+    # "beta" was evicted by "gamma" while "alpha" stayed hot.
+    assert len(classifier.calls) == 4
+    assert len(cache) == 2
+    assert cache.stats.memory_hits == 2
+
+
+@pytest.mark.asyncio
+async def test_unreachable_redis_falls_back_to_the_classifier(monkeypatch):
+    classifier = CountingClassifier()
+    monkeypatch.setattr(taxonomy_classification_cache, "classify_quiz_taxonomy", classifier)
+    cache = _cache(UnreachableRedis())
+
+    classification, status = await taxonomy_classification_cache.classify_quiz_taxonomy_cached(
+        cache, quiz_type="multichoice", title="Programming"
+    )
+
+    assert classification is not None
+    assert status == "miss"
+    assert cache.stats.redis_errors == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("raw", ["not json", "[1, 2]", '{"category": "Technology"}', '{"tags": [], "retired_field": 1}'])
+async def test_unreadable_redis_entry_is_discarded_and_reclassified(monkeypatch, raw):
+    classifier = CountingClassifier()
+    monkeypatch.setattr(taxonomy_classification_cache, "classify_quiz_taxonomy", classifier)
+    redis_client = FakeRedis()
+    cache = _cache(redis_client)
+    key = build_classification_cache_key("Programming", "multichoice")
+    await redis_client.set(f"quiz-classification:{key}", raw)
+
+    classification, status = await taxonomy_classification_cache.classify_quiz_taxonomy_cached(
+        cache, quiz_type="multichoice", title="Programming"
+    )
+
+    assert classification is not None
+    assert status == "miss"
+    assert len(classifier.calls) == 1
+    assert cache.stats.corrupt_entries == 1
+    assert cache.stats.misses == 1
+    # The bad value was replaced by the fresh classification.
+    assert (await _cache(redis_client).get(key))[1] == "redis"
+
+
+def test_cache_key_normalizes_text_and_quiz_type():
+    assert build_classification_cache_key("Cells, Organisms!", "multiple choice") == (
+        build_classification_cache_key("cells organisms", "multichoice")
+    )
+    assert build_classification_cache_key("cells", "multichoice") != (
+        build_classification_cache_key("cells", "true-false")
+    )
@@ -10,7 +10,7 @@ async def test_v2_collection_setup_is_idempotent(test_db):
     await ensure_v2_collections_and_validators(test_db)
 
     names = set(await test_db.list_collection_names())
-    assert {"quizzes_v2", "folders_v2", "folder_items_v2", "saved_quizzes_v2", "quiz_history_v2"} <= names
+    assert {"quizzes_v2", "folders_v2", "folder_items_v2", "saved_quizzes_v2", "quiz_history_v2", "quiz_access_v2"} <= names
 
 
 @pytest.mark.asyncio
@@ -22,6 +22,7 @@ async def test_v2_indexes_are_created(test_db):
         test_db["folder_items_v2"],
         test_db["saved_quizzes_v2"],
         test_db["quiz_history_v2"],
+        test_db["quiz_access_v2"],
     )
 
     quizzes_indexes = await test_db["quizzes_v2"].index_information()
@@ -31,6 +32,7 @@ async def test_v2_indexes_are_created(test_db):
     assert "category_browse_v2" in quizzes_indexes
     assert "tags_status_visibility_v2" in quizzes_indexes
     assert "user_id_1_quiz_id_1" in saved_indexes
+    assert (await test_db["quiz_access_v2"].index_information())["user_id_1_quiz_id_1"]["unique"] is True
 
 
 @pytest.mark.asyncio